@@ -13,6 +13,7 @@ from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 
 from shared.models.change_detection import ChangeCategory, ChangePriority
+from discord.core.services.field_path_matcher import FieldPathMatcher
 
 
 class EnhancedChangeType(Enum):
@@ -466,12 +467,16 @@ ENHANCED_FIELD_MAPPINGS = {
 }
 
 
+# All mapping patterns in one matcher; the first mapping in table order wins
+_FIELD_MAPPING_MATCHER = FieldPathMatcher(
+    (mapping.api_path, mapping) for mapping in ENHANCED_FIELD_MAPPINGS.values()
+)
+
+
 def get_field_mapping(field_path: str) -> Optional[EnhancedFieldMapping]:
     """Get the field mapping for a given field path."""
-    for mapping_key, mapping in ENHANCED_FIELD_MAPPINGS.items():
-        if mapping.matches_path(field_path):
-            return mapping
-    return None
+    match = _FIELD_MAPPING_MATCHER.match(field_path)
+    return match[1] if match else None
 
 
 def get_mappings_by_category(category: ChangeCategory) -> List[EnhancedFieldMapping]:
@@ -167,11 +167,40 @@ class ChangeLogConfig:
     enable_causation_analysis: bool = True
     enable_detailed_descriptions: bool = True
     backup_old_logs: bool = True
+    backend: str = "segments"  # "segments" (JSON Lines files) or "sqlite"
+    database_file: str = "change_logs.db"  # sqlite backend, relative to storage_dir
     
     def __post_init__(self):
         """Ensure storage_dir is a Path object."""
         if not isinstance(self.storage_dir, Path):
             self.storage_dir = Path(self.storage_dir)
+        if self.backend not in ("segments", "sqlite"):
+            raise ValueError(f"Unknown change log backend: {self.backend}")
+    
+    @property
+    def database_path(self) -> Path:
+        """SQLite database used by the sqlite backend."""
+        return self.storage_dir / self.database_file
+    
+    @classmethod
+    def from_yaml(cls, config_path: Path = Path("config/change_log.yaml"), **overrides) -> 'ChangeLogConfig':
+        """
+        Load the change_log section of change_log.yaml; missing file or keys use defaults.
+        
+        Args:
+            config_path: YAML file with a top-level change_log section
+            **overrides: Values that take precedence over the file
+        """
+        import yaml
+        
+        settings = {}
+        config_path = Path(config_path)
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                section = (yaml.safe_load(f) or {}).get('change_log') or {}
+            settings = {name: value for name, value in section.items() if name in cls.__dataclass_fields__}
+        settings.update(overrides)
+        return cls(**settings)
 
 
 @dataclass
@@ -221,6 +250,17 @@ class ChangeLogMetadata:
             discord_notifications_sent=data.get('discord_notifications_sent', 0),
             change_categories=data.get('change_categories', {})
         )
+    
+    def record_entry(self, entry: 'ChangeLogEntry'):
+        """Count a newly written entry."""
+        self.total_entries += 1
+        self.last_updated = datetime.now()
+        
+        # Update category counts
+        category_key = entry.category.value
+        if category_key not in self.change_categories:
+            self.change_categories[category_key] = 0
+        self.change_categories[category_key] += 1
 
 
 @dataclass
@@ -232,14 +272,8 @@ class ChangeLogFile:
     def add_entry(self, entry: ChangeLogEntry):
         """Add an entry to the log file."""
         self.entries.append(entry)
+        self.metadata.record_entry(entry)
         self.metadata.total_entries = len(self.entries)
-        self.metadata.last_updated = datetime.now()
-        
-        # Update category counts
-        category_key = entry.category.value
-        if category_key not in self.metadata.change_categories:
-            self.metadata.change_categories[category_key] = 0
-        self.metadata.change_categories[category_key] += 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
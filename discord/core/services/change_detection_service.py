@@ -17,7 +17,8 @@ from discord.core.models.change_detection_models import (
     is_change_type_enabled, get_priority_for_field, validate_enhanced_config
 )
 from discord.core.services.change_detectors import (
-    create_enhanced_detector, get_available_enhanced_detectors
+    create_enhanced_detector, get_available_enhanced_detectors,
+    compute_changed_paths, CHARACTER_DATA_ROOT_KEYS
 )
 from discord.core.services.causation_analyzer import ChangeCausationAnalyzer
 from discord.core.services.change_log_service import ChangeLogService
@@ -380,8 +381,11 @@ class EnhancedChangeDetectionService:
         failed_detectors = []
         
         try:
+            # One structural diff up front; only detectors watching a changed subtree run
+            affected_detectors = self._route_detectors(old_data, new_data)
+            
             # Run each enabled detector with error handling
-            for detector_name, detector in self.detectors.items():
+            for detector_name, detector in affected_detectors.items():
                 if is_change_type_enabled(detector_name, self.config):
                     try:
                         changes = detector.detect_changes(old_data, new_data, context)
@@ -457,6 +461,32 @@ class EnhancedChangeDetectionService:
         
         return all_changes
     
+    def _route_detectors(self, old_data: Dict[str, Any], new_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Select the detectors whose watched paths overlap the changed subtrees.
+        
+        Falls back to every detector when a top-level key outside the known
+        scraper output layout changed, since watched paths only describe it.
+        """
+        if not isinstance(old_data, dict) or not isinstance(new_data, dict):
+            return self.detectors
+        
+        changed_paths = compute_changed_paths(old_data, new_data)
+        changed_roots = {path.split('.', 1)[0] for path in changed_paths}
+        
+        if not changed_roots <= CHARACTER_DATA_ROOT_KEYS:
+            unknown = sorted(changed_roots - CHARACTER_DATA_ROOT_KEYS)
+            self.logger.debug(f"Unrecognised top-level keys changed {unknown}, running all detectors")
+            return self.detectors
+        
+        affected = {
+            name: detector for name, detector in self.detectors.items()
+            if detector.is_affected_by(changed_paths)
+        }
+        self.logger.debug(f"Changed paths {sorted(changed_paths)} routed to "
+                          f"{len(affected)}/{len(self.detectors)} detectors: {list(affected)}")
+        return affected
+    
     def analyze_causation(self, changes: List[FieldChange], old_data: Dict[str, Any], 
                          new_data: Dict[str, Any]) -> List[ChangeCausation]:
         """
@@ -740,6 +770,9 @@ class EnhancedChangeDetectionService:
             for i, excluded in enumerate(excluded_changes, 1):
                 self.logger.info(f"   {i}. {excluded['field_path']}: {excluded['description']} (Priority: {excluded['priority']}) - {excluded['reason']}")
         
+        # Persist any fields auto-discovered during this run in one write
+        self.dynamic_config.flush_discovered_fields()
+        
         return filtered_changes
 
     def _create_change_log_service(self) -> Optional[ChangeLogService]:
@@ -747,7 +780,7 @@ class EnhancedChangeDetectionService:
         try:
             self.logger.debug(f"Creating change log service, enable_change_logging={self.config.enable_change_logging}")
             if self.config.enable_change_logging:
-                change_log_config = ChangeLogConfig(
+                change_log_config = ChangeLogConfig.from_yaml(
                     enable_causation_analysis=self.config.enable_causation_analysis,
                     enable_detailed_descriptions=True,
                     log_retention_days=self.config.change_log_retention_days,
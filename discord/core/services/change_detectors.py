@@ -2011,15 +2011,68 @@ def extract_movement_speeds_data(character_data: Dict) -> Dict[str, int]:
         return {'walk': 30, 'fly': 0, 'swim': 0, 'climb': 0, 'burrow': 0}
 
 
+# Top-level keys of current scraper output. Detectors declare which of these
+# they read (watched_paths); a change under any other top-level key means an
+# unrecognised (e.g. legacy) layout, and every detector runs.
+CHARACTER_DATA_ROOT_KEYS = frozenset({
+    'abilities', 'calculation_metadata', 'character_info', 'combat', 'equipment',
+    'features', 'proficiencies', 'resources', 'rule_version', 'spellcasting',
+    'spells', 'appearance', 'traits', 'notes', 'scraper_version', 'api_version',
+    'character_url', 'generated_timestamp'
+})
+
+
+def compute_changed_paths(old_data: Any, new_data: Any, max_depth: int = 2, _prefix: str = '') -> Set[str]:
+    """
+    Structural diff of two character dicts.
+
+    Returns the dotted paths of changed subtrees, descending into nested
+    dicts up to max_depth levels (deeper changes are reported at that depth).
+    Added and removed keys count as changed.
+    """
+    changed = set()
+    if not isinstance(old_data, dict) or not isinstance(new_data, dict):
+        return changed
+
+    for key in old_data.keys() | new_data.keys():
+        old_value = old_data.get(key)
+        new_value = new_data.get(key)
+        if old_value is new_value or ((key in old_data) == (key in new_data) and old_value == new_value):
+            continue
+
+        path = f"{_prefix}{key}"
+        nested = None
+        if max_depth > 1 and isinstance(old_value, dict) and isinstance(new_value, dict):
+            nested = compute_changed_paths(old_value, new_value, max_depth - 1, f"{path}.")
+        changed.update(nested or {path})
+
+    return changed
+
+
 class BaseEnhancedDetector(ABC):
     """Base class for enhanced change detectors."""
-    
-    def __init__(self, field_mappings: Dict[str, EnhancedFieldMapping], 
+
+    # Paths this detector reads (top-level keys or dotted subtrees). The
+    # service only runs the detector when one of them changed. None = always run.
+    watched_paths: Optional[tuple] = None
+
+    def __init__(self, field_mappings: Dict[str, EnhancedFieldMapping],
                  priority_rules: Dict[str, ChangePriority]):
         self.field_mappings = field_mappings
         self.priority_rules = priority_rules
         self.logger = logging.getLogger(self.__class__.__name__)
-    
+
+    def is_affected_by(self, changed_paths: Set[str]) -> bool:
+        """Whether any changed path overlaps this detector's watched paths."""
+        if self.watched_paths is None:
+            return True
+        for changed in changed_paths:
+            for watched in self.watched_paths:
+                if (changed == watched or changed.startswith(watched + '.')
+                        or watched.startswith(changed + '.')):
+                    return True
+        return False
+
     @abstractmethod
     def detect_changes(self, old_data: Dict, new_data: Dict, context: DetectionContext) -> List[FieldChange]:
         """Detect changes specific to this detector's domain."""
@@ -2098,6 +2151,8 @@ class BaseEnhancedDetector(ABC):
 class FeatsChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for feat additions, removals, and modifications with detailed attribution."""
     
+    watched_paths = ('abilities', 'combat', 'features', 'proficiencies', 'spellcasting', 'spells')
+    
     def __init__(self):
         field_mappings = {
             'feats': EnhancedFieldMapping(
@@ -2753,6 +2808,8 @@ class FeatsChangeDetector(BaseEnhancedDetector):
 class EnhancedAbilityScoreDetector(BaseEnhancedDetector):
     """Enhanced detector for ability score changes with comprehensive causation tracking."""
     
+    watched_paths = ('abilities', 'character_info', 'equipment', 'features', 'proficiencies', 'spellcasting')
+    
     def __init__(self):
         field_mappings = {
             'ability_scores': EnhancedFieldMapping(
@@ -3553,6 +3610,8 @@ class EnhancedAbilityScoreDetector(BaseEnhancedDetector):
 class SubclassChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for subclass selections and changes with multiclass support."""
     
+    watched_paths = ('character_info', 'features')
+    
     def __init__(self):
         field_mappings = {
             'subclass': EnhancedFieldMapping(
@@ -3866,6 +3925,8 @@ class SubclassChangeDetector(BaseEnhancedDetector):
 class EnhancedSpellsChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for comprehensive spell tracking."""
     
+    watched_paths = ('spellcasting', 'spells')
+    
     def __init__(self):
         field_mappings = {
             'spells_known': EnhancedFieldMapping(
@@ -4446,6 +4507,8 @@ class EnhancedSpellsChangeDetector(BaseEnhancedDetector):
 class EnhancedInventoryChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for inventory and equipment changes with proper item name extraction."""
     
+    watched_paths = ('character_info', 'equipment')
+    
     def __init__(self):
         field_mappings = {
             'inventory': EnhancedFieldMapping(
@@ -5186,6 +5249,8 @@ class EnhancedInventoryChangeDetector(BaseEnhancedDetector):
 class LevelProgressionDetector(BaseEnhancedDetector):
     """Detector for overall character level progression and advancement."""
     
+    watched_paths = ('character_info',)
+    
     def __init__(self):
         field_mappings = {
             'character_level': EnhancedFieldMapping(
@@ -5478,6 +5543,8 @@ def get_available_enhanced_detectors() -> List[str]:
 class BackgroundChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for background changes and related proficiencies/traits."""
     
+    watched_paths = ('features', 'proficiencies', 'traits')
+    
     def __init__(self):
         field_mappings = {
             'background': EnhancedFieldMapping(
@@ -5952,6 +6019,8 @@ class BackgroundChangeDetector(BaseEnhancedDetector):
 class MaxHPChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for maximum hit point changes with detailed causation attribution."""
     
+    watched_paths = ('abilities', 'character_info', 'combat', 'equipment', 'features')
+    
     def __init__(self):
         field_mappings = {
             'max_hp': EnhancedFieldMapping(
@@ -6683,6 +6752,8 @@ class MaxHPChangeDetector(BaseEnhancedDetector):
 class ProficienciesChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for skill, tool, language, and saving throw proficiency changes with expertise tracking."""
     
+    watched_paths = ('character_info', 'proficiencies')
+    
     def __init__(self):
         field_mappings = {
             'skill_proficiencies': EnhancedFieldMapping(
@@ -7229,6 +7300,8 @@ class ProficienciesChangeDetector(BaseEnhancedDetector):
 class RaceSpeciesChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for race and species changes with racial trait tracking."""
     
+    watched_paths = ('proficiencies', 'traits')
+    
     def __init__(self):
         field_mappings = {
             'race': EnhancedFieldMapping(
@@ -7777,6 +7850,8 @@ class RaceSpeciesChangeDetector(BaseEnhancedDetector):
 class MulticlassChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for multiclass progression with detailed class attribution and causation linking."""
     
+    watched_paths = ('character_info', 'features', 'proficiencies', 'spellcasting')
+    
     def __init__(self):
         field_mappings = {
             'classes': EnhancedFieldMapping(
@@ -8388,6 +8463,8 @@ class MulticlassChangeDetector(BaseEnhancedDetector):
 class PersonalityChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for personality changes including traits, ideals, bonds, and flaws."""
     
+    watched_paths = ('traits',)
+    
     def __init__(self):
         field_mappings = {
             'personality_traits': EnhancedFieldMapping(
@@ -8891,6 +8968,8 @@ class PersonalityChangeDetector(BaseEnhancedDetector):
 class SpellcastingStatsDetector(BaseEnhancedDetector):
     """Enhanced detector for spellcasting stat changes with causation attribution."""
     
+    watched_paths = ('abilities', 'character_info', 'equipment', 'features', 'spellcasting')
+    
     def __init__(self):
         field_mappings = {
             'spell_attack_bonus': EnhancedFieldMapping(
@@ -9565,6 +9644,8 @@ class SpellcastingStatsDetector(BaseEnhancedDetector):
 class InitiativeChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for initiative bonus changes with causation attribution."""
     
+    watched_paths = ('abilities', 'combat', 'equipment', 'features')
+    
     def __init__(self):
         field_mappings = {
             'initiative_bonus': EnhancedFieldMapping(
@@ -10035,6 +10116,8 @@ class InitiativeChangeDetector(BaseEnhancedDetector):
 class PassiveSkillsDetector(BaseEnhancedDetector):
     """Enhanced detector for passive skill changes with detailed causation attribution."""
     
+    watched_paths = ('abilities', 'character_info', 'equipment', 'features', 'proficiencies')
+    
     def __init__(self):
         field_mappings = {
             'passive_perception': EnhancedFieldMapping(
@@ -10690,6 +10773,8 @@ class PassiveSkillsDetector(BaseEnhancedDetector):
 class PassiveSkillsDetector(BaseEnhancedDetector):
     """Enhanced detector for passive skill changes with detailed causation attribution."""
     
+    watched_paths = ('abilities', 'character_info', 'equipment', 'features', 'proficiencies')
+    
     def __init__(self):
         field_mappings = {
             'passive_perception': EnhancedFieldMapping(
@@ -11338,6 +11423,8 @@ class PassiveSkillsDetector(BaseEnhancedDetector):
 class PassiveSkillsDetector(BaseEnhancedDetector):
     """Enhanced detector for passive skill changes (passive perception, investigation, etc.)."""
     
+    watched_paths = ('abilities', 'character_info', 'proficiencies')
+    
     def __init__(self):
         field_mappings = {
             'passive_perception': EnhancedFieldMapping(
@@ -11959,6 +12046,9 @@ class PassiveSkillsDetector(BaseEnhancedDetector):
 class AlignmentChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for character alignment changes and modifications."""
     
+    # Only reads legacy top-level keys, so current-format data never affects it
+    watched_paths = ()
+    
     def __init__(self):
         field_mappings = {
             'alignment': EnhancedFieldMapping(
@@ -12304,6 +12394,9 @@ class AlignmentChangeDetector(BaseEnhancedDetector):
 class SizeChangeDetector(BaseEnhancedDetector):
     """Enhanced detector for character size category changes and size-related effects."""
     
+    # Only reads legacy top-level keys, so current-format data never affects it
+    watched_paths = ()
+    
     def __init__(self):
         field_mappings = {
             'size': EnhancedFieldMapping(
@@ -12747,6 +12840,9 @@ class SizeChangeDetector(BaseEnhancedDetector):
 class MovementSpeedDetector(BaseEnhancedDetector):
     """Enhanced detector for movement speed modifications and various movement types."""
     
+    # The roots extract_movement_speeds_data() reads
+    watched_paths = ('character', 'movement', 'speed', 'speeds')
+    
     def __init__(self):
         field_mappings = {
             'speed': EnhancedFieldMapping(
@@ -13604,6 +13700,8 @@ class MovementSpeedDetector(BaseEnhancedDetector):
 class ClassFeaturesChangeDetector(BaseEnhancedDetector):
     """Detector for class feature changes including both single-class and multiclass characters."""
     
+    watched_paths = ('features',)
+    
     def __init__(self):
         field_mappings = {
             'class_features': EnhancedFieldMapping(
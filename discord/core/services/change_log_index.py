@@ -0,0 +1,163 @@
+"""
+Change Log Index
+
+Secondary indexes over a character's segmented change log. Each entry gets one
+compact row (segment, byte offset, length, timestamp and the fields queries
+filter on), appended to {character_dir}/index.jsonl as the entry is written.
+In memory the rows are organised into a timestamp-ordered list and posting
+lists per indexed field, so a query touches only the rows it can match and
+then reads just the selected entries from their segments.
+"""
+
+import bisect
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from discord.core.models.change_log import ChangeLogEntry
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+
+# Fields with posting lists; values are the entry's plain (JSON) values
+INDEXED_FIELDS = (
+    'field_path', 'change_type', 'category', 'priority',
+    'trigger', 'source', 'source_name', 'source_type'
+)
+
+
+class IndexRecord(NamedTuple):
+    """Location and indexed fields of one change log entry."""
+    segment: int
+    offset: int
+    length: int
+    timestamp: datetime
+    field_path: str
+    change_type: str
+    category: str
+    priority: int
+    trigger: Optional[str]
+    source: Optional[str]
+    source_name: Optional[str]
+    source_type: Optional[str]
+
+    @classmethod
+    def from_entry(cls, segment: int, offset: int, length: int, entry: ChangeLogEntry) -> 'IndexRecord':
+        """Build the row for an entry stored at segment/offset."""
+        return cls(
+            segment=segment,
+            offset=offset,
+            length=length,
+            timestamp=entry.timestamp,
+            field_path=entry.field_path,
+            change_type=entry.change_type,
+            category=entry.category.value,
+            priority=entry.priority.value,
+            trigger=entry.causation.trigger if entry.causation else None,
+            source=entry.attribution.source if entry.attribution else None,
+            source_name=entry.attribution.source_name if entry.attribution else None,
+            source_type=entry.attribution.source_type if entry.attribution else None
+        )
+
+    def to_line(self) -> str:
+        """Serialise as one index file line."""
+        return json.dumps([self.segment, self.offset, self.length, self.timestamp.isoformat(),
+                           *self[4:]], ensure_ascii=False) + '\n'
+
+    @classmethod
+    def from_line(cls, line: str) -> 'IndexRecord':
+        """Parse one index file line."""
+        values = json.loads(line)
+        values[3] = datetime.fromisoformat(values[3])
+        return cls(*values)
+
+
+class ChangeLogIndex:
+    """
+    In-memory secondary indexes for one character.
+
+    Row ids are positions in append order, which is also the order entries
+    are streamed from the segments.
+    """
+
+    def __init__(self):
+        self.records: List[IndexRecord] = []
+        self.indexed_end: Dict[int, int] = {}  # segment -> end of last indexed entry
+        self._by_time: List[tuple] = []  # (timestamp, row id), sorted
+        self._postings: Dict[str, Dict[Any, List[int]]] = {name: {} for name in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, records: Iterable[IndexRecord]) -> None:
+        """Index newly appended rows."""
+        for record in records:
+            row = len(self.records)
+            self.records.append(record)
+            self.indexed_end[record.segment] = max(self.indexed_end.get(record.segment, 0),
+                                                   record.offset + record.length)
+
+            # Appends are almost always in time order, making this an O(1) append
+            key = (record.timestamp, row)
+            if not self._by_time or self._by_time[-1] <= key:
+                self._by_time.append(key)
+            else:
+                bisect.insort(self._by_time, key)
+
+            for name in INDEXED_FIELDS:
+                value = getattr(record, name)
+                if value is not None:
+                    self._postings[name].setdefault(value, []).append(row)
+
+    def rows_for(self, name: str, value: Any) -> List[int]:
+        """Row ids (append order) whose indexed field equals value."""
+        return self._postings[name].get(value, [])
+
+    def select(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               **equals: Optional[Set[Any]]) -> List[int]:
+        """
+        Row ids matching a time range and per-field value sets.
+
+        Args:
+            start: Inclusive lower timestamp bound
+            end: Inclusive upper timestamp bound
+            **equals: INDEXED_FIELDS name -> accepted values (None = any)
+
+        Returns:
+            Matching row ids in append order
+        """
+        candidates: Optional[Set[int]] = None
+        for name, values in sorted(equals.items(), key=lambda item: self._posting_size(*item)):
+            if values is None:
+                continue
+            rows = {row for value in values for row in self.rows_for(name, value)}
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return []
+
+        if start is None and end is None:
+            return sorted(candidates) if candidates is not None else list(range(len(self.records)))
+
+        low = bisect.bisect_left(self._by_time, (start,)) if start else 0
+        high = bisect.bisect_right(self._by_time, (end, len(self.records))) if end else len(self._by_time)
+
+        # Walk whichever side is smaller: the time slice or the equality matches
+        if candidates is not None and len(candidates) < high - low:
+            return sorted(row for row in candidates
+                          if (start is None or self.records[row].timestamp >= start)
+                          and (end is None or self.records[row].timestamp <= end))
+        rows = (row for _, row in self._by_time[low:high])
+        if candidates is not None:
+            rows = (row for row in rows if row in candidates)
+        return sorted(rows)
+
+    def _posting_size(self, name: str, values: Optional[Set[Any]]) -> int:
+        if values is None:
+            return 0
+        return sum(len(self.rows_for(name, value)) for value in values)
+
+    def order_newest_first(self, rows: Iterable[int]) -> List[int]:
+        """Order rows the way get_change_history returns entries (newest first, stable)."""
+        return sorted(sorted(rows), key=lambda row: self.records[row].timestamp, reverse=True)
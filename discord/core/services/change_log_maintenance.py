@@ -16,6 +16,7 @@ import shutil
 
 from discord.core.models.change_log import ChangeLogConfig, ChangeLogFile, ChangeLogMetadata
 from discord.core.services.change_log_service import ChangeLogService
+from discord.core.services.change_log_sqlite import SQLiteChangeLogStore
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,10 @@ class ChangeLogMaintenanceService:
         
         # Ensure storage directory exists
         self.config.storage_dir.mkdir(parents=True, exist_ok=True)
+        
+        # SQLite backend: maintenance runs as indexed queries instead of file scans
+        self.sqlite_store = (SQLiteChangeLogStore(self.config.database_path)
+                             if self.config.backend == "sqlite" else None)
     
     async def run_scheduled_maintenance(self) -> Dict[str, Any]:
         """Run scheduled maintenance operations."""
@@ -266,6 +271,19 @@ class ChangeLogMaintenanceService:
             
             cutoff_date = datetime.now() - timedelta(days=self.config.log_retention_days)
             
+            if self.sqlite_store is not None:
+                size_before = self.sqlite_store.size_bytes()
+                archive_path = (self.config.storage_dir / "archive" / self.config.database_file
+                                if self.config.backup_old_logs else None)
+                removed = self.sqlite_store.delete_before(cutoff_date, archive_path)
+                results['entries_removed'] = removed
+                results['entries_archived' if archive_path else 'entries_deleted'] = removed
+                results['space_freed_mb'] = round(max(0, size_before - self.sqlite_store.size_bytes()) / (1024 * 1024), 2)
+                
+                self.logger.info(f"Log cleanup completed: {removed} entries older than {cutoff_date.date()} "
+                               f"{'archived' if archive_path else 'deleted'}")
+                return results
+            
             # Process current log files
             current_files = list(self.config.storage_dir.glob("character_*_changes.json"))
             
@@ -335,6 +353,28 @@ class ChangeLogMaintenanceService:
                 'errors': []
             }
             
+            if self.sqlite_store is not None:
+                problems = self.sqlite_store.integrity_check()
+                invalid_entries = self.sqlite_store.count_invalid_entries()
+                repairs = []
+                if invalid_entries and not problems:
+                    self.sqlite_store.delete_invalid_entries()
+                    repairs.append(f"Removed {invalid_entries} entries with invalid JSON")
+                
+                status = 'corrupted' if problems else 'repaired' if repairs else 'valid'
+                results['files_checked'] = 1
+                results['files_' + status] += 1
+                results['success'] = not problems
+                results['validation_details'].append({
+                    'file': str(self.sqlite_store.db_path),
+                    'status': status,
+                    'issues': problems,
+                    'repairs': repairs
+                })
+                
+                self.logger.info(f"Log validation completed: database {status}")
+                return results
+            
             # Get all log files
             all_files = []
             all_files.extend(self.config.storage_dir.glob("character_*_changes.json"))
@@ -519,6 +559,16 @@ class ChangeLogMaintenanceService:
             'files_with_warnings': 0
         }
         
+        if self.sqlite_store is not None:
+            results['files_checked'] = 1
+            if self.sqlite_store.integrity_check(quick=True):
+                results['corrupted_files'] = 1
+            elif self.sqlite_store.count_invalid_entries():
+                results['files_with_warnings'] = 1
+            else:
+                results['files_valid'] = 1
+            return results
+        
         all_files = list(self.config.storage_dir.glob("character_*_changes.json"))
         for character_dir in self.config.storage_dir.glob("character_*"):
             if character_dir.is_dir():
@@ -16,11 +16,23 @@ from discord.core.models.change_log import (
     ChangeLogEntry, ChangeLogConfig, ChangeLogMetadata, ChangeLogFile,
     ChangeCausation, ChangeAttribution
 )
+from discord.core.services.change_log_index import ChangeLogIndex
+from discord.core.services.change_log_search import SEARCH_FIELDS
 from discord.core.services.change_log_service import ChangeLogService
 from discord.services.change_detection.models import ChangeCategory, ChangePriority
 
 logger = logging.getLogger(__name__)
 
+# Custom filter fields the change log index can answer: entry path -> indexed field
+INDEXED_FILTER_FIELDS = {
+    'field_path': 'field_path',
+    'change_type': 'change_type',
+    'causation.trigger': 'trigger',
+    'attribution.source': 'source',
+    'attribution.source_name': 'source_name',
+    'attribution.source_type': 'source_type'
+}
+
 
 class SortOrder(Enum):
     """Sort order for query results."""
@@ -201,6 +213,16 @@ class ChangeLogQueryInterface:
         start_time = datetime.now()
         
         try:
+            # The sqlite backend answers the query with its own indexes
+            if self.change_log_service.sqlite_store is not None:
+                await self.change_log_service._ensure_migrated(character_id)
+                return self._query_sqlite(character_id, options, start_time)
+            
+            # Seek straight to matching entries when the log is indexed
+            index = await self.change_log_service.get_index(character_id)
+            if index is not None:
+                return self._query_indexed(character_id, index, options, start_time)
+            
             # Get all entries for the character
             all_entries = await self.change_log_service.get_change_history(
                 character_id, 
@@ -342,10 +364,16 @@ class ChangeLogQueryInterface:
         """
         Search changes by text content in descriptions and other fields.
         
+        Indexed logs are searched through the full-text index: words match
+        whole terms, ``fire*`` matches a prefix and ``"magic missile"`` a
+        phrase; all of them must match, and results are ranked best first.
+        Logs that are not indexed yet, or fields outside the index, fall back
+        to a substring scan in log order.
+        
         Args:
             character_id: Character to query
             search_term: Text to search for
-            search_fields: Fields to search in (default: description, detailed_description)
+            search_fields: Fields to search in (default: description, detailed_description, field_path)
             limit: Optional limit on results
             
         Returns:
@@ -353,7 +381,14 @@ class ChangeLogQueryInterface:
         """
         try:
             if search_fields is None:
-                search_fields = ["description", "detailed_description", "field_path"]
+                search_fields = list(SEARCH_FIELDS)
+            
+            if all(field in SEARCH_FIELDS for field in search_fields):
+                search_index = await self.change_log_service.get_search_index(character_id)
+                if search_index is not None:
+                    hits = search_index.search(search_term, search_fields)
+                    rows = [row for row, _ in (hits[:limit] if limit else hits)]
+                    return self.change_log_service.read_indexed_entries(character_id, search_index.index, rows)
             
             # Create filters for each search field
             filters = []
@@ -489,6 +524,10 @@ class ChangeLogQueryInterface:
             List of related change log entries
         """
         try:
+            index = await self.change_log_service.get_index(character_id)
+            if index is not None:
+                return self._get_related_changes_indexed(character_id, index, field_path, time_window_hours)
+            
             # Get all entries
             all_entries = await self.change_log_service.get_change_history(
                 character_id, 
@@ -551,33 +590,19 @@ class ChangeLogQueryInterface:
                 'cleanup_time': datetime.now().isoformat()
             }
             
-            # Get current log file
-            log_file_path = self.change_log_service._get_current_log_file_path(character_id)
-            
-            if not log_file_path.exists():
-                return cleanup_results
-            
-            # Load log file
-            log_file = await self.change_log_service._load_log_file(log_file_path)
-            original_count = len(log_file.entries)
-            cleanup_results['entries_before'] = original_count
-            
-            # Apply cleanup criteria
-            filtered_entries = []
-            
-            for entry in log_file.entries:
-                should_keep = True
+            def should_keep(entry: ChangeLogEntry) -> bool:
+                keep = True
                 
                 # Age-based cleanup
                 if 'max_age_days' in cleanup_criteria:
                     max_age = timedelta(days=cleanup_criteria['max_age_days'])
                     if datetime.now() - entry.timestamp > max_age:
-                        should_keep = False
+                        keep = False
                 
                 # Category-based cleanup
                 if 'exclude_categories' in cleanup_criteria:
                     if entry.category.value in cleanup_criteria['exclude_categories']:
-                        should_keep = False
+                        keep = False
                         if entry.category.value not in cleanup_results['categories_cleaned']:
                             cleanup_results['categories_cleaned'].append(entry.category.value)
                 
@@ -585,15 +610,40 @@ class ChangeLogQueryInterface:
                 if 'min_priority' in cleanup_criteria:
                     min_priority = cleanup_criteria['min_priority']
                     if entry.priority.value < min_priority:
-                        should_keep = False
+                        keep = False
                 
                 # Change type cleanup
                 if 'exclude_change_types' in cleanup_criteria:
                     if entry.change_type in cleanup_criteria['exclude_change_types']:
-                        should_keep = False
+                        keep = False
+                
+                return keep
+            
+            # Segmented or sqlite log: rewritten in place by the service
+            if (self.change_log_service.sqlite_store is not None
+                    or await self.change_log_service.get_index(character_id) is not None):
+                original_count, kept_count = await self.change_log_service.rewrite_log(character_id, should_keep)
+                cleanup_results['entries_before'] = original_count
+                cleanup_results['entries_after'] = kept_count
+                cleanup_results['entries_removed'] = original_count - kept_count
+                
+                self.logger.info(f"Cleaned up {cleanup_results['entries_removed']} entries for character {character_id}")
                 
-                if should_keep:
-                    filtered_entries.append(entry)
+                return cleanup_results
+            
+            # Get current log file
+            log_file_path = self.change_log_service._get_current_log_file_path(character_id)
+            
+            if not log_file_path.exists():
+                return cleanup_results
+            
+            # Load log file
+            log_file = await self.change_log_service._load_log_file(log_file_path)
+            original_count = len(log_file.entries)
+            cleanup_results['entries_before'] = original_count
+            
+            # Apply cleanup criteria
+            filtered_entries = [entry for entry in log_file.entries if should_keep(entry)]
             
             # Update log file
             log_file.entries = filtered_entries
@@ -672,6 +722,153 @@ class ChangeLogQueryInterface:
             self.logger.error(f"Error getting maintenance info for character {character_id}: {e}", exc_info=True)
             return {'error': str(e)}
     
+    def _query_indexed(self, character_id: int, index: ChangeLogIndex,
+                       options: QueryOptions, start_time: datetime) -> QueryResult:
+        """Answer a query from the index, reading only the entries on the requested page."""
+        equals, residual_filters = self._index_constraints(options)
+        rows = index.select(options.start_date, options.end_date, **equals)
+        rows = self._sort_rows(index.order_newest_first(rows), index, options)
+        
+        if residual_filters:
+            # Filters the index cannot answer are checked against the candidate entries
+            candidates = self.change_log_service.read_indexed_entries(character_id, index, rows)
+            matching_entries = [e for e in candidates if all(f.matches(e) for f in residual_filters)]
+            filtered_count = len(matching_entries)
+            paginated_entries = self._apply_pagination(matching_entries, options)
+        else:
+            filtered_count = len(rows)
+            paginated_entries = self.change_log_service.read_indexed_entries(
+                character_id, index, self._apply_pagination(rows, options)
+            )
+        
+        # Remove causation/attribution if not requested
+        if not options.include_causation:
+            for entry in paginated_entries:
+                entry.causation = None
+                entry.attribution = None
+        
+        if not options.include_attribution:
+            for entry in paginated_entries:
+                entry.attribution = None
+        
+        return QueryResult(
+            entries=paginated_entries,
+            total_count=len(index),
+            filtered_count=filtered_count,
+            has_more=(options.offset + len(paginated_entries)) < filtered_count,
+            query_time_ms=(datetime.now() - start_time).total_seconds() * 1000
+        )
+    
+    def _query_sqlite(self, character_id: int, options: QueryOptions, start_time: datetime) -> QueryResult:
+        """Answer a query with SQL, decoding only the entries on the requested page."""
+        store = self.change_log_service.sqlite_store
+        equals, residual_filters = self._index_constraints(options)
+        descending = options.sort_order == SortOrder.DESC
+        
+        if residual_filters:
+            # Filters the indexed columns cannot answer are checked against the candidate entries
+            candidates = store.select(character_id, options.start_date, options.end_date,
+                                      options.sort_by, descending, **equals)
+            matching_entries = [e for e in candidates if all(f.matches(e) for f in residual_filters)]
+            filtered_count = len(matching_entries)
+            paginated_entries = self._apply_pagination(matching_entries, options)
+        else:
+            filtered_count = store.count(character_id, options.start_date, options.end_date, **equals)
+            paginated_entries = store.select(character_id, options.start_date, options.end_date,
+                                             options.sort_by, descending,
+                                             limit=options.limit or None, offset=options.offset, **equals)
+        
+        # Remove causation/attribution if not requested
+        if not options.include_causation:
+            for entry in paginated_entries:
+                entry.causation = None
+                entry.attribution = None
+        
+        if not options.include_attribution:
+            for entry in paginated_entries:
+                entry.attribution = None
+        
+        return QueryResult(
+            entries=paginated_entries,
+            total_count=store.count(character_id),
+            filtered_count=filtered_count,
+            has_more=(options.offset + len(paginated_entries)) < filtered_count,
+            query_time_ms=(datetime.now() - start_time).total_seconds() * 1000
+        )
+    
+    def _index_constraints(self, options: QueryOptions) -> Tuple[Dict[str, Set[Any]], List[QueryFilter]]:
+        """Split query options into index lookups and filters that need the entries."""
+        equals: Dict[str, Set[Any]] = {}
+        residual_filters = []
+        
+        def narrow(name: str, values: Set[Any]):
+            equals[name] = equals[name] & values if name in equals else values
+        
+        if options.categories:
+            narrow('category', {getattr(c, 'value', c) for c in options.categories})
+        if options.priorities:
+            narrow('priority', {getattr(p, 'value', p) for p in options.priorities})
+        if options.change_types:
+            narrow('change_type', set(options.change_types))
+        if options.cause_types:
+            narrow('trigger', set(options.cause_types))
+        if options.cause_names:
+            narrow('source_name', set(options.cause_names))
+        if options.source_types:
+            narrow('source_type', set(options.source_types))
+        
+        for filter_obj in options.filters:
+            name = INDEXED_FILTER_FIELDS.get(filter_obj.field)
+            try:
+                if name and filter_obj.operator == QueryOperator.EQUALS:
+                    narrow(name, {filter_obj.value})
+                    continue
+                if name and filter_obj.operator == QueryOperator.IN and \
+                        isinstance(filter_obj.value, (set, frozenset, list, tuple)):
+                    narrow(name, set(filter_obj.value))
+                    continue
+            except TypeError:
+                pass  # Unhashable value; compare against the entries instead
+            residual_filters.append(filter_obj)
+        
+        return equals, residual_filters
+    
+    def _sort_rows(self, rows: List[int], index: ChangeLogIndex, options: QueryOptions) -> List[int]:
+        """Sort index rows like _apply_sorting sorts entries."""
+        sort_field = options.sort_by if options.sort_by in (
+            'priority', 'category', 'change_type', 'field_path'
+        ) else 'timestamp'
+        return sorted(rows, key=lambda row: getattr(index.records[row], sort_field),
+                      reverse=options.sort_order == SortOrder.DESC)
+    
+    def _get_related_changes_indexed(self, character_id: int, index: ChangeLogIndex,
+                                     field_path: str, time_window_hours: int) -> List[ChangeLogEntry]:
+        """get_related_changes reading only the reference entry and its time window."""
+        field_rows = index.rows_for('field_path', field_path)
+        if not field_rows:
+            return []
+        
+        # The most recent change to the field is the reference
+        reference_row = index.order_newest_first(field_rows)[0]
+        reference_entry = self.change_log_service.read_indexed_entries(character_id, index, [reference_row])[0]
+        
+        # Define time window
+        time_window = timedelta(hours=time_window_hours)
+        window_rows = index.order_newest_first(index.select(
+            reference_entry.timestamp - time_window,
+            reference_entry.timestamp + time_window
+        ))
+        
+        related_entries = [
+            entry for entry in self.change_log_service.read_indexed_entries(character_id, index, window_rows)
+            if entry != reference_entry and self._are_entries_related(reference_entry, entry)
+        ]
+        
+        # Sort by timestamp
+        related_entries.sort(key=lambda x: x.timestamp)
+        
+        return related_entries
+    
     def _apply_filters(self, entries: List[ChangeLogEntry], options: QueryOptions) -> List[ChangeLogEntry]:
         """Apply filters to entries."""
         filtered_entries = entries
@@ -683,13 +880,15 @@ class ChangeLogQueryInterface:
         if options.end_date:
             filtered_entries = [e for e in filtered_entries if e.timestamp <= options.end_date]
         
-        # Category filtering
+        # Category filtering (by value: entries and options may use different enum classes)
         if options.categories:
-            filtered_entries = [e for e in filtered_entries if e.category in options.categories]
+            categories = {getattr(c, 'value', c) for c in options.categories}
+            filtered_entries = [e for e in filtered_entries if e.category.value in categories]
         
         # Priority filtering
         if options.priorities:
-            filtered_entries = [e for e in filtered_entries if e.priority in options.priorities]
+            priorities = {getattr(p, 'value', p) for p in options.priorities}
+            filtered_entries = [e for e in filtered_entries if e.priority.value in priorities]
         
         # Change type filtering
         if options.change_types:
@@ -0,0 +1,223 @@
+"""
+Change Log Search
+
+Full-text inverted index over the text of a character's change log entries
+(description, detailed_description and field_path). Each entry's tokens are
+appended to {character_dir}/search.jsonl as the entry is written, keyed by the
+entry's segment and offset, so the index loads without reading the segments.
+In memory, every field keeps positional posting lists (term -> row -> token
+positions); rows are the same ids as in change_log_index.
+
+Query syntax (all clauses must match):
+    fireball          term
+    fire*             prefix
+    "magic missile"   phrase
+    armor_class       punctuated words are searched as a phrase
+"""
+
+import bisect
+import json
+import math
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from discord.core.models.change_log import ChangeLogEntry
+from discord.core.services.change_log_index import ChangeLogIndex, IndexRecord
+
+SEARCH_FILE = "search.jsonl"
+
+# Searchable entry fields and how much a match in each counts towards the score
+SEARCH_FIELDS = ('description', 'detailed_description', 'field_path')
+FIELD_WEIGHTS = {'description': 2.0, 'field_path': 1.5, 'detailed_description': 1.0}
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text; underscores and dots separate words."""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def entry_terms(entry: ChangeLogEntry) -> List[List[str]]:
+    """Tokens of an entry's searchable fields, in SEARCH_FIELDS order."""
+    return [tokenize(getattr(entry, name, None)) for name in SEARCH_FIELDS]
+
+
+def search_line(record: IndexRecord, terms: Sequence[List[str]]) -> str:
+    """Serialise one search file line for the entry at record's location."""
+    return json.dumps([record.segment, record.offset, *terms], ensure_ascii=False) + '\n'
+
+
+def parse_search_line(line: str) -> Tuple[int, int, List[List[str]]]:
+    """Parse one search file line into (segment, offset, terms per field)."""
+    values = json.loads(line)
+    if len(values) != 2 + len(SEARCH_FIELDS):
+        raise ValueError(f"Expected {2 + len(SEARCH_FIELDS)} values, got {len(values)}")
+    return values[0], values[1], values[2:]
+
+
+class SearchClause(NamedTuple):
+    """One parsed query clause."""
+    kind: str  # 'term', 'prefix' or 'phrase'
+    terms: Tuple[str, ...]
+
+
+def parse_query(query: str) -> List[SearchClause]:
+    """Split a query string into term, prefix and phrase clauses."""
+    clauses = []
+    for quoted, word in _QUERY_PATTERN.findall(query or ''):
+        text = quoted if quoted else word
+        terms = tuple(tokenize(text))
+        if not terms:
+            continue
+        if len(terms) > 1:
+            clauses.append(SearchClause('phrase', terms))
+        elif not quoted and word.endswith('*'):
+            clauses.append(SearchClause('prefix', terms))
+        else:
+            clauses.append(SearchClause('term', terms))
+    return clauses
+
+
+class ChangeLogSearchIndex:
+    """
+    Positional inverted index for one character, aligned with its ChangeLogIndex.
+
+    Args:
+        index: The secondary index whose row ids this index uses; if that
+            index is rebuilt, this one is discarded with it
+    """
+
+    def __init__(self, index: ChangeLogIndex):
+        self.index = index
+        self.rows: Set[int] = set()
+        # field -> term -> row -> token positions
+        self._postings: Dict[str, Dict[str, Dict[int, List[int]]]] = {name: {} for name in SEARCH_FIELDS}
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: int, terms: Sequence[List[str]]) -> None:
+        """Index the tokens of one row (SEARCH_FIELDS order)."""
+        if row in self.rows:
+            return
+        self.rows.add(row)
+        for name, tokens in zip(SEARCH_FIELDS, terms):
+            postings = self._postings[name]
+            for position, token in enumerate(tokens):
+                if token not in postings:
+                    postings[token] = {}
+                    self._sorted_terms = None
+                postings[token].setdefault(row, []).append(position)
+
+    def missing_rows(self) -> List[int]:
+        """Rows of the secondary index whose text is not indexed yet."""
+        if len(self.rows) >= len(self.index):
+            return []
+        return [row for row in range(len(self.index)) if row not in self.rows]
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None) -> List[Tuple[int, float]]:
+        """
+        Rows matching every clause of a query, best match first.
+
+        Scores add up tf-idf per clause and field, weighted by FIELD_WEIGHTS.
+        Equal scores are ordered newest row first.
+
+        Args:
+            query: Query string (see module docstring)
+            fields: Subset of SEARCH_FIELDS to search (default: all)
+
+        Returns:
+            (row id, score) pairs
+        """
+        fields = [name for name in (fields or SEARCH_FIELDS) if name in self._postings]
+        clauses = parse_query(query)
+        if not clauses or not fields:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        # Rarest clauses first so the candidate set shrinks as fast as possible
+        for clause in sorted(clauses, key=self._clause_size):
+            clause_scores = self._score_clause(clause, fields, scores)
+            if scores is None:
+                scores = clause_scores
+            else:
+                scores = {row: scores[row] + score for row, score in clause_scores.items() if row in scores}
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+    def _clause_size(self, clause: SearchClause) -> int:
+        if clause.kind == 'prefix':
+            return sum(len(self._postings[name].get(term, ())) for name in SEARCH_FIELDS
+                       for term in self._expand_prefix(clause.terms[0]))
+        return min(sum(len(self._postings[name].get(term, ())) for name in SEARCH_FIELDS)
+                   for term in clause.terms)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """All indexed terms starting with prefix."""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted({term for postings in self._postings.values() for term in postings})
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + '\U0010ffff')
+        return self._sorted_terms[start:end]
+
+    def _idf(self, term: str, fields: List[str]) -> float:
+        rows = set()
+        for name in fields:
+            rows.update(self._postings[name].get(term, ()))
+        return math.log(1 + len(self.rows) / max(1, len(rows)))
+
+    def _score_clause(self, clause: SearchClause, fields: List[str],
+                      candidates: Optional[Dict[int, float]]) -> Dict[int, float]:
+        """Score of each row matching one clause, restricted to candidates if given."""
+        scores: Dict[int, float] = {}
+        terms = self._expand_prefix(clause.terms[0]) if clause.kind == 'prefix' else clause.terms
+        idf = {term: self._idf(term, fields) for term in set(terms)}
+
+        for name in fields:
+            postings = self._postings[name]
+            weight = FIELD_WEIGHTS.get(name, 1.0)
+
+            if clause.kind == 'phrase':
+                matches = self._phrase_matches(postings, clause.terms, candidates)
+                phrase_idf = sum(idf[term] for term in clause.terms)
+                for row, count in matches.items():
+                    scores[row] = scores.get(row, 0.0) + weight * (1 + math.log(count)) * phrase_idf
+                continue
+
+            for term in terms:
+                for row, positions in postings.get(term, {}).items():
+                    if candidates is not None and row not in candidates:
+                        continue
+                    scores[row] = scores.get(row, 0.0) + weight * (1 + math.log(len(positions))) * idf[term]
+
+        return scores
+
+    @staticmethod
+    def _phrase_matches(postings: Dict[str, Dict[int, List[int]]], terms: Tuple[str, ...],
+                        candidates: Optional[Dict[int, float]]) -> Dict[int, int]:
+        """Rows where terms occur consecutively, with the number of occurrences."""
+        term_rows = [postings.get(term) for term in terms]
+        if not all(term_rows):
+            return {}
+
+        rows = set(min(term_rows, key=len))
+        for other in term_rows:
+            rows.intersection_update(other)
+        if candidates is not None:
+            rows.intersection_update(candidates)
+
+        matches = {}
+        for row in rows:
+            following = [set(other[row]) for other in term_rows[1:]]
+            count = sum(1 for start in term_rows[0][row]
+                        if all(start + offset in positions for offset, positions in enumerate(following, 1)))
+            if count:
+                matches[row] = count
+        return matches
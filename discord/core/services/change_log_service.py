@@ -3,13 +3,20 @@ Change Log Service
 
 Provides persistent logging of all character changes with structured storage,
 detailed attribution, and causation analysis.
+
+Entries are stored in append-only JSON Lines segments (see change_log_store).
+Legacy whole-file {name}_{id}_changes.json logs are migrated per character the
+first time that character's log is written or read.
 """
 
 import json
+import heapq
+import itertools
 import logging
 import asyncio
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import os
 
@@ -19,6 +26,10 @@ from discord.core.models.change_log import (
     ChangeCausation, ChangeAttribution
 )
 from discord.core.services.causation_analyzer import ChangeCausationAnalyzer
+from discord.core.services.change_log_index import ChangeLogIndex
+from discord.core.services.change_log_search import ChangeLogSearchIndex
+from discord.core.services.change_log_sqlite import SQLiteChangeLogStore
+from discord.core.services.change_log_store import SegmentedChangeLogStore
 from discord.core.services.error_handler import get_error_handler, ErrorHandlerConfig
 
 logger = logging.getLogger(__name__)
@@ -46,7 +57,18 @@ class ChangeLogService:
             self.logger.error(f"Failed to create storage directory {self.config.storage_dir}: {e}")
             raise
         
-        self.logger.info(f"Change log service initialized with storage at {self.config.storage_dir}")
+        # Append-only segments, rotated at the configured log size
+        self.store = SegmentedChangeLogStore(
+            self.config.storage_dir / "segments",
+            int(self.config.log_rotation_size_mb * 1024 * 1024)
+        )
+        self._migrated_characters: Set[int] = set()
+        
+        # SQLite backend; file-based logs are imported into it on first use
+        self.sqlite_store = (SQLiteChangeLogStore(self.config.database_path)
+                             if self.config.backend == "sqlite" else None)
+        
+        self.logger.info(f"Change log service initialized with {self.config.backend} storage at {self.config.storage_dir}")
     
     async def log_changes(self, character_id: int, changes: List[FieldChange], 
                          character_data: Dict[str, Any], old_character_data: Optional[Dict[str, Any]] = None) -> bool:
@@ -110,32 +132,27 @@ class ChangeLogService:
                                include_causation: bool = True) -> List[ChangeLogEntry]:
         """Retrieve change history with optional causation details."""
         try:
-            entries = []
-            
-            # Get all log files for this character
-            log_files = self._get_character_log_files(character_id)
-            
-            for log_file_path in log_files:
-                try:
-                    log_file = await self._load_log_file(log_file_path)
-                    
-                    # Filter by date if specified
-                    file_entries = log_file.entries
-                    if since:
-                        file_entries = [entry for entry in file_entries if entry.timestamp >= since]
-                    
-                    entries.extend(file_entries)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error loading log file {log_file_path}: {e}")
-                    continue
-            
-            # Sort by timestamp (most recent first)
-            entries.sort(key=lambda x: x.timestamp, reverse=True)
+            await self._ensure_migrated(character_id)
+            
+            if self.sqlite_store is not None:
+                entries = self.sqlite_store.select(character_id, start=since, limit=limit)
+                if not include_causation:
+                    for entry in entries:
+                        entry.causation = None
+                        entry.attribution = None
+                return entries
+            
+            # Stream across segments (plus any legacy file whose migration failed)
+            stream = itertools.chain(
+                self.store.iter_entries(character_id, since),
+                await self._load_legacy_entries(character_id, since)
+            )
             
-            # Apply limit if specified
+            # Sort by timestamp (most recent first); with a limit only that many are held
             if limit:
-                entries = entries[:limit]
+                entries = heapq.nlargest(limit, stream, key=lambda x: x.timestamp)
+            else:
+                entries = sorted(stream, key=lambda x: x.timestamp, reverse=True)
             
             # Remove causation data if not requested
             if not include_causation:
@@ -154,6 +171,15 @@ class ChangeLogService:
                                  cause_type: str, cause_name: str) -> List[ChangeLogEntry]:
         """Get all changes caused by a specific source (e.g., specific feat)."""
         try:
+            if self.sqlite_store is not None:
+                await self._ensure_migrated(character_id)
+                return self.sqlite_store.select(character_id, source={cause_type}, source_name={cause_name})
+            
+            index = await self.get_index(character_id)
+            if index is not None:
+                rows = index.select(source={cause_type}, source_name={cause_name})
+                return self.read_indexed_entries(character_id, index, index.order_newest_first(rows))
+            
             all_entries = await self.get_change_history(character_id, include_causation=True)
             
             # Filter by cause
@@ -171,63 +197,93 @@ class ChangeLogService:
             self.logger.error(f"Error getting changes by cause for character {character_id}: {e}", exc_info=True)
             return []
     
+    async def get_index(self, character_id: int) -> Optional[ChangeLogIndex]:
+        """
+        Secondary index over the character's log, for queries that seek to matching entries.
+        
+        Returns:
+            The up-to-date index, or None if the log is not (yet) segmented or
+            the sqlite backend (which has its own indexes) is in use
+        """
+        await self._ensure_migrated(character_id)
+        if self.sqlite_store is not None or not self.store.has_log(character_id):
+            return None
+        return self.store.load_index(character_id)
+    
+    async def get_search_index(self, character_id: int) -> Optional[ChangeLogSearchIndex]:
+        """
+        Full-text index over the character's entry descriptions and field paths.
+        
+        Returns:
+            The up-to-date search index, or None if the log is not (yet) segmented
+            or the sqlite backend is in use
+        """
+        await self._ensure_migrated(character_id)
+        if self.sqlite_store is not None or not self.store.has_log(character_id):
+            return None
+        return self.store.load_search_index(character_id)
+    
+    def read_indexed_entries(self, character_id: int, index: ChangeLogIndex,
+                             rows: List[int]) -> List[ChangeLogEntry]:
+        """Load the entries for index rows, in the given order."""
+        return self.store.read_entries(character_id, [index.records[row] for row in rows])
+    
+    async def rewrite_log(self, character_id: int, keep: Callable[[ChangeLogEntry], bool]) -> Tuple[int, int]:
+        """
+        Drop entries from a character's log, keeping those for which keep() is true.
+        
+        Returns:
+            (entries before, entries after)
+        """
+        await self._ensure_migrated(character_id)
+        if self.sqlite_store is not None:
+            # Entry counts are derived from the rows, so there is no metadata to fix up
+            return self.sqlite_store.rewrite(character_id, keep)
+        
+        before, after = self.store.rewrite(character_id, keep)
+        
+        # Recalculate counts from what is left
+        metadata = self.store.load_metadata(character_id)
+        if metadata is not None:
+            metadata.total_entries = 0
+            metadata.change_categories = {}
+            for entry in self.store.iter_entries(character_id):
+                metadata.record_entry(entry)
+            self.store.save_metadata(character_id, metadata)
+        
+        return before, after
+    
     async def rotate_logs(self, character_id: int, character_name: str = None) -> bool:
-        """Rotate log files when they become too large."""
+        """Seal the active log segment when it becomes too large."""
         try:
-            # Find the current log file (could be old or new naming pattern)
-            log_files = self._get_character_log_files(character_id)
-            if not log_files:
+            await self._ensure_migrated(character_id)
+            
+            # A database has nothing to rotate
+            if self.sqlite_store is not None:
                 return True
             
-            current_log_path = log_files[0]  # Should be only one current file
+            sealed_segment = self.store.rotate(character_id)
+            if sealed_segment is None:
+                return True
             
-            # Check file size
-            file_size_mb = current_log_path.stat().st_size / (1024 * 1024)
+            file_size_mb = sealed_segment.stat().st_size / (1024 * 1024)
             
-            if file_size_mb >= self.config.log_rotation_size_mb:
-                # Load current log file to update rotation count and get character name
-                try:
-                    log_file = await self._load_log_file(current_log_path)
-                    log_file.metadata.rotation_count += 1
-                    character_name = log_file.metadata.character_name or character_name or "Unknown"
-                except Exception as e:
-                    self.logger.warning(f"Could not load log file for rotation count update: {e}")
-                    # Create minimal metadata for rotation
-                    character_name = character_name or "Unknown"
-                    metadata = ChangeLogMetadata(
-                        character_id=character_id,
-                        character_name=character_name,
-                        rotation_count=1
-                    )
-                    log_file = ChangeLogFile(metadata=metadata)
-                
-                # Create rotated directory structure with character name
-                sanitized_name = self._sanitize_filename(character_name, character_id)
-                rotated_dir = self.config.storage_dir / f"{sanitized_name}_{character_id}" / "rotated"
-                rotated_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Create backup filename with timestamp and rotation count
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                rotation_count = log_file.metadata.rotation_count
-                backup_filename = f"changes_{timestamp}_r{rotation_count:03d}.json"
-                backup_path = rotated_dir / backup_filename
-                
-                # Save the rotated log with updated metadata
-                await self._save_log_file(backup_path, log_file)
-                
-                # Remove original file
-                current_log_path.unlink()
-                
-                self.logger.info(f"Rotated log file for character {character_id}: {backup_path}")
-                
-                # Update storage health metrics
-                await self._update_storage_health_metrics(character_id, "rotation", {
-                    "rotated_file": str(backup_path),
-                    "file_size_mb": file_size_mb,
-                    "rotation_count": rotation_count
-                })
-                
-                return True
+            metadata = self.store.load_metadata(character_id) or ChangeLogMetadata(
+                character_id=character_id,
+                character_name=character_name or "Unknown",
+                retention_policy_days=self.config.log_retention_days
+            )
+            metadata.rotation_count += 1
+            self.store.save_metadata(character_id, metadata)
+            
+            self.logger.info(f"Rotated log segment for character {character_id}: {sealed_segment}")
+            
+            # Update storage health metrics
+            await self._update_storage_health_metrics(character_id, "rotation", {
+                "rotated_file": str(sealed_segment),
+                "file_size_mb": file_size_mb,
+                "rotation_count": metadata.rotation_count
+            })
             
             return True
             
@@ -249,7 +305,51 @@ class ChangeLogService:
             deleted_count = 0
             total_size_cleaned = 0
             
-            # Process current log files - handle all naming patterns
+            if self.sqlite_store is not None:
+                archive_path = (self.config.storage_dir / "archive" / self.config.database_file
+                                if self.config.backup_old_logs else None)
+                removed = self.sqlite_store.delete_before(cutoff_date, archive_path)
+                
+                await self._update_storage_health_metrics(None, "cleanup", {
+                    "retention_days": retention_days,
+                    "total_cleaned": removed,
+                    "archived": removed if archive_path else 0,
+                    "deleted": 0 if archive_path else removed,
+                    "cutoff_date": cutoff_date.isoformat()
+                })
+                
+                self.logger.info(f"Cleaned up {removed} old log entries (retention: {retention_days} days)")
+                return removed
+            
+            # Process sealed segments; every entry in one was written before its mtime
+            for char_id in self.store.character_ids():
+                for segment_path in self.store.sealed_segments(char_id):
+                    try:
+                        file_size = segment_path.stat().st_size
+                        file_mtime = datetime.fromtimestamp(segment_path.stat().st_mtime)
+                        
+                        if file_mtime < cutoff_date:
+                            summary = self.store.summarize_segment(segment_path)
+                            
+                            if self.config.backup_old_logs:
+                                archive_dir = self.config.storage_dir / "archive" / "segments" / str(char_id)
+                                self.store.remove_segment(char_id, segment_path, archive_dir)
+                                self.logger.debug(f"Archived old log segment: {archive_dir / segment_path.name}")
+                                archived_count += 1
+                            else:
+                                self.store.remove_segment(char_id, segment_path)
+                                self.logger.debug(f"Deleted old log segment: {segment_path}")
+                                deleted_count += 1
+                            
+                            self._forget_segment_entries(char_id, summary)
+                            cleaned_count += 1
+                            total_size_cleaned += file_size
+                    
+                    except Exception as e:
+                        self.logger.warning(f"Error processing log segment {segment_path}: {e}")
+                        continue
+            
+            # Process legacy log files not yet migrated - handle all naming patterns
             log_file_patterns = [
                 "*_changes.json",  # New pattern: {name}_{id}_changes.json and old patterns
             ]
@@ -355,6 +455,25 @@ class ChangeLogService:
     async def get_log_statistics(self, character_id: int) -> Dict[str, Any]:
         """Get statistics about change logs for a character."""
         try:
+            await self._ensure_migrated(character_id)
+            
+            if self.sqlite_store is not None:
+                category_counts = self.sqlite_store.category_counts(character_id)
+                oldest_entry, newest_entry = self.sqlite_store.time_range(character_id)
+                total_size = self.sqlite_store.size_bytes()
+                return {
+                    'character_id': character_id,
+                    'total_entries': sum(category_counts.values()),
+                    'total_files': 1,
+                    'total_size_bytes': total_size,
+                    'total_size_mb': round(total_size / (1024 * 1024), 2),
+                    'oldest_entry': oldest_entry.isoformat() if oldest_entry else None,
+                    'newest_entry': newest_entry.isoformat() if newest_entry else None,
+                    'category_counts': category_counts,
+                    'storage_file': str(self.sqlite_store.db_path)
+                }
+            
+            segments = self.store.segments(character_id)
             log_files = self._get_character_log_files(character_id)
             
             total_entries = 0
@@ -363,6 +482,27 @@ class ChangeLogService:
             newest_entry = None
             category_counts = {}
             
+            for segment_path in segments:
+                try:
+                    summary = self.store.summarize_segment(segment_path)
+                    
+                    total_entries += summary['entries']
+                    total_size += segment_path.stat().st_size
+                    
+                    for category, count in summary['change_categories'].items():
+                        category_counts[category] = category_counts.get(category, 0) + count
+                    
+                    if summary['entries']:
+                        if oldest_entry is None or summary['oldest_entry'] < oldest_entry:
+                            oldest_entry = summary['oldest_entry']
+                        if newest_entry is None or summary['newest_entry'] > newest_entry:
+                            newest_entry = summary['newest_entry']
+                    
+                except Exception as e:
+                    self.logger.warning(f"Error processing log segment {segment_path} for statistics: {e}")
+                    continue
+            
+            # Legacy files only remain if their migration failed
             for log_file_path in log_files:
                 try:
                     log_file = await self._load_log_file(log_file_path)
@@ -392,13 +532,14 @@ class ChangeLogService:
             return {
                 'character_id': character_id,
                 'total_entries': total_entries,
-                'total_files': len(log_files),
+                'total_files': len(segments) + len(log_files),
                 'total_size_bytes': total_size,
                 'total_size_mb': round(total_size / (1024 * 1024), 2),
                 'oldest_entry': oldest_entry.isoformat() if oldest_entry else None,
                 'newest_entry': newest_entry.isoformat() if newest_entry else None,
                 'category_counts': category_counts,
-                'storage_file': str(self._get_current_log_file_path(character_id))
+                'storage_file': str(self.store.active_segment(character_id)
+                                    or self._get_current_log_file_path(character_id))
             }
             
         except Exception as e:
@@ -630,57 +771,52 @@ class ChangeLogService:
         return log_files
     
     async def _write_log_entries(self, character_id: int, entries: List[ChangeLogEntry]) -> bool:
-        """Write log entries to the appropriate log file with error handling and retry."""
+        """Append log entries to the character's active segment with error handling and retry."""
+        appended_to = []
+        
         async def write_operation():
             # Ensure storage directory exists
             self.config.storage_dir.mkdir(parents=True, exist_ok=True)
             
-            # Extract character name for filename
+            # Extract character name for metadata
             character_name = entries[0].character_name if entries else "Unknown"
             
-            # Get current log file path with character name
-            log_file_path = self._get_current_log_file_path(character_id, character_name)
+            # Bring over history from a legacy whole-file log, if any
+            await self._ensure_migrated(character_id)
             
-            # Check if we need to migrate from old naming patterns
-            if not log_file_path.exists():
-                # Look for existing files to migrate from
-                existing_files = self._get_character_log_files(character_id)
-                
-                # Find the most recent file to migrate from
-                if existing_files:
-                    # Sort by modification time, most recent first
-                    existing_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-                    old_log_file_path = existing_files[0]
-                    
-                    if old_log_file_path != log_file_path:
-                        # Migrate from old naming pattern to new one
-                        self.logger.info(f"Migrating log file from {old_log_file_path.name} to {log_file_path.name}")
-                        old_log_file_path.rename(log_file_path)
-            
-            # Load existing log file or create new one
-            if log_file_path.exists():
-                log_file = await self._load_log_file(log_file_path)
-                # Update character name in metadata if it has changed
-                if log_file.metadata.character_name != character_name:
-                    log_file.metadata.character_name = character_name
-            else:
-                # Create new log file
-                metadata = ChangeLogMetadata(
+            if self.sqlite_store is not None:
+                metadata = self.sqlite_store.load_metadata(character_id) or ChangeLogMetadata(
                     character_id=character_id,
                     character_name=character_name,
                     retention_policy_days=self.config.log_retention_days
                 )
-                log_file = ChangeLogFile(metadata=metadata)
-            
-            # Add new entries
-            for entry in entries:
-                log_file.add_entry(entry)
+                metadata.character_name = character_name
+                for entry in entries:
+                    metadata.record_entry(entry)
+                # One transaction, so a retry can never duplicate entries
+                self.sqlite_store.append(character_id, entries, metadata)
+                return True
             
-            # Check if rotation is needed
+            # Seal the active segment first if it is full
             await self.rotate_logs(character_id, character_name)
             
-            # Write log file
-            await self._save_log_file(log_file_path, log_file)
+            metadata = self.store.load_metadata(character_id) or ChangeLogMetadata(
+                character_id=character_id,
+                character_name=character_name,
+                retention_policy_days=self.config.log_retention_days
+            )
+            # Update character name in metadata if it has changed
+            if metadata.character_name != character_name:
+                metadata.character_name = character_name
+            
+            # Append once; a retry after a metadata failure must not duplicate entries
+            if not appended_to:
+                appended_to.append(self.store.append(character_id, entries))
+            
+            for entry in entries:
+                metadata.record_entry(entry)
+            metadata.log_file_size = appended_to[0].stat().st_size
+            self.store.save_metadata(character_id, metadata)
             
             return True
         
@@ -697,6 +833,110 @@ class ChangeLogService:
             self.logger.error(f"Error writing log entries for character {character_id}: {e}", exc_info=True)
             return False
     
+    async def _ensure_migrated(self, character_id: int) -> None:
+        """Move a character's legacy whole-file JSON log(s) into the segmented store."""
+        if character_id in self._migrated_characters:
+            return
+        
+        legacy_files = self._get_character_log_files(character_id)
+        if legacy_files:
+            try:
+                if not self.store.has_log(character_id):
+                    # Oldest first, so the most recent file's metadata wins
+                    legacy_files.sort(key=lambda f: f.stat().st_mtime)
+                    entries = []
+                    metadata = None
+                    for log_file_path in legacy_files:
+                        log_file = await self._load_log_file(log_file_path)
+                        entries.extend(log_file.entries)
+                        metadata = log_file.metadata
+                    
+                    entries.sort(key=lambda x: x.timestamp)
+                    metadata.total_entries = 0
+                    metadata.change_categories = {}
+                    for entry in entries:
+                        metadata.record_entry(entry)
+                    
+                    self.store.import_entries(character_id, metadata, entries)
+                    self.logger.info(f"Migrated {len(entries)} change log entries for character {character_id} "
+                                   f"from {', '.join(f.name for f in legacy_files)}")
+                
+                # Keep the originals, renamed so they are no longer picked up as logs
+                for log_file_path in legacy_files:
+                    log_file_path.rename(log_file_path.with_name(log_file_path.name + ".migrated"))
+                    
+            except Exception as e:
+                self.logger.error(f"Error migrating legacy change log for character {character_id}: {e}", exc_info=True)
+                return
+        
+        if self.sqlite_store is not None and self.store.has_log(character_id):
+            try:
+                self._import_segments_to_sqlite(character_id)
+            except Exception as e:
+                self.logger.error(f"Error importing change log segments for character {character_id}: {e}", exc_info=True)
+                return
+        
+        self._migrated_characters.add(character_id)
+    
+    def _import_segments_to_sqlite(self, character_id: int) -> None:
+        """Move a character's segmented log into the SQLite database."""
+        if not self.sqlite_store.has_log(character_id):
+            metadata = self.store.load_metadata(character_id)
+            entries = list(self.store.iter_entries(character_id))
+            self.sqlite_store.import_entries(character_id, metadata, entries)
+            self.logger.info(f"Imported {len(entries)} change log entries for character {character_id} into SQLite")
+        
+        # Keep the segments, renamed so they are no longer picked up as a log
+        character_dir = self.store.character_dir(character_id)
+        self.store.invalidate_index(character_id)
+        migrated_dir = character_dir.with_name(character_dir.name + ".migrated")
+        if migrated_dir.exists():
+            migrated_dir = character_dir.with_name(f"{character_dir.name}.migrated.{datetime.now():%Y%m%d%H%M%S}")
+        character_dir.rename(migrated_dir)
+    
+    async def migrate_legacy_logs(self) -> int:
+        """Migrate every legacy whole-file JSON log in the storage directory."""
+        character_ids = set()
+        for log_file_path in self.config.storage_dir.glob("*_changes.json"):
+            character_id = self._extract_character_id_from_path(log_file_path)
+            if character_id:
+                character_ids.add(character_id)
+        
+        for character_id in character_ids:
+            await self._ensure_migrated(character_id)
+        
+        return len(character_ids)
+    
+    async def _load_legacy_entries(self, character_id: int, since: Optional[datetime] = None) -> List[ChangeLogEntry]:
+        """Entries from legacy log files still present because their migration failed."""
+        if self.store.has_log(character_id) or (self.sqlite_store is not None and self.sqlite_store.has_log(character_id)):
+            return []
+        
+        entries = []
+        for log_file_path in self._get_character_log_files(character_id):
+            try:
+                log_file = await self._load_log_file(log_file_path)
+                entries.extend(entry for entry in log_file.entries if since is None or entry.timestamp >= since)
+            except Exception as e:
+                self.logger.warning(f"Error loading log file {log_file_path}: {e}")
+                continue
+        return entries
+    
+    def _forget_segment_entries(self, character_id: int, summary: Dict[str, Any]) -> None:
+        """Take a removed segment's entries out of the character's metadata counts."""
+        metadata = self.store.load_metadata(character_id)
+        if metadata is None:
+            return
+        
+        metadata.total_entries = max(0, metadata.total_entries - summary['entries'])
+        for category, count in summary['change_categories'].items():
+            remaining = metadata.change_categories.get(category, 0) - count
+            if remaining > 0:
+                metadata.change_categories[category] = remaining
+            else:
+                metadata.change_categories.pop(category, None)
+        self.store.save_metadata(character_id, metadata)
+    
     async def _load_log_file(self, file_path: Path) -> ChangeLogFile:
         """Load a log file from disk with error handling."""
         try:
@@ -773,8 +1013,9 @@ class ChangeLogService:
         """Update storage health metrics for monitoring."""
         try:
             health_file = self.config.storage_dir / "storage_health.json"
+            operations_file = self.config.storage_dir / "storage_health.jsonl"
             
-            # Load existing health data
+            # Load existing summary
             health_data = {}
             if health_file.exists():
                 try:
@@ -783,9 +1024,14 @@ class ChangeLogService:
                 except Exception as e:
                     self.logger.warning(f"Error loading health data: {e}")
             
+            # Operations used to be stored inline; move them to the append-only file
+            legacy_operations = health_data.pop('operations', None)
+            if legacy_operations:
+                with open(operations_file, 'a', encoding='utf-8') as f:
+                    for record in legacy_operations[-1000:]:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            
             # Initialize structure if needed
-            if 'operations' not in health_data:
-                health_data['operations'] = []
             if 'summary' not in health_data:
                 health_data['summary'] = {
                     'total_operations': 0,
@@ -795,14 +1041,15 @@ class ChangeLogService:
                     'cleanup_count': 0
                 }
             
-            # Add new operation record
+            # Append new operation record
             operation_record = {
                 'timestamp': datetime.now().isoformat(),
                 'character_id': character_id,
                 'operation': operation,
                 'metrics': metrics
             }
-            health_data['operations'].append(operation_record)
+            with open(operations_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(operation_record, ensure_ascii=False) + '\n')
             
             # Update summary
             health_data['summary']['total_operations'] += 1
@@ -815,17 +1062,39 @@ class ChangeLogService:
             elif operation == 'cleanup':
                 health_data['summary']['cleanup_count'] += 1
             
-            # Keep only last 1000 operations to prevent unbounded growth
-            if len(health_data['operations']) > 1000:
-                health_data['operations'] = health_data['operations'][-1000:]
+            # Every 1000 operations, trim to the last 1000 to prevent unbounded growth
+            if health_data['summary']['total_operations'] % 1000 == 0:
+                with open(operations_file, 'r', encoding='utf-8') as f:
+                    recent_operations = list(deque(f, maxlen=1000))
+                temp_path = operations_file.with_suffix('.tmp')
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.writelines(recent_operations)
+                temp_path.replace(operations_file)
             
-            # Save health data
-            with open(health_file, 'w', encoding='utf-8') as f:
+            # Save summary (small and fixed-size)
+            temp_path = health_file.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
                 json.dump(health_data, f, indent=2, ensure_ascii=False)
+            temp_path.replace(health_file)
                 
         except Exception as e:
             self.logger.warning(f"Error updating storage health metrics: {e}")
     
+    def _load_recent_health_operations(self, count: int) -> List[Dict[str, Any]]:
+        """Last few operation records from the append-only health log."""
+        operations_file = self.config.storage_dir / "storage_health.jsonl"
+        if not operations_file.exists():
+            return []
+        
+        operations = []
+        with open(operations_file, 'r', encoding='utf-8') as f:
+            for line in deque(f, maxlen=count):
+                try:
+                    operations.append(json.loads(line))
+                except ValueError:
+                    continue
+        return operations
+    
     async def get_storage_health(self) -> Dict[str, Any]:
         """Get storage health information for monitoring."""
         try:
@@ -847,7 +1116,8 @@ class ChangeLogService:
             return {
                 'storage_directory': str(self.config.storage_dir),
                 'health_summary': health_data.get('summary', {}),
-                'recent_operations': health_data.get('operations', [])[-10:],  # Last 10 operations
+                'recent_operations': (health_data.get('operations', [])[-10:]  # Not yet moved to the .jsonl
+                                      or self._load_recent_health_operations(10)),
                 'storage_statistics': storage_stats,
                 'configuration': {
                     'rotation_size_mb': self.config.log_rotation_size_mb,
@@ -919,9 +1189,54 @@ class ChangeLogService:
                     self.logger.warning(f"Error processing log file {log_file_path}: {e}")
                     continue
             
+            # Process segmented logs
+            segmented_ids = self.store.character_ids()
+            for character_id in segmented_ids:
+                try:
+                    segments = self.store.segments(character_id)
+                    stats['total_log_files'] += len(segments)
+                    
+                    for segment_path in segments:
+                        file_size_mb = segment_path.stat().st_size / (1024 * 1024)
+                        stats['total_size_mb'] += file_size_mb
+                        stats['largest_file_mb'] = max(stats['largest_file_mb'], file_size_mb)
+                        
+                        summary = self.store.summarize_segment(segment_path)
+                        if summary['entries']:
+                            if stats['oldest_entry'] is None or summary['oldest_entry'] < stats['oldest_entry']:
+                                stats['oldest_entry'] = summary['oldest_entry']
+                            if stats['newest_entry'] is None or summary['newest_entry'] > stats['newest_entry']:
+                                stats['newest_entry'] = summary['newest_entry']
+                    
+                    # Check if the active segment needs rotation
+                    if segments and segments[-1].stat().st_size >= self.store.segment_size_bytes:
+                        stats['characters_needing_rotation'].append(character_id)
+                        
+                except Exception as e:
+                    stats['characters_with_errors'].append({
+                        'character_id': character_id,
+                        'error': str(e)
+                    })
+            
+            # SQLite database: one file, answered from its indexes
+            sqlite_ids = []
+            if self.sqlite_store is not None:
+                sqlite_ids = self.sqlite_store.character_ids()
+                file_size_mb = self.sqlite_store.size_bytes() / (1024 * 1024)
+                stats['total_log_files'] += 1
+                stats['total_size_mb'] += file_size_mb
+                stats['largest_file_mb'] = max(stats['largest_file_mb'], file_size_mb)
+                
+                oldest_entry, newest_entry = self.sqlite_store.time_range()
+                if oldest_entry and (stats['oldest_entry'] is None or oldest_entry < stats['oldest_entry']):
+                    stats['oldest_entry'] = oldest_entry
+                if newest_entry and (stats['newest_entry'] is None or newest_entry > stats['newest_entry']):
+                    stats['newest_entry'] = newest_entry
+            
             # Count character directories
             character_dirs = list(self.config.storage_dir.glob("character_*"))
-            stats['total_characters'] = len([d for d in character_dirs if d.is_dir()])
+            stats['total_characters'] = (len([d for d in character_dirs if d.is_dir()])
+                                         + len(segmented_ids) + len(sqlite_ids))
             
             # Count rotated files
             for character_dir in character_dirs:
@@ -942,7 +1257,7 @@ class ChangeLogService:
             # Count archived files
             archive_dir = self.config.storage_dir / "archive"
             if archive_dir.exists():
-                archived_files = list(archive_dir.rglob("*.json"))
+                archived_files = [f for f in archive_dir.rglob("*") if f.suffix in ('.json', '.jsonl')]
                 stats['total_archived_files'] = len(archived_files)
                 
                 # Add archived file sizes
@@ -1017,6 +1332,12 @@ class ChangeLogService:
                 }
             }
             
+            # Operation 0: Migrate legacy whole-file logs to segments
+            if character_id:
+                await self._ensure_migrated(character_id)
+            else:
+                await self.migrate_legacy_logs()
+            
             # Operation 1: Check and rotate logs if needed
             if character_id:
                 rotation_result = await self.rotate_logs(character_id)
@@ -1089,6 +1410,55 @@ class ChangeLogService:
                 'errors': []
             }
             
+            # SQLite checks its own pages and indexes; entries with broken JSON are removed
+            if self.sqlite_store is not None:
+                validation_results['files_checked'] += 1
+                problems = self.sqlite_store.integrity_check()
+                if problems:
+                    validation_results['files_corrupted'] += 1
+                    validation_results['errors'].extend(
+                        {'file': str(self.sqlite_store.db_path), 'error': problem} for problem in problems
+                    )
+                elif self.sqlite_store.count_invalid_entries():
+                    removed = self.sqlite_store.delete_invalid_entries()
+                    self.logger.info(f"Removed {removed} unreadable change log entries from {self.sqlite_store.db_path}")
+                    validation_results['files_repaired'] += 1
+                else:
+                    validation_results['files_valid'] += 1
+            
+            # Validate segmented logs; unreadable lines are dropped by compaction
+            segmented_ids = [character_id] if character_id else self.store.character_ids()
+            for char_id in segmented_ids:
+                entry_count = 0
+                for segment_path in self.store.segments(char_id):
+                    validation_results['files_checked'] += 1
+                    try:
+                        summary = self.store.summarize_segment(segment_path)
+                        entry_count += summary['entries']
+                        if summary['invalid_lines']:
+                            validation_results['files_corrupted'] += 1
+                            validation_results['errors'].append({
+                                'file': str(segment_path),
+                                'error': f"{summary['invalid_lines']} unreadable lines"
+                            })
+                        else:
+                            validation_results['files_valid'] += 1
+                    except Exception as e:
+                        validation_results['files_corrupted'] += 1
+                        validation_results['errors'].append({
+                            'file': str(segment_path),
+                            'error': str(e)
+                        })
+                        self.logger.warning(f"Corrupted log segment {segment_path}: {e}")
+                
+                # Repair metadata entry count
+                metadata = self.store.load_metadata(char_id)
+                if metadata and metadata.total_entries != entry_count:
+                    self.logger.info(f"Repaired entry count for character {char_id}: {metadata.total_entries} -> {entry_count}")
+                    metadata.total_entries = entry_count
+                    self.store.save_metadata(char_id, metadata)
+                    validation_results['files_repaired'] += 1
+            
             # Get files to validate
             if character_id:
                 log_files = self._get_character_log_files(character_id)
@@ -1152,9 +1522,26 @@ class ChangeLogService:
                 'directories_created': 0,
                 'directories_cleaned': 0,
                 'files_moved': 0,
-                'space_saved_mb': 0
+                'space_saved_mb': 0,
+                'segments_merged': 0,
+                'lines_dropped': 0
             }
             
+            if self.sqlite_store is not None:
+                vacuum = self.sqlite_store.optimize()
+                optimization_results['space_saved_mb'] += round(
+                    (vacuum['size_before'] - vacuum['size_after']) / (1024 * 1024), 2)
+            
+            # Compact segmented logs: merge small sealed segments, drop torn lines
+            segmented_ids = [character_id] if character_id else self.store.character_ids()
+            for char_id in segmented_ids:
+                size_before = sum(p.stat().st_size for p in self.store.segments(char_id))
+                compaction = self.store.compact(char_id)
+                size_after = sum(p.stat().st_size for p in self.store.segments(char_id))
+                optimization_results['segments_merged'] += compaction['segments_before'] - compaction['segments_after']
+                optimization_results['lines_dropped'] += compaction['lines_dropped']
+                optimization_results['space_saved_mb'] += round((size_before - size_after) / (1024 * 1024), 2)
+            
             # Create proper directory structure for characters
             if character_id:
                 character_dirs = [self.config.storage_dir / f"character_{character_id}"]
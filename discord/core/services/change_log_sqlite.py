@@ -0,0 +1,356 @@
+"""
+SQLite Change Log Store
+
+Single-database backend for character change logs, selected with
+``backend: sqlite`` in change_log.yaml. Entries are stored as JSON next to
+indexed columns for the fields queries and maintenance filter on, so appends
+are transactional, retention is one indexed DELETE and integrity checks are
+SQLite's own.
+
+Layout:
+    {storage_dir}/{database_file}            change_log_entries + change_log_characters (WAL mode)
+    {storage_dir}/archive/{database_file}    entries removed by retention when backup_old_logs is set
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from discord.core.models.change_log import ChangeLogEntry, ChangeLogMetadata
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_log_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    character_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    change_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    field_path TEXT NOT NULL,
+    trigger TEXT,
+    source TEXT,
+    source_name TEXT,
+    source_type TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_change_log_character_time ON change_log_entries(character_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_change_log_character_type ON change_log_entries(character_id, change_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_change_log_character_field ON change_log_entries(character_id, field_path, timestamp);
+CREATE INDEX IF NOT EXISTS idx_change_log_character_cause ON change_log_entries(character_id, source, source_name);
+CREATE INDEX IF NOT EXISTS idx_change_log_character_trigger ON change_log_entries(character_id, trigger);
+CREATE INDEX IF NOT EXISTS idx_change_log_timestamp ON change_log_entries(timestamp);
+CREATE TABLE IF NOT EXISTS change_log_characters (
+    character_id INTEGER PRIMARY KEY,
+    metadata TEXT NOT NULL
+)
+"""
+
+ENTRY_COLUMNS = ('character_id', 'timestamp', 'change_type', 'category', 'priority', 'field_path',
+                 'trigger', 'source', 'source_name', 'source_type', 'entry')
+
+# Columns select() accepts as equality constraints (same names as change_log_index.INDEXED_FIELDS)
+FILTER_COLUMNS = ('field_path', 'change_type', 'category', 'priority',
+                  'trigger', 'source', 'source_name', 'source_type')
+SORT_COLUMNS = ('timestamp', 'priority', 'category', 'change_type', 'field_path')
+
+# Keep IN (...) lists under SQLite's default variable limit
+_MAX_VARIABLES = 500
+
+
+def _timestamp_key(value: datetime) -> str:
+    """Fixed-width ISO timestamp, so text order matches time order."""
+    return value.isoformat(timespec='microseconds')
+
+
+def _entry_row(character_id: int, entry: ChangeLogEntry) -> Tuple[Any, ...]:
+    causation, attribution = entry.causation, entry.attribution
+    return (
+        character_id,
+        _timestamp_key(entry.timestamp),
+        entry.change_type,
+        entry.category.value,
+        entry.priority.value,
+        entry.field_path,
+        causation.trigger if causation else None,
+        attribution.source if attribution else None,
+        attribution.source_name if attribution else None,
+        attribution.source_type if attribution else None,
+        json.dumps(entry.to_dict(), ensure_ascii=False)
+    )
+
+
+class SQLiteChangeLogStore:
+    """
+    Change log entries and per-character metadata in one SQLite database.
+
+    Args:
+        db_path: Database file
+        enable_wal: Use write-ahead logging so readers never block the writer
+    """
+
+    def __init__(self, db_path: Path, enable_wal: bool = True):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        if enable_wal:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(CHANGE_LOG_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    # Characters and metadata
+
+    def has_log(self, character_id: int) -> bool:
+        """Whether the character has a log in the database."""
+        return bool(self._query("SELECT 1 FROM change_log_characters WHERE character_id = ?", (character_id,)))
+
+    def character_ids(self) -> List[int]:
+        """All characters with a log."""
+        return [row[0] for row in self._query("SELECT character_id FROM change_log_characters ORDER BY character_id")]
+
+    def load_metadata(self, character_id: int) -> Optional[ChangeLogMetadata]:
+        """A character's log metadata with entry counts taken from the entries themselves."""
+        rows = self._query("SELECT metadata FROM change_log_characters WHERE character_id = ?", (character_id,))
+        if not rows:
+            return None
+        metadata = ChangeLogMetadata.from_dict(json.loads(rows[0][0]))
+        metadata.change_categories = self.category_counts(character_id)
+        metadata.total_entries = sum(metadata.change_categories.values())
+        return metadata
+
+    def save_metadata(self, character_id: int, metadata: ChangeLogMetadata) -> None:
+        """Insert or replace a character's log metadata."""
+        with self._transaction() as connection:
+            self._upsert_metadata(connection, character_id, metadata)
+
+    @staticmethod
+    def _upsert_metadata(connection: sqlite3.Connection, character_id: int, metadata: ChangeLogMetadata) -> None:
+        connection.execute(
+            "INSERT INTO change_log_characters (character_id, metadata) VALUES (?, ?) "
+            "ON CONFLICT(character_id) DO UPDATE SET metadata = excluded.metadata",
+            (character_id, json.dumps(metadata.to_dict(), ensure_ascii=False))
+        )
+
+    # Writing
+
+    def append(self, character_id: int, entries: List[ChangeLogEntry],
+               metadata: Optional[ChangeLogMetadata] = None) -> None:
+        """Insert entries (and update the metadata) in one transaction."""
+        rows = [_entry_row(character_id, entry) for entry in entries]
+        with self._transaction() as connection:
+            connection.executemany(
+                f"INSERT INTO change_log_entries ({', '.join(ENTRY_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in ENTRY_COLUMNS)})",
+                rows
+            )
+            if metadata is not None:
+                self._upsert_metadata(connection, character_id, metadata)
+
+    def import_entries(self, character_id: int, metadata: ChangeLogMetadata,
+                       entries: List[ChangeLogEntry]) -> None:
+        """Write a character's complete history (used when migrating file-based logs)."""
+        self.append(character_id, entries, metadata)
+
+    def delete_before(self, cutoff: datetime, archive_path: Optional[Path] = None) -> int:
+        """
+        Remove every entry older than cutoff, optionally copying it to an archive database first.
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff_key = _timestamp_key(cutoff)
+        with self._lock:
+            if archive_path is not None:
+                archive_path.parent.mkdir(parents=True, exist_ok=True)
+                self._connection.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+            try:
+                with self._transaction() as connection:
+                    if archive_path is not None:
+                        connection.execute("CREATE TABLE IF NOT EXISTS archive.change_log_entries AS "
+                                           "SELECT * FROM main.change_log_entries WHERE 0")
+                        connection.execute("INSERT INTO archive.change_log_entries "
+                                           "SELECT * FROM main.change_log_entries WHERE timestamp < ?",
+                                           (cutoff_key,))
+                    return connection.execute("DELETE FROM main.change_log_entries WHERE timestamp < ?",
+                                              (cutoff_key,)).rowcount
+            finally:
+                if archive_path is not None:
+                    self._connection.execute("DETACH DATABASE archive")
+
+    def rewrite(self, character_id: int, keep: Callable[[ChangeLogEntry], bool]) -> Tuple[int, int]:
+        """
+        Delete a character's entries for which keep() is false (unreadable ones too).
+
+        Returns:
+            (entries before, entries after)
+        """
+        drop = []
+        before = 0
+        for row_id, entry_json in self._query(
+                "SELECT id, entry FROM change_log_entries WHERE character_id = ?", (character_id,)):
+            before += 1
+            try:
+                if keep(ChangeLogEntry.from_dict(json.loads(entry_json))):
+                    continue
+            except (ValueError, KeyError, TypeError):
+                pass
+            drop.append(row_id)
+
+        with self._transaction() as connection:
+            for start in range(0, len(drop), _MAX_VARIABLES):
+                chunk = drop[start:start + _MAX_VARIABLES]
+                connection.execute(f"DELETE FROM change_log_entries WHERE id IN ({', '.join('?' for _ in chunk)})",
+                                   tuple(chunk))
+        return before, before - len(drop)
+
+    # Reading
+
+    def select(self, character_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               sort_by: str = 'timestamp', descending: bool = True,
+               limit: Optional[int] = None, offset: int = 0,
+               **equals: Optional[Set[Any]]) -> List[ChangeLogEntry]:
+        """
+        A character's entries matching a time range and per-column value sets.
+
+        Args:
+            start: Inclusive lower timestamp bound
+            end: Inclusive upper timestamp bound
+            sort_by: One of SORT_COLUMNS (ties keep insertion order)
+            descending: Sort direction
+            limit: Maximum entries to return
+            offset: Entries to skip
+            **equals: FILTER_COLUMNS name -> accepted values (None = any)
+        """
+        where, params = self._where(character_id, start, end, equals)
+        if sort_by not in SORT_COLUMNS:
+            sort_by = 'timestamp'
+        direction = 'DESC' if descending else 'ASC'
+        sql = f"SELECT entry FROM change_log_entries WHERE {where} ORDER BY {sort_by} {direction}, id"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += (limit if limit is not None else -1, offset)
+        return self._decode(self._query(sql, params))
+
+    def count(self, character_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              **equals: Optional[Set[Any]]) -> int:
+        """Number of entries select() would return without a limit."""
+        where, params = self._where(character_id, start, end, equals)
+        return self._query(f"SELECT COUNT(*) FROM change_log_entries WHERE {where}", params)[0][0]
+
+    def iter_entries(self, character_id: int, since: Optional[datetime] = None) -> Iterator[ChangeLogEntry]:
+        """Stream a character's entries, oldest first."""
+        yield from self.select(character_id, start=since, descending=False)
+
+    def _where(self, character_id: int, start: Optional[datetime], end: Optional[datetime],
+               equals: Dict[str, Optional[Set[Any]]]) -> Tuple[str, Tuple[Any, ...]]:
+        clauses = ["character_id = ?"]
+        params: List[Any] = [character_id]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp_key(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_timestamp_key(end))
+        for name, values in equals.items():
+            if values is None:
+                continue
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter change log entries on {name}")
+            values = list(values)
+            clauses.append(f"{name} IN ({', '.join('?' for _ in values)})" if values else "0")
+            params.extend(values)
+        return " AND ".join(clauses), tuple(params)
+
+    @staticmethod
+    def _decode(rows: List[Tuple[Any, ...]]) -> List[ChangeLogEntry]:
+        entries = []
+        for (entry_json,) in rows:
+            try:
+                entries.append(ChangeLogEntry.from_dict(json.loads(entry_json)))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping unreadable change log entry: {e}")
+        return entries
+
+    # Statistics and maintenance
+
+    def category_counts(self, character_id: int) -> Dict[str, int]:
+        """Entry count per category for one character."""
+        return dict(self._query(
+            "SELECT category, COUNT(*) FROM change_log_entries WHERE character_id = ? GROUP BY category",
+            (character_id,)
+        ))
+
+    def time_range(self, character_id: Optional[int] = None) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Oldest and newest entry timestamps, for one character or all of them."""
+        if character_id is None:
+            oldest, newest = self._query("SELECT MIN(timestamp), MAX(timestamp) FROM change_log_entries")[0]
+        else:
+            oldest, newest = self._query(
+                "SELECT MIN(timestamp), MAX(timestamp) FROM change_log_entries WHERE character_id = ?",
+                (character_id,)
+            )[0]
+        return (datetime.fromisoformat(oldest) if oldest else None,
+                datetime.fromisoformat(newest) if newest else None)
+
+    def size_bytes(self) -> int:
+        """Size of the database including its write-ahead log."""
+        return sum(path.stat().st_size for path in
+                   (self.db_path, self.db_path.with_name(self.db_path.name + "-wal"))
+                   if path.exists())
+
+    def integrity_check(self, quick: bool = False) -> List[str]:
+        """
+        Problems SQLite finds in the database pages and indexes.
+
+        Args:
+            quick: Use quick_check, which skips verifying index contents
+
+        Returns:
+            Problem descriptions; empty when the database is sound
+        """
+        pragma = "quick_check" if quick else "integrity_check"
+        return [row[0] for row in self._query(f"PRAGMA {pragma}") if row[0] != 'ok']
+
+    def count_invalid_entries(self) -> int:
+        """Number of entries whose JSON does not parse."""
+        return self._query("SELECT COUNT(*) FROM change_log_entries WHERE NOT json_valid(entry)")[0][0]
+
+    def delete_invalid_entries(self) -> int:
+        """Remove entries whose JSON does not parse; returns how many."""
+        with self._transaction() as connection:
+            return connection.execute("DELETE FROM change_log_entries WHERE NOT json_valid(entry)").rowcount
+
+    def optimize(self) -> Dict[str, Any]:
+        """Refresh query planner statistics and reclaim free pages."""
+        size_before = self.size_bytes()
+        with self._lock:
+            self._connection.execute("PRAGMA optimize")
+            self._connection.execute("VACUUM")
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {'size_before': size_before, 'size_after': self.size_bytes()}
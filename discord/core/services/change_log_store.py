@@ -0,0 +1,544 @@
+"""
+Segmented Change Log Store
+
+Append-only JSON Lines storage for character change logs. Each character gets
+a directory of numbered segments; new entries are appended to the newest
+(active) segment, which is sealed and replaced by a fresh one once it reaches
+the rotation size. Writing a batch therefore costs the size of the batch, not
+the size of the character's history.
+
+Layout:
+    {root}/{character_id}/meta.json              ChangeLogMetadata (small, rewritten per batch)
+    {root}/{character_id}/segment_000001.jsonl   one ChangeLogEntry per line, oldest first
+    {root}/{character_id}/segment_000002.jsonl   ...
+    {root}/{character_id}/index.jsonl            secondary index rows (see change_log_index)
+    {root}/{character_id}/search.jsonl           entry tokens for full-text search (see change_log_search)
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from discord.core.models.change_log import ChangeLogEntry, ChangeLogMetadata
+from discord.core.services.change_log_index import ChangeLogIndex, IndexRecord, INDEX_FILE
+from discord.core.services.change_log_search import (
+    ChangeLogSearchIndex, SEARCH_FILE, entry_terms, parse_search_line, search_line
+)
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".jsonl"
+METADATA_FILE = "meta.json"
+COMPACTION_MARKER = "compaction.json"
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    """Write via a temporary file and rename so readers never see a partial file."""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(path)
+    except Exception:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+
+class SegmentedChangeLogStore:
+    """
+    Append-only, size-rotated JSON Lines segments per character.
+
+    Args:
+        root: Directory holding one subdirectory per character
+        segment_size_bytes: Size at which the active segment is sealed
+    """
+
+    def __init__(self, root: Path, segment_size_bytes: int):
+        self.root = Path(root)
+        self.segment_size_bytes = max(1, int(segment_size_bytes))
+        self._indexes: Dict[int, ChangeLogIndex] = {}
+        self._search_indexes: Dict[int, ChangeLogSearchIndex] = {}
+
+    # Layout
+
+    def character_dir(self, character_id: int) -> Path:
+        """Directory holding a character's segments and metadata."""
+        return self.root / str(character_id)
+
+    def has_log(self, character_id: int) -> bool:
+        """Whether the character has any segmented log yet."""
+        return (self.character_dir(character_id) / METADATA_FILE).exists()
+
+    def character_ids(self) -> List[int]:
+        """All characters with a segmented log."""
+        if not self.root.exists():
+            return []
+        return sorted(int(path.name) for path in self.root.iterdir()
+                      if path.is_dir() and path.name.isdigit())
+
+    def segments(self, character_id: int) -> List[Path]:
+        """Segment files, oldest first; the last one is the active segment."""
+        character_dir = self.character_dir(character_id)
+        if not character_dir.exists():
+            return []
+        self._finish_compaction(character_dir)
+        return sorted(character_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def active_segment(self, character_id: int) -> Optional[Path]:
+        """The segment new entries are appended to, if any exist."""
+        segments = self.segments(character_id)
+        return segments[-1] if segments else None
+
+    def sealed_segments(self, character_id: int) -> List[Path]:
+        """Segments that will no longer be appended to."""
+        return self.segments(character_id)[:-1]
+
+    def _segment_path(self, character_dir: Path, number: int) -> Path:
+        return character_dir / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    # Metadata
+
+    def load_metadata(self, character_id: int) -> Optional[ChangeLogMetadata]:
+        """Load a character's log metadata, or None if there is no log yet."""
+        metadata_path = self.character_dir(character_id) / METADATA_FILE
+        if not metadata_path.exists():
+            return None
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            return ChangeLogMetadata.from_dict(json.load(f))
+
+    def save_metadata(self, character_id: int, metadata: ChangeLogMetadata) -> None:
+        """Atomically replace a character's log metadata."""
+        character_dir = self.character_dir(character_id)
+        character_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(character_dir / METADATA_FILE,
+                      json.dumps(metadata.to_dict(), indent=2, ensure_ascii=False))
+
+    # Writing
+
+    def append(self, character_id: int, entries: List[ChangeLogEntry]) -> Path:
+        """
+        Append entries to the active segment as one write, then index them.
+
+        Returns:
+            The segment the entries were written to
+        """
+        character_dir = self.character_dir(character_id)
+        character_dir.mkdir(parents=True, exist_ok=True)
+
+        # Index first so rows for earlier entries are never skipped
+        index = self.load_index(character_id)
+
+        # Serialise everything first so a bad entry cannot leave half a batch behind
+        lines = [(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n').encode('utf-8') for entry in entries]
+
+        segment_path = self.active_segment(character_id) or self._segment_path(character_dir, 1)
+        with open(segment_path, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            # Terminate a line torn by an earlier crash so it cannot swallow ours
+            if position > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+                    position += 1
+            f.write(b''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        segment = self._segment_number(segment_path)
+        records = []
+        for entry, line in zip(entries, lines):
+            records.append(IndexRecord.from_entry(segment, position, len(line), entry))
+            position += len(line)
+        self._append_index_records(character_dir, records)
+        first_row = len(index)
+        index.add(records)
+        self._add_search_terms(character_id, index, range(first_row, len(index)), records, entries)
+
+        return segment_path
+
+    def rotate(self, character_id: int) -> Optional[Path]:
+        """
+        Seal the active segment if it has reached the rotation size.
+
+        Returns:
+            The sealed segment, or None if no rotation was needed
+        """
+        active = self.active_segment(character_id)
+        if active is None or active.stat().st_size < self.segment_size_bytes:
+            return None
+
+        # Creating the next segment is all it takes; appends go to the newest one
+        self._segment_path(active.parent, self._segment_number(active) + 1).touch()
+        return active
+
+    def import_entries(self, character_id: int, metadata: ChangeLogMetadata,
+                       entries: List[ChangeLogEntry]) -> None:
+        """Write a character's complete history (used when migrating legacy logs)."""
+        character_dir = self.character_dir(character_id)
+        character_dir.mkdir(parents=True, exist_ok=True)
+
+        number = 1
+        lines = []
+        size = 0
+        for entry in entries:
+            line = json.dumps(entry.to_dict(), ensure_ascii=False) + '\n'
+            lines.append(line)
+            size += len(line.encode('utf-8'))
+            if size >= self.segment_size_bytes:
+                _atomic_write(self._segment_path(character_dir, number), ''.join(lines))
+                number += 1
+                lines, size = [], 0
+        _atomic_write(self._segment_path(character_dir, number), ''.join(lines))
+        self.invalidate_index(character_id)
+
+        # Metadata last: its presence marks the migration as complete
+        self.save_metadata(character_id, metadata)
+
+    def remove_segment(self, character_id: int, segment_path: Path,
+                       archive_dir: Optional[Path] = None) -> None:
+        """Archive (move) or delete a sealed segment."""
+        if segment_path == self.active_segment(character_id):
+            raise ValueError(f"Cannot remove active segment {segment_path}")
+        if archive_dir is not None:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            segment_path.rename(archive_dir / segment_path.name)
+        else:
+            segment_path.unlink()
+        self.invalidate_index(character_id)
+
+    def rewrite(self, character_id: int, keep: Callable[[ChangeLogEntry], bool]) -> Tuple[int, int]:
+        """
+        Rewrite every segment keeping only entries for which keep() is true.
+
+        Unreadable lines are dropped as well. Each segment is replaced
+        atomically, so an interrupted rewrite leaves a mix of filtered and
+        unfiltered segments, never a damaged one.
+
+        Returns:
+            (entries before, entries after)
+        """
+        before = after = 0
+        for segment_path in self.segments(character_id):
+            kept = []
+            for entry in self.iter_segment(segment_path):
+                before += 1
+                if keep(entry):
+                    kept.append(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n')
+            after += len(kept)
+            _atomic_write(segment_path, ''.join(kept))
+        self.invalidate_index(character_id)
+        return before, after
+
+    # Reading
+
+    def iter_segment(self, segment_path: Path) -> Iterator[ChangeLogEntry]:
+        """Stream the entries of one segment, skipping torn or corrupted lines."""
+        with open(segment_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield ChangeLogEntry.from_dict(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable entry {segment_path.name}:{line_number}: {e}")
+
+    def iter_entries(self, character_id: int, since=None) -> Iterator[ChangeLogEntry]:
+        """
+        Stream a character's entries across all segments, oldest segment first.
+
+        Args:
+            character_id: Character to read
+            since: Only yield entries at or after this datetime
+        """
+        for segment_path in self.segments(character_id):
+            # Entries are written when detected, so a segment last modified before
+            # `since` cannot hold anything newer
+            if since and segment_path.stat().st_mtime < since.timestamp():
+                continue
+            for entry in self.iter_segment(segment_path):
+                if since is None or entry.timestamp >= since:
+                    yield entry
+
+    def read_entries(self, character_id: int, records: List[IndexRecord]) -> List[ChangeLogEntry]:
+        """Read the entries for index rows, in the given order, seeking directly to each."""
+        character_dir = self.character_dir(character_id)
+        entries: List[Optional[ChangeLogEntry]] = [None] * len(records)
+
+        by_segment: Dict[int, List[int]] = {}
+        for position, record in enumerate(records):
+            by_segment.setdefault(record.segment, []).append(position)
+
+        for segment, positions in by_segment.items():
+            with open(self._segment_path(character_dir, segment), 'rb') as f:
+                for position in sorted(positions, key=lambda p: records[p].offset):
+                    record = records[position]
+                    f.seek(record.offset)
+                    entries[position] = ChangeLogEntry.from_dict(json.loads(f.read(record.length)))
+
+        return entries
+
+    def summarize_segment(self, segment_path: Path) -> Dict[str, Any]:
+        """Entry count, category counts, bad lines and timestamp range of one segment."""
+        summary = {'entries': 0, 'invalid_lines': 0, 'change_categories': {},
+                   'oldest_entry': None, 'newest_entry': None}
+        with open(segment_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = ChangeLogEntry.from_dict(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    summary['invalid_lines'] += 1
+                    continue
+                summary['entries'] += 1
+                category = entry.category.value
+                summary['change_categories'][category] = summary['change_categories'].get(category, 0) + 1
+                if summary['oldest_entry'] is None or entry.timestamp < summary['oldest_entry']:
+                    summary['oldest_entry'] = entry.timestamp
+                if summary['newest_entry'] is None or entry.timestamp > summary['newest_entry']:
+                    summary['newest_entry'] = entry.timestamp
+        return summary
+
+    # Index
+
+    def load_index(self, character_id: int) -> ChangeLogIndex:
+        """
+        The character's secondary index, brought up to date with the segments.
+
+        Loaded from index.jsonl once per process; afterwards only segment
+        bytes not yet indexed (e.g. written by another process, or lost to a
+        crash between the segment and index writes) are scanned.
+        """
+        character_dir = self.character_dir(character_id)
+        index = self._indexes.get(character_id)
+
+        if index is None:
+            index = ChangeLogIndex()
+            index_path = character_dir / INDEX_FILE
+            if index_path.exists():
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    records = []
+                    for line in f:
+                        try:
+                            records.append(IndexRecord.from_line(line))
+                        except (ValueError, TypeError):
+                            continue  # Torn final line; its entry is re-indexed below
+                index.add(records)
+            self._indexes[character_id] = index
+
+        return self._catch_up_index(character_id, index)
+
+    def invalidate_index(self, character_id: int) -> None:
+        """Drop the index after segments were rewritten; it is rebuilt on next use."""
+        self._indexes.pop(character_id, None)
+        self._search_indexes.pop(character_id, None)
+        for name in (INDEX_FILE, SEARCH_FILE):
+            index_path = self.character_dir(character_id) / name
+            if index_path.exists():
+                index_path.unlink()
+
+    def _catch_up_index(self, character_id: int, index: ChangeLogIndex) -> ChangeLogIndex:
+        """Index segment bytes past the last indexed entry of each segment."""
+        character_dir = self.character_dir(character_id)
+        sizes = {self._segment_number(path): path.stat().st_size for path in self.segments(character_id)}
+
+        # Segments replaced behind our back: offsets can no longer be trusted
+        if (self._indexes.get(character_id) is not index
+                or any(segment not in sizes or sizes[segment] < end for segment, end in index.indexed_end.items())):
+            logger.info(f"Rebuilding change log index for character {character_id}")
+            self.invalidate_index(character_id)
+            index = ChangeLogIndex()
+            self._indexes[character_id] = index
+
+        records, entries = [], []
+        for segment, size in sorted(sizes.items()):
+            position = index.indexed_end.get(segment, 0)
+            if size <= position:
+                continue
+            with open(self._segment_path(character_dir, segment), 'rb') as f:
+                f.seek(position)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Incomplete line still being written
+                    try:
+                        entry = ChangeLogEntry.from_dict(json.loads(line))
+                        records.append(IndexRecord.from_entry(segment, position, len(line), entry))
+                        entries.append(entry)
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                    position += len(line)
+
+        if records:
+            self._append_index_records(character_dir, records)
+            first_row = len(index)
+            index.add(records)
+            self._add_search_terms(character_id, index, range(first_row, len(index)), records, entries)
+        return index
+
+    def _append_index_records(self, character_dir: Path, records: List[IndexRecord]) -> None:
+        if not records:
+            return
+        self._append_lines(character_dir / INDEX_FILE, [record.to_line() for record in records])
+
+    @staticmethod
+    def _append_lines(path: Path, lines: List[str]) -> None:
+        with open(path, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(''.join(lines).encode('utf-8'))
+            f.flush()
+
+    # Full-text search
+
+    def load_search_index(self, character_id: int) -> ChangeLogSearchIndex:
+        """
+        The character's full-text index, aligned with the current secondary index.
+
+        Loaded from search.jsonl once per process. Rows without stored tokens
+        (logs indexed before search.jsonl existed, or a crash between writes)
+        are read from their segments and tokenised.
+        """
+        index = self.load_index(character_id)
+        search = self._search_indexes.get(character_id)
+
+        if search is None or search.index is not index:
+            search = ChangeLogSearchIndex(index)
+            search_path = self.character_dir(character_id) / SEARCH_FILE
+            if search_path.exists():
+                rows = {(record.segment, record.offset): row for row, record in enumerate(index.records)}
+                with open(search_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            segment, offset, terms = parse_search_line(line)
+                        except (ValueError, TypeError):
+                            continue  # Torn final line; its row is re-tokenised below
+                        row = rows.get((segment, offset))
+                        if row is not None:
+                            search.add(row, terms)
+            self._search_indexes[character_id] = search
+
+        missing = search.missing_rows()
+        if missing:
+            logger.info(f"Indexing text of {len(missing)} change log entries for character {character_id}")
+            entries = self.read_entries(character_id, [index.records[row] for row in missing])
+            self._add_search_terms(character_id, index, missing, [index.records[row] for row in missing], entries)
+        return search
+
+    def _add_search_terms(self, character_id: int, index: ChangeLogIndex, rows: Sequence[int],
+                          records: List[IndexRecord], entries: List[ChangeLogEntry]) -> None:
+        """Persist the tokens of newly indexed entries and add them to a loaded search index."""
+        if not records:
+            return
+        terms = [entry_terms(entry) for entry in entries]
+        self._append_lines(self.character_dir(character_id) / SEARCH_FILE,
+                           [search_line(record, entry_tokens) for record, entry_tokens in zip(records, terms)])
+
+        search = self._search_indexes.get(character_id)
+        if search is not None and search.index is index:
+            for row, entry_tokens in zip(rows, terms):
+                search.add(row, entry_tokens)
+
+    # Compaction
+
+    def compact(self, character_id: int) -> Dict[str, Any]:
+        """
+        Merge runs of small sealed segments and drop unreadable lines.
+
+        Sealed segments are normally already close to the rotation size; small
+        ones come from retention removing neighbours, a lowered rotation size or
+        torn writes. The active segment is never touched.
+
+        Returns:
+            Counts of segments merged and lines dropped
+        """
+        results = {'segments_before': 0, 'segments_after': 0, 'lines_dropped': 0}
+        sealed = self.sealed_segments(character_id)
+        results['segments_before'] = len(sealed)
+
+        # Group consecutive sealed segments that fit in one segment together
+        groups, group, group_size = [], [], 0
+        for segment_path in sealed:
+            size = segment_path.stat().st_size
+            if group and group_size + size > self.segment_size_bytes:
+                groups.append(group)
+                group, group_size = [], 0
+            group.append(segment_path)
+            group_size += size
+        if group:
+            groups.append(group)
+
+        for group in groups:
+            if len(group) == 1 and not self.summarize_segment(group[0])['invalid_lines']:
+                continue
+            results['lines_dropped'] += self._merge_segments(group)
+
+        results['segments_after'] = len(self.sealed_segments(character_id))
+        return results
+
+    def _merge_segments(self, group: List[Path]) -> int:
+        """Rewrite a group of segments into the first one; returns lines dropped."""
+        target = group[0]
+        character_dir = target.parent
+        temp_path = target.with_name(f".{target.name}.compact")
+        dropped = 0
+
+        with open(temp_path, 'w', encoding='utf-8') as out:
+            for segment_path in group:
+                with open(segment_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        stripped = line.strip()
+                        if not stripped:
+                            continue
+                        try:
+                            ChangeLogEntry.from_dict(json.loads(stripped))
+                        except (ValueError, KeyError, TypeError):
+                            dropped += 1
+                            continue
+                        out.write(stripped + '\n')
+            out.flush()
+            os.fsync(out.fileno())
+
+        # Record intent so an interrupted merge is completed, not half-applied
+        _atomic_write(character_dir / COMPACTION_MARKER, json.dumps({
+            'temp': temp_path.name,
+            'target': target.name,
+            'sources': [segment_path.name for segment_path in group[1:]]
+        }))
+        self._finish_compaction(character_dir)
+        return dropped
+
+    def _finish_compaction(self, character_dir: Path) -> None:
+        """Complete a merge recorded in the compaction marker, if any."""
+        marker_path = character_dir / COMPACTION_MARKER
+        if not marker_path.exists():
+            return
+        try:
+            with open(marker_path, 'r', encoding='utf-8') as f:
+                marker = json.load(f)
+            temp_path = character_dir / marker['temp']
+            if temp_path.exists():
+                temp_path.replace(character_dir / marker['target'])
+            for name in marker['sources']:
+                source_path = character_dir / name
+                if source_path.exists():
+                    source_path.unlink()
+            marker_path.unlink()
+            self.invalidate_index(int(character_dir.name))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not complete compaction in {character_dir}: {e}")
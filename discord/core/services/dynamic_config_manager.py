@@ -5,6 +5,8 @@ Manages field-specific priorities with pattern matching and auto-discovery.
 Supports separate thresholds for Discord notifications vs changelog.
 """
 
+import atexit
+import os
 import re
 import logging
 from typing import Dict, List, Any, Optional, Set
@@ -13,6 +15,7 @@ import yaml
 from enum import Enum
 
 from shared.models.change_detection import FieldChange, ChangePriority
+from discord.core.services.field_path_matcher import FieldPathMatcher, wildcard_to_regex
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +32,7 @@ class DynamicConfigManager:
     
     Features:
     - Pattern matching for field paths (e.g., spells.*)
-    - Auto-discovery of new field types
+    - Auto-discovery of new field types (persisted to a sidecar file)
     - Hierarchical priority overrides
     - Separate thresholds for Discord vs changelog
     """
@@ -38,10 +41,19 @@ class DynamicConfigManager:
         self.config_path = Path(config_path)
         self.config = {}
         self.discovered_fields: Set[str] = set()
+        # Auto-discovered fields live beside the hand-edited config, e.g. discord.discovered.yaml
+        self.discovered_path = self.config_path.with_name(f"{self.config_path.stem}.discovered.yaml")
+        self._pending_discovered: Dict[str, str] = {}
         self.pattern_cache: Dict[str, List[re.Pattern]] = {}
+        self._priority_matcher: Optional[FieldPathMatcher] = None
+        self._specific_matcher: Optional[FieldPathMatcher] = None
         
         self._load_config()
+        self._load_discovered_fields()
         self._compile_patterns()
+        
+        # Safety net for discoveries made after the last detection run's flush
+        atexit.register(self.flush_discovered_fields)
     
     def _load_config(self):
         """Load configuration from file, creating default if missing."""
@@ -58,6 +70,24 @@ class DynamicConfigManager:
             logger.error(f"Error loading config: {e}")
             self._create_default_config()
     
+    def _load_discovered_fields(self):
+        """Merge previously discovered fields from the sidecar file; the main config wins."""
+        try:
+            if not self.discovered_path.exists():
+                return
+            with open(self.discovered_path, 'r') as f:
+                discovered = (yaml.safe_load(f) or {}).get('field_patterns', {}) or {}
+        except Exception as e:
+            logger.error(f"Error loading discovered fields from {self.discovered_path}: {e}")
+            return
+        
+        field_patterns = self.config.setdefault('detection', {}).setdefault('field_patterns', {})
+        for field_path, priority in discovered.items():
+            if field_path not in field_patterns:
+                field_patterns[field_path] = priority
+                self.discovered_fields.add(field_path)
+        logger.debug(f"Loaded {len(discovered)} discovered fields from {self.discovered_path}")
+    
     def _create_default_config(self):
         """Create default configuration with sensible priorities integrated into Discord config."""
         # Don't overwrite existing config - just add our section if missing
@@ -117,6 +147,24 @@ class DynamicConfigManager:
                     self.pattern_cache[pattern_str].append(compiled_pattern)
                 except re.error as e:
                     logger.warning(f"Invalid pattern '{pattern_str}': {e}")
+        
+        # One matcher over all valid wildcards, most specific (fewest '*') first;
+        # ties keep config order
+        self._priority_matcher = FieldPathMatcher(
+            ((pattern_str, None) for pattern_str in self.pattern_cache),
+            translate=wildcard_to_regex,
+            rank=lambda index, pattern_str: (pattern_str.count('*'), index),
+            normalize=None
+        )
+        
+        # Field-specific overrides: first matching wildcard in config order wins
+        field_specific_config = self.config.get('detection', {}).get('field_specific_priorities', {})
+        self._specific_matcher = FieldPathMatcher(
+            ((pattern_str, field_config) for pattern_str, field_config in field_specific_config.items()
+             if '*' in pattern_str and isinstance(field_config, dict)),
+            translate=wildcard_to_regex,
+            normalize=None
+        )
     
     def get_field_priority(self, field_path: str, auto_discover: bool = True) -> ChangePriority:
         """
@@ -140,16 +188,9 @@ class DynamicConfigManager:
             return self._str_to_priority(priority_str)
         
         # 2. Check pattern matches (most specific first)
-        matched_patterns = []
-        for pattern_str, compiled_patterns in self.pattern_cache.items():
-            for compiled_pattern in compiled_patterns:
-                if compiled_pattern.match(field_path):
-                    matched_patterns.append((pattern_str, field_priorities[pattern_str]))
-        
-        # Sort by specificity (fewer wildcards = more specific)
-        if matched_patterns:
-            matched_patterns.sort(key=lambda x: x[0].count('*'))
-            most_specific_priority = matched_patterns[0][1]
+        match = self._priority_matcher.match(field_path)
+        if match:
+            most_specific_priority = field_priorities[match[0]]
             if most_specific_priority.upper() == 'IGNORED':
                 return None  # Special case for IGNORED
             return self._str_to_priority(most_specific_priority)
@@ -157,7 +198,7 @@ class DynamicConfigManager:
         # 3. Auto-discover new field if enabled (only if not already covered by wildcard)
         if auto_discover and self.config.get('detection', {}).get('auto_add_new_fields', True):
             # Don't auto-add if we found a matching pattern (wildcard already covers it)
-            if not matched_patterns:
+            if not match:
                 default_priority = self.config.get('detection', {}).get('default_priority_for_new_fields', 'MEDIUM')
                 self._add_discovered_field(field_path, default_priority)
                 return self._str_to_priority(default_priority)
@@ -225,100 +266,83 @@ class DynamicConfigManager:
                 return field_config.get(target.value)
         
         # Check for wildcard matches
-        for pattern_str, field_config in field_specific_config.items():
-            if '*' in pattern_str and isinstance(field_config, dict):
-                # Use compiled patterns if available
-                if pattern_str in self.pattern_cache:
-                    for compiled_pattern in self.pattern_cache[pattern_str]:
-                        if compiled_pattern.match(field_path):
-                            return field_config.get(target.value)
-                else:
-                    # Fallback pattern matching
-                    regex_pattern = pattern_str.replace('.', r'\.').replace('*', r'.*')
-                    regex_pattern = f'^{regex_pattern}$'
-                    try:
-                        if re.match(regex_pattern, field_path):
-                            return field_config.get(target.value)
-                    except re.error:
-                        pass
+        match = self._specific_matcher.match(field_path)
+        if match:
+            return match[1].get(target.value)
         
         return None
     
     def _add_discovered_field(self, field_path: str, priority: str):
-        """Add a newly discovered field to config."""
+        """Add a newly discovered field to config (persisted by flush_discovered_fields)."""
         if field_path not in self.discovered_fields:
             self.discovered_fields.add(field_path)
             
-            # Add to field_patterns section (will be saved with comment)
             field_patterns = self.config.setdefault('detection', {}).setdefault('field_patterns', {})
             field_patterns[field_path] = priority
+            self._pending_discovered[field_path] = priority
             
             logger.info(f"Auto-discovered new field: {field_path} (priority: {priority})")
-            
-            # Save updated config
-            self._save_config()
+    
+    def flush_discovered_fields(self, force: bool = False):
+        """
+        Persist fields discovered since the last flush to the sidecar file.
+        
+        Called once per detection run (and at exit), so a first run against a
+        new character writes one file instead of one config rewrite per field.
+        
+        Args:
+            force: Rewrite the sidecar even if nothing new was discovered
+        """
+        if not self._pending_discovered and not force:
+            return
+        
+        field_patterns = self.config.get('detection', {}).get('field_patterns', {})
+        discovered = {
+            field_path: field_patterns[field_path]
+            for field_path in sorted(self.discovered_fields)
+            if field_path in field_patterns
+        }
+        content = (
+            "# Auto-discovered field patterns, maintained by the change detector.\n"
+            f"# Move an entry into {self.config_path.name} to customise its priority.\n"
+            + yaml.safe_dump({'field_patterns': discovered}, default_flow_style=False, sort_keys=False)
+        )
+        
+        try:
+            self._atomic_write(self.discovered_path, content)
+            logger.debug(f"Saved {len(self._pending_discovered)} newly discovered fields to {self.discovered_path}")
+            self._pending_discovered.clear()
+        except Exception as e:
+            logger.error(f"Error saving discovered fields: {e}")
     
     def _save_config(self):
-        """Save current configuration to file with auto-discovered patterns properly commented."""
+        """Save current configuration to file (auto-discovered fields stay in the sidecar)."""
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # If we have discovered fields, we need to add them with proper commenting
+            config = self.config
             if self.discovered_fields:
-                self._save_config_with_autodiscovered_section()
-            else:
-                # Standard YAML save
-                with open(self.config_path, 'w') as f:
-                    yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+                field_patterns = self.config.get('detection', {}).get('field_patterns', {})
+                config = dict(self.config)
+                config['detection'] = dict(self.config['detection'])
+                config['detection']['field_patterns'] = {
+                    k: v for k, v in field_patterns.items() if k not in self.discovered_fields
+                }
             
+            self._atomic_write(
+                self.config_path,
+                yaml.dump(config, default_flow_style=False, sort_keys=False)
+            )
             logger.debug(f"Saved config to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
     
-    def _save_config_with_autodiscovered_section(self):
-        """Save config with auto-discovered patterns appended at the end of field_patterns."""
-        # Read the existing config file content
-        with open(self.config_path, 'r') as f:
-            content = f.read()
-        
-        # Find auto-discovered fields
-        field_patterns = self.config.get('detection', {}).get('field_patterns', {})
-        auto_discovered = {k: v for k, v in field_patterns.items() if k in self.discovered_fields}
-        
-        if auto_discovered:
-            # Check if auto-discovered section already exists
-            if '# === AUTO-DISCOVERED PATTERNS ===' not in content:
-                # Add auto-discovered section at the end of the file
-                if not content.endswith('\n'):
-                    content += '\n'
-                content += '\n    # === AUTO-DISCOVERED PATTERNS ===\n'
-                for field_path, priority in sorted(auto_discovered.items()):
-                    content += f"    {field_path}: {priority}\n"
-            else:
-                # Update existing auto-discovered section
-                lines = content.split('\n')
-                updated_lines = []
-                in_auto_section = False
-                
-                for line in lines:
-                    if '# === AUTO-DISCOVERED PATTERNS ===' in line:
-                        in_auto_section = True
-                        updated_lines.append(line)
-                        # Add all auto-discovered patterns
-                        for field_path, priority in sorted(auto_discovered.items()):
-                            updated_lines.append(f"    {field_path}: {priority}")
-                    elif in_auto_section and line.strip() and not line.startswith('    '):
-                        # End of auto-discovered section
-                        in_auto_section = False
-                        updated_lines.append(line)
-                    elif not in_auto_section:
-                        updated_lines.append(line)
-                
-                content = '\n'.join(updated_lines)
-            
-            # Write the updated content
-            with open(self.config_path, 'w') as f:
-                f.write(content)
+    @staticmethod
+    def _atomic_write(path: Path, content: str):
+        """Write a file via a temporary file and rename, so readers never see it half-written."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
     
     def _str_to_priority(self, priority_str: str) -> ChangePriority:
         """Convert string priority to enum."""
@@ -352,6 +376,11 @@ class DynamicConfigManager:
         """Update priority for a specific field path."""
         field_priorities = self.config.setdefault('detection', {}).setdefault('field_patterns', {})
         field_priorities[field_path] = priority.upper()
+        if field_path in self.discovered_fields:
+            # Now a configured field: moves from the sidecar into the main config
+            self.discovered_fields.discard(field_path)
+            self._pending_discovered.pop(field_path, None)
+            self.flush_discovered_fields(force=True)
         self._save_config()
         self._compile_patterns()  # Recompile patterns after update
         logger.info(f"Updated field priority: {field_path} -> {priority}")
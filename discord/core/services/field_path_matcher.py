@@ -0,0 +1,90 @@
+"""
+Compiled field path matcher.
+
+Resolves a change's field path (e.g. 'spells.Wizard.fireball') to the best
+matching configured pattern in one step. All patterns are combined into a
+single regex alternation, ordered by precomputed rank, so the first
+alternative that fully matches is the winner; resolved paths are memoised.
+Used for both the static field mappings and the dynamic priority patterns.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """fnmatch.fnmatch semantics ('*' also crosses dots, '?' and [...] supported)."""
+    return fnmatch.translate(os.path.normcase(pattern))
+
+
+def wildcard_to_regex(pattern: str) -> str:
+    """Dynamic config semantics: '.' is literal and '*' matches anything."""
+    return pattern.replace('.', r'\.').replace('*', r'.*')
+
+
+class FieldPathMatcher:
+    """
+    Match field paths against many patterns with one compiled regex.
+
+    Args:
+        patterns: (pattern, value) pairs
+        translate: Converts a pattern to a regex (default fnmatch semantics)
+        rank: Sort key over (index, pattern); lower ranks win when several
+            patterns match (default: original order, first match wins)
+        normalize: Applied to field paths before matching
+        memo_size: Number of resolved field paths to remember
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]],
+                 translate: Callable[[str], str] = glob_to_regex,
+                 rank: Optional[Callable[[int, str], Any]] = None,
+                 normalize: Optional[Callable[[str], str]] = os.path.normcase,
+                 memo_size: int = 4096):
+        self._normalize = normalize
+        self._entries = []
+        alternatives = []
+
+        indexed = list(enumerate(patterns))
+        if rank is not None:
+            indexed.sort(key=lambda item: rank(item[0], item[1][0]))
+
+        for _, (pattern, value) in indexed:
+            regex = translate(pattern)
+            try:
+                re.compile(regex)
+            except re.error as e:
+                logger.warning(f"Invalid pattern '{pattern}': {e}")
+                continue
+            alternatives.append(f"(?P<_p{len(self._entries)}>{regex})")
+            self._entries.append((pattern, value))
+
+        self._regex = re.compile('|'.join(alternatives)) if alternatives else None
+        self._lookup = lru_cache(maxsize=memo_size)(self._match_uncached)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _match_uncached(self, field_path: str) -> Optional[Tuple[str, Any]]:
+        if self._regex is None:
+            return None
+        subject = self._normalize(field_path) if self._normalize else field_path
+        match = self._regex.fullmatch(subject)
+        if match is None:
+            return None
+        # Each wrapper group closes after anything nested in it, so lastgroup is ours
+        return self._entries[int(match.lastgroup[2:])]
+
+    def match(self, field_path: str) -> Optional[Tuple[str, Any]]:
+        """
+        Get the best matching (pattern, value) for a field path.
+
+        Returns:
+            The winning (pattern, value) pair, or None if nothing matches
+        """
+        return self._lookup(field_path)
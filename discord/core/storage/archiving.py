@@ -4,13 +4,19 @@ Shared snapshot archiving utility for the D&D Beyond scraper system.
 
 Provides centralized archiving functionality that can be used by both
 the parser and Discord monitor to manage character snapshot retention.
+Archived snapshots are stored as delta-encoded history (keyframes plus
+JSON Patch deltas) or, with archive_format "files", moved to archive/.
 """
 
+import json
 import logging
 from pathlib import Path
 from typing import Optional
 import yaml
 
+from .snapshot_catalog import get_snapshot_catalog
+from .snapshot_history import DEFAULT_KEYFRAME_INTERVAL, get_snapshot_history, json_equal
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +26,7 @@ class SnapshotArchiver:
     
     Features:
     - Configurable snapshot retention limits
+    - Delta-encoded history for archived snapshots
     - Automatic archive directory creation
     - Safe file moving with error handling
     - Supports multiple configuration sources
@@ -37,6 +44,8 @@ class SnapshotArchiver:
         self.max_snapshots = max_snapshots if max_snapshots is not None else self._retention_config.get('max_per_character', 10)
         self.max_scraper_files = self._retention_config.get('max_scraper_files_per_character', 10)
         self.max_raw_files = self._retention_config.get('max_raw_files_per_character', 5)
+        self.archive_format = self._retention_config.get('archive_format', 'delta')
+        self.keyframe_interval = self._retention_config.get('keyframe_interval', DEFAULT_KEYFRAME_INTERVAL)
 
     def _load_retention_config(self) -> dict:
         """
@@ -49,6 +58,8 @@ class SnapshotArchiver:
             'max_per_character': 10,
             'max_scraper_files_per_character': 10,
             'max_raw_files_per_character': 5,
+            'archive_format': 'delta',
+            'keyframe_interval': DEFAULT_KEYFRAME_INTERVAL,
         }
 
         project_root = Path(__file__).parent.parent.parent
@@ -90,50 +101,59 @@ class SnapshotArchiver:
             return 0
         
         try:
-            # Find all snapshot files for this character
-            pattern = f"character_{character_id}_*.json"
-            snapshot_files = list(storage_dir.glob(pattern))
-            
-            if len(snapshot_files) <= self.max_snapshots:
-                logger.debug(f"Character {character_id} has {len(snapshot_files)} snapshots, "
-                           f"no archiving needed (max: {self.max_snapshots})")
-                return 0
-            
-            # Sort by modification time (oldest first)
-            snapshot_files.sort(key=lambda p: p.stat().st_mtime)
-            
-            # Determine which files to archive
-            files_to_archive = snapshot_files[:-self.max_snapshots]
-            
-            if not files_to_archive:
-                return 0
-            
-            # Create archive directory
-            archive_dir = storage_dir / "archive"
-            archive_dir.mkdir(exist_ok=True)
-            
-            # Move old files to archive
-            archived_count = 0
-            for file_path in files_to_archive:
-                try:
-                    archive_path = archive_dir / file_path.name
-                    
-                    # Handle duplicate names in archive
-                    counter = 1
-                    original_archive_path = archive_path
-                    while archive_path.exists():
-                        stem = original_archive_path.stem
-                        suffix = original_archive_path.suffix
-                        archive_path = archive_dir / f"{stem}_duplicate_{counter}{suffix}"
-                        counter += 1
-                    
-                    file_path.rename(archive_path)
-                    archived_count += 1
-                    logger.debug(f"Archived {file_path.name} to {archive_path.name}")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to archive {file_path.name}: {e}")
-            
+            # Snapshot files for this character, oldest first, from the catalog
+            catalog = get_snapshot_catalog(storage_dir)
+            # Validate the catalog before moving files, so only our own moves are accepted
+            with catalog.changing():
+                snapshot_entries = catalog.get_snapshots(character_id)
+                snapshot_files = [entry.path for entry in snapshot_entries]
+                
+                if len(snapshot_files) <= self.max_snapshots:
+                    logger.debug(f"Character {character_id} has {len(snapshot_files)} snapshots, "
+                               f"no archiving needed (max: {self.max_snapshots})")
+                    return 0
+                
+                # Determine which files to archive
+                entries_to_archive = snapshot_entries[:-self.max_snapshots]
+                files_to_archive = snapshot_files[:-self.max_snapshots]
+                
+                if not files_to_archive:
+                    return 0
+                
+                # Delta history first; anything it cannot read is moved to archive/ instead
+                archived_files = []
+                if self.archive_format == 'delta':
+                    archived_files = self._archive_to_history(character_id, storage_dir, entries_to_archive)
+                    files_to_archive = [path for path in files_to_archive if path not in archived_files]
+                
+                # Create archive directory
+                archive_dir = storage_dir / "archive"
+                if files_to_archive:
+                    archive_dir.mkdir(exist_ok=True)
+                
+                # Move old files to archive
+                for file_path in files_to_archive:
+                    try:
+                        archive_path = archive_dir / file_path.name
+                        
+                        # Handle duplicate names in archive
+                        counter = 1
+                        original_archive_path = archive_path
+                        while archive_path.exists():
+                            stem = original_archive_path.stem
+                            suffix = original_archive_path.suffix
+                            archive_path = archive_dir / f"{stem}_duplicate_{counter}{suffix}"
+                            counter += 1
+                        
+                        file_path.rename(archive_path)
+                        archived_files.append(file_path)
+                        logger.debug(f"Archived {file_path.name} to {archive_path.name}")
+                        
+                    except Exception as e:
+                        logger.warning(f"Failed to archive {file_path.name}: {e}")
+                
+                catalog.remove_snapshots(character_id, archived_files)
+            archived_count = len(archived_files)
             if archived_count > 0:
                 logger.info(f"Archived {archived_count} old snapshots for character {character_id} "
                            f"(keeping {self.max_snapshots} most recent)")
@@ -144,6 +164,37 @@ class SnapshotArchiver:
             logger.error(f"Error during snapshot archiving for character {character_id}: {e}")
             return 0
     
+    def _archive_to_history(self, character_id: int, storage_dir: Path, entries: list) -> list:
+        """
+        Append snapshots to the character's delta history and delete the files
+        once the history reads them back unchanged.
+        
+        Args:
+            character_id: Character ID the snapshots belong to
+            storage_dir: Directory containing character snapshots
+            entries: Catalog entries to archive, oldest first
+            
+        Returns:
+            Paths of the snapshots now stored in the history
+        """
+        history = get_snapshot_history(storage_dir, self.keyframe_interval)
+        archived = []
+        for entry in entries:
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    character_data = json.load(f)
+                stored = history.append(character_id, character_data, entry.mtime, entry.path.name, entry.content_hash)
+                # Only delete the file once the history reproduces it exactly
+                if not json_equal(history.load_version(character_id, stored.version), character_data):
+                    raise ValueError(f"history version {stored.version} does not match the snapshot")
+                entry.path.unlink()
+                archived.append(entry.path)
+                logger.debug(f"Archived {entry.path.name} to delta history")
+            except Exception as e:
+                # Left in place for the file archive below
+                logger.warning(f"Failed to add {entry.path.name} to delta history: {e}")
+        return archived
+    
     def cleanup_scraper_files(self, character_id: int, project_root: Path) -> int:
         """
         Delete old scraper output files for a character, keeping only the most recent.
@@ -216,6 +267,11 @@ class SnapshotArchiver:
             'max_snapshots_per_character': self.max_snapshots
         }
         
-        stats['total_snapshots'] = stats['active_snapshots'] + stats['archived_snapshots']
+        history_stats = get_snapshot_history(storage_dir, self.keyframe_interval).get_stats()
+        stats['history_versions'] = history_stats['versions']
+        stats['history_keyframes'] = history_stats['keyframes']
+        stats['history_bytes'] = history_stats['bytes']
+        
+        stats['total_snapshots'] = stats['active_snapshots'] + stats['archived_snapshots'] + stats['history_versions']
         
         return stats
\ No newline at end of file
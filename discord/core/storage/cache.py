@@ -3,9 +3,13 @@ Cache implementations for improved storage performance.
 """
 
 import json
+import sys
 import time
+import types
+import heapq
 import pickle
-from typing import Any, Optional, Dict, Set, List
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Dict, Set, List, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
 from asyncio import Lock
@@ -17,15 +21,75 @@ from shared.interfaces.storage import ICacheStorage
 logger = logging.getLogger(__name__)
 
 
+# Referenced by value objects but not part of them (pickle stores them by name)
+_UNSIZED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def _slot_values(item: Any) -> List[Any]:
+    """Values of the __slots__ attributes set on an object."""
+    values = []
+    for cls in type(item).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot not in ('__dict__', '__weakref__') and hasattr(item, slot):
+                values.append(getattr(item, slot))
+    return values
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory size of a value without serialising it.
+    
+    Walks dicts, lists, tuples and sets and the __dict__/__slots__ attributes
+    of other objects (dataclasses, models), summing sys.getsizeof; shared and
+    cyclic references are counted once. Classes, modules and functions are
+    not counted.
+    """
+    total = 0
+    seen: Set[int] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, int, float, type(None))):
+            total += sys.getsizeof(item)
+            continue
+        if isinstance(item, _UNSIZED_TYPES) or id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            attributes = getattr(item, '__dict__', None)
+            if isinstance(attributes, dict):
+                stack.append(attributes)
+            stack.extend(_slot_values(item))
+    return total
+
+
+def pickle_size(value: Any) -> int:
+    """Exact pickled size of a value (allocates the pickle)."""
+    return len(pickle.dumps(value))
+
+
+SIZE_ESTIMATORS: Dict[str, Callable[[Any], int]] = {
+    "estimate": estimate_size,
+    "pickle": pickle_size,
+}
+
+
 class MemoryCache(ICacheStorage):
     """
     In-memory cache implementation.
     
     Features:
-    - LRU eviction
-    - TTL support
+    - LRU eviction (ordered dict: O(1) touch and evict)
+    - TTL support (expiry heap: cleanup only visits expired entries)
     - Automatic cleanup
-    - Memory usage tracking
+    - Memory usage tracking (caller-supplied or estimated sizes)
     """
     
     def __init__(
@@ -33,16 +97,25 @@ class MemoryCache(ICacheStorage):
         max_size: int = 1000,
         default_ttl_seconds: int = 3600,
         cleanup_interval_seconds: int = 300,
-        max_memory_mb: int = 100
+        max_memory_mb: int = 100,
+        size_estimator: Union[str, Callable[[Any], int]] = "estimate"
     ):
         self.max_size = max_size
         self.default_ttl_seconds = default_ttl_seconds
         self.cleanup_interval_seconds = cleanup_interval_seconds
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        if callable(size_estimator):
+            self._size_estimator = size_estimator
+        elif size_estimator in SIZE_ESTIMATORS:
+            self._size_estimator = SIZE_ESTIMATORS[size_estimator]
+        else:
+            raise ValueError(f"Unknown size estimator: {size_estimator}")
         
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._access_times: Dict[str, float] = {}
+        # Least recently used first
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._expiry_times: Dict[str, float] = {}
+        # (expiry time, key); entries whose key was since removed or re-set are skipped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._lock = Lock()
         
         # Start cleanup task
@@ -52,26 +125,29 @@ class MemoryCache(ICacheStorage):
         self._hits = 0
         self._misses = 0
         self._evictions = 0
+        self._expirations = 0
         self._memory_usage = 0
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         async with self._lock:
-            current_time = time.time()
+            entry = self._cache.get(key)
             
             # Check if key exists and not expired
-            if key in self._cache:
-                if key in self._expiry_times and current_time > self._expiry_times[key]:
+            if entry is not None:
+                expiry_time = self._expiry_times.get(key)
+                if expiry_time is not None and time.time() > expiry_time:
                     # Expired
-                    await self._remove_key(key)
+                    self._remove_key(key)
+                    self._expirations += 1
                     self._misses += 1
                     return None
                 
-                # Update access time for LRU
-                self._access_times[key] = current_time
+                # Mark as most recently used
+                self._cache.move_to_end(key)
                 self._hits += 1
                 
-                return self._cache[key]['value']
+                return entry['value']
             
             self._misses += 1
             return None
@@ -80,9 +156,19 @@ class MemoryCache(ICacheStorage):
         self,
         key: str,
         value: Any,
-        ttl_seconds: Optional[int] = None
+        ttl_seconds: Optional[int] = None,
+        size_bytes: Optional[int] = None
     ) -> bool:
-        """Set value in cache with optional TTL."""
+        """
+        Set value in cache with optional TTL.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Time to live (default_ttl_seconds if None, no expiry if <= 0)
+            size_bytes: Known size of the value (e.g. its serialised length);
+                estimated with the configured size estimator if omitted
+        """
         async with self._lock:
             current_time = time.time()
             
@@ -90,35 +176,45 @@ class MemoryCache(ICacheStorage):
             ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
             expiry_time = current_time + ttl if ttl > 0 else None
             
-            # Serialize value to calculate size
-            try:
-                serialized = pickle.dumps(value)
-                value_size = len(serialized)
-            except Exception as e:
-                logger.error(f"Failed to serialize cache value for key {key}: {e}")
+            if size_bytes is None:
+                try:
+                    size_bytes = self._size_estimator(value)
+                except Exception as e:
+                    logger.error(f"Failed to size cache value for key {key}: {e}")
+                    return False
+            
+            # A value that cannot fit even in an empty cache is rejected
+            # without touching the entry it would replace
+            if self.max_size <= 0 or size_bytes > self.max_memory_bytes:
+                logger.warning(f"Cache full, cannot store key: {key}")
                 return False
             
-            # Check if we need to evict entries
+            # The new value will be stored, so a replaced key frees its old entry
+            self._remove_key(key)
+            
+            # Expired entries go before any live entry is evicted
+            if (len(self._cache) >= self.max_size or
+                    self._memory_usage + size_bytes > self.max_memory_bytes):
+                self._expire_due(current_time)
+            
+            # Evict until the new value fits (always reached by an empty cache)
             while (len(self._cache) >= self.max_size or 
-                   self._memory_usage + value_size > self.max_memory_bytes):
-                
-                if not await self._evict_lru():
-                    # Can't evict anymore, reject the new value
-                    logger.warning(f"Cache full, cannot store key: {key}")
-                    return False
+                   self._memory_usage + size_bytes > self.max_memory_bytes):
+                self._evict_lru()
             
             # Store the value
             self._cache[key] = {
                 'value': value,
-                'size': value_size,
+                'size': size_bytes,
                 'created_at': current_time
             }
-            self._access_times[key] = current_time
             
             if expiry_time:
                 self._expiry_times[key] = expiry_time
+                heapq.heappush(self._expiry_heap, (expiry_time, key))
+                self._compact_expiry_heap()
             
-            self._memory_usage += value_size
+            self._memory_usage += size_bytes
             
             return True
     
@@ -126,7 +222,7 @@ class MemoryCache(ICacheStorage):
         """Delete value from cache."""
         async with self._lock:
             if key in self._cache:
-                await self._remove_key(key)
+                self._remove_key(key)
                 return True
             return False
     
@@ -135,51 +231,64 @@ class MemoryCache(ICacheStorage):
         async with self._lock:
             count = len(self._cache)
             self._cache.clear()
-            self._access_times.clear()
             self._expiry_times.clear()
+            self._expiry_heap.clear()
             self._memory_usage = 0
             return count
     
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         async with self._lock:
-            current_time = time.time()
-            
             if key not in self._cache:
                 return False
             
             # Check if expired
-            if key in self._expiry_times and current_time > self._expiry_times[key]:
-                await self._remove_key(key)
+            expiry_time = self._expiry_times.get(key)
+            if expiry_time is not None and time.time() > expiry_time:
+                self._remove_key(key)
+                self._expirations += 1
                 return False
             
             return True
     
-    async def _remove_key(self, key: str):
+    def _remove_key(self, key: str):
         """Remove a key from cache and update statistics."""
-        if key in self._cache:
-            self._memory_usage -= self._cache[key]['size']
-            del self._cache[key]
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._memory_usage -= entry['size']
         
-        if key in self._access_times:
-            del self._access_times[key]
-        
-        if key in self._expiry_times:
-            del self._expiry_times[key]
+        # Its heap entry is left behind and skipped once it surfaces
+        self._expiry_times.pop(key, None)
     
-    async def _evict_lru(self) -> bool:
+    def _evict_lru(self) -> bool:
         """Evict least recently used item."""
-        if not self._access_times:
+        if not self._cache:
             return False
         
-        # Find LRU item
-        lru_key = min(self._access_times.keys(), key=lambda k: self._access_times[k])
-        
-        await self._remove_key(lru_key)
+        lru_key = next(iter(self._cache))
+        self._remove_key(lru_key)
         self._evictions += 1
         
         return True
     
+    def _expire_due(self, current_time: float) -> int:
+        """Remove entries whose expiry time has passed, earliest first."""
+        expired = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < current_time:
+            expiry_time, key = heapq.heappop(heap)
+            if self._expiry_times.get(key) == expiry_time:
+                self._remove_key(key)
+                expired += 1
+        self._expirations += expired
+        return expired
+    
+    def _compact_expiry_heap(self):
+        """Drop stale heap entries once they outnumber live ones."""
+        if len(self._expiry_heap) > 2 * len(self._expiry_times) + 64:
+            self._expiry_heap = [(expiry, key) for key, expiry in self._expiry_times.items()]
+            heapq.heapify(self._expiry_heap)
+    
     async def _cleanup_loop(self):
         """Background task to clean up expired entries."""
         while True:
@@ -194,14 +303,7 @@ class MemoryCache(ICacheStorage):
     async def _cleanup_expired(self):
         """Remove expired entries."""
         async with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, expiry in self._expiry_times.items()
-                if current_time > expiry
-            ]
-            
-            for key in expired_keys:
-                await self._remove_key(key)
+            self._expire_due(time.time())
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -215,7 +317,8 @@ class MemoryCache(ICacheStorage):
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": hit_rate,
-            "evictions": self._evictions
+            "evictions": self._evictions,
+            "expirations": self._expirations
         }
     
     async def close(self):
@@ -417,14 +520,15 @@ class TieredCache(ICacheStorage):
         self,
         key: str,
         value: Any,
-        ttl_seconds: Optional[int] = None
+        ttl_seconds: Optional[int] = None,
+        size_bytes: Optional[int] = None
     ) -> bool:
         """Set value in all caches."""
         success = False
         
         for i, cache in enumerate(self.caches):
             try:
-                if await cache.set(key, value, ttl_seconds):
+                if await _cache_set(cache, key, value, ttl_seconds, size_bytes):
                     success = True
             except Exception as e:
                 logger.warning(f"Failed to set in cache {i}: {e}")
@@ -468,6 +572,13 @@ class TieredCache(ICacheStorage):
         
         return False
     
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics of each tier that reports them."""
+        return {
+            "tiers": [cache.get_statistics() if hasattr(cache, 'get_statistics') else {}
+                      for cache in self.caches]
+        }
+    
     async def close(self):
         """Close all caches."""
         for cache in self.caches:
@@ -478,6 +589,19 @@ class TieredCache(ICacheStorage):
                 logger.warning(f"Failed to close cache: {e}")
 
 
+async def _cache_set(
+    cache: ICacheStorage,
+    key: str,
+    value: Any,
+    ttl_seconds: Optional[int],
+    size_bytes: Optional[int]
+) -> bool:
+    """Set a value, passing a known size to caches that accept one."""
+    if size_bytes is not None and isinstance(cache, (MemoryCache, TieredCache)):
+        return await cache.set(key, value, ttl_seconds, size_bytes=size_bytes)
+    return await cache.set(key, value, ttl_seconds)
+
+
 # Cache key generation utilities
 
 def make_character_key(character_id: int, version: Optional[int] = None) -> str:
@@ -541,20 +665,43 @@ class CacheManager:
         self.cache = cache
         self.default_ttl = default_ttl
         self._invalidation_patterns: Dict[str, Set[str]] = {}
+        
+        # Lookup counters per kind ("character", "query")
+        self._hits: Dict[str, int] = {"character": 0, "query": 0}
+        self._misses: Dict[str, int] = {"character": 0, "query": 0}
+    
+    async def _get(self, kind: str, key: str):
+        value = await self.cache.get(key)
+        if value is None:
+            self._misses[kind] += 1
+        else:
+            self._hits[kind] += 1
+        return value
     
     async def get_character(self, character_id: int, version: Optional[int] = None):
         """Get cached character data."""
         key = make_character_key(character_id, version)
-        return await self.cache.get(key)
+        return await self._get("character", key)
     
     async def set_character(
         self,
         character_id: int,
         data: Any,
         version: Optional[int] = None,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        size_bytes: Optional[int] = None
     ):
-        """Cache character data."""
+        """
+        Cache character data.
+        
+        Args:
+            character_id: Character ID
+            data: Character data to cache
+            version: Specific version (None = latest)
+            ttl: Time to live in seconds (default_ttl if None)
+            size_bytes: Known size of data, e.g. the length of the already
+                serialised snapshot, so the cache does not have to estimate it
+        """
         key = make_character_key(character_id, version)
         ttl = ttl or self.default_ttl
         
@@ -564,7 +711,7 @@ class CacheManager:
             self._invalidation_patterns[pattern] = set()
         self._invalidation_patterns[pattern].add(key)
         
-        return await self.cache.set(key, data, ttl)
+        return await _cache_set(self.cache, key, data, ttl, size_bytes)
     
     async def invalidate_character(self, character_id: int):
         """Invalidate all cached data for a character."""
@@ -579,7 +726,7 @@ class CacheManager:
     async def get_query_result(self, filter: 'QueryFilter'):
         """Get cached query result."""
         key = make_query_key(filter)
-        return await self.cache.get(key)
+        return await self._get("query", key)
     
     async def set_query_result(
         self,
@@ -604,4 +751,40 @@ class CacheManager:
         # For memory cache, we'd need to track query keys
         
         # Placeholder implementation
-        pass
\ No newline at end of file
+        pass
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Hit ratio and eviction counters for tuning cache size and TTLs.
+        
+        Returns:
+            Manager-level hits/misses/hit_ratio overall and per kind, plus
+            evictions, expirations and the backend's own statistics when
+            the backend reports them
+        """
+        hits = sum(self._hits.values())
+        misses = sum(self._misses.values())
+        stats = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "by_kind": {
+                kind: {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "hit_ratio": (self._hits[kind] / (self._hits[kind] + self._misses[kind])
+                                  if self._hits[kind] + self._misses[kind] else 0.0)
+                }
+                for kind in self._hits
+            },
+            "evictions": 0,
+            "expirations": 0
+        }
+        
+        backend_stats = self.cache.get_statistics() if hasattr(self.cache, 'get_statistics') else {}
+        for tier in backend_stats.get("tiers", [backend_stats]):
+            stats["evictions"] += tier.get("evictions", 0)
+            stats["expirations"] += tier.get("expirations", 0)
+        stats["backend"] = backend_stats
+        
+        return stats
@@ -217,12 +217,14 @@ class StorageFactory(IStorageFactory):
         default_ttl_seconds = config.get("default_ttl_seconds", 3600)
         cleanup_interval_seconds = config.get("cleanup_interval_seconds", 300)
         max_memory_mb = config.get("max_memory_mb", 100)
+        size_estimator = config.get("size_estimator", "estimate")
         
         return MemoryCache(
             max_size=max_size,
             default_ttl_seconds=default_ttl_seconds,
             cleanup_interval_seconds=cleanup_interval_seconds,
-            max_memory_mb=max_memory_mb
+            max_memory_mb=max_memory_mb,
+            size_estimator=size_estimator
         )
     
     def _create_redis_cache(self, config: Dict[str, Any]) -> RedisCache:
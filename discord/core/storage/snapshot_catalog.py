@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Persistent catalog of character snapshot files.
+
+Keeps, per character, the ordered list of snapshot files in a storage
+directory together with the latest snapshot's name, avatar URL and content
+hash, so notification checks and archiving can find the latest snapshots and
+character metadata without globbing the directory, stat-sorting every file or
+parsing full snapshots.
+
+Layout of {storage_dir}/.snapshot_catalog/catalog.json:
+    {
+      "version": 1,
+      "directory_mtime_ns": <storage_dir mtime after the last catalog write>,
+      "characters": {
+        "<character_id>": {
+          "snapshots": [{"file": ..., "mtime": ..., "hash": ...}, ...],  # oldest first
+          "name": ..., "avatar_url": ..., "decoration_avatar_url": ...,
+          "content_hash": <hash of the latest snapshot>
+        }
+      }
+    }
+
+The catalog is updated when snapshots are saved and archived, inside
+changing() blocks that validate the stamp before the directory is touched.
+It lives in its own subdirectory so rewriting it leaves the storage
+directory's mtime alone; if that mtime no longer matches the stamp (files
+copied or deleted by hand, another tool writing snapshots), the next lookup
+or update rebuilds the catalog from a one-off scan.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CATALOG_DIR = ".snapshot_catalog"
+CATALOG_FILE = "catalog.json"
+CATALOG_VERSION = 1
+
+_SNAPSHOT_PATTERN = re.compile(r"^character_(\d+)_.*\.json$")
+
+
+class SnapshotEntry(NamedTuple):
+    """One catalogued snapshot file."""
+    path: Path
+    mtime: float
+    content_hash: str
+
+
+def compute_content_hash(content: Union[str, bytes]) -> str:
+    """Hex SHA-256 digest of a snapshot file's content."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def extract_snapshot_metadata(character_data: Any) -> Dict[str, Optional[str]]:
+    """
+    Pull the fields notifications need out of a parsed snapshot.
+
+    Args:
+        character_data: Parsed snapshot JSON
+
+    Returns:
+        Dictionary with name, avatar_url (character_info) and
+        decoration_avatar_url (decorations/avatar fallbacks)
+    """
+    metadata = {'name': None, 'avatar_url': None, 'decoration_avatar_url': None}
+    if not isinstance(character_data, dict):
+        return metadata
+
+    character_info = character_data.get('character_info')
+    if isinstance(character_info, dict):
+        metadata['name'] = character_info.get('name')
+        metadata['avatar_url'] = character_info.get('avatarUrl') or character_info.get('avatar_url') or None
+
+    decorations = character_data.get('decorations')
+    avatar = character_data.get('avatar')
+    if isinstance(decorations, dict) and isinstance(decorations.get('avatar'), dict):
+        metadata['decoration_avatar_url'] = decorations['avatar'].get('avatarUrl')
+    elif isinstance(avatar, str):
+        metadata['decoration_avatar_url'] = avatar
+    elif isinstance(avatar, dict):
+        metadata['decoration_avatar_url'] = avatar.get('avatarUrl')
+
+    return metadata
+
+
+class SnapshotCatalog:
+    """
+    Thread-safe snapshot catalog for one storage directory.
+
+    Use get_snapshot_catalog() so every component in a process shares the
+    same instance (and lock) for a directory.
+    """
+
+    def __init__(self, storage_dir: Path):
+        self.storage_dir = Path(storage_dir)
+        self.catalog_path = self.storage_dir / CATALOG_DIR / CATALOG_FILE
+        self._lock = threading.RLock()
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._catalog_mtime_ns: Optional[int] = None
+        # Depth of changing() blocks held by the thread owning the lock
+        self._changing = 0
+
+    @contextlib.contextmanager
+    def changing(self) -> Iterator['SnapshotCatalog']:
+        """
+        Hold the catalog while the caller writes, renames or deletes snapshots.
+
+        The directory stamp is validated (rescanning if anything changed
+        outside the catalog) before the caller touches the directory, so
+        record_snapshot() and remove_snapshots() inside the block only accept
+        the caller's own change. Called outside a block, they validate the
+        stamp themselves and rescan when the directory has changed.
+        """
+        with self._lock:
+            self._load()
+            self._changing += 1
+            try:
+                yield self
+            finally:
+                self._changing -= 1
+
+    def record_snapshot(self, character_id: Union[int, str], snapshot_path: Path,
+                        content: Optional[Union[str, bytes]] = None,
+                        character_data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add a newly written snapshot as the character's latest.
+
+        Args:
+            character_id: Character the snapshot belongs to
+            snapshot_path: Path of the written snapshot file
+            content: Serialised file content, hashed instead of re-reading the file
+            character_data: Parsed snapshot, used for name and avatar instead of re-reading
+        """
+        snapshot_path = Path(snapshot_path)
+        with self._lock:
+            try:
+                # Inside changing() the stamp was validated before the new file was written
+                characters = self._load(check_directory=not self._changing)['characters']
+                record = characters.setdefault(str(character_id), {'snapshots': []})
+                if content is None:
+                    content = snapshot_path.read_bytes()
+                if character_data is None:
+                    character_data = json.loads(content)
+
+                content_hash = compute_content_hash(content)
+                record['snapshots'] = [item for item in record['snapshots'] if item['file'] != snapshot_path.name]
+                record['snapshots'].append({
+                    'file': snapshot_path.name,
+                    'mtime': snapshot_path.stat().st_mtime,
+                    'hash': content_hash
+                })
+                record.update(extract_snapshot_metadata(character_data))
+                record['content_hash'] = content_hash
+                self._write()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to catalog snapshot {snapshot_path.name}: {e}")
+
+    def remove_snapshots(self, character_id: Union[int, str], snapshot_paths: Iterable[Path]) -> None:
+        """Drop archived or deleted snapshots from a character's list."""
+        names = {Path(path).name for path in snapshot_paths}
+        if not names:
+            return
+        with self._lock:
+            record = self._load(check_directory=not self._changing)['characters'].get(str(character_id))
+            if not record:
+                return
+            record['snapshots'] = [item for item in record['snapshots'] if item['file'] not in names]
+            if not record['snapshots']:
+                del self._catalog['characters'][str(character_id)]
+            self._save()
+
+    def get_snapshots(self, character_id: Union[int, str]) -> List[SnapshotEntry]:
+        """All snapshots of a character, oldest first."""
+        with self._lock:
+            record = self._load()['characters'].get(str(character_id))
+            if not record:
+                return []
+            return [SnapshotEntry(self.storage_dir / item['file'], item['mtime'], item['hash'])
+                    for item in record['snapshots']]
+
+    def latest_snapshots(self, character_id: Union[int, str], count: int = 2) -> List[SnapshotEntry]:
+        """The character's most recent snapshots, oldest first."""
+        return self.get_snapshots(character_id)[-count:]
+
+    def get_metadata(self, character_id: Union[int, str]) -> Dict[str, Optional[str]]:
+        """Name, avatar URLs and content hash of the character's latest snapshot."""
+        with self._lock:
+            record = self._load()['characters'].get(str(character_id))
+            if not record:
+                return {}
+            return {key: value for key, value in record.items() if key != 'snapshots'}
+
+    def rebuild(self) -> None:
+        """Rebuild the catalog from a scan of the storage directory."""
+        with self._lock:
+            if not self.storage_dir.exists():
+                self._catalog = {'version': CATALOG_VERSION, 'directory_mtime_ns': None, 'characters': {}}
+                return
+
+            grouped: Dict[str, List[Path]] = {}
+            for path in self.storage_dir.glob("character_*.json"):
+                match = _SNAPSHOT_PATTERN.match(path.name)
+                if match:
+                    grouped.setdefault(match.group(1), []).append(path)
+
+            characters = {}
+            for character_id, paths in grouped.items():
+                record = self._scan_character(paths)
+                if record:
+                    characters[character_id] = record
+
+            self._catalog = {'version': CATALOG_VERSION, 'directory_mtime_ns': None, 'characters': characters}
+            logger.debug(f"Rebuilt snapshot catalog for {len(characters)} characters in {self.storage_dir}")
+            self._save()
+
+    def _scan_character(self, paths: List[Path]) -> Optional[Dict[str, Any]]:
+        """Catalog record for one character's files; only the latest file is parsed."""
+        snapshots = []
+        for path in paths:
+            try:
+                snapshots.append({
+                    'file': path.name,
+                    'mtime': path.stat().st_mtime,
+                    'hash': compute_content_hash(path.read_bytes())
+                })
+            except OSError as e:
+                logger.debug(f"Skipping unreadable snapshot {path.name}: {e}")
+        if not snapshots:
+            return None
+        snapshots.sort(key=lambda item: item['mtime'])
+
+        record = {'snapshots': snapshots}
+        try:
+            with open(self.storage_dir / snapshots[-1]['file'], 'r', encoding='utf-8') as f:
+                record.update(extract_snapshot_metadata(json.load(f)))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read metadata from {snapshots[-1]['file']}: {e}")
+            record.update(extract_snapshot_metadata(None))
+        record['content_hash'] = snapshots[-1]['hash']
+        return record
+
+    def _load(self, check_directory: bool = True) -> Dict[str, Any]:
+        """
+        Current catalog, reloading it if another process rewrote the file and
+        rebuilding it if the directory changed without a catalog update.
+
+        Args:
+            check_directory: Compare the directory mtime with the stamp; only
+                skipped inside changing(), where it was checked before the change
+        """
+        try:
+            catalog_mtime_ns = self.catalog_path.stat().st_mtime_ns
+        except OSError:
+            catalog_mtime_ns = None
+
+        if self._catalog is None or catalog_mtime_ns != self._catalog_mtime_ns:
+            self._catalog = None
+            if catalog_mtime_ns is not None:
+                try:
+                    with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                        catalog = json.load(f)
+                    if catalog.get('version') == CATALOG_VERSION:
+                        self._catalog = catalog
+                        self._catalog_mtime_ns = catalog_mtime_ns
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable snapshot catalog {self.catalog_path}: {e}")
+
+        if self._catalog is None or (check_directory and
+                                     self._directory_mtime_ns() != self._catalog.get('directory_mtime_ns')):
+            self.rebuild()
+        return self._catalog
+
+    def _directory_mtime_ns(self) -> Optional[int]:
+        try:
+            return self.storage_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _save(self) -> None:
+        try:
+            self._write()
+        except OSError as e:
+            logger.warning(f"Failed to persist snapshot catalog {self.catalog_path}: {e}")
+
+    def _write(self) -> None:
+        """Atomically rewrite the catalog file, stamped with the storage directory mtime."""
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        self._catalog['directory_mtime_ns'] = self._directory_mtime_ns()
+        tmp_path = self.catalog_path.with_suffix(self.catalog_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._catalog, f, indent=2)
+        os.replace(tmp_path, self.catalog_path)
+        self._catalog_mtime_ns = self.catalog_path.stat().st_mtime_ns
+
+
+_catalogs: Dict[str, SnapshotCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_snapshot_catalog(storage_dir: Path) -> SnapshotCatalog:
+    """Get the process-wide catalog for a storage directory."""
+    key = str(Path(storage_dir).resolve())
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = SnapshotCatalog(Path(key))
+        return _catalogs[key]
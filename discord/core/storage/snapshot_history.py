@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Delta-encoded character snapshot history.
+
+Archived snapshots are stored per character as periodic full keyframes plus
+JSON Patch (RFC 6902) deltas between consecutive versions, instead of whole
+pretty-printed files. Any version can be read back by replaying deltas from
+the nearest earlier keyframe.
+
+Layout of {storage_dir}/history/character_{id}.jsonl, one version per line:
+    <header JSON>\t<payload JSON>
+where the header is {"version", "kind", "timestamp", "file", "hash"} and the
+payload is the full snapshot for kind "keyframe" or the patch from the
+previous version for kind "delta". Headers are parsed on their own, so
+listing versions never parses snapshot data.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = "history"
+DEFAULT_KEYFRAME_INTERVAL = 20
+
+
+def _escape_token(token: str) -> str:
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape_token(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def json_equal(old: Any, new: Any) -> bool:
+    """
+    Type-strict JSON equality.
+
+    Unlike ==, 1, 1.0 and True are different values, at any depth, so a
+    change between them is never dropped from a patch.
+    """
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(json_equal(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(json_equal(a, b) for a, b in zip(old, new))
+    return old == new
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    JSON Patch turning old into new.
+
+    Objects are diffed key by key and lists element by element after
+    trimming their common prefix and suffix, so an inserted or removed item
+    costs one operation rather than shifting the rest of the list.
+
+    Args:
+        old: Previous JSON value
+        new: Next JSON value
+        path: JSON Pointer of the values being compared
+
+    Returns:
+        List of add/remove/replace operations
+    """
+    if type(old) is not type(new):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape_token(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape_token(key)}"
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        prefix = 0
+        while prefix < len(old) and prefix < len(new) and json_equal(old[prefix], new[prefix]):
+            prefix += 1
+        suffix = 0
+        while (suffix < len(old) - prefix and suffix < len(new) - prefix
+               and json_equal(old[-1 - suffix], new[-1 - suffix])):
+            suffix += 1
+
+        old_middle = len(old) - prefix - suffix
+        new_middle = len(new) - prefix - suffix
+        common = min(old_middle, new_middle)
+
+        ops = []
+        for index in range(prefix, prefix + common):
+            ops.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+        for index in range(prefix + common, prefix + new_middle):
+            ops.append({'op': 'add', 'path': f"{path}/{index}", 'value': new[index]})
+        for _ in range(old_middle - common):
+            ops.append({'op': 'remove', 'path': f"{path}/{prefix + common}"})
+        return ops
+
+    if old != new:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    return []
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    Apply a JSON Patch from make_patch.
+
+    The document is modified in place; the result is returned because a
+    root-level replace swaps the whole document.
+    """
+    for op in patch:
+        tokens = [_unescape_token(token) for token in op['path'].split('/')[1:]]
+        if not tokens:
+            if op['op'] in ('add', 'replace'):
+                document = op['value']
+            continue
+
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        key = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == '-' else int(key)
+            if op['op'] == 'add':
+                parent.insert(index, op['value'])
+            elif op['op'] == 'remove':
+                del parent[index]
+            elif op['op'] == 'replace':
+                parent[index] = op['value']
+            else:
+                raise ValueError(f"Unsupported patch operation: {op['op']}")
+        else:
+            if op['op'] in ('add', 'replace'):
+                parent[key] = op['value']
+            elif op['op'] == 'remove':
+                del parent[key]
+            else:
+                raise ValueError(f"Unsupported patch operation: {op['op']}")
+    return document
+
+
+class HistoryVersion(NamedTuple):
+    """Header and file location of one stored version."""
+    version: int
+    kind: str  # 'keyframe' or 'delta'
+    timestamp: float
+    file: Optional[str]
+    content_hash: Optional[str]
+    offset: int
+    length: int
+
+
+class SnapshotHistory:
+    """
+    Thread-safe delta history for the characters of one storage directory.
+
+    Use get_snapshot_history() so every component in a process shares the
+    same instance (and lock) for a directory.
+
+    Args:
+        storage_dir: Snapshot storage directory (history lives in its history/ subfolder)
+        keyframe_interval: Store a full keyframe at least every this many versions
+    """
+
+    def __init__(self, storage_dir: Path, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        self.storage_dir = Path(storage_dir)
+        self.history_dir = self.storage_dir / HISTORY_DIR
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._lock = threading.RLock()
+        # character_id -> (file size when scanned, versions)
+        self._versions: Dict[str, tuple] = {}
+        # character_id -> (version, data) of the newest version, to diff the next append against
+        self._latest: Dict[str, tuple] = {}
+
+    def history_path(self, character_id: Union[int, str]) -> Path:
+        """History file of a character."""
+        return self.history_dir / f"character_{character_id}.jsonl"
+
+    def append(self, character_id: Union[int, str], character_data: Dict[str, Any],
+               timestamp: float, file: Optional[str] = None,
+               content_hash: Optional[str] = None) -> HistoryVersion:
+        """
+        Store a snapshot as the character's next version.
+
+        Args:
+            character_id: Character the snapshot belongs to
+            character_data: Parsed snapshot
+            timestamp: Snapshot time (file mtime)
+            file: Original snapshot filename
+            content_hash: Hash of the original file content
+
+        Returns:
+            The stored version
+        """
+        key = str(character_id)
+        with self._lock:
+            versions = self._load_versions(key)
+            path = self.history_path(key)
+            version = versions[-1].version + 1 if versions else 1
+
+            full_payload = json.dumps(character_data, ensure_ascii=False, separators=(',', ':'))
+            kind, payload = 'keyframe', full_payload
+            if versions and self._since_keyframe(versions) < self.keyframe_interval:
+                patch = make_patch(self._latest_data(key, versions), character_data)
+                delta_payload = json.dumps(patch, ensure_ascii=False, separators=(',', ':'))
+                if len(delta_payload) < len(full_payload):
+                    kind, payload = 'delta', delta_payload
+
+            header = json.dumps({
+                'version': version, 'kind': kind, 'timestamp': timestamp,
+                'file': file, 'hash': content_hash
+            }, ensure_ascii=False, separators=(',', ':'))
+            line = f"{header}\t{payload}\n".encode('utf-8')
+
+            self.history_dir.mkdir(parents=True, exist_ok=True)
+            offset = versions[-1].offset + versions[-1].length if versions else 0
+            with open(path, 'ab') as f:
+                # Drop a torn line left by an interrupted write
+                if f.tell() != offset:
+                    f.truncate(offset)
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = HistoryVersion(version, kind, timestamp, file, content_hash, offset, len(line))
+            versions.append(entry)
+            self._versions[key] = (offset + len(line), versions)
+            self._latest[key] = (version, json.loads(full_payload))
+            return entry
+
+    def list_versions(self, character_id: Union[int, str]) -> List[HistoryVersion]:
+        """All stored versions of a character, oldest first."""
+        with self._lock:
+            return list(self._load_versions(str(character_id)))
+
+    def load_version(self, character_id: Union[int, str], version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reconstruct one version by replaying deltas from the nearest keyframe.
+
+        Args:
+            character_id: Character to read
+            version: Version number (default: newest)
+
+        Returns:
+            Snapshot data, or None if the version does not exist
+        """
+        key = str(character_id)
+        with self._lock:
+            versions = self._load_versions(key)
+            if not versions:
+                return None
+            if version is None:
+                version = versions[-1].version
+            position = self._position(versions, version)
+            if position is None:
+                return None
+            return self._reconstruct(key, versions, position)
+
+    def load_file(self, character_id: Union[int, str], file: str) -> Optional[Dict[str, Any]]:
+        """Reconstruct the version archived from a given snapshot filename."""
+        for entry in reversed(self.list_versions(character_id)):
+            if entry.file == file:
+                return self.load_version(character_id, entry.version)
+        return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Version, keyframe and byte counts across all characters."""
+        stats = {'characters': 0, 'versions': 0, 'keyframes': 0, 'bytes': 0}
+        if not self.history_dir.exists():
+            return stats
+        for path in self.history_dir.glob("character_*.jsonl"):
+            versions = self.list_versions(path.stem[len("character_"):])
+            stats['characters'] += 1
+            stats['versions'] += len(versions)
+            stats['keyframes'] += sum(1 for entry in versions if entry.kind == 'keyframe')
+            stats['bytes'] += path.stat().st_size
+        return stats
+
+    @staticmethod
+    def _position(versions: List[HistoryVersion], version: int) -> Optional[int]:
+        # Versions are consecutive from 1 unless a torn or corrupt line was skipped
+        position = version - versions[0].version
+        if 0 <= position < len(versions) and versions[position].version == version:
+            return position
+        for position, entry in enumerate(versions):
+            if entry.version == version:
+                return position
+        return None
+
+    def _since_keyframe(self, versions: List[HistoryVersion]) -> int:
+        """Versions stored since (and including) the newest keyframe."""
+        count = 0
+        for entry in reversed(versions):
+            count += 1
+            if entry.kind == 'keyframe':
+                break
+        return count
+
+    def _latest_data(self, key: str, versions: List[HistoryVersion]) -> Dict[str, Any]:
+        cached = self._latest.get(key)
+        if cached and cached[0] == versions[-1].version:
+            return cached[1]
+        return self._reconstruct(key, versions, len(versions) - 1)
+
+    def _reconstruct(self, key: str, versions: List[HistoryVersion], position: int) -> Dict[str, Any]:
+        start = position
+        while versions[start].kind != 'keyframe':
+            start -= 1
+            if start < 0:
+                raise ValueError(f"No keyframe before version {versions[position].version} of character {key}")
+
+        document = None
+        with open(self.history_path(key), 'rb') as f:
+            f.seek(versions[start].offset)
+            for entry in versions[start:position + 1]:
+                if f.tell() != entry.offset:
+                    f.seek(entry.offset)
+                _, payload = f.read(entry.length).split(b'\t', 1)
+                value = json.loads(payload)
+                document = value if entry.kind == 'keyframe' else apply_patch(document, value)
+        return document
+
+    def _load_versions(self, key: str) -> List[HistoryVersion]:
+        """Version headers of a character, rescanned if the file changed size."""
+        path = self.history_path(key)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            self._versions.pop(key, None)
+            return []
+
+        cached = self._versions.get(key)
+        if cached and cached[0] == size:
+            return cached[1]
+
+        versions = []
+        offset = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    logger.warning(f"Ignoring incomplete last line in {path.name}")
+                    break
+                try:
+                    header = json.loads(line.split(b'\t', 1)[0])
+                    versions.append(HistoryVersion(
+                        header['version'], header['kind'], header['timestamp'],
+                        header.get('file'), header.get('hash'), offset, len(line)
+                    ))
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Skipping corrupt history line at byte {offset} of {path.name}: {e}")
+                offset += len(line)
+
+        self._versions[key] = (size, versions)
+        return versions
+
+
+_histories: Dict[str, SnapshotHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_snapshot_history(storage_dir: Path, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> SnapshotHistory:
+    """Get the process-wide history for a storage directory."""
+    key = str(Path(storage_dir).resolve())
+    with _histories_lock:
+        if key not in _histories:
+            _histories[key] = SnapshotHistory(Path(key), keyframe_interval)
+        _histories[key].keyframe_interval = max(1, keyframe_interval)
+        return _histories[key]
@@ -16,8 +16,10 @@ import os
 from pathlib import Path
 from typing import List, Optional, Set, Tuple, Dict, Any
 from datetime import datetime, timedelta
+import time
 import yaml
 import functools
+from concurrent.futures import ThreadPoolExecutor
 
 # Force all print statements to flush immediately for subprocess compatibility
 print = functools.partial(print, flush=True)
@@ -104,8 +106,15 @@ from services.configuration_validator import ConfigurationValidator, SecurityLev
 from services.discord_logger import DiscordLogger, OperationType, LogLevel, log_configuration_event
 
 from scraper.enhanced_dnd_scraper import EnhancedDnDScraper
+from scraper.core.calculators.character_calculator import CharacterCalculator
+from scraper.core.clients.rate_limiter import get_shared_rate_limiter
+from scraper.core.clients.async_dndbeyond_client import AsyncDNDBeyondClient
 from shared.config.manager import get_config_manager
 from discord.core.storage.archiving import SnapshotArchiver
+from discord.core.models.change_log import ChangeLogConfig
+from discord.core.services.change_log_service import ChangeLogService
+from discord.core.services.change_log_query_interface import ChangeLogQueryInterface
+from discord.formatters.discord_formatter import DiscordFormatter
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +140,14 @@ class DiscordMonitor:
         self.running = False
         self.character_ids = []
         self.archiver = None
+        self.max_concurrent_scrapes = 1
+        self.rate_limiter = None
+        self._scrape_executor = None
+        self._scrape_semaphore = None
+        self.api_client = None
+        self.calculator = None
+        self.skip_unchanged_characters = True
+        self._unchanged_character_ids: Set[int] = set()
         self.use_party_mode = use_party_mode
         self.character_id_override = character_id_override
         
@@ -346,6 +363,30 @@ class DiscordMonitor:
         # Initialize archiver
         self.archiver = SnapshotArchiver()
         
+        # Concurrent scrape engine: bounded worker pool plus a shared token-bucket
+        # rate limiter so parallel scrapes still respect D&D Beyond limits
+        self.max_concurrent_scrapes = max(1, int(self.config.get('max_concurrent_scrapes', 4)))
+        if self._scrape_executor is None:
+            self._scrape_executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_scrapes,
+                thread_name_prefix='scrape'
+            )
+        self._scrape_semaphore = asyncio.Semaphore(self.max_concurrent_scrapes)
+        self.rate_limiter = get_shared_rate_limiter(self.config_manager)
+        self.skip_unchanged_characters = bool(self.config.get('skip_unchanged_characters', True))
+        if self.api_client is None:
+            self.api_client = AsyncDNDBeyondClient(
+                rate_limiter=self.rate_limiter,
+                max_connections=self.max_concurrent_scrapes
+            )
+        if self.calculator is None:
+            # One calculator stack shared by every scrape; its pipeline is reentrant
+            self.calculator = await asyncio.get_running_loop().run_in_executor(
+                self._scrape_executor, CharacterCalculator
+            )
+            # Per-calculator result caches would serve stale results across scrapes
+            self.calculator.disable_result_caching()
+        
         # Set up notification configuration
         notification_config = self._create_notification_config()
         self.notification_manager = NotificationManager(
@@ -544,44 +585,93 @@ class DiscordMonitor:
         """
         Scrape a character and store the data.
         
+        The API fetch is awaited on the shared pooled async client, while the
+        blocking calculate/save work runs on the scrape worker pool. Both are
+        bounded by the concurrency semaphore, so the event loop stays responsive
+        and several characters can be in flight at once.
+        
         Args:
             character_id: Character ID to scrape
             
         Returns:
             True if successful, False otherwise
         """
-        try:
-            logger.info(f"Scraping character {character_id}")
-            
-            # Create scraper for this character with discord_output enabled
-            scraper = EnhancedDnDScraper(
-                character_id=str(character_id), 
-                session_cookie=self.session_cookie,
-                discord_output=True  # Always save to discord directory
-            )
-            
-            # Check rate limiting before API call
-            scraper._check_rate_limit()
-            
-            # Fetch character data
-            if not scraper.fetch_character_data():
-                logger.warning(f"Failed to fetch data for character {character_id}")
+        async with self._scrape_semaphore:
+            try:
+                logger.info(f"Scraping character {character_id}")
+                loop = asyncio.get_running_loop()
+                
+                # Create scraper for this character with discord_output enabled
+                scraper = await loop.run_in_executor(
+                    self._scrape_executor,
+                    functools.partial(
+                        EnhancedDnDScraper,
+                        character_id=str(character_id),
+                        discord_output=True,  # Always save to discord directory
+                        skip_unchanged=self.skip_unchanged_characters,
+                        calculator=self.calculator
+                    )
+                )
+                
+                # Fetch character data over the shared connection pool. The shared
+                # rate limiter paces API requests across all concurrent scrapes,
+                # replacing the per-process .last_scrape file check.
+                if not await scraper.fetch_character_data_async(self.api_client):
+                    logger.warning(f"Failed to fetch data for character {character_id}")
+                    return False
+                
+                return await loop.run_in_executor(
+                    self._scrape_executor, self._store_scraped_character, scraper, character_id
+                )
+                
+            except Exception as e:
+                logger.error(f"Error scraping character {character_id}: {e}")
                 return False
-            
-            # Save character data - this will automatically save to discord directory
-            output_path = scraper.save_character_data()
-            logger.info(f"Character data saved via scraper to: {output_path}")
-            
-            # Archive old snapshots and clean up scraper files per retention config
-            self.archiver.archive_old_snapshots(character_id, self.storage_dir)
-            self.archiver.cleanup_scraper_files(character_id, project_root)
-            
-            logger.info(f"Successfully scraped and stored character {character_id}")
+    
+    def _store_scraped_character(self, scraper: EnhancedDnDScraper, character_id: int) -> bool:
+        """Calculate, save and archive a fetched character (runs on a worker thread)."""
+        # Save character data - this will automatically save to discord directory
+        output_path = scraper.save_character_data()
+        if scraper.last_save_skipped:
+            self._unchanged_character_ids.add(character_id)
             return True
-            
-        except Exception as e:
-            logger.error(f"Error scraping character {character_id}: {e}")
-            return False
+        logger.info(f"Character data saved via scraper to: {output_path}")
+        
+        # Archive old snapshots and clean up scraper files per retention config
+        self.archiver.archive_old_snapshots(character_id, self.storage_dir)
+        self.archiver.cleanup_scraper_files(character_id, project_root)
+        
+        logger.info(f"Successfully scraped and stored character {character_id}")
+        return True
+    
+    async def scrape_all_characters(self) -> int:
+        """
+        Scrape every monitored character concurrently.
+        
+        Returns:
+            Number of characters scraped successfully
+        """
+        start_time = time.monotonic()
+        self._unchanged_character_ids = set()
+        scrape_tasks = [
+            self.scrape_character(char_id) for char_id in self.character_ids
+        ]
+        scrape_results = await asyncio.gather(*scrape_tasks, return_exceptions=True)
+        
+        successful_scrapes = sum(1 for result in scrape_results if result is True)
+        logger.info(
+            f"Scraped {successful_scrapes}/{len(self.character_ids)} characters successfully "
+            f"({len(self._unchanged_character_ids)} unchanged) in {time.monotonic() - start_time:.1f}s "
+            f"(concurrency {self.max_concurrent_scrapes})"
+        )
+        return successful_scrapes
+    
+    def _get_changed_character_ids(self) -> List[int]:
+        """Characters whose last scrape wrote a new snapshot and need change detection."""
+        return [
+            char_id for char_id in self.character_ids
+            if char_id not in self._unchanged_character_ids
+        ]
     
     
     async def monitor_loop(self):
@@ -598,23 +688,21 @@ class DiscordMonitor:
                 logger.debug(f"Checking {len(self.character_ids)} characters for updates")
                 
                 # Scrape all characters
-                scrape_tasks = [
-                    self.scrape_character(char_id) for char_id in self.character_ids
-                ]
-                scrape_results = await asyncio.gather(*scrape_tasks, return_exceptions=True)
-                
-                successful_scrapes = sum(1 for result in scrape_results if result is True)
-                logger.info(f"Scraped {successful_scrapes}/{len(self.character_ids)} characters successfully")
+                await self.scrape_all_characters()
                 
-                # Check for changes and send notifications
-                if len(self.character_ids) == 1:
+                # Check for changes and send notifications (unchanged characters
+                # wrote no new snapshot, so there is nothing to compare for them)
+                changed_ids = self._get_changed_character_ids()
+                if not changed_ids:
+                    logger.info("No character data changed since last check")
+                elif len(self.character_ids) == 1:
                     await self.notification_manager.check_and_notify_character_changes(
-                        self.character_ids[0],
+                        changed_ids[0],
                         min_change_interval
                     )
                 else:
                     await self.notification_manager.check_and_notify_multiple_characters(
-                        self.character_ids,
+                        changed_ids,
                         min_change_interval
                     )
                 
@@ -675,9 +763,24 @@ class DiscordMonitor:
         else:
             logger.warning("No notification manager available for shutdown notification")
         
+        await self._close_scrape_engine()
+        
         logger.info("Discord monitor stopped")
         self._shutdown_sent = True
     
+    async def _close_scrape_engine(self):
+        """Release the pooled API client and scrape worker threads."""
+        if self.api_client is not None:
+            await self.api_client.close()
+            self.api_client = None
+        
+        if self._scrape_executor is not None:
+            self._scrape_executor.shutdown(wait=False, cancel_futures=True)
+            self._scrape_executor = None
+        
+        if self.calculator is not None:
+            self.calculator.calculation_pipeline.shutdown()
+    
     async def run_once(self, skip_scraping=False):
         """Run a single check for changes and send notifications if any."""
         await self.initialize(skip_webhook_test=True)  # Skip webhook test during normal runs
@@ -688,14 +791,10 @@ class DiscordMonitor:
             logger.info("Running one-shot character change check...")
             
             # Scrape all characters
-            scrape_tasks = [
-                self.scrape_character(char_id) for char_id in self.character_ids
-            ]
-            scrape_results = await asyncio.gather(*scrape_tasks, return_exceptions=True)
-            
-            # Log scrape results
-            successful_scrapes = sum(1 for result in scrape_results if result is True)
-            logger.info(f"Scraped {successful_scrapes}/{len(self.character_ids)} characters successfully")
+            try:
+                successful_scrapes = await self.scrape_all_characters()
+            finally:
+                await self._close_scrape_engine()
             
             if successful_scrapes == 0:
                 logger.error("No characters could be scraped successfully")
@@ -705,10 +804,15 @@ class DiscordMonitor:
         notifications_sent = 0
         min_change_interval = timedelta(minutes=0)  # No minimum interval for one-shot
         
+        check_ids = self.character_ids if skip_scraping else self._get_changed_character_ids()
+        if not check_ids:
+            logger.info("No character data changed since last scrape")
+            return True
+        
         if len(self.character_ids) == 1:
             if skip_scraping:
                 result = await self.notification_manager.check_and_notify_character_changes(
-                    self.character_ids[0],
+                    check_ids[0],
                     min_change_interval,
                     return_message_content=True
                 )
@@ -727,14 +831,14 @@ class DiscordMonitor:
                             print("=====================================\n")
             else:
                 success = await self.notification_manager.check_and_notify_character_changes(
-                    self.character_ids[0],
+                    check_ids[0],
                     min_change_interval
                 )
                 if success:
                     notifications_sent += 1
         else:
             results = await self.notification_manager.check_and_notify_multiple_characters(
-                self.character_ids,
+                check_ids,
                 min_change_interval
             )
             notifications_sent = sum(1 for success in results.values() if success)
@@ -963,6 +1067,53 @@ class DiscordMonitor:
         
         return passed == total
     
+    async def search_change_logs(self, query: str, limit: int = 10, post: bool = False) -> bool:
+        """
+        Search the change logs of the configured characters and print the ranked results.
+        
+        Args:
+            query: Search query (terms, prefix* and "phrases")
+            limit: Maximum results per character
+            post: Also post the results to Discord
+            
+        Returns:
+            True if any change matched
+        """
+        if self.character_id_override:
+            character_ids = [int(self.character_id_override)]
+        elif self.use_party_mode:
+            character_ids = [int(char['character_id']) for char in self.config.get('party') or []]
+        elif 'character_id' in self.config:
+            character_ids = [int(self.config['character_id'])]
+        else:
+            character_ids = [int(char['character_id']) for char in self.config.get('characters', [])]
+        
+        query_interface = ChangeLogQueryInterface(ChangeLogService(ChangeLogConfig.from_yaml()))
+        formatter = DiscordFormatter(self.config)
+        messages = []
+        found = False
+        
+        for character_id in character_ids:
+            entries = await query_interface.search_changes(character_id, query, limit=limit)
+            character_name = entries[0].character_name if entries else str(character_id)
+            logger.info(f"Change log search for {character_name} ({character_id}): {len(entries)} match(es) for '{query}'")
+            for entry in entries:
+                logger.info(f"  {entry.timestamp.strftime('%Y-%m-%d %H:%M')} [{entry.priority.name}] {entry.description} ({entry.field_path})")
+            if entries:
+                found = True
+                messages.append(formatter.format_change_log_search(character_name, query, entries, max_results=limit))
+        
+        if post and messages:
+            notification_config = self._create_notification_config()
+            async with DiscordService(
+                webhook_url=notification_config.webhook_url,
+                username=notification_config.username
+            ) as discord:
+                for message in messages:
+                    await discord.send_message(message)
+        
+        return found
+    
     def show_logging_stats(self):
         """Display comprehensive logging and error statistics."""
         logger.info("Discord Logging Statistics")
@@ -1119,6 +1270,22 @@ async def main():
         action='store_true',
         help='Show logging and error statistics'
     )
+    parser.add_argument(
+        '--search-changes',
+        metavar='QUERY',
+        help='Search change logs (terms, prefix*, "phrases") and exit'
+    )
+    parser.add_argument(
+        '--search-limit',
+        type=int,
+        default=10,
+        help='Maximum search results per character (default: 10)'
+    )
+    parser.add_argument(
+        '--search-post',
+        action='store_true',
+        help='Also post --search-changes results to Discord'
+    )
 
     
     args = parser.parse_args()
@@ -1180,6 +1347,11 @@ async def main():
             monitor.show_logging_stats()
             sys.exit(0)
         
+        if args.search_changes:
+            # Change log search mode
+            found = await monitor.search_change_logs(args.search_changes, args.search_limit, args.search_post)
+            sys.exit(0 if found else 1)
+        
 
         
         if args.check_only:
@@ -13,6 +13,7 @@ from datetime import datetime
 
 # Use consolidated enhanced change detection system
 from discord.services.change_detection.models import CharacterChangeSet
+from discord.core.models.change_log import ChangeLogEntry
 from shared.models.change_detection import FieldChange, ChangeType, ChangePriority
 from discord.services.discord_service import (
     DiscordEmbed, DiscordMessage, EmbedColor,
@@ -999,4 +1000,42 @@ class DiscordFormatter:
         embed.fields = fields
         embed.footer = {'text': f"Individual character updates will follow"}
         
-        return DiscordMessage(embeds=[embed])
\ No newline at end of file
+        return DiscordMessage(embeds=[embed])
+    
+    def format_change_log_search(
+        self,
+        character_name: str,
+        query: str,
+        entries: List[ChangeLogEntry],
+        max_results: int = 10
+    ) -> DiscordMessage:
+        """
+        Format change log search results (best match first) into a Discord message.
+        
+        Args:
+            character_name: Character whose log was searched
+            query: Search query as entered
+            entries: Matching change log entries, ranked
+            max_results: Maximum entries to list
+            
+        Returns:
+            Discord message with one line per result
+        """
+        shown = entries[:max_results]
+        lines = []
+        for entry in shown:
+            emoji = self.priority_emojis.get(entry.priority, "⚪")
+            description = entry.description or entry.field_path
+            if len(description) > 150:
+                description = description[:147] + "..."
+            lines.append(f"{emoji} `{entry.timestamp.strftime('%Y-%m-%d')}` {description}")
+        
+        embed = DiscordEmbed(
+            title=f"🔎 {character_name}: \"{query}\"",
+            description="\n".join(lines) if lines else "No matching changes found.",
+            color=EmbedColor.INFO.value,
+            timestamp=datetime.utcnow().isoformat(),
+            footer={'text': f"Showing {len(shown)} of {len(entries)} matches"}
+        )
+        
+        return DiscordMessage(embeds=[embed])
@@ -17,6 +17,7 @@ from copy import deepcopy
 from .discord_service import DiscordService, EmbedColor
 from .party_inventory_tracker import PartyInventoryTracker
 from discord.core.services.change_detection_service import EnhancedChangeDetectionService as ChangeDetectionService
+from discord.core.storage.snapshot_catalog import get_snapshot_catalog
 from shared.models.change_detection import ChangePriority, ChangeDetectionResult
 from discord.services.change_detection.models import CharacterChangeSet, CharacterSnapshot
 
@@ -81,6 +82,9 @@ class NotificationManager:
             # Default to character_data/discord directory (where character files are stored)
             self.storage_dir = Path("../character_data/discord")
         
+        # Snapshot catalog: latest snapshot paths and character metadata without globbing
+        self.snapshot_catalog = get_snapshot_catalog(self.storage_dir)
+        
         # Initialize services - using enhanced change detection as primary service
         enhanced_config = self._create_enhanced_change_detection_config()
         self.change_detector = ChangeDetectionService(config=enhanced_config)
@@ -223,12 +227,9 @@ class NotificationManager:
                 logger.debug(f"Skipping character {character_id} - too soon since last notification")
                 return False
             
-            # Find the most recent snapshot files
-            storage_dir = self.storage_dir
-            pattern = f"character_{character_id}_*.json"
-            
-            # Find all snapshot files for this character
-            snapshot_files = sorted(storage_dir.glob(pattern), key=lambda p: p.stat().st_mtime)
+            # Find the two most recent snapshot files
+            snapshot_entries = self.snapshot_catalog.latest_snapshots(character_id, 2)
+            snapshot_files = [entry.path for entry in snapshot_entries]
             
             if len(snapshot_files) == 0:
                 logger.info(f"Character {character_id} has no snapshots - this shouldn't happen after scraper runs")
@@ -245,6 +246,13 @@ class NotificationManager:
             
             # We have 2+ snapshots, proceed with enhanced change detection
             
+            # Identical content cannot contain changes
+            if snapshot_entries[-2].content_hash == snapshot_entries[-1].content_hash:
+                logger.info(f"No changes detected for character {character_id} (identical snapshots)")
+                if return_message_content:
+                    return False, ""
+                return False
+            
             # Load the two most recent snapshots
             try:
                 import json
@@ -267,10 +275,10 @@ class NotificationManager:
             try:
                 # Create snapshot objects for the enhanced service
                 class SimpleSnapshot:
-                    def __init__(self, data, file_path, version):
+                    def __init__(self, data, entry, version):
                         self.character_data = data
                         self.character_id = character_id
-                        self.timestamp = datetime.fromtimestamp(file_path.stat().st_mtime)
+                        self.timestamp = datetime.fromtimestamp(entry.mtime)
                         self.version = version
                 
                 import re
@@ -286,8 +294,8 @@ class NotificationManager:
                 old_version = extract_timestamp_version(snapshot_files[-2])
                 new_version = extract_timestamp_version(snapshot_files[-1])
                 
-                old_snapshot = SimpleSnapshot(old_data, snapshot_files[-2], old_version)
-                new_snapshot = SimpleSnapshot(new_data, snapshot_files[-1], new_version)
+                old_snapshot = SimpleSnapshot(old_data, snapshot_entries[-2], old_version)
+                new_snapshot = SimpleSnapshot(new_data, snapshot_entries[-1], new_version)
                 
                 # Use enhanced change detection service (now the primary service)
                 change_set = self.change_detector.detect_changes_as_changeset(old_snapshot, new_snapshot)
@@ -454,14 +462,10 @@ class NotificationManager:
                     continue
                 
                 # For file-based storage, use the same approach as single character
-                # Find all snapshot files for this character
-                storage_dir = self.storage_dir
-                pattern = f"character_{character_id}_*.json"
-                
-                # Find all snapshot files for this character
-                snapshot_files = sorted(storage_dir.glob(pattern), key=lambda p: p.stat().st_mtime)
+                snapshot_entries = self.snapshot_catalog.latest_snapshots(character_id, 2)
+                snapshot_files = [entry.path for entry in snapshot_entries]
                 
-                if len(snapshot_files) < 2:
+                if len(snapshot_files) < 2 or snapshot_entries[-2].content_hash == snapshot_entries[-1].content_hash:
                     results[character_id] = False
                     continue
                 
@@ -475,10 +479,10 @@ class NotificationManager:
                     
                     # Create simple snapshot objects for comparison
                     class SimpleSnapshot:
-                        def __init__(self, data, file_path, version):
+                        def __init__(self, data, entry, version):
                             self.character_data = data
                             self.character_id = character_id
-                            self.timestamp = datetime.fromtimestamp(file_path.stat().st_mtime)
+                            self.timestamp = datetime.fromtimestamp(entry.mtime)
                             self.version = version
                     
                     # Use timestamp-based version numbering
@@ -497,8 +501,8 @@ class NotificationManager:
                     old_version = extract_timestamp_version(snapshot_files[-2])
                     new_version = extract_timestamp_version(snapshot_files[-1])
                     
-                    old_snapshot = SimpleSnapshot(old_data, snapshot_files[-2], old_version)
-                    new_snapshot = SimpleSnapshot(new_data, snapshot_files[-1], new_version)
+                    old_snapshot = SimpleSnapshot(old_data, snapshot_entries[-2], old_version)
+                    new_snapshot = SimpleSnapshot(new_data, snapshot_entries[-1], new_version)
                     
                 except Exception as e:
                     logger.error(f"Failed to load snapshots for character {character_id}: {e}")
@@ -802,99 +806,35 @@ class NotificationManager:
     
     
     async def _get_character_name(self, character_id: int) -> str:
-        """Get character name from storage."""
+        """Get character name from the snapshot catalog."""
         try:
-            # For file-based storage, get the latest snapshot file
-            storage_dir = self.storage_dir
-            pattern = f"character_{character_id}_*.json"
-            
-            import glob
-            import json
-            
-            # Find the latest file
-            character_files = glob.glob(str(storage_dir / pattern))
-            if not character_files:
-                return f"Character {character_id}"
-            
-            latest_file = max(character_files, key=lambda x: Path(x).stat().st_mtime)
-            
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                character_data = json.load(f)
-                
-                if 'character_info' in character_data:
-                    character_info = character_data['character_info']
-                    if isinstance(character_info, dict):
-                        character_name = character_info.get('name', f'Character {character_id}')
-                        return character_name
-                
-                return f"Character {character_id}"
+            metadata = self.snapshot_catalog.get_metadata(character_id)
+            return metadata.get('name') or f"Character {character_id}"
                 
         except Exception as e:
             logger.warning(f"Could not get character name for {character_id}: {e}")
             return f"Character {character_id}"
 
     async def _get_character_avatar_url(self, character_id: int) -> Optional[str]:
-        """Get character avatar URL from storage."""
+        """Get character avatar URL from the snapshot catalog."""
         try:
-            # For file-based storage, get the latest snapshot file
-            storage_dir = self.storage_dir
-            pattern = f"character_{character_id}_*.json"
+            metadata = self.snapshot_catalog.get_metadata(character_id)
+            if not metadata:
+                return None
             
-            # Find the most recent snapshot file
-            snapshot_files = sorted(storage_dir.glob(pattern), key=lambda p: p.stat().st_mtime)
+            # Custom character_info avatar, sized for Discord thumbnails
+            if metadata.get('avatar_url'):
+                return self._add_avatar_size_params(metadata['avatar_url'])
             
-            if not snapshot_files:
-                return None
-                
-            # Load the latest snapshot
-            import json
-            with open(snapshot_files[-1], 'r', encoding='utf-8') as f:
-                character_data = json.load(f)
+            # Generate default avatar if no custom avatar found
+            if metadata.get('name'):
+                default_avatar = self._generate_default_avatar_url(character_id, metadata['name'])
+                if default_avatar:
+                    return default_avatar
             
-            # Try to get avatar URL from various possible locations
-            if isinstance(character_data, dict):
-                # Check character_info first (v6.0.0 format)
-                if 'character_info' in character_data:
-                    character_info = character_data['character_info']
-                    if isinstance(character_info, dict):
-                        # Check for avatarUrl (D&D Beyond format)
-                        if 'avatarUrl' in character_info and character_info['avatarUrl']:
-                            avatar_url = character_info['avatarUrl']
-                            # Add size parameters for Discord thumbnail optimization
-                            avatar_url = self._add_avatar_size_params(avatar_url)
-                            return avatar_url
-                        # Check for avatar_url (alternative format)
-                        if 'avatar_url' in character_info and character_info['avatar_url']:
-                            avatar_url = character_info['avatar_url']
-                            avatar_url = self._add_avatar_size_params(avatar_url)
-                            return avatar_url
-                
-                # Generate default D&D Beyond avatar if no custom avatar found
-                if 'character_info' in character_data:
-                    character_info = character_data['character_info']
-                    if isinstance(character_info, dict):
-                        character_name = character_info.get('name', 'Unknown')
-                        character_id = character_info.get('character_id')
-                        if character_id:
-                            default_avatar = self._generate_default_avatar_url(character_id, character_name)
-                            if default_avatar:
-                                return default_avatar
-                
-                # Check decorations for avatar
-                if 'decorations' in character_data:
-                    decorations = character_data['decorations']
-                    if isinstance(decorations, dict) and 'avatar' in decorations:
-                        avatar = decorations['avatar']
-                        if isinstance(avatar, dict) and 'avatarUrl' in avatar:
-                            return avatar['avatarUrl']
-                
-                # Check direct avatar field
-                if 'avatar' in character_data:
-                    avatar = character_data['avatar']
-                    if isinstance(avatar, str):
-                        return avatar
-                    elif isinstance(avatar, dict) and 'avatarUrl' in avatar:
-                        return avatar['avatarUrl']
+            # Decorations or direct avatar field
+            if metadata.get('decoration_avatar_url'):
+                return metadata['decoration_avatar_url']
             
         except Exception as e:
             logger.debug(f"Could not get avatar for character {character_id}: {e}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Batch renderer for many character sheets at once.
+
+Rendering a party one dnd_json_to_markdown.py run at a time pays interpreter
+startup, config loading and generator construction per character. The batch
+renderer spreads the characters over a process pool whose workers load the
+parser configuration, build the formatters and load the spell index once, then
+render every character they are given with them.
+
+Usage:
+    python parser/batch_render.py SOURCE[=OUTPUT] [SOURCE[=OUTPUT] ...] [options]
+    python parser/batch_render.py @party.txt [options]
+
+SOURCE is a character JSON file or a character ID (rendered from its newest
+scraped file in character_data/scraper/). OUTPUT is the note to write; relative
+paths and the default <Character_Name>.md go in --output-dir. An @file holds
+one SOURCE[=OUTPUT] per line.
+
+Nothing is scraped and no Discord notifications are sent: scrape first, then
+batch render. Notes whose content is unchanged are not rewritten.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).absolute().parent.parent
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "character_data" / "parser"
+
+# Per-worker parser state, built once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+class RenderJob(NamedTuple):
+    """One character to render."""
+    source: str
+    output: Optional[str]
+
+
+class RenderResult(NamedTuple):
+    """Outcome of one render."""
+    source: str
+    name: Optional[str]
+    output: Optional[str]
+    seconds: float
+    written: bool
+    error: Optional[str]
+
+
+def parse_job(spec: str) -> RenderJob:
+    """Parse a SOURCE[=OUTPUT] argument."""
+    source, _, output = spec.strip().partition('=')
+    return RenderJob(source.strip(), output.strip() or None)
+
+
+def default_note_name(character_name: str) -> str:
+    """Note filename dnd_json_to_markdown.py uses when no output path is given."""
+    safe_name = "".join(c for c in character_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"{safe_name.replace(' ', '_')}.md"
+
+
+def _init_worker(use_enhanced_spells: bool, log_level: int) -> None:
+    """Load config, build the generator and load the spell index once per worker."""
+    import dnd_json_to_markdown  # noqa: F401  (configures logging and sys.path)
+    from dnd_json_to_markdown import CharacterMarkdownGenerator, ParserConfigManager
+    from shared.config.manager import get_config_manager
+    from utils.spell_compendium import get_spell_compendium
+
+    logging.getLogger().setLevel(log_level)
+
+    # The generator reads section order from the process-wide config manager
+    get_config_manager().get_config_value('parser', 'output', 'section_order', default=None)
+    parser_config = ParserConfigManager()
+    if use_enhanced_spells:
+        get_spell_compendium(str(parser_config.resolve_paths()["spells"]))
+
+    _worker.update(
+        parser_config=parser_config,
+        generator=CharacterMarkdownGenerator.create_generator(use_enhanced_spells),
+        use_enhanced_spells=use_enhanced_spells
+    )
+
+
+def _render(job: RenderJob, output_dir: str, use_section_cache: bool) -> RenderResult:
+    """Render one character with this worker's preloaded generator."""
+    import json
+    from dnd_json_to_markdown import CharacterMarkdownGenerator, find_latest_scraped_json
+    from utils.section_cache import write_if_changed
+
+    start = time.perf_counter()
+    name = None
+    output_path = None
+    try:
+        source = Path(job.source)
+        if not source.suffix and job.source.isdigit():
+            source = find_latest_scraped_json(PROJECT_ROOT, job.source)
+            if source is None:
+                raise FileNotFoundError(f"no scraped data for character ID {job.source}")
+        with open(source, 'r', encoding='utf-8') as f:
+            character_data = json.load(f)
+
+        generator = CharacterMarkdownGenerator(
+            character_data,
+            parser_config=_worker['parser_config'],
+            use_enhanced_spells=_worker['use_enhanced_spells'],
+            generator=_worker['generator']
+        )
+        name = generator.character_name
+
+        output_path = Path(job.output or default_note_name(name))
+        if not output_path.is_absolute():
+            output_path = Path(output_dir) / output_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        markdown = generator.generate_markdown(note_path=output_path if use_section_cache else None)
+        written = write_if_changed(output_path, markdown)
+        return RenderResult(job.source, name, str(output_path), time.perf_counter() - start, written, None)
+    except Exception as e:
+        logger.error(f"Batch:    Failed to render {job.source}: {e}")
+        return RenderResult(job.source, name, str(output_path) if output_path else None,
+                            time.perf_counter() - start, False, str(e))
+
+
+def render_batch(jobs: List[RenderJob], output_dir: Path = DEFAULT_OUTPUT_DIR, workers: Optional[int] = None,
+                 use_enhanced_spells: bool = True, use_section_cache: bool = True,
+                 log_level: int = logging.WARNING) -> List[RenderResult]:
+    """
+    Render characters across a pool of warm worker processes.
+
+    Args:
+        jobs: Characters to render
+        output_dir: Directory for default and relative output paths
+        workers: Worker processes (default: one per CPU, at most one per job)
+        use_enhanced_spells: Whether to use enhanced spell data
+        use_section_cache: Reuse unchanged sections cached next to each note
+        log_level: Log level inside the workers
+
+    Returns:
+        One result per job, in job order
+    """
+    if not jobs:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+
+    if use_enhanced_spells:
+        # Build the persisted spell index once here, so workers only load it
+        from dnd_json_to_markdown import ParserConfigManager
+        from utils.spell_compendium import get_spell_compendium
+        get_spell_compendium(str(ParserConfigManager().resolve_paths()["spells"]))
+
+    if workers == 1:
+        _init_worker(use_enhanced_spells, log_level)
+        return [_render(job, str(output_dir), use_section_cache) for job in jobs]
+
+    results: List[Optional[RenderResult]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(use_enhanced_spells, log_level)) as pool:
+        futures = {pool.submit(_render, job, str(output_dir), use_section_cache): index
+                   for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                # Worker died (e.g. failed initializer); report rather than abort the batch
+                results[index] = RenderResult(jobs[index].source, None, None, 0.0, False, str(e))
+    return results
+
+
+def main():
+    """Render the characters given on the command line and print timings."""
+    parser = argparse.ArgumentParser(
+        description='Render many character sheets across a pool of warm worker processes',
+        fromfile_prefix_chars='@'
+    )
+    parser.add_argument('jobs', nargs='+', metavar='SOURCE[=OUTPUT]',
+                        help='Character JSON file or character ID, optionally =output note path')
+    parser.add_argument('-o', '--output-dir', type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help='Directory for default and relative output paths (default: character_data/parser)')
+    parser.add_argument('-j', '--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--no-enhance-spells', action='store_true', help='Disable enhanced spell data, use API only')
+    parser.add_argument('--no-section-cache', action='store_true', help='Re-render every section of every note')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging in the workers')
+    args = parser.parse_args()
+
+    import dnd_json_to_markdown  # noqa: F401  (configures logging and sys.path)
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    logging.getLogger().setLevel(log_level)
+
+    jobs = [parse_job(spec) for spec in args.jobs if spec.strip() and not spec.lstrip().startswith('#')]
+
+    start = time.perf_counter()
+    results = render_batch(jobs, args.output_dir, args.workers, not args.no_enhance_spells,
+                           not args.no_section_cache, log_level)
+    wall = time.perf_counter() - start
+
+    failures = 0
+    for result in results:
+        label = f"{result.name} ({result.source})" if result.name else result.source
+        if result.error:
+            failures += 1
+            print(f"  FAILED     {label}: {result.error}")
+        else:
+            status = 'written' if result.written else 'unchanged'
+            print(f"  {status:<10} {label} in {result.seconds:.2f}s -> {result.output}")
+
+    render_total = sum(result.seconds for result in results)
+    print(f"Rendered {len(results) - failures}/{len(results)} characters in {wall:.2f}s "
+          f"({render_total:.2f}s total render time)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Command line arguments of dnd_json_to_markdown.py.
+
+Kept free of parser imports so the render daemon client can parse and
+rewrite arguments without loading the parser.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+from pathlib import Path
+from typing import List, Optional
+
+# Options whose values are file system paths, resolved against the working directory
+PATH_OPTIONS = ('--config', '--spells-path', '--scraper-path', '--output-dir', '-o')
+PATH_DESTS = ('config', 'spells_path', 'scraper_path', 'output_dir')
+
+# Options taking a separate value argument
+VALUE_OPTIONS = PATH_OPTIONS + ('--section',)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line arguments of dnd_json_to_markdown.py (shared with the render daemon client)."""
+    parser = argparse.ArgumentParser(
+        description='Convert D&D Beyond JSON to Markdown with YAML frontmatter and DnD UI Toolkit blocks'
+    )
+    parser.add_argument('character_id', help='D&D Beyond character ID')
+    parser.add_argument('output_path', nargs='?', help='Output markdown file path (default: character_data/parser/current_output_{character_id}.md)')
+    
+    # Core options
+    parser.add_argument('--config', help='Path to parser configuration file (default: config/parser.yaml)')
+    parser.add_argument('--scraper-path', type=Path, help='Path to enhanced_dnd_scraper.py script (runs the scraper as a subprocess)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    
+    # Spell enhancement options
+    parser.add_argument('--no-enhance-spells', action='store_true', help='Disable enhanced spell data, use API only')
+    parser.add_argument('--spells-path', help='Path to enhanced spell files directory')
+    
+    # Rule version options
+    parser.add_argument('--force-2014', action='store_true', help='Force 2014 rules regardless of character content')
+    parser.add_argument('--force-2024', action='store_true', help='Force 2024 rules regardless of character content')
+    
+    # Legacy compatibility options
+    parser.add_argument('-o', '--output-dir', help='Output directory for markdown files')
+    parser.add_argument('--enhanced-spells', action='store_true', help='Use enhanced spell data (inverse of --no-enhance-spells)')
+    parser.add_argument('--validate-only', action='store_true', help='Only validate the character data')
+    parser.add_argument('--section', help='Generate only a specific section')
+    parser.add_argument('--list-sections', action='store_true', help='List available sections')
+    parser.add_argument('--skip-discord', action='store_true', help='Skip Discord notifications and change detection (faster batch refresh)')
+    parser.add_argument('--no-section-cache', action='store_true', help='Re-render every section instead of reusing unchanged ones from the section cache')
+
+    return parser
+
+
+def resolve_output_path(output_path: str, project_root: Path) -> Path:
+    """
+    Note path for an output_path argument.
+    
+    Absolute paths are used as given; relative paths are placed in
+    character_data/parser/ (created if missing), independent of the working directory.
+    """
+    if Path(output_path).is_absolute():
+        return Path(output_path)
+    parser_dir = project_root / "character_data" / "parser"
+    parser_dir.mkdir(exist_ok=True, parents=True)
+    return parser_dir / output_path
+
+
+def _parse_quietly(parser: argparse.ArgumentParser, argv: List[str]) -> Optional[argparse.Namespace]:
+    """Parse without printing usage or help; None if argparse would exit."""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return parser.parse_args(argv)
+    except SystemExit:
+        return None
+
+
+def find_relative_paths(argv: List[str]) -> Optional[List[str]]:
+    """
+    Path arguments in argv that are not absolute.
+    
+    Returns:
+        The relative paths (empty if all are absolute), or None if argv does not parse
+    """
+    args = _parse_quietly(build_arg_parser(), argv)
+    if args is None:
+        return None
+    values = [args.output_path] + [getattr(args, dest) for dest in PATH_DESTS]
+    return [str(value) for value in values if value and not Path(value).is_absolute()]
+
+
+def absolute_path_argv(argv: List[str], cwd: str, project_root: Path) -> Optional[List[str]]:
+    """
+    Rewrite argv so every path argument is absolute.
+    
+    Option paths are resolved against cwd, as a local run would; the output
+    path is resolved with resolve_output_path(). The result is re-parsed and
+    must match the original arguments with only the paths changed.
+    
+    Args:
+        argv: dnd_json_to_markdown.py arguments
+        cwd: Working directory the arguments were given in
+        project_root: Project root for relative output paths
+        
+    Returns:
+        Rewritten arguments, or None if argv cannot be rewritten safely
+    """
+    parser = build_arg_parser()
+    args = _parse_quietly(parser, argv)
+    if args is None:
+        return None
+    
+    def absolute(path: str) -> str:
+        return os.path.normpath(os.path.join(cwd, path))
+    
+    rewritten = []
+    pending_option = None
+    positionals = 0
+    for token in argv:
+        if pending_option is not None:
+            rewritten.append(absolute(token) if pending_option in PATH_OPTIONS else token)
+            pending_option = None
+            continue
+        if token.startswith('-') and token != '-':
+            name, separator, value = token.partition('=')
+            if separator and name in PATH_OPTIONS:
+                token = f"{name}={absolute(value)}"
+            elif not separator and name in VALUE_OPTIONS:
+                pending_option = name
+            rewritten.append(token)
+            continue
+        positionals += 1
+        if positionals == 2:
+            token = str(resolve_output_path(token, project_root))
+        rewritten.append(token)
+    
+    # Anything the walk above got wrong (abbreviated options, -oPATH, ...) shows up here
+    expected = vars(args)
+    if args.output_path:
+        expected['output_path'] = str(resolve_output_path(args.output_path, project_root))
+    for dest in PATH_DESTS:
+        value = expected[dest]
+        if value:
+            expected[dest] = type(value)(absolute(str(value)))
+    
+    reparsed = _parse_quietly(parser, rewritten)
+    if reparsed is None or vars(reparsed) != expected:
+        return None
+    return rewritten
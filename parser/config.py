@@ -5,15 +5,63 @@ Handles loading and managing parser-specific configuration from YAML files.
 Integrates with the main project config system while providing parser-specific defaults.
 """
 
+import logging
 import os
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 # Import main config system
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from shared.config.manager import ConfigManager as MainConfigManager
+from shared.config.manager import get_config_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER_CONFIG_PATH = Path(__file__).parent.parent / "config" / "parser.yaml"
+
+# Resolved path -> ((mtime_ns, size) or None if missing, parsed config)
+_snapshots: Dict[str, Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = {}
+_snapshots_lock = threading.Lock()
+
+
+def load_parser_config(config_file: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Get the process-wide parsed parser.yaml.
+    
+    The file is parsed once and re-read only when its mtime or size changes,
+    so every formatter, generator and CLI step reading it costs one stat.
+    The same dict is returned until the file changes: treat it as read-only.
+    
+    Args:
+        config_file: Parser config file (default: config/parser.yaml)
+        
+    Returns:
+        Parsed configuration, or an empty dict if the file is missing or invalid
+    """
+    path = Path(config_file) if config_file else DEFAULT_PARSER_CONFIG_PATH
+    key = str(path.resolve())
+    try:
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    
+    with _snapshots_lock:
+        cached = _snapshots.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        config = {}
+        if signature is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = yaml.safe_load(f) or {}
+            except Exception as e:
+                logger.warning(f"Parser:   Could not load parser config from {path}: {e}")
+        _snapshots[key] = (signature, config)
+        return config
 
 
 class ParserConfigManager:
@@ -21,38 +69,19 @@ class ParserConfigManager:
     Parser-specific configuration manager.
     
     Combines main project config with parser-specific settings and CLI overrides.
+    Reads go through the process-wide snapshot from load_parser_config(), so
+    creating managers is cheap and edits to parser.yaml are picked up.
     """
     
     def __init__(self, config_file: Optional[str] = None):
         """Initialize parser config manager."""
-        self.main_config = MainConfigManager()
-        
-        # Find parser config file
-        if config_file:
-            self.parser_config_path = Path(config_file)
-        else:
-            # Default location relative to this file
-            project_root = Path(__file__).parent.parent
-            self.parser_config_path = project_root / "config" / "parser.yaml"
-        
-        self._parser_config_data = None
-        self._load_parser_config()
-    
-    def _load_parser_config(self):
-        """Load parser-specific configuration from YAML file."""
-        try:
-            if self.parser_config_path.exists():
-                with open(self.parser_config_path, 'r', encoding='utf-8') as f:
-                    self._parser_config_data = yaml.safe_load(f) or {}
-            else:
-                self._parser_config_data = {}
-        except Exception as e:
-            print(f"Warning: Could not load parser config from {self.parser_config_path}: {e}")
-            self._parser_config_data = {}
+        # Main config and parser.yaml are loaded once per process and shared
+        self.main_config = get_config_manager()
+        self.parser_config_path = Path(config_file) if config_file else DEFAULT_PARSER_CONFIG_PATH
     
     def get_parser_config(self, *keys: str, default: Any = None) -> Any:
         """Get a parser-specific configuration value using dot notation."""
-        current = self._parser_config_data
+        current = load_parser_config(self.parser_config_path)
         for key in keys:
             if isinstance(current, dict) and key in current:
                 current = current[key]
@@ -13,7 +13,6 @@ Version: 6.0.0-refactored
 License: MIT
 """
 
-import argparse
 import asyncio
 import json
 import logging
@@ -63,7 +62,12 @@ except ImportError as e:
 # Handle relative imports for both direct execution and module import
 try:
     from shared.config import ParserConfigManager
+    from .config import load_parser_config
+    from .cli_args import build_arg_parser, resolve_output_path
     from .factories.generator_factory import GeneratorFactory
+    from .utils.section_cache import SectionCache, render_fingerprint, section_cache_path, write_if_changed
+    from .utils.spell_compendium import spells_directory_signature
+    from shared.text import configure_memo, get_memo
 except ImportError:
     # When run directly, use absolute imports
     import sys
@@ -71,8 +75,12 @@ except ImportError:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, current_dir)
     
-    from config import ParserConfigManager
+    from config import ParserConfigManager, load_parser_config
+    from cli_args import build_arg_parser, resolve_output_path
     from factories.generator_factory import GeneratorFactory
+    from utils.section_cache import SectionCache, render_fingerprint, section_cache_path, write_if_changed
+    from utils.spell_compendium import spells_directory_signature
+    from shared.text import configure_memo, get_memo
 
 # Logging already configured above
 
@@ -86,7 +94,8 @@ class CharacterMarkdownGenerator:
     """
     
     def __init__(self, character_data: Dict[str, Any], parser_config: ParserConfigManager = None,
-                 spells_path: str = None, use_enhanced_spells: bool = None):
+                 spells_path: str = None, use_enhanced_spells: bool = None,
+                 generator: Any = None):
         """
         Initialize the markdown generator.
         
@@ -95,6 +104,8 @@ class CharacterMarkdownGenerator:
             parser_config: Parser configuration manager (if None, creates default)
             spells_path: Path to enhanced spell files (overrides config)
             use_enhanced_spells: Whether to use enhanced spell data (overrides config)
+            generator: Already built FactoryCharacterMarkdownGenerator to reuse
+                (formatters hold no per-character state); if None, one is created
         """
         # Store character data directly
         self.character_data = character_data
@@ -109,6 +120,13 @@ class CharacterMarkdownGenerator:
         self.spells_path = spells_path or str(paths["spells"])
         self.use_enhanced_spells = use_enhanced_spells if use_enhanced_spells is not None else self.config.get_default("enhance_spells", True)
         
+        # Memoize description conversions, persisted between runs if enabled
+        text_cache = self.config.get_parser_config("parser", "text_cache", default={}) or {}
+        configure_memo(
+            text_cache.get("max_entries", 4096),
+            paths["project_root"] / "character_data" / "cache" / "text_memo.pickle" if text_cache.get("persist", True) else None
+        )
+        
         # These are now always enabled for consistent behavior
         self.use_dnd_ui_toolkit = True      # Always use DnD UI Toolkit blocks
         self.use_yaml_frontmatter = True    # Always include YAML frontmatter
@@ -126,30 +144,69 @@ class CharacterMarkdownGenerator:
         self.rule_version = meta_info.get('rule_version', character_info.get('rule_version', 'unknown'))
         
         # Create the generator using the factory
-        self.factory = GeneratorFactory()
-        template_type = 'ui_toolkit' if self.use_dnd_ui_toolkit else 'obsidian'
-        
-        self.generator = self.factory.create_generator(
-            use_yaml_frontmatter=self.use_yaml_frontmatter,
-            use_enhanced_spells=self.use_enhanced_spells,
-            template_type=template_type
-        )
+        if generator is not None:
+            self.generator = generator
+        else:
+            self.generator = self.create_generator(self.use_enhanced_spells)
         
         logger.info(f"Parser:   Initialized CharacterMarkdownGenerator for {self.character_name} (Level {self.character_level})")
     
-    def generate_markdown(self) -> str:
+    @staticmethod
+    def create_generator(use_enhanced_spells: bool = True):
+        """
+        Build the factory generator a CharacterMarkdownGenerator renders with.
+        
+        Args:
+            use_enhanced_spells: Whether to use enhanced spell data
+            
+        Returns:
+            Configured FactoryCharacterMarkdownGenerator
+        """
+        # YAML frontmatter and DnD UI Toolkit blocks are always enabled
+        return GeneratorFactory().create_generator(
+            use_yaml_frontmatter=True,
+            use_enhanced_spells=use_enhanced_spells,
+            template_type='ui_toolkit'
+        )
+    
+    def generate_markdown(self, note_path: Optional[Path] = None) -> str:
         """
         Generate complete character markdown.
         
+        Args:
+            note_path: Vault note the markdown is written to; when given, rendered
+                sections are cached next to it and unchanged sections are reused
+        
         Returns:
             Complete markdown content
         """
         try:
-            return self.generator.generate_markdown(self.character_data)
+            section_cache = None
+            if note_path is not None:
+                section_cache = SectionCache(section_cache_path(note_path), self._render_fingerprint())
+            markdown = self.generator.generate_markdown(self.character_data, section_cache=section_cache)
+            get_memo().save()
+            return markdown
         except Exception as e:
             logger.error(f"Parser:   Failed to generate markdown for {self.character_name}: {e}")
             raise
     
+    def _render_fingerprint(self) -> str:
+        """Fingerprint of the parser code, config and spell files this output depends on."""
+        spells_signature = None
+        if self.use_enhanced_spells:
+            try:
+                # Formatters read the spells directory from config
+                spells_signature = spells_directory_signature(self.config.resolve_paths()["spells"])
+            except Exception as e:
+                logger.debug(f"Parser:   Could not stat spells directory: {e}")
+        options = {
+            'template_type': 'ui_toolkit' if self.use_dnd_ui_toolkit else 'obsidian',
+            'use_yaml_frontmatter': self.use_yaml_frontmatter,
+            'use_enhanced_spells': self.use_enhanced_spells
+        }
+        return render_fingerprint(options, spells_signature)
+    
     def generate_section(self, section_name: str) -> str:
         """
         Generate a specific section of the character sheet.
@@ -214,25 +271,27 @@ def process_character_json(json_file: str, output_dir: str = None, **kwargs) ->
         # Create generator
         generator = CharacterMarkdownGenerator(character_data, **kwargs)
         
-        # Generate markdown
-        markdown = generator.generate_markdown()
+        # Without an output directory, just return the markdown
+        if not output_dir:
+            return generator.generate_markdown()
         
-        # Save to file if output directory is specified
-        if output_dir:
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Create output filename
-            character_name = generator.character_name
-            safe_name = re.sub(r'[^\w\s-]', '', character_name).strip()
-            safe_name = re.sub(r'[-\s]+', '-', safe_name)
-            
-            output_file = output_path / f"{safe_name}.md"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(markdown)
-            
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Create output filename
+        character_name = generator.character_name
+        safe_name = re.sub(r'[^\w\s-]', '', character_name).strip()
+        safe_name = re.sub(r'[-\s]+', '-', safe_name)
+        
+        output_file = output_path / f"{safe_name}.md"
+        
+        # Reuse unchanged sections cached next to the note
+        markdown = generator.generate_markdown(note_path=output_file)
+        
+        if write_if_changed(output_file, markdown):
             logger.info(f"Parser:   Saved {character_name} to {output_file}")
+        else:
+            logger.info(f"Parser:   {character_name} unchanged in {output_file}")
         
         return markdown
         
@@ -258,14 +317,8 @@ async def trigger_discord_notifications(character_data: Dict[str, Any], characte
         # Check if Discord integration is enabled in parser config
         discord_enabled = True  # Default to enabled
         try:
-            import yaml
-            project_root = Path(__file__).parent.parent
-            parser_config_path = project_root / "config" / "parser.yaml"
-
-            if parser_config_path.exists():
-                with open(parser_config_path, 'r') as f:
-                    parser_config = yaml.safe_load(f) or {}
-                discord_enabled = parser_config.get('parser', {}).get('discord', {}).get('enabled', True)
+            parser_config = load_parser_config()
+            discord_enabled = parser_config.get('parser', {}).get('discord', {}).get('enabled', True)
         except Exception as e:
             logger.debug(f"Parser:   Discord config check failed, defaulting to enabled: {e}")
 
@@ -302,36 +355,156 @@ async def trigger_discord_notifications(character_data: Dict[str, Any], characte
         return {'character': False, 'party_inventory': False}
 
 
-async def main():
-    """Main entry point for the script."""
-    parser = argparse.ArgumentParser(
-        description='Convert D&D Beyond JSON to Markdown with YAML frontmatter and DnD UI Toolkit blocks'
+def scrape_character(character_id: str, discord_output: bool = False,
+                     force_rule_version: Optional[str] = None,
+                     calculator: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Scrape and calculate a character in-process.
+
+    The scraper still saves its usual JSON files (the discord copy feeds change
+    detection), but the calculated data is returned directly instead of being
+    re-read from the newest file in character_data/scraper.
+
+    Args:
+        character_id: D&D Beyond character ID
+        discord_output: Also save a copy to the discord directory
+        force_rule_version: '2014' or '2024' to override rule detection
+        calculator: Optional warm CharacterCalculator to reuse (render daemon)
+
+    Returns:
+        Character data, identical to loading the saved JSON file
+    """
+    from scraper.enhanced_dnd_scraper import EnhancedDnDScraper, to_json_compatible
+    from scraper.core.rules.version_manager import RuleVersion
+
+    scraper = EnhancedDnDScraper(
+        character_id=character_id,
+        force_rule_version=RuleVersion(force_rule_version) if force_rule_version else None,
+        storage_dir="character_data",
+        discord_output=discord_output,
+        calculator=calculator
     )
-    parser.add_argument('character_id', help='D&D Beyond character ID')
-    parser.add_argument('output_path', nargs='?', help='Output markdown file path (default: character_data/parser/current_output_{character_id}.md)')
-    
-    # Core options
-    parser.add_argument('--config', help='Path to parser configuration file (default: config/parser.yaml)')
-    parser.add_argument('--scraper-path', type=Path, help='Path to enhanced_dnd_scraper.py script')
-    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
-    
-    # Spell enhancement options
-    parser.add_argument('--no-enhance-spells', action='store_true', help='Disable enhanced spell data, use API only')
-    parser.add_argument('--spells-path', help='Path to enhanced spell files directory')
-    
-    # Rule version options
-    parser.add_argument('--force-2014', action='store_true', help='Force 2014 rules regardless of character content')
-    parser.add_argument('--force-2024', action='store_true', help='Force 2024 rules regardless of character content')
+    scraper._check_rate_limit()
+
+    if not scraper.fetch_character_data():
+        raise RuntimeError(f"Failed to fetch character data for {character_id}")
+
+    # Fingerprint before calculating, since calculators may annotate raw_data
+    payload_fingerprint = scraper.get_payload_fingerprint()
+    complete_data = scraper.calculate_character_data()
+    output_path = scraper.write_character_data(complete_data, payload_fingerprint)
+    logger.info(f"Parser:   Scraped character saved to: {Path(output_path).name}")
+
+    return to_json_compatible(complete_data)
+
+
+def find_latest_scraped_json(project_root: Path, character_id: str) -> Optional[Path]:
+    """
+    Most recent scraper output file for a character.
     
-    # Legacy compatibility options
-    parser.add_argument('-o', '--output-dir', help='Output directory for markdown files')
-    parser.add_argument('--enhanced-spells', action='store_true', help='Use enhanced spell data (inverse of --no-enhance-spells)')
-    parser.add_argument('--validate-only', action='store_true', help='Only validate the character data')
-    parser.add_argument('--section', help='Generate only a specific section')
-    parser.add_argument('--list-sections', action='store_true', help='List available sections')
-    parser.add_argument('--skip-discord', action='store_true', help='Skip Discord notifications and change detection (faster batch refresh)')
-
-    args = parser.parse_args()
+    Args:
+        project_root: Project root directory
+        character_id: D&D Beyond character ID
+        
+    Returns:
+        Path of the newest character_{id}_*.json in character_data/scraper, or None
+    """
+    scraper_data_dir = Path(project_root) / "character_data" / "scraper"
+    json_files = list(scraper_data_dir.glob(f"character_{character_id}_*.json"))
+    if not json_files:
+        return None
+    return max(json_files, key=lambda f: f.stat().st_mtime)
+
+
+def run_scraper_subprocess(scraper_script: Path, character_id: str, project_root: Path,
+                           discord_output: bool = False, force_rule_version: Optional[str] = None,
+                           verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run enhanced_dnd_scraper.py as a subprocess and load its newest output file.
+
+    Fallback for --scraper-path or when the scraper cannot be imported.
+    Exits the process on failure.
+    """
+    if not scraper_script.exists():
+        logger.error(f"Parser:   Scraper script not found at {scraper_script}")
+        sys.exit(1)
+
+    # Build scraper command
+    scraper_cmd = [sys.executable, str(scraper_script), character_id]
+    if verbose:
+        scraper_cmd.append('--verbose')
+    if discord_output:
+        scraper_cmd.append('--discord')
+    if force_rule_version:
+        scraper_cmd.append(f'--force-{force_rule_version}')
+
+    # Run the scraper
+    logger.info(f"Parser:   Running: {' '.join(scraper_cmd)}")
+    try:
+        result = subprocess.run(
+            scraper_cmd,
+            cwd=str(project_root),
+            capture_output=True,
+            text=True,
+            timeout=120  # 2 minute timeout
+        )
+
+        if result.returncode != 0:
+            logger.error(f"Parser:   Scraper failed with exit code {result.returncode}")
+            if result.stderr:
+                logger.error(f"Parser:   Scraper error: {result.stderr}")
+            if result.stdout:
+                logger.info(f"Parser:   Scraper output: {result.stdout}")
+            print(f"Scraper failed (exit code {result.returncode})", file=sys.stderr)
+            sys.exit(1)
+        else:
+            logger.info("Parser:   Scraper completed successfully")
+            if result.stdout:
+                # Show scraper output for transparency
+                for line in result.stdout.strip().split('\n'):
+                    if line.strip():
+                        logger.info(f"Scraper: {line.strip()}")
+                        print(f"  {line.strip()}")
+
+    except subprocess.TimeoutExpired:
+        logger.error("Parser:   Scraper timed out after 2 minutes")
+        print("Scraper timed out", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Parser:   Failed to run scraper: {e}")
+        print(f"Failed to run scraper: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Use the most recent file (should be the one just created by scraper)
+    json_file = find_latest_scraped_json(project_root, character_id)
+    if json_file is None:
+        logger.error(f"Parser:   No JSON files found in scraper directory for character ID {character_id}")
+        logger.info(f"Parser:   Looking in: {project_root / 'character_data' / 'scraper'}")
+        print(f"No character data found for ID {character_id}", file=sys.stderr)
+        sys.exit(1)
+    logger.info(f"Parser:   Using scraped character file: {json_file.name}")
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+async def main(argv: Optional[list] = None, calculator: Optional[Any] = None,
+               parser_config: Optional[ParserConfigManager] = None,
+               generators: Optional[Dict[bool, Any]] = None):
+    """
+    Main entry point for the script.
+
+    Args:
+        argv: Command line arguments (default sys.argv[1:])
+        calculator: Optional warm CharacterCalculator reused across runs
+        parser_config: Optional already-loaded parser configuration
+        generators: Optional prebuilt generators keyed by use_enhanced_spells
+
+    The render daemon passes its long-lived calculator, config and generators
+    so repeat refreshes skip rebuilding them.
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
     
     # Note: Default output path will be set after loading character data to use character name
     
@@ -339,113 +512,72 @@ async def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # --config replaces the default (or daemon's) parser configuration
+    if args.config:
+        parser_config = ParserConfigManager(args.config)
+    
     try:
-        # New architecture: Call scraper first, then read from scraper directory
+        # Scrape in-process and hand the calculated data straight to the generator
         character_id = args.character_id
         project_root = Path(__file__).parent.parent
         _timings = {}
         _t0 = time.time()
 
-        # Step 1: Call the scraper to get fresh data
-        logger.info(f"Parser:   Calling scraper for character {character_id})")
-        scraper_script = project_root / "scraper" / "enhanced_dnd_scraper.py"
-        
-        if not scraper_script.exists():
-            logger.error(f"Parser:   Scraper script not found at {scraper_script}")
+        # Rule version override, passed straight through to the scraper
+        if args.force_2014 and args.force_2024:
+            logger.error("Parser:   Cannot specify both --force-2014 and --force-2024")
             sys.exit(1)
-        
-        # Build scraper command
-        scraper_cmd = [sys.executable, str(scraper_script), character_id]
-        
-        # Add verbose flag if requested
-        if args.verbose:
-            scraper_cmd.append('--verbose')
-        
-        # Check if Discord is enabled in parser config and add --discord flag
+        force_rule_version = '2014' if args.force_2014 else '2024' if args.force_2024 else None
+
+        # Check if Discord is enabled in parser config (scraper then saves a discord copy)
         # --skip-discord CLI flag overrides config to skip all Discord processing
+        discord_output = False
         if args.skip_discord:
             logger.info("Parser:   Discord skipped (--skip-discord flag)")
         else:
             try:
-                import yaml
-                parser_config_path = project_root / "config" / "parser.yaml"
-                with open(parser_config_path, 'r') as f:
-                    parser_config = yaml.safe_load(f)
-
-                discord_enabled = parser_config.get('parser', {}).get('discord', {}).get('enabled', True)
-                logger.debug(f"Parser:   Discord config check: enabled={discord_enabled}")
-                if discord_enabled:
-                    scraper_cmd.append('--discord')
+                parser_settings = load_parser_config(args.config)
+                discord_output = parser_settings.get('parser', {}).get('discord', {}).get('enabled', True)
+                logger.debug(f"Parser:   Discord config check: enabled={discord_output}")
+                if discord_output:
                     logger.info("Parser:   Discord enabled: scraper will save copy to discord directory")
                 else:
                     logger.info("Parser:   Discord disabled in parser config")
             except Exception as e:
                 # If config check fails, default to enabling Discord
-                scraper_cmd.append('--discord')
+                discord_output = True
                 logger.info("Parser:   Discord enabled by default (config check failed)")
                 logger.debug(f"Parser:   Config check error: {e}")
-        
-        # Run the scraper
-        logger.info(f"Parser:   Running: {' '.join(scraper_cmd)}")
+
+        # Step 1: Scrape and calculate fresh data
+        logger.info(f"Parser:   Calling scraper for character {character_id}")
         try:
-            result = subprocess.run(
-                scraper_cmd,
-                cwd=str(project_root),
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout
-            )
-            
-            if result.returncode != 0:
-                logger.error(f"Parser:   Scraper failed with exit code {result.returncode}")
-                if result.stderr:
-                    logger.error(f"Parser:   Scraper error: {result.stderr}")
-                if result.stdout:
-                    logger.info(f"Parser:   Scraper output: {result.stdout}")
-                print(f"Scraper failed (exit code {result.returncode})", file=sys.stderr)
+            from scraper.enhanced_dnd_scraper import EnhancedDnDScraper  # noqa: F401
+            scrape_in_process = args.scraper_path is None
+        except ImportError as e:
+            logger.warning(f"Parser:   In-process scraper unavailable, falling back to subprocess: {e}")
+            scrape_in_process = False
+
+        if scrape_in_process:
+            try:
+                # Blocking network + CPU work; keep the event loop free
+                character_data = await asyncio.to_thread(
+                    scrape_character, character_id, discord_output, force_rule_version, calculator
+                )
+            except Exception as e:
+                logger.error(f"Parser:   Scraper failed: {e}")
+                print(f"Scraper failed: {e}", file=sys.stderr)
                 sys.exit(1)
-            else:
-                logger.info("Parser:   Scraper completed successfully")
-                if result.stdout:
-                    # Show scraper output for transparency
-                    for line in result.stdout.strip().split('\n'):
-                        if line.strip():
-                            logger.info(f"Scraper: {line.strip()}")
-                            print(f"  {line.strip()}")
-                            
-        except subprocess.TimeoutExpired:
-            logger.error("Parser:   Scraper timed out after 2 minutes")
-            print("Scraper timed out", file=sys.stderr)
-            sys.exit(1)
-        except Exception as e:
-            logger.error(f"Parser:   Failed to run scraper: {e}")
-            print(f"Failed to run scraper: {e}", file=sys.stderr)
-            sys.exit(1)
-        
+            logger.info("Parser:   Scraper completed successfully")
+        else:
+            scraper_script = args.scraper_path or project_root / "scraper" / "enhanced_dnd_scraper.py"
+            character_data = run_scraper_subprocess(
+                scraper_script, character_id, project_root, discord_output, force_rule_version, args.verbose
+            )
+
         _timings['scraper'] = time.time() - _t0
         _t1 = time.time()
 
-        # Step 2: Read the scraped data from scraper directory
-        scraper_data_dir = project_root / "character_data" / "scraper"
-        
-        # Look for the most recent JSON file for this character ID in scraper directory
-        pattern = f"character_{character_id}_*.json"
-        json_files = list(scraper_data_dir.glob(pattern))
-        
-        if not json_files:
-            logger.error(f"Parser:   No JSON files found in scraper directory for character ID {character_id}")
-            logger.info(f"Parser:   Looking in: {scraper_data_dir}")
-            print(f"No character data found for ID {character_id}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Use the most recent file (should be the one just created by scraper)
-        json_file = str(max(json_files, key=lambda f: f.stat().st_mtime))
-        logger.info(f"Parser:   Using scraped character file: {Path(json_file).name}")
-        
-        # Load character data
-        with open(json_file, 'r', encoding='utf-8') as f:
-            character_data = json.load(f)
-        
         # Set default output path using character name if none provided
         if not args.output_path:
             character_info = character_data.get('character_info', {})
@@ -470,8 +602,10 @@ async def main():
         # YAML frontmatter and DnD UI Toolkit are now always enabled
         generator = CharacterMarkdownGenerator(
             character_data,
+            parser_config=parser_config,
             spells_path=args.spells_path,
-            use_enhanced_spells=use_enhanced_spells
+            use_enhanced_spells=use_enhanced_spells,
+            generator=(generators or {}).get(use_enhanced_spells)
         )
         
         # Handle different operations
@@ -499,21 +633,13 @@ async def main():
             print(section_content)
             return
         
-        # Generate full markdown
-        markdown_content = generator.generate_markdown()
-        _timings['parse+generate'] = time.time() - _t1
-        _t2 = time.time()
-
         # Determine output path based on new directory structure
+        output_path = resolve_output_path(args.output_path, project_root)
         if Path(args.output_path).is_absolute():
             # Absolute path provided - use it directly for backward compatibility
-            output_path = Path(args.output_path)
             logger.info(f"Parser:   Using absolute path: {output_path}")
         else:
             # Relative path - save to parser directory
-            parser_dir = project_root / "character_data" / "parser"
-            parser_dir.mkdir(exist_ok=True, parents=True)
-            output_path = parser_dir / args.output_path
             logger.info(f"Parser:   Using relative path in parser dir: {output_path}")
 
         # Unicode-aware path resolution: if the target file doesn't exist,
@@ -545,6 +671,13 @@ async def main():
                         output_path = existing_file
                         break
 
+        # Generate full markdown, reusing sections whose inputs are unchanged
+        markdown_content = generator.generate_markdown(
+            note_path=None if args.no_section_cache else output_path
+        )
+        _timings['parse+generate'] = time.time() - _t1
+        _t2 = time.time()
+
         # Trigger Discord notifications BEFORE writing the file.
         # The file write causes Obsidian to reload the view, which clears the
         # Execute Code output pane. By printing status first, the subprocess
@@ -570,11 +703,12 @@ async def main():
 
         _timings['discord'] = time.time() - _t2
 
-        # Write file LAST - this triggers Obsidian to reload the view
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-
-        logger.info(f"Parser:   [OK] Character markdown saved to: {output_path.absolute()}")
+        # Write file LAST - this triggers Obsidian to reload the view, so an
+        # unchanged sheet is left alone
+        if write_if_changed(output_path, markdown_content):
+            logger.info(f"Parser:   [OK] Character markdown saved to: {output_path.absolute()}")
+        else:
+            logger.info(f"Parser:   [OK] Character markdown unchanged: {output_path.absolute()}")
         
     except Exception as e:
         logger.error(f"Parser:   Error processing character: {e}")
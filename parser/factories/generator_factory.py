@@ -22,6 +22,7 @@ sys.path.insert(0, parser_dir)
 
 from core.interfaces import IFormatter, ITemplateManager, ITextProcessor, IValidationService
 from utils.text import TextProcessor
+from utils.section_cache import SectionCache, TrackingDict
 from utils.validation import ValidationService
 from templates.obsidian import ObsidianTemplateManager
 from templates.ui_toolkit import UIToolkitTemplateManager
@@ -306,12 +307,15 @@ class FactoryCharacterMarkdownGenerator:
         self.text_processor = text_processor
         self.logger = logging.getLogger(self.__class__.__name__)
     
-    def generate_markdown(self, character_data: Dict[str, Any]) -> str:
+    def generate_markdown(self, character_data: Dict[str, Any],
+                          section_cache: Optional[SectionCache] = None) -> str:
         """
         Generate complete character markdown.
         
         Args:
             character_data: Complete character data dictionary
+            section_cache: Cache of previously rendered sections; sections whose
+                inputs are unchanged are reused instead of re-formatted
             
         Returns:
             Generated markdown content
@@ -327,17 +331,42 @@ class FactoryCharacterMarkdownGenerator:
         # Get section order from config, with fallback to default
         section_order = self._get_section_order()
         
+        if section_cache is not None:
+            section_cache.begin(character_data)
+        
         for section_name in section_order:
             formatter = self.formatters.get(section_name)
             if formatter:
+                if section_cache is not None:
+                    section_content = section_cache.lookup(section_name)
+                    if section_content is not None:
+                        if section_content:
+                            sections.append(section_content)
+                        continue
                 try:
-                    section_content = formatter.format(character_data)
+                    if section_cache is None:
+                        section_content = formatter.format(character_data)
+                    else:
+                        tracked_data = TrackingDict(character_data)
+                        section_content = formatter.format(tracked_data)
+                        if tracked_data.mutated:
+                            # Later sections see the change, but it invalidates the cached input hashes
+                            self.logger.debug(f"Section {section_name} modified the character data; section cache disabled")
+                            character_data = dict(tracked_data)
+                            section_cache.save()
+                            section_cache = None
+                        else:
+                            section_cache.store(section_name, tracked_data.accessed, section_content or '')
                     if section_content:
                         sections.append(section_content)
                 except Exception as e:
                     self.logger.error(f"Failed to format {section_name}: {e}")
                     # Continue with other sections
         
+        if section_cache is not None:
+            self.logger.debug(f"Section cache: {section_cache.hits} reused, {section_cache.misses} rendered")
+            section_cache.save()
+        
         # Join sections with appropriate spacing
         if sections:
             return '\n\n'.join(sections)
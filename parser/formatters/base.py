@@ -395,11 +395,8 @@ class BaseFormatter(IFormatter, ABC):
         else:
             # Fallback to base method without container info
             items = self.get_inventory(character_data)
-            # Add default container info
-            for item in items:
-                if 'container' not in item:
-                    item['container'] = 'Character'
-            return items
+            # Add default container info (on copies, leaving the character data untouched)
+            return [item if 'container' in item else {**item, 'container': 'Character'} for item in items]
     
     def _extract_inventory_with_containers(self, container_inventory: Dict[str, Any], equipment_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract inventory items from containers data with container information."""
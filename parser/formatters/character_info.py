@@ -120,7 +120,7 @@ except AttributeError:
     # Fallback for older Python versions
     pass
 
-cmd = ['python', 'parser/dnd_json_to_markdown.py', '{character_id}', full_path]
+cmd = ['python', 'parser/render_daemon.py', '{character_id}', full_path]
 print('Refreshing...')
 sys.stdout.flush()
 try:
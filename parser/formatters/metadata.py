@@ -13,12 +13,11 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime
 import logging
-import yaml
-from pathlib import Path
 
 from formatters.base import BaseFormatter
 from utils.text import TextProcessor
 from utils.spell_data_extractor import SpellDataExtractor
+from utils.item_categories import CategoryMatcher, get_category_matcher
 
 
 class MetadataFormatter(BaseFormatter):
@@ -39,6 +38,7 @@ class MetadataFormatter(BaseFormatter):
         super().__init__(text_processor)
         self.logger = logging.getLogger(self.__class__.__name__)
         self.spell_extractor = None
+        self.category_matcher = None
     
     def _to_yaml_value(self, value: Any) -> str:
         """Convert Python values to proper YAML format."""
@@ -133,8 +133,11 @@ class MetadataFormatter(BaseFormatter):
         ability_scores = self.get_ability_scores(character_data)
         spells = self.get_spells(character_data)
         
-        # Initialize spell extractor and get combat data
+        # Initialize spell extractor (per character: rule version and feats differ) and get combat data
+        self.spell_extractor = None
         self._initialize_spell_extractor(character_data)
+        # Pick up parser.yaml edits between characters (one stat, not one per item)
+        self.category_matcher = None
         combat_data = character_data.get('combat', {})
         
         # Character basic info - consistent character_id extraction from adapted data
@@ -790,187 +793,14 @@ infusions:
         if item.get('is_container', False):
             return "Container"
         
-        # Specific override rules for items that need special handling
-        name_lower = name.lower()
-        override_category = self._check_category_overrides(name_lower, item_type, item)
-        if override_category:
-            return override_category
-        
-        # Check item_type first (most reliable)
-        if item_type:
-            # Weapons
-            if any(weapon_type in item_type for weapon_type in [
-                'sword', 'bow', 'crossbow', 'dagger', 'staff', 'mace', 'axe', 
-                'hammer', 'spear', 'club', 'javelin', 'trident', 'whip', 'scimitar',
-                'rapier', 'shortsword', 'longsword', 'greatsword', 'handaxe', 'battleaxe',
-                'warhammer', 'maul', 'glaive', 'halberd', 'pike', 'lance'
-            ]):
-                return "Weapon"
-            
-            # Armor
-            if any(armor_type in item_type for armor_type in [
-                'armor', 'shield', 'leather', 'chain', 'plate', 'scale', 'splint',
-                'studded', 'hide', 'padded', 'ring mail', 'breastplate'
-            ]):
-                return "Armor"
-            
-            # Tools and kits
-            if any(tool_type in item_type for tool_type in [
-                'supplies', 'kit', 'tools', 'instrument', 'gaming set', 'artisan'
-            ]):
-                return "Tool"
-            
-            # Potions and consumables
-            if any(consumable_type in item_type for consumable_type in [
-                'potion', 'elixir', 'philter', 'oil'
-            ]):
-                return "Consumable"
-            
-            # Scrolls and books
-            if any(scroll_type in item_type for scroll_type in [
-                'scroll', 'tome', 'book', 'manual', 'spellbook'
-            ]):
-                return "Scroll"
-            
-            # Wondrous items
-            if 'wondrous' in item_type:
-                return "Magic"
-        
-        # Check name for additional categorization
-        name_lower = name.lower()
-        
-        # Ammunition
-        if any(ammo_type in name_lower for ammo_type in [
-            'bolt', 'arrow', 'dart', 'bullet', 'shot', 'ammunition'
-        ]):
-            return "Ammo"
-        
-        # Scrolls and documents by name (check BEFORE consumables to catch "Book - potions" etc.)
-        if any(scroll_type in name_lower for scroll_type in [
-            'scroll', 'parchment', 'paper', 'document', 'letter', 'map', 'book', 'tome', 'manual', 'spellbook'
-        ]):
-            return "Document"
-        
-        # Potions and consumables by name (moved after documents)
-        if any(potion_type in name_lower for potion_type in [
-            'potion', 'elixir', 'philter', 'draught', 'tincture'
-        ]):
-            return "Consumable"
-        
-        # Gear and equipment
-        if any(gear_type in name_lower for gear_type in [
-            'rope', 'torch', 'lamp', 'lantern', 'oil', 'ration', 'bedroll', 'blanket', 
-            'tent', 'pack', 'bag', 'sack', 'pouch', 'case', 'chest', 'box', 'barrel',
-            'flask', 'bottle', 'jug', 'mug', 'cup', 'bowl', 'plate', 'spoon', 'fork',
-            'knife', 'tinderbox', 'flint', 'steel', 'candle', 'waterskin', 'backpack',
-            'quiver', 'sheath', 'scabbard', 'holster', 'bandolier'
-        ]):
-            return "Gear"
-        
-        # Jewelry and valuables
-        if any(jewelry_type in name_lower for jewelry_type in [
-            'ring', 'necklace', 'amulet', 'bracelet', 'crown', 'tiara', 'circlet',
-            'brooch', 'pin', 'earring', 'pendant', 'chain', 'locket', 'gem', 'jewel',
-            'diamond', 'ruby', 'emerald', 'sapphire', 'pearl', 'gold', 'silver', 'platinum'
-        ]):
-            return "Valuable"
-        
-        # Clothing
-        if any(clothing_type in name_lower for clothing_type in [
-            'robe', 'cloak', 'cape', 'tunic', 'shirt', 'pants', 'trousers', 'dress',
-            'hat', 'cap', 'hood', 'gloves', 'boots', 'shoes', 'sandals', 'belt',
-            'vest', 'jacket', 'coat', 'garment', 'clothing', 'outfit'
-        ]):
-            return "Clothing"
-        
-        # Food and provisions
-        if any(food_type in name_lower for food_type in [
-            'bread', 'cheese', 'meat', 'beef', 'pork', 'chicken', 'fish', 'fruit',
-            'apple', 'orange', 'berry', 'nut', 'grain', 'flour', 'sugar', 'salt',
-            'spice', 'herb', 'wine', 'ale', 'beer', 'mead', 'water', 'milk', 'egg',
-            'bacon', 'ham', 'sausage', 'jerky', 'biscuit', 'cake', 'pie', 'pastry'
-        ]):
-            return "Food"
-        
-        # Tools by name
-        if any(tool_type in name_lower for tool_type in [
-            'hammer', 'saw', 'chisel', 'file', 'pliers', 'tongs', 'anvil', 'bellows',
-            'needle', 'thread', 'scissors', 'brush', 'pen', 'ink', 'quill', 'chalk',
-            'ruler', 'compass', 'scale', 'balance', 'hourglass', 'sundial', 'lens',
-            'magnifying', 'telescope', 'spyglass', 'lockpick', 'crowbar', 'shovel',
-            'pickaxe', 'hoe', 'rake', 'sickle', 'scythe', 'net', 'trap', 'snare'
-        ]):
-            return "Tool"
-        
-        # Default to "Other" instead of "Unknown"
-        return "Other"
-    
-    def _check_category_overrides(self, name_lower: str, item_type: str, item: Dict[str, Any]) -> Optional[str]:
-        """
-        Check for specific category overrides for items that need special handling.
-        
-        This method uses configuration from config/parser.yaml for customizable
-        item categorization rules.
-        
-        Args:
-            name_lower: Lowercase item name
-            item_type: Item type from D&D Beyond
-            item: Full item dictionary
-            
-        Returns:
-            Override category if found, None otherwise
-        """
-        config = self._load_categorization_config()
-        defaults = self._get_categorization_defaults()
-        
-        # Check document patterns
-        document_patterns = config.get('document_patterns', defaults['document_patterns'])
-        for pattern in document_patterns:
-            if pattern in name_lower:
-                return "Document"
-        
-        # Check valuable materials + tableware combinations
-        valuable_materials = config.get('valuable_materials', defaults['valuable_materials'])
-        valuable_tableware = config.get('valuable_tableware', defaults['valuable_tableware'])
-        
-        has_valuable_material = any(material in name_lower for material in valuable_materials)
-        has_tableware = any(item_name in name_lower for item_name in valuable_tableware)
-        
-        if has_valuable_material and has_tableware:
-            return "Valuable"
-        
-        # Check custom overrides
-        custom_overrides = config.get('custom_overrides', defaults['custom_overrides'])
-        if custom_overrides:
-            for item_name, category in custom_overrides.items():
-                if item_name.lower() in name_lower:
-                    return category
-        
-        return None
+        # parser.yaml overrides, then item type and item name rules (see utils/item_categories.py)
+        return self._get_category_matcher().categorize(name.lower(), item_type)
     
-    def _load_categorization_config(self) -> Dict[str, Any]:
-        """Load categorization configuration from parser.yaml."""
-        try:
-            config_path = Path(__file__).parent.parent.parent / "config" / "parser.yaml"
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            categorization_config = config.get('parser', {}).get('categorization', {})
-            if categorization_config is None:
-                categorization_config = {}
-            return categorization_config
-        except Exception as e:
-            self.logger.warning(f"Failed to load categorization config: {e}")
-            # Return fallback defaults
-            return {}
-        
-    def _get_categorization_defaults(self) -> Dict[str, Any]:
-        """Get default categorization rules."""
-        return {
-            'document_patterns': ['book -', 'book:', 'book ', 'spellbook', 'map -', 'map:', 'map ', 'scroll -', 'scroll:', 'scroll '],
-            'valuable_materials': ['silver', 'gold', 'platinum', 'copper', 'bronze', 'brass', 'pewter'],
-            'valuable_tableware': ['bowl', 'cup', 'mug', 'goblet', 'chalice', 'tankard', 'stein', 'plate', 'platter', 'dish', 'saucer', 'carafe', 'pitcher', 'jug', 'flask', 'bottle', 'decanter', 'urn', 'vase'],
-            'custom_overrides': {}
-        }
+    def _get_category_matcher(self) -> CategoryMatcher:
+        """Compiled categorization rules for the current parser.yaml, fetched once per character."""
+        if self.category_matcher is None:
+            self.category_matcher = get_category_matcher()
+        return self.category_matcher
     
     def _clean_item_description(self, description: str) -> str:
         """Clean item description for YAML output."""
@@ -6,7 +6,6 @@ spell statistics, spell slots, spell lists, and detailed spell descriptions.
 """
 
 from typing import Dict, Any, List, Optional, Tuple
-from pathlib import Path
 import re
 
 # Import interfaces and utilities using absolute import
@@ -472,7 +471,8 @@ return <SpellQuery characterName="{character_name_sanitized}" />;
         for source, spell_list in spells.items():
             for spell in spell_list:
                 # Convert spell to dict and add source information for formatting
-                spell_dict = self._convert_spell_to_dict(spell)
+                # Copy so the source annotation doesn't leak into the character data
+                spell_dict = dict(self._convert_spell_to_dict(spell))
                 spell_dict['display_source'] = source
                 all_spells.append(spell_dict)
 
@@ -508,14 +508,11 @@ return <SpellQuery characterName="{character_name_sanitized}" />;
     
     def _has_enhanced_spell_file(self, spell: Dict[str, Any]) -> bool:
         """Check if an enhanced spell file exists for this spell."""
-        if not self.spell_extractor or not self.spell_extractor.spells_path:
+        if not self.spell_extractor:
             return False
-            
-        spell_name = spell.get('name', '').lower().replace(' ', '-').replace("'", "")
-        spell_name = re.sub(r'[^\w\-]', '', spell_name)  # Remove special characters
-        spell_file = Path(self.spell_extractor.spells_path) / f"{spell_name}-xphb.md"
         
-        return spell_file.exists()
+        # Answered from the shared spell compendium index, without touching the file
+        return self.spell_extractor.has_enhanced_spell_file(spell)
     
     def _is_homebrew_spell(self, spell: Dict[str, Any]) -> bool:
         """Check if this appears to be a homebrew/custom spell."""
@@ -669,8 +666,10 @@ return <SpellQuery characterName="{character_name_sanitized}" />;
         Returns:
             Formatted spellcasting section
         """
-        # Store character data for spell extractor initialization
+        # Store character data for spell extractor initialization; the extractor
+        # depends on the character's rule version and feats, so rebuild it
         self._current_character_data = character_data
+        self.spell_extractor = None
         
         spells = self.get_spells(character_data)
         
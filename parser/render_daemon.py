@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Render daemon for dnd_json_to_markdown.
+
+Every refresh normally pays interpreter startup, config YAML parsing, rule
+loading, calculator and formatter construction. The daemon keeps a
+CharacterCalculator, the markdown generators and the parser configuration
+warm in one long-running process and serves "scrape + render character N to
+path P" requests over localhost HTTP.
+
+Usage:
+    python parser/render_daemon.py serve [--port PORT]
+    python parser/render_daemon.py CHARACTER_ID [OUTPUT_PATH] [parser options]
+
+The second form is a thin client taking exactly the dnd_json_to_markdown.py
+arguments. It forwards them to a running daemon, or runs the parser in this
+process when no daemon is available, so it is always safe to call. Path
+arguments are made absolute before they are sent (the daemon rejects relative
+ones), so they mean the same as in a local run from the caller's directory.
+
+The daemon publishes its address and a random access token in
+character_data/.render_daemon.json (readable only by the current user). The
+token must be sent as a header, so other users and web pages cannot drive it.
+Restart the daemon after editing config files.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import secrets
+import signal
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from cli_args import absolute_path_argv, find_relative_paths
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).absolute().parent.parent
+DISCOVERY_FILE = PROJECT_ROOT / "character_data" / ".render_daemon.json"
+TOKEN_HEADER = 'X-Render-Token'
+
+# Connecting to a live daemon is near-instant; a scrape can take a while
+CONNECT_TIMEOUT = 2.0
+REQUEST_TIMEOUT = 180.0
+
+
+def _read_discovery() -> Optional[dict]:
+    """Address and token of the running daemon, if one has registered."""
+    try:
+        with open(DISCOVERY_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def request_render(argv: List[str]) -> Optional[int]:
+    """
+    Forward parser arguments to the running daemon and replay its output.
+
+    Returns:
+        The parser's exit code, or None if no daemon answered (caller falls back)
+    """
+    discovery = _read_discovery()
+    if not discovery:
+        return None
+
+    # The daemon runs in its own working directory: send absolute paths only
+    cwd = os.getcwd()
+    absolute_argv = absolute_path_argv(argv, cwd, PROJECT_ROOT)
+    if absolute_argv is None:
+        logger.debug("Render daemon: could not make path arguments absolute, running locally")
+        return None
+
+    connection = http.client.HTTPConnection(discovery['host'], discovery['port'], timeout=CONNECT_TIMEOUT)
+    try:
+        connection.connect()
+    except OSError as e:
+        logger.debug(f"Render daemon not reachable at {discovery['host']}:{discovery['port']}: {e}")
+        return None
+
+    try:
+        # Connected: allow for the full scrape from here on
+        connection.sock.settimeout(REQUEST_TIMEOUT)
+        connection.request(
+            'POST', '/render',
+            body=json.dumps({'argv': absolute_argv, 'cwd': cwd}).encode('utf-8'),
+            headers={'Content-Type': 'application/json', TOKEN_HEADER: discovery['token']}
+        )
+        response = connection.getresponse()
+        if response.status != 200:
+            # Stale discovery file from another daemon; nothing ran yet
+            logger.debug(f"Render daemon rejected request (HTTP {response.status}), running locally")
+            return None
+        result = json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        # The daemon may be mid-scrape; running again locally could double up
+        print(f"Render daemon request failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    if result.get('stdout'):
+        sys.stdout.write(result['stdout'])
+        sys.stdout.flush()
+    if result.get('stderr'):
+        sys.stderr.write(result['stderr'])
+        sys.stderr.flush()
+    return result.get('exit_code', 1)
+
+
+class RenderDaemon:
+    """
+    Long-running parser process serving render requests one at a time.
+
+    Requests are serialised: the scraper's rate limiting expects one caller,
+    and each request's stdout/stderr is captured for the client.
+
+    Args:
+        host: Interface to bind (loopback only by default)
+        port: Port to bind (0 = any free port)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self.token = secrets.token_urlsafe(32)
+        self.calculator = None
+        self.parser_config = None
+        self.generators = None
+        self._lock = asyncio.Lock()
+
+    def warm_up(self):
+        """Build the calculator, generators and spell index and load configuration once, up front."""
+        from dnd_json_to_markdown import CharacterMarkdownGenerator, ParserConfigManager
+        from scraper.core.calculators.character_calculator import CharacterCalculator
+        from utils.spell_compendium import get_spell_compendium
+
+        self.parser_config = ParserConfigManager()
+        self.calculator = CharacterCalculator()
+        # Result caches are keyed on part of the payload; a refresh must not render old values
+        self.calculator.disable_result_caching()
+        # Formatters reset their per-character state on each render, so one
+        # generator per spell mode serves every request
+        self.generators = {
+            use_enhanced_spells: CharacterMarkdownGenerator.create_generator(use_enhanced_spells)
+            for use_enhanced_spells in (True, False)
+        }
+        get_spell_compendium(str(self.parser_config.resolve_paths()["spells"]))
+        logger.info("Render daemon: calculator, generators and parser configuration loaded")
+
+    async def handle_render(self, request):
+        from aiohttp import web
+
+        if not secrets.compare_digest(request.headers.get(TOKEN_HEADER, ''), self.token):
+            return web.json_response({'error': 'forbidden'}, status=403)
+
+        try:
+            body = await request.json()
+            argv = [str(arg) for arg in body['argv']]
+            cwd = str(body['cwd'])
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({'error': 'expected {"argv": [...], "cwd": "..."}'}, status=400)
+
+        # Relative paths would resolve against the daemon's directory, not the caller's
+        relative_paths = find_relative_paths(argv)
+        if not os.path.isabs(cwd) or relative_paths:
+            return web.json_response({'error': f"paths must be absolute: {relative_paths or [cwd]}"}, status=400)
+
+        async with self._lock:
+            return web.json_response(await self._run_parser(argv, cwd))
+
+    async def _run_parser(self, argv: List[str], cwd: str) -> dict:
+        """Run the parser's main() with captured output, as the CLI would."""
+        from dnd_json_to_markdown import main as parser_main
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        root_logger = logging.getLogger()
+        log_level = root_logger.level
+        exit_code = 0
+
+        logger.info(f"Render daemon: {' '.join(argv)} (from {cwd})")
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                await parser_main(argv, calculator=self.calculator, parser_config=self.parser_config,
+                                  generators=self.generators)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if isinstance(e.code, str):
+                stderr.write(e.code + '\n')
+        except Exception as e:
+            logger.error(f"Render daemon: request failed: {e}")
+            stderr.write(f"Error: {e}\n")
+            exit_code = 1
+        finally:
+            # --verbose only applies to the request that asked for it
+            root_logger.setLevel(log_level)
+
+        return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+    def _publish(self, port: int):
+        """Write the discovery file, readable only by this user."""
+        DISCOVERY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = DISCOVERY_FILE.with_suffix('.tmp')
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'host': self.host, 'port': port, 'token': self.token, 'pid': os.getpid()}, f)
+        os.replace(tmp_path, DISCOVERY_FILE)
+
+    def _unpublish(self):
+        """Remove the discovery file if it still points at this daemon."""
+        discovery = _read_discovery()
+        if discovery and discovery.get('token') == self.token:
+            with contextlib.suppress(OSError):
+                DISCOVERY_FILE.unlink()
+
+    async def serve(self):
+        """Serve until Ctrl+C or SIGTERM."""
+        from aiohttp import web
+
+        self.warm_up()
+
+        app = web.Application()
+        app.router.add_post('/render', self.handle_render)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+
+        port = runner.addresses[0][1]
+        self._publish(port)
+        logger.info(f"Render daemon listening on http://{self.host}:{port}")
+
+        stop = asyncio.Event()
+        with contextlib.suppress(NotImplementedError, AttributeError):
+            # Not available on Windows; Ctrl+C still works there
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+        try:
+            await stop.wait()
+        finally:
+            self._unpublish()
+            await runner.cleanup()
+
+
+def main():
+    """Serve, or forward a render request with in-process fallback."""
+    argv = sys.argv[1:]
+
+    if argv and argv[0] == 'serve':
+        parser = argparse.ArgumentParser(description='Keep the parser warm and serve render requests')
+        parser.add_argument('serve')
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=0, help='Port to bind (default: any free port)')
+        args = parser.parse_args(argv)
+
+        import dnd_json_to_markdown  # noqa: F401  (configures logging and sys.path)
+        try:
+            asyncio.run(RenderDaemon(args.host, args.port).serve())
+        except KeyboardInterrupt:
+            logger.info("Render daemon stopped")
+        return
+
+    exit_code = request_render(argv)
+    if exit_code is None:
+        # No daemon: behave exactly like dnd_json_to_markdown.py
+        from dnd_json_to_markdown import main as parser_main
+        asyncio.run(parser_main(argv))
+        exit_code = 0
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Compiled inventory item categorization rules.
+
+Item categories come from the categorization overrides in config/parser.yaml
+(document_patterns, valuable_materials + valuable_tableware, custom_overrides)
+followed by the built-in item type and item name keyword rules. Each keyword
+list is compiled into a single regex alternation once per parser.yaml
+version, so categorizing an item is one search per rule instead of a
+substring scan per keyword.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from config import load_parser_config
+
+# Used when parser.yaml does not set a rule
+DEFAULT_CATEGORIZATION: Dict[str, Any] = {
+    'document_patterns': ['book -', 'book:', 'book ', 'spellbook', 'map -', 'map:', 'map ', 'scroll -', 'scroll:', 'scroll '],
+    'valuable_materials': ['silver', 'gold', 'platinum', 'copper', 'bronze', 'brass', 'pewter'],
+    'valuable_tableware': ['bowl', 'cup', 'mug', 'goblet', 'chalice', 'tankard', 'stein', 'plate', 'platter', 'dish', 'saucer', 'carafe', 'pitcher', 'jug', 'flask', 'bottle', 'decanter', 'urn', 'vase'],
+    'custom_overrides': {}
+}
+
+# Checked in order against the D&D Beyond item type (most reliable)
+TYPE_RULES: List[Tuple[str, List[str]]] = [
+    ("Weapon", [
+        'sword', 'bow', 'crossbow', 'dagger', 'staff', 'mace', 'axe',
+        'hammer', 'spear', 'club', 'javelin', 'trident', 'whip', 'scimitar',
+        'rapier', 'shortsword', 'longsword', 'greatsword', 'handaxe', 'battleaxe',
+        'warhammer', 'maul', 'glaive', 'halberd', 'pike', 'lance'
+    ]),
+    ("Armor", [
+        'armor', 'shield', 'leather', 'chain', 'plate', 'scale', 'splint',
+        'studded', 'hide', 'padded', 'ring mail', 'breastplate'
+    ]),
+    ("Tool", ['supplies', 'kit', 'tools', 'instrument', 'gaming set', 'artisan']),
+    ("Consumable", ['potion', 'elixir', 'philter', 'oil']),
+    ("Scroll", ['scroll', 'tome', 'book', 'manual', 'spellbook']),
+    ("Magic", ['wondrous']),
+]
+
+# Checked in order against the lowercase item name when the type did not match
+NAME_RULES: List[Tuple[str, List[str]]] = [
+    ("Ammo", ['bolt', 'arrow', 'dart', 'bullet', 'shot', 'ammunition']),
+    # Documents before consumables to catch "Book - potions" etc.
+    ("Document", [
+        'scroll', 'parchment', 'paper', 'document', 'letter', 'map', 'book', 'tome', 'manual', 'spellbook'
+    ]),
+    ("Consumable", ['potion', 'elixir', 'philter', 'draught', 'tincture']),
+    ("Gear", [
+        'rope', 'torch', 'lamp', 'lantern', 'oil', 'ration', 'bedroll', 'blanket',
+        'tent', 'pack', 'bag', 'sack', 'pouch', 'case', 'chest', 'box', 'barrel',
+        'flask', 'bottle', 'jug', 'mug', 'cup', 'bowl', 'plate', 'spoon', 'fork',
+        'knife', 'tinderbox', 'flint', 'steel', 'candle', 'waterskin', 'backpack',
+        'quiver', 'sheath', 'scabbard', 'holster', 'bandolier'
+    ]),
+    ("Valuable", [
+        'ring', 'necklace', 'amulet', 'bracelet', 'crown', 'tiara', 'circlet',
+        'brooch', 'pin', 'earring', 'pendant', 'chain', 'locket', 'gem', 'jewel',
+        'diamond', 'ruby', 'emerald', 'sapphire', 'pearl', 'gold', 'silver', 'platinum'
+    ]),
+    ("Clothing", [
+        'robe', 'cloak', 'cape', 'tunic', 'shirt', 'pants', 'trousers', 'dress',
+        'hat', 'cap', 'hood', 'gloves', 'boots', 'shoes', 'sandals', 'belt',
+        'vest', 'jacket', 'coat', 'garment', 'clothing', 'outfit'
+    ]),
+    ("Food", [
+        'bread', 'cheese', 'meat', 'beef', 'pork', 'chicken', 'fish', 'fruit',
+        'apple', 'orange', 'berry', 'nut', 'grain', 'flour', 'sugar', 'salt',
+        'spice', 'herb', 'wine', 'ale', 'beer', 'mead', 'water', 'milk', 'egg',
+        'bacon', 'ham', 'sausage', 'jerky', 'biscuit', 'cake', 'pie', 'pastry'
+    ]),
+    ("Tool", [
+        'hammer', 'saw', 'chisel', 'file', 'pliers', 'tongs', 'anvil', 'bellows',
+        'needle', 'thread', 'scissors', 'brush', 'pen', 'ink', 'quill', 'chalk',
+        'ruler', 'compass', 'scale', 'balance', 'hourglass', 'sundial', 'lens',
+        'magnifying', 'telescope', 'spyglass', 'lockpick', 'crowbar', 'shovel',
+        'pickaxe', 'hoe', 'rake', 'sickle', 'scythe', 'net', 'trap', 'snare'
+    ]),
+]
+
+DEFAULT_CATEGORY = "Other"
+
+
+def _substring_pattern(keywords: Iterable[Any]) -> Optional[Pattern]:
+    """Regex matching any of the keywords as a plain substring (None if there are none)."""
+    keywords = [str(keyword) for keyword in keywords or []]
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+class CategoryMatcher:
+    """
+    Item categorizer built from one version of the categorization config.
+
+    Use get_category_matcher() to share the matcher for the current parser.yaml.
+
+    Args:
+        categorization: The parser.categorization section of parser.yaml
+    """
+
+    def __init__(self, categorization: Optional[Dict[str, Any]] = None):
+        categorization = categorization or {}
+
+        def rule(name: str) -> Any:
+            return categorization.get(name, DEFAULT_CATEGORIZATION[name])
+
+        self._documents = _substring_pattern(rule('document_patterns'))
+        self._materials = _substring_pattern(rule('valuable_materials'))
+        self._tableware = _substring_pattern(rule('valuable_tableware'))
+
+        # Overrides apply in config order, so the combined pattern only tells
+        # whether any of them matches before looking for the first one that does
+        self._overrides = [(str(name).lower(), category)
+                           for name, category in (rule('custom_overrides') or {}).items()]
+        self._any_override = _substring_pattern(name for name, _ in self._overrides)
+
+        self._type_rules = [(category, _substring_pattern(keywords)) for category, keywords in TYPE_RULES]
+        self._name_rules = [(category, _substring_pattern(keywords)) for category, keywords in NAME_RULES]
+
+    def override(self, name_lower: str) -> Optional[str]:
+        """
+        Category forced by the parser.yaml overrides.
+
+        Args:
+            name_lower: Lowercase item name
+
+        Returns:
+            Override category if one applies, None otherwise
+        """
+        if self._documents and self._documents.search(name_lower):
+            return "Document"
+
+        if (self._materials and self._tableware
+                and self._materials.search(name_lower) and self._tableware.search(name_lower)):
+            return "Valuable"
+
+        if self._any_override and self._any_override.search(name_lower):
+            for override_name, category in self._overrides:
+                if override_name in name_lower:
+                    return category
+
+        return None
+
+    def categorize(self, name_lower: str, item_type: str) -> str:
+        """
+        Category of a non-magic, non-container item.
+
+        Args:
+            name_lower: Lowercase item name
+            item_type: Lowercase D&D Beyond item type
+
+        Returns:
+            Overridden, type-based or name-based category, else "Other"
+        """
+        category = self.override(name_lower)
+        if category:
+            return category
+
+        if item_type:
+            for category, pattern in self._type_rules:
+                if pattern.search(item_type):
+                    return category
+
+        for category, pattern in self._name_rules:
+            if pattern.search(name_lower):
+                return category
+
+        return DEFAULT_CATEGORY
+
+
+_matchers: Dict[str, Tuple[Dict[str, Any], CategoryMatcher]] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_category_matcher(config_file: Optional[Path] = None) -> CategoryMatcher:
+    """
+    Get the process-wide matcher for the current parser.yaml.
+
+    The rules are recompiled only when load_parser_config() returns a new
+    snapshot, i.e. when the file changed.
+    """
+    config = load_parser_config(config_file)
+    key = str(config_file or "")
+    with _matchers_lock:
+        cached = _matchers.get(key)
+        if cached is None or cached[0] is not config:
+            categorization = (config.get('parser') or {}).get('categorization') or {}
+            cached = (config, CategoryMatcher(categorization))
+            _matchers[key] = cached
+        return cached[1]
@@ -0,0 +1,300 @@
+"""
+On-disk cache of rendered character sheet sections.
+
+Each section's markdown is stored with the top-level character data keys its
+formatter read while rendering, and a hash of each of those values. On the
+next render a section whose inputs hash the same is reused verbatim instead
+of re-running its formatter, so a scrape that only changed hit points or a
+few items re-renders only the sections that read those keys.
+
+Dependencies are recorded, not declared: formatters receive a dict that logs
+which keys they look up. A formatter that iterates over the values depends on
+the whole character. Entries are also keyed by a render fingerprint (parser
+source files, config files, spells directory and generator options), so
+editing the parser or config invalidates every section.
+
+The cache for a note lives next to it in a hidden .parser_cache/ folder,
+which Obsidian does not index:
+    {note_dir}/.parser_cache/{note_stem}.sections.json
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = ".parser_cache"
+CACHE_VERSION = 1
+
+# Pseudo-dependencies: the set of top-level keys, and the whole character
+KEYS_DEPENDENCY = "__keys__"
+ALL_DEPENDENCY = "__all__"
+
+_MISSING_HASH = "missing"
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def content_hash(text: str) -> str:
+    """Hex SHA-256 digest of rendered markdown."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def section_cache_path(note_path: Path) -> Path:
+    """Section cache file kept next to a vault note."""
+    note_path = Path(note_path)
+    return note_path.parent / CACHE_DIR / f"{note_path.stem}.sections.json"
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write a note only if its content differs from what is already on disk.
+
+    Leaving an unchanged file alone keeps its mtime, so Obsidian does not
+    re-index or reload the note.
+
+    Args:
+        path: Note to write
+        content: Complete markdown content
+
+    Returns:
+        True if the file was written, False if it already had this content
+    """
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if content_hash(f.read()) == content_hash(content):
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def render_fingerprint(options: Optional[Dict[str, Any]] = None,
+                       spells_signature: Optional[Tuple[int, int, int]] = None) -> str:
+    """
+    Hash of everything besides the character data that shapes the output.
+
+    Only stats files, so it is cheap enough to compute on every render.
+
+    Args:
+        options: Generator options (template type, enhanced spells, ...)
+        spells_signature: Signature of the enhanced spells directory, if used
+
+    Returns:
+        Hex digest that changes when parser code, config or spell files change
+    """
+    stamps = []
+    for root, pattern in ((_PROJECT_ROOT / "parser", "*.py"),
+                          (_PROJECT_ROOT / "shared", "*.py"),
+                          (_PROJECT_ROOT / "config", "*.yaml")):
+        for path in sorted(root.rglob(pattern)):
+            try:
+                stat = path.stat()
+                stamps.append((str(path.relative_to(_PROJECT_ROOT)), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+
+    payload = json.dumps({
+        'version': CACHE_VERSION,
+        'files': stamps,
+        'options': options or {},
+        'spells': spells_signature
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TrackingDict(dict):
+    """
+    Shallow copy of the character data that records which top-level keys are read.
+
+    Lookups (get, [], in) record the key. Listing keys (iteration, len, bool)
+    records a dependency on the key set; reading every value (items, values,
+    copy, serialisation) records a dependency on the whole character. Any
+    top-level write marks the data as mutated.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        self.accessed = set()
+        self.mutated = False
+
+    def __getitem__(self, key):
+        self.accessed.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.accessed.add(key)
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self.accessed.add(KEYS_DEPENDENCY)
+        return super().__iter__()
+
+    def __len__(self):
+        self.accessed.add(KEYS_DEPENDENCY)
+        return super().__len__()
+
+    def keys(self):
+        self.accessed.add(KEYS_DEPENDENCY)
+        return super().keys()
+
+    def items(self):
+        self.accessed.add(ALL_DEPENDENCY)
+        return super().items()
+
+    def values(self):
+        self.accessed.add(ALL_DEPENDENCY)
+        return super().values()
+
+    def copy(self):
+        self.accessed.add(ALL_DEPENDENCY)
+        return dict(super().items())
+
+    def __setitem__(self, key, value):
+        self.mutated = True
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.mutated = True
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        self.accessed.add(key)
+        if not super().__contains__(key):
+            self.mutated = True
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self.mutated = True
+        return super().pop(*args)
+
+    def popitem(self):
+        self.mutated = True
+        return super().popitem()
+
+    def update(self, *args, **kwargs):
+        self.mutated = True
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self.mutated = True
+        super().clear()
+
+
+class SectionCache:
+    """
+    Rendered sections of one note, reused while their inputs are unchanged.
+
+    Args:
+        path: Cache file (see section_cache_path())
+        fingerprint: Render fingerprint (see render_fingerprint()); entries
+            written under a different fingerprint are ignored
+    """
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._character_data: Optional[Dict[str, Any]] = None
+        self._key_hashes: Dict[str, str] = {}
+        self._load()
+
+    def begin(self, character_data: Dict[str, Any]) -> None:
+        """
+        Start a render of the given character data.
+
+        Every top-level value is hashed up front, so the hashes describe the
+        input even if a formatter later modifies nested data in place.
+        """
+        self._character_data = character_data
+        self._key_hashes = {}
+        for key in character_data:
+            self._dependency_hash(key)
+        self._dependency_hash(KEYS_DEPENDENCY)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, section_name: str) -> Optional[str]:
+        """Cached output of a section if none of its inputs changed, else None."""
+        entry = self._sections.get(section_name)
+        if entry is not None and all(self._dependency_hash(key) == value
+                                     for key, value in entry['inputs'].items()):
+            self.hits += 1
+            return entry['output']
+        self.misses += 1
+        return None
+
+    def store(self, section_name: str, accessed: Iterable[str], output: str) -> None:
+        """Remember a freshly rendered section and the keys it read."""
+        if ALL_DEPENDENCY in accessed:
+            accessed = [ALL_DEPENDENCY]
+        inputs = {key: self._dependency_hash(key) for key in sorted(accessed, key=str)}
+        entry = {'inputs': inputs, 'output': output}
+        if self._sections.get(section_name) != entry:
+            self._sections[section_name] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache file if any section changed."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': CACHE_VERSION,
+                    'fingerprint': self.fingerprint,
+                    'sections': self._sections
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Parser:   Failed to write section cache {self.path}: {e}")
+
+    def _dependency_hash(self, key: str) -> str:
+        if key not in self._key_hashes:
+            data = self._character_data or {}
+            if key == ALL_DEPENDENCY:
+                # Combine the per-key hashes taken in begin()
+                value = {name: self._dependency_hash(name) for name in data}
+            elif key == KEYS_DEPENDENCY:
+                value = sorted(data, key=str)
+            elif key in data:
+                value = data[key]
+            else:
+                self._key_hashes[key] = _MISSING_HASH
+                return _MISSING_HASH
+            serialized = json.dumps(value, sort_keys=True, ensure_ascii=False,
+                                    separators=(',', ':'), default=str)
+            self._key_hashes[key] = hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+        return self._key_hashes[key]
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"Parser:   Ignoring unreadable section cache {self.path}: {e}")
+            return
+        if cached.get('version') == CACHE_VERSION and cached.get('fingerprint') == self.fingerprint:
+            self._sections = cached.get('sections', {})
+        else:
+            # Stale entries are dropped on the next save
+            self._dirty = True
@@ -0,0 +1,303 @@
+"""
+Preloaded index of the enhanced spell files.
+
+Reads every spell file in the spells directory once, keeping its parsed
+frontmatter, cleaned description body and components/range/duration/casting
+time, so spell lookups while rendering a sheet never touch the spell files.
+
+The index is shared process-wide per directory and persisted as a pickle in
+character_data/cache/, keyed by the spells path. It is rebuilt when the
+directory signature changes: the directory mtime (files added, removed or
+renamed) plus the newest file mtime (files edited in place, which does not
+change the directory mtime).
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_FILE_SUFFIX = "-xphb.md"
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "character_data" / "cache"
+
+_FRONTMATTER_LINE = re.compile(r'^([A-Za-z_][\w-]*):\s*(.*)$')
+_COMPONENTS_FRONTMATTER = re.compile(r'^components:\s*(.+)$', re.MULTILINE)
+_BODY_FIELD = re.compile(r'\*\*(Casting time|Range|Components|Duration):\*\*\s*([^\n]+)')
+_IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+
+class SpellEntry(NamedTuple):
+    """Parsed contents of one enhanced spell file."""
+    frontmatter: Dict[str, str]
+    description: str
+    components: str
+    range: str
+    duration: str
+    casting_time: str
+
+
+def spell_file_stem(spell_name: str, strip_special: bool = True) -> str:
+    """
+    File stem (without suffix) an enhanced spell file uses for a spell name.
+
+    Args:
+        spell_name: Spell name as it appears on the sheet
+        strip_special: Also drop characters other than word characters and hyphens
+    """
+    stem = spell_name.lower().replace(' ', '-').replace("'", "")
+    if strip_special:
+        stem = re.sub(r'[^\w\-]', '', stem)
+    return stem
+
+
+def process_spell_images(content: str) -> str:
+    """Process images in spell content to add size constraints using correct Obsidian syntax."""
+    def replace_image(match):
+        alt_text = match.group(1)
+        url_with_anchor = match.group(2)
+
+        # Check if alt text already has size constraints (Obsidian format: ![alt|size](url))
+        if '|' in alt_text:
+            # Image already has size constraints in alt text, leave as is
+            return match.group(0)
+
+        # Add size constraints to alt text using correct Obsidian syntax
+        if '#' in url_with_anchor:
+            url, anchor = url_with_anchor.rsplit('#', 1)
+            # Correct Obsidian syntax: size goes in alt text, not URL
+            return f'![{alt_text}|300]({url}#{anchor})'
+        else:
+            # No anchor, add size to alt text
+            return f'![{alt_text}|300]({url_with_anchor})'
+
+    return _IMAGE_PATTERN.sub(replace_image, content)
+
+
+def clean_enhanced_spell_content(content: str) -> str:
+    """Remove redundant spell title and metadata section from enhanced spell content."""
+    # Pattern to match and remove the spell title section:
+    # # Spell Name
+    # *level, school*
+    # (optional image)
+    # - **Casting time:** ...
+    # - **Range:** ...
+    # - **Components:** ...
+    # - **Duration:** ...
+    lines = content.split('\n')
+    cleaned_lines = []
+    skip_mode = False
+    found_title = False
+
+    for line in lines:
+        # Check if this line starts the redundant section
+        if line.startswith('# ') and not found_title:
+            found_title = True
+            skip_mode = True
+            continue
+
+        # Skip the spell level/school line (e.g., "*cantrip, Evocation*")
+        if skip_mode and line.strip().startswith('*') and line.strip().endswith('*') and ', ' in line:
+            continue
+
+        # Skip image lines
+        if skip_mode and line.strip().startswith('!['):
+            continue
+
+        # Skip empty lines while in skip mode
+        if skip_mode and line.strip() == '':
+            continue
+
+        # Skip the component list section (lines starting with "- **")
+        if skip_mode and line.strip().startswith('- **') and any(comp in line for comp in ['Casting time:', 'Range:', 'Components:', 'Duration:']):
+            continue
+
+        # If we've found content that's not part of the redundant section, exit skip mode
+        if skip_mode and line.strip() and not line.startswith('- **'):
+            skip_mode = False
+
+        # Add the line if we're not in skip mode
+        if not skip_mode:
+            cleaned_lines.append(line)
+
+    # Join the cleaned lines back together (strip also drops leading empty lines)
+    return '\n'.join(cleaned_lines).strip()
+
+
+def parse_spell_file(content: str) -> SpellEntry:
+    """
+    Parse the text of one enhanced spell file.
+
+    Args:
+        content: Full file content (optional YAML frontmatter, then markdown)
+
+    Returns:
+        SpellEntry with the cleaned description and extracted fields
+    """
+    frontmatter: Dict[str, str] = {}
+    body = content.strip()
+    if '---' in content:
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            for line in parts[1].splitlines():
+                match = _FRONTMATTER_LINE.match(line)
+                if match:
+                    frontmatter[match.group(1)] = match.group(2).strip()
+            body = parts[2].strip()
+
+    body_fields: Dict[str, str] = {}
+    for name, value in _BODY_FIELD.findall(content):
+        body_fields.setdefault(name.lower(), value.strip())
+
+    # Components come from any 'components:' line first, matching the original lookup
+    components_match = _COMPONENTS_FRONTMATTER.search(content)
+    components = components_match.group(1).strip() if components_match else body_fields.get('components', '')
+
+    return SpellEntry(
+        frontmatter=frontmatter,
+        description=clean_enhanced_spell_content(process_spell_images(body)),
+        components=components,
+        range=frontmatter.get('range') or body_fields.get('range', ''),
+        duration=frontmatter.get('duration') or body_fields.get('duration', ''),
+        casting_time=frontmatter.get('casting_time') or body_fields.get('casting time', '')
+    )
+
+
+def spells_directory_signature(spells_path: Path,
+                               file_suffix: str = DEFAULT_FILE_SUFFIX) -> Optional[Tuple[int, int, int]]:
+    """
+    (directory mtime, file count, newest file mtime) of a spells directory,
+    without reading any file. None if the directory cannot be read.
+    """
+    try:
+        directory_mtime = Path(spells_path).stat().st_mtime_ns
+        count = 0
+        newest = 0
+        with os.scandir(spells_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(file_suffix) and entry.is_file():
+                    count += 1
+                    newest = max(newest, entry.stat().st_mtime_ns)
+        return directory_mtime, count, newest
+    except OSError:
+        return None
+
+
+class SpellCompendium:
+    """
+    In-memory index of one spells directory, keyed by file stem.
+
+    Use get_spell_compendium() to share one instance per directory.
+
+    Args:
+        spells_path: Directory of enhanced spell files
+        file_suffix: Suffix of the spell files (stem + suffix = filename)
+        cache_dir: Where the persisted index is kept (None = don't persist)
+    """
+
+    def __init__(self, spells_path: Path, file_suffix: str = DEFAULT_FILE_SUFFIX,
+                 cache_dir: Optional[Path] = DEFAULT_CACHE_DIR):
+        self.spells_path = Path(spells_path)
+        self.file_suffix = file_suffix
+        self.cache_path = None
+        if cache_dir is not None:
+            digest = hashlib.sha1(f"{self.spells_path.resolve()}|{file_suffix}".encode('utf-8')).hexdigest()[:12]
+            self.cache_path = Path(cache_dir) / f"spell_compendium_{digest}.pickle"
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._spells: Dict[str, SpellEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._spells)
+
+    def __contains__(self, stem: str) -> bool:
+        return stem in self._spells
+
+    def get(self, stem: str) -> Optional[SpellEntry]:
+        """Indexed spell for a file stem, or None if there is no such file."""
+        return self._spells.get(stem)
+
+    def refresh(self) -> None:
+        """Load or rebuild the index if the directory changed since it was built."""
+        with self._lock:
+            signature = self._directory_signature()
+            if signature == self._signature:
+                return
+            if signature is None:
+                self._spells, self._signature = {}, None
+                return
+            if not self._load_cache(signature):
+                self._build(signature)
+                self._save_cache()
+
+    def _directory_signature(self) -> Optional[Tuple[int, int, int]]:
+        return spells_directory_signature(self.spells_path, self.file_suffix)
+
+    def _build(self, signature: Tuple[int, int, int]) -> None:
+        spells = {}
+        for path in self.spells_path.glob(f"*{self.file_suffix}"):
+            try:
+                spells[path.name[:-len(self.file_suffix)]] = parse_spell_file(path.read_text(encoding='utf-8'))
+            except (OSError, UnicodeDecodeError) as e:
+                logger.debug(f"Parser:   Failed to read enhanced spell file {path}: {e}")
+        self._spells, self._signature = spells, signature
+        logger.debug(f"Parser:   Indexed {len(spells)} enhanced spell files from {self.spells_path}")
+
+    def _load_cache(self, signature: Tuple[int, int, int]) -> bool:
+        if self.cache_path is None:
+            return False
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != INDEX_VERSION or tuple(cached.get('signature', ())) != signature:
+                return False
+            self._spells = {stem: SpellEntry(*fields) for stem, fields in cached['spells'].items()}
+            self._signature = signature
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.debug(f"Parser:   Ignoring unreadable spell index cache {self.cache_path}: {e}")
+            return False
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    'version': INDEX_VERSION,
+                    'signature': self._signature,
+                    'spells': {stem: tuple(entry) for stem, entry in self._spells.items()}
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Parser:   Failed to persist spell index cache {self.cache_path}: {e}")
+
+
+_compendiums: Dict[Tuple[str, str], SpellCompendium] = {}
+_compendiums_lock = threading.Lock()
+
+
+def get_spell_compendium(spells_path: str, file_suffix: str = DEFAULT_FILE_SUFFIX) -> SpellCompendium:
+    """
+    Get the process-wide, up-to-date compendium for a spells directory.
+
+    Checking freshness only stats the directory and its entries; spell files
+    are read only when the index has to be rebuilt.
+    """
+    key = (str(Path(spells_path).resolve()), file_suffix)
+    with _compendiums_lock:
+        if key not in _compendiums:
+            _compendiums[key] = SpellCompendium(Path(key[0]), file_suffix)
+        compendium = _compendiums[key]
+    compendium.refresh()
+    return compendium
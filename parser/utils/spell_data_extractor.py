@@ -15,9 +15,13 @@ Key fixes:
 
 import logging
 import re
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from .spell_compendium import (
+    SpellCompendium, get_spell_compendium, spell_file_stem,
+    process_spell_images, clean_enhanced_spell_content
+)
+
 
 class SpellDataExtractor:
     """
@@ -48,6 +52,19 @@ class SpellDataExtractor:
         self.rule_version = rule_version
         self.character_feats = character_feats or []
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._compendium: Optional[SpellCompendium] = None
+    
+    @property
+    def compendium(self) -> Optional[SpellCompendium]:
+        """Shared index of the enhanced spell files (None without a spells path)."""
+        if self._compendium is None and self.spells_path:
+            self._compendium = get_spell_compendium(self.spells_path)
+        return self._compendium
+    
+    def has_enhanced_spell_file(self, spell: Dict[str, Any]) -> bool:
+        """Check if an enhanced spell file exists for this spell."""
+        compendium = self.compendium
+        return compendium is not None and spell_file_stem(spell.get('name', '')) in compendium
     
     def extract_components(self, spell: Dict[str, Any], combat_data: Dict[str, Any] = None) -> str:
         """Extract spell components with v6.0.0 combat data support."""
@@ -123,34 +140,13 @@ class SpellDataExtractor:
         return "V, S"
     
     def _get_enhanced_spell_components(self, spell: Dict[str, Any]) -> str:
-        """Get components from enhanced spell file."""
-        if not self.spells_path:
+        """Get components from enhanced spell file (frontmatter first, then description)."""
+        compendium = self.compendium
+        if compendium is None:
             return ""
-            
-        spell_name = spell.get('name', '').lower().replace(' ', '-').replace("'", "")
-        spell_file = Path(self.spells_path) / f"{spell_name}-xphb.md"
         
-        if not spell_file.exists():
-            return ""
-        
-        try:
-            with open(spell_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Look for components in the frontmatter
-            components_match = re.search(r'^components:\s*(.+)$', content, re.MULTILINE)
-            if components_match:
-                return components_match.group(1).strip()
-            
-            # Look for components in the description
-            components_match = re.search(r'\*\*Components:\*\*\s*([^\n]+)', content)
-            if components_match:
-                return components_match.group(1).strip()
-                
-        except Exception as e:
-            self.logger.debug(f"Parser:   Failed to read enhanced spell file {spell_file}: {e}")
-        
-        return ""
+        entry = compendium.get(spell_file_stem(spell.get('name', ''), strip_special=False))
+        return entry.components if entry else ""
     
     def extract_casting_time(self, spell: Dict[str, Any], combat_data: Dict[str, Any] = None) -> str:
         """Extract and clean casting time with v6.0.0 combat data support."""
@@ -462,123 +458,24 @@ class SpellDataExtractor:
                 else:
                     self.logger.debug(f"Parser:   Using enhanced spell data for {spell.get('name', '')} - character uses 2024 rules, spell isLegacy field missing")
             
-            # Try to load from enhanced spell file with proper naming
-            if self.spells_path:
-                spell_name = spell.get('name', '').lower().replace(' ', '-').replace("'", "")
-                # Remove special characters like v5.2.0 did
-                spell_name = re.sub(r'[^\w\-]', '', spell_name)
-                spell_file = Path(self.spells_path) / f"{spell_name}-xphb.md"
-                
-                if spell_file.exists():
-                    try:
-                        with open(spell_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Extract content after frontmatter
-                        if '---' in content:
-                            parts = content.split('---', 2)
-                            if len(parts) >= 3:
-                                description = parts[2].strip()
-                                # Process images to add size constraints
-                                description = self._process_spell_images(description)
-                                # Remove redundant spell title and metadata section
-                                description = self._clean_enhanced_spell_content(description)
-                                return description
-                        
-                        # If no frontmatter, use whole content
-                        content_processed = self._process_spell_images(content.strip())
-                        content_processed = self._clean_enhanced_spell_content(content_processed)
-                        return content_processed
-                        
-                    except Exception as e:
-                        self.logger.debug(f"Parser:   Failed to read enhanced spell file {spell_file}: {e}")
+            # Use the indexed enhanced spell file (body after frontmatter, images
+            # sized, redundant title and metadata section removed)
+            compendium = self.compendium
+            if compendium is not None:
+                entry = compendium.get(spell_file_stem(spell.get('name', '')))
+                if entry:
+                    return entry.description
         
         # Fall back to spell data description
         return spell.get('description', 'No description available.')
     
     def _process_spell_images(self, content: str) -> str:
         """Process images in spell content to add size constraints using correct Obsidian syntax."""
-        # Pattern to match markdown images: ![alt text](url#anchor)
-        image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        
-        def replace_image(match):
-            alt_text = match.group(1)
-            url_with_anchor = match.group(2)
-            
-            # Check if alt text already has size constraints (Obsidian format: ![alt|size](url))
-            if '|' in alt_text:
-                # Image already has size constraints in alt text, leave as is
-                return match.group(0)
-            
-            # Add size constraints to alt text using correct Obsidian syntax
-            if '#' in url_with_anchor:
-                url, anchor = url_with_anchor.rsplit('#', 1)
-                # Correct Obsidian syntax: size goes in alt text, not URL
-                return f'![{alt_text}|300]({url}#{anchor})'
-            else:
-                # No anchor, add size to alt text
-                return f'![{alt_text}|300]({url_with_anchor})'
-        
-        # Apply the replacement to all images
-        processed_content = re.sub(image_pattern, replace_image, content)
-        return processed_content
+        return process_spell_images(content)
     
     def _clean_enhanced_spell_content(self, content: str) -> str:
         """Remove redundant spell title and metadata section from enhanced spell content."""
-        # Pattern to match and remove the spell title section:
-        # # Spell Name
-        # *level, school*
-        # (optional image)
-        # - **Casting time:** ...
-        # - **Range:** ...
-        # - **Components:** ...
-        # - **Duration:** ...
-        
-        # Split content into lines for easier processing
-        lines = content.split('\n')
-        cleaned_lines = []
-        skip_mode = False
-        found_title = False
-        
-        for i, line in enumerate(lines):
-            # Check if this line starts the redundant section
-            if line.startswith('# ') and not found_title:
-                found_title = True
-                skip_mode = True
-                continue
-            
-            # Skip the spell level/school line (e.g., "*cantrip, Evocation*")
-            if skip_mode and line.strip().startswith('*') and line.strip().endswith('*') and ', ' in line:
-                continue
-            
-            # Skip image lines
-            if skip_mode and line.strip().startswith('!['):
-                continue
-            
-            # Skip empty lines while in skip mode
-            if skip_mode and line.strip() == '':
-                continue
-            
-            # Skip the component list section (lines starting with "- **")
-            if skip_mode and line.strip().startswith('- **') and any(comp in line for comp in ['Casting time:', 'Range:', 'Components:', 'Duration:']):
-                continue
-            
-            # If we've found content that's not part of the redundant section, exit skip mode
-            if skip_mode and line.strip() and not line.startswith('- **'):
-                skip_mode = False
-            
-            # Add the line if we're not in skip mode
-            if not skip_mode:
-                cleaned_lines.append(line)
-        
-        # Join the cleaned lines back together
-        cleaned_content = '\n'.join(cleaned_lines).strip()
-        
-        # Remove any leading empty lines
-        while cleaned_content.startswith('\n'):
-            cleaned_content = cleaned_content[1:]
-            
-        return cleaned_content
+        return clean_enhanced_spell_content(content)
     
     def _fix_image_path(self, url: str) -> str:
         """Fix image path separators for Windows compatibility."""
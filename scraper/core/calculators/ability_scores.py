@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -650,8 +651,7 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         racial_bonuses = {ability: 0 for ability in self.ability_names}
         
         # Check modifiers for racial bonuses first (common in test data)
-        modifiers = character_data.get('modifiers', {})
-        race_modifiers = modifiers.get('race', [])
+        race_modifiers = get_modifier_index(character_data).from_source('race')
 
         for modifier in race_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -695,8 +695,7 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         feat_bonuses = {ability: 0 for ability in self.ability_names}
 
         # Check modifiers for feat-based bonuses
-        modifiers = character_data.get('modifiers', {})
-        feat_modifiers = modifiers.get('feat', [])
+        feat_modifiers = get_modifier_index(character_data).from_source('feat')
 
         # Check for 2024 background ASI feats (componentId 1789182 = Sailor ASI)
         # These should only apply in 2024 rules, not 2014 rules
@@ -722,8 +721,7 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         asi_bonuses = {ability: 0 for ability in self.ability_names}
         
         # Check modifiers for class ASI bonuses (common in test data)
-        modifiers = character_data.get('modifiers', {})
-        class_modifiers = modifiers.get('class', [])
+        class_modifiers = get_modifier_index(character_data).from_source('class')
 
         for modifier in class_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -751,8 +749,7 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         item_bonuses = {ability: 0 for ability in self.ability_names}
         
         # Check modifiers for item-based bonuses
-        modifiers = character_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(character_data).from_source('item')
         
         for modifier in item_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -766,21 +763,12 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         """Calculate ability score bonuses from other sources."""
         other_bonuses = {ability: 0 for ability in self.ability_names}
         
-        # Check for other modifier sources
-        modifiers = character_data.get('modifiers', {})
-        
-        for source_type, modifier_list in modifiers.items():
-            if source_type in ['race', 'feat', 'item', 'class']:
-                continue  # Already handled
-                
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_ability_score_modifier(modifier):
-                    ability_name, bonus = self._extract_ability_modifier(modifier)
-                    if ability_name:
-                        other_bonuses[ability_name] += bonus
+        # Check for other modifier sources (race, feat, item and class are already handled)
+        for source_type, modifier in get_modifier_index(character_data).except_sources('race', 'feat', 'item', 'class'):
+            if self._is_ability_score_modifier(modifier):
+                ability_name, bonus = self._extract_ability_modifier(modifier)
+                if ability_name:
+                    other_bonuses[ability_name] += bonus
         
         return other_bonuses
     
@@ -795,21 +783,16 @@ class EnhancedAbilityScoreCalculator(RuleAwareCalculator, ICachedCalculator):
         set_modifiers = {ability: None for ability in self.ability_names}
 
         # Check all modifier sources for set modifiers
-        modifiers = character_data.get('modifiers', {})
 
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if self._is_ability_score_modifier(modifier) and modifier.get('type') == 'set':
-                    ability_name, set_value = self._extract_ability_modifier(modifier)
-                    if ability_name:
-                        restriction = modifier.get('restriction', '')
-                        set_modifiers[ability_name] = {
-                            'value': set_value,
-                            'restriction': restriction
-                        }
+        for source_type, modifier in get_modifier_index(character_data).by_type('set'):
+            if self._is_ability_score_modifier(modifier):
+                ability_name, set_value = self._extract_ability_modifier(modifier)
+                if ability_name:
+                    restriction = modifier.get('restriction', '')
+                    set_modifiers[ability_name] = {
+                        'value': set_value,
+                        'restriction': restriction
+                    }
 
         return set_modifiers
     
@@ -12,6 +12,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from .utils.modifier_index import get_modifier_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -305,8 +307,7 @@ class ActionAttackExtractor:
         damage_bonus = 0
 
         # Check for item modifiers that grant bonuses to unarmed attacks
-        modifiers = raw_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(raw_data).from_source('item')
 
         if not isinstance(item_modifiers, list):
             return (attack_bonus, damage_bonus)
@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -634,16 +635,11 @@ class EnhancedArmorClassCalculator(RuleAwareCalculator, ICachedCalculator):
     def _get_natural_armor_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get natural armor bonus from race or other sources."""
         # Check modifiers for natural armor bonuses
-        modifiers = character_data.get('modifiers', {})
         bonus = 0
         
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_natural_armor_modifier(modifier):
-                    bonus += modifier.get('value', 0)
+        index = get_modifier_index(character_data)
+        for _, modifier in index.by_subtype_containing('natural-armor', 'natural_armor'):
+            bonus += modifier.get('value', 0)
         
         return bonus
     
@@ -656,16 +652,14 @@ class EnhancedArmorClassCalculator(RuleAwareCalculator, ICachedCalculator):
     def _get_misc_ac_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get miscellaneous AC bonuses."""
         # Check modifiers for other AC bonuses
-        modifiers = character_data.get('modifiers', {})
         bonus = 0
         
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_ac_modifier(modifier) and not self._is_natural_armor_modifier(modifier):
-                    bonus += modifier.get('value', 0)
+        # Only modifiesTypeId 1 or an AC-like subtype can match
+        index = get_modifier_index(character_data)
+        candidates = index.merge(index.with_value('modifiesTypeId', 1), index.by_subtype_containing('armor-class', 'ac'))
+        for _, modifier in candidates:
+            if self._is_ac_modifier(modifier) and not self._is_natural_armor_modifier(modifier):
+                bonus += modifier.get('value', 0)
         
         return bonus
     
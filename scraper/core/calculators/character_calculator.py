@@ -5,6 +5,7 @@ Main character calculator facade with full dependency injection wiring.
 Coordinates all calculation services and coordinators to produce complete character data.
 """
 
+from dataclasses import replace
 from typing import Dict, Any, Optional
 import logging
 
@@ -19,6 +20,7 @@ from .services.calculation_pipeline import CalculationPipeline
 from .services.spell_service import SpellProcessingService
 from .services.spell_processor import EnhancedSpellProcessor
 from .factories.calculator_factory import CalculatorFactory
+from .interfaces.core import ICachedCalculator
 from .services.interfaces import CalculationContext, CalculationStatus
 from .utils.performance import monitor_performance
 
@@ -75,7 +77,12 @@ class CharacterCalculator(RuleAwareCalculator):
     
     def _create_calculation_pipeline(self) -> CalculationPipeline:
         """Create calculation pipeline with dependency management."""
-        pipeline = CalculationPipeline()
+        parallel = self.config_manager.get_config_value('performance', 'parallel_pipeline', default=False)
+        workers = self.config_manager.get_config_value('performance', 'pipeline_workers', default=4)
+        pipeline = CalculationPipeline(
+            execution_mode='parallel' if parallel else 'sequential',
+            max_workers=workers
+        )
         
         # Register coordinator execution stages with dependencies
         coordinators = self.calculation_service.list_coordinators()
@@ -127,7 +134,7 @@ class CharacterCalculator(RuleAwareCalculator):
             pipeline.register_stage(
                 'equipment', 
                 self.calculation_service.get_coordinator('equipment'), 
-                dependencies=['character_info']
+                dependencies=['character_info', 'abilities']
             )
         
         if 'resources' in coordinators:
@@ -326,6 +333,24 @@ class CharacterCalculator(RuleAwareCalculator):
         """
         return self.factory
     
+    def disable_result_caching(self) -> None:
+        """
+        Turn off the enhanced calculators' result caches.
+        
+        Call this before sharing one calculator across scrapes. The cache keys
+        only cover part of the payload (hit points ignore removedHitPoints, for
+        one), so a long-lived calculator would keep returning results from an
+        earlier payload, and the plain-dict caches are not safe to share
+        between scrape threads.
+        """
+        for name in self.calculation_service.list_coordinators():
+            coordinator = self.calculation_service.get_coordinator(name)
+            for calculator in vars(coordinator).values():
+                if isinstance(calculator, ICachedCalculator):
+                    calculator.config = replace(calculator.config, enable_caching=False)
+                    calculator.clear_cache()
+        self.logger.debug("Disabled calculator result caching")
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Perform health check of the calculator and all dependencies.
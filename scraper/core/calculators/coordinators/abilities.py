@@ -14,6 +14,7 @@ from ..ability_scores import EnhancedAbilityScoreCalculator
 from ..utils.data_transformer import EnhancedCalculatorDataTransformer
 from ..utils.performance import monitor_performance
 from ..utils.validation import validate_character_data
+from ..utils.modifier_index import get_modifier_index
 from ..services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 
 logger = logging.getLogger(__name__)
@@ -444,8 +445,7 @@ class AbilitiesCoordinator(ICoordinator):
         # Method 2: Check for racial ability score modifiers (for some races)
         # Only use this if no 2024 racial ASI choices are detected
         if not self._has_2024_racial_asi_choices(raw_data):
-            modifiers = raw_data.get('modifiers', {})
-            race_modifiers = modifiers.get('race', [])
+            race_modifiers = get_modifier_index(raw_data).from_source('race')
             
             for modifier in race_modifiers:
                 if self._is_ability_score_modifier(modifier):
@@ -463,8 +463,7 @@ class AbilitiesCoordinator(ICoordinator):
         feat_bonuses = {ability: 0 for ability in self.ability_names}
         
         # Check modifiers for feat-based ability score increases
-        modifiers = raw_data.get('modifiers', {})
-        feat_modifiers = modifiers.get('feat', [])
+        feat_modifiers = get_modifier_index(raw_data).from_source('feat')
         
         for modifier in feat_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -499,8 +498,7 @@ class AbilitiesCoordinator(ICoordinator):
                         self.logger.debug(f"2024 Racial ASI {ability_name}: +{bonus}")
         
         # Method 2: Check class modifiers for ASI improvements
-        modifiers = raw_data.get('modifiers', {})
-        class_modifiers = modifiers.get('class', [])
+        class_modifiers = get_modifier_index(raw_data).from_source('class')
         
         for modifier in class_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -525,8 +523,7 @@ class AbilitiesCoordinator(ICoordinator):
         item_set_modifiers = {}  # Track "set" type modifiers separately
 
         # Check modifiers for item-based ability score increases
-        modifiers = raw_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(raw_data).from_source('item')
 
         for modifier in item_modifiers:
             if self._is_ability_score_modifier(modifier):
@@ -585,21 +582,15 @@ class AbilitiesCoordinator(ICoordinator):
         other_bonuses = {ability: 0 for ability in self.ability_names}
         
         # Check for other modifier sources
-        modifiers = raw_data.get('modifiers', {})
-        
-        for source_type, modifier_list in modifiers.items():
+        for source_type, modifier in get_modifier_index(raw_data).all():
             if source_type in ['race', 'feat', 'item', 'class']:
                 continue  # Already handled in dedicated methods
-                
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_ability_score_modifier(modifier):
-                    ability_name, bonus = self._extract_ability_modifier(modifier)
-                    if ability_name:
-                        other_bonuses[ability_name] += bonus
-                        self.logger.debug(f"Other bonus {ability_name}: +{bonus} (source: {source_type})")
+            
+            if self._is_ability_score_modifier(modifier):
+                ability_name, bonus = self._extract_ability_modifier(modifier)
+                if ability_name:
+                    other_bonuses[ability_name] += bonus
+                    self.logger.debug(f"Other bonus {ability_name}: +{bonus} (source: {source_type})")
         
         return other_bonuses
     
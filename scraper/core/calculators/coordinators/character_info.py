@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from ..interfaces.coordination import ICoordinator
 from ..utils.performance import monitor_performance
 from ..utils.validation import validate_character_data
+from ..utils.modifier_index import get_modifier_index
 from ..services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from shared.models.character import CharacterClass, Species, Background
 
@@ -273,21 +274,17 @@ class CharacterInfoCoordinator(ICoordinator):
         When multiple sources grant the same sense, the highest value wins.
         """
         senses = {}
-        modifiers = raw_data.get('modifiers', {})
 
-        for modifier_list in modifiers.values():
-            if not isinstance(modifier_list, list):
+        for _, modifier in get_modifier_index(raw_data).all():
+            friendly_type = (modifier.get('friendlyTypeName') or '').lower()
+            if friendly_type != 'sense':
                 continue
-            for modifier in modifier_list:
-                friendly_type = (modifier.get('friendlyTypeName') or '').lower()
-                if friendly_type != 'sense':
-                    continue
-                sense_name = modifier.get('friendlySubtypeName', '')
-                value = modifier.get('value')
-                if sense_name and value and isinstance(value, (int, float)):
-                    key = sense_name.lower().replace(' ', '_')
-                    senses[key] = max(senses.get(key, 0), int(value))
-                    self.logger.debug(f"Sense: {sense_name} {value}ft")
+            sense_name = modifier.get('friendlySubtypeName', '')
+            value = modifier.get('value')
+            if sense_name and value and isinstance(value, (int, float)):
+                key = sense_name.lower().replace(' ', '_')
+                senses[key] = max(senses.get(key, 0), int(value))
+                self.logger.debug(f"Sense: {sense_name} {value}ft")
 
         return senses
 
@@ -19,6 +19,7 @@ from ..hit_points import EnhancedHitPointsCalculator
 from ..speed import EnhancedSpeedCalculator
 from ..action_attacks import ActionAttackExtractor
 from ..utils.data_transformer import EnhancedCalculatorDataTransformer
+from ..utils.modifier_index import get_modifier_index
 
 logger = logging.getLogger(__name__)
 
@@ -957,28 +958,23 @@ class CombatCoordinator(ICoordinator):
         breakdown_parts = [f"Dex {dex_mod:+d}"]
 
         # Check for initiative bonuses from modifiers
-        modifiers = raw_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if self._is_initiative_modifier(modifier):
-                    bonus = modifier.get('value', 0) or modifier.get('bonus', 0)
-                    bonus_types = modifier.get('bonusTypes', [])
-
-                    # bonusTypes [1] means proficiency bonus (e.g. Alert feat)
-                    if 1 in bonus_types and not bonus:
-                        bonus = proficiency_bonus
-                        source_name = self._get_modifier_source_name(raw_data, modifier, source_type)
-                        initiative_bonus += bonus
-                        breakdown_parts.append(f"{source_name} {bonus:+d}")
-                        self.logger.debug(f"Initiative proficiency bonus from {source_type}: +{bonus}")
-                    elif bonus != 0:
-                        source_name = modifier.get('friendlySubtypeName') or modifier.get('friendlyTypeName') or source_type
-                        initiative_bonus += bonus
-                        breakdown_parts.append(f"{source_name} {bonus:+d}")
-                        self.logger.debug(f"Initiative bonus from {source_type}: +{bonus}")
+        for source_type, modifier in get_modifier_index(raw_data).by_subtype_containing('initiative'):
+            if self._is_initiative_modifier(modifier):
+                bonus = modifier.get('value', 0) or modifier.get('bonus', 0)
+                bonus_types = modifier.get('bonusTypes', [])
+
+                # bonusTypes [1] means proficiency bonus (e.g. Alert feat)
+                if 1 in bonus_types and not bonus:
+                    bonus = proficiency_bonus
+                    source_name = self._get_modifier_source_name(raw_data, modifier, source_type)
+                    initiative_bonus += bonus
+                    breakdown_parts.append(f"{source_name} {bonus:+d}")
+                    self.logger.debug(f"Initiative proficiency bonus from {source_type}: +{bonus}")
+                elif bonus != 0:
+                    source_name = modifier.get('friendlySubtypeName') or modifier.get('friendlyTypeName') or source_type
+                    initiative_bonus += bonus
+                    breakdown_parts.append(f"{source_name} {bonus:+d}")
+                    self.logger.debug(f"Initiative bonus from {source_type}: +{bonus}")
 
         breakdown = ", ".join(breakdown_parts)
 
@@ -1045,17 +1041,12 @@ class CombatCoordinator(ICoordinator):
 
         # Check for speed modifiers
         total_speed = base_speed
-        modifiers = raw_data.get('modifiers', {})
-
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
 
-            for modifier in modifier_list:
-                if self._is_speed_modifier(modifier):
-                    bonus = modifier.get('value', 0) or modifier.get('bonus', 0)
-                    total_speed += bonus
-                    self.logger.debug(f"Speed modifier from {source_type}: +{bonus}")
+        for source_type, modifier in get_modifier_index(raw_data).by_subtype_containing('speed', 'movement'):
+            if self._is_speed_modifier(modifier):
+                bonus = modifier.get('value', 0) or modifier.get('bonus', 0)
+                total_speed += bonus
+                self.logger.debug(f"Speed modifier from {source_type}: +{bonus}")
 
         # Parse climbing speed from racial traits
         climbing_speed = 0
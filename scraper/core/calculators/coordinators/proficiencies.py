@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from ..interfaces.coordination import ICoordinator
 from ..utils.performance import monitor_performance
 from ..utils.validation import validate_character_data
+from ..utils.modifier_index import get_modifier_index
 from ..services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from ..proficiency import EnhancedProficiencyCalculator
 
@@ -420,21 +421,16 @@ class ProficienciesCoordinator(ICoordinator):
         skill_expertise = []
         
         # Extract from modifiers (D&D Beyond structure)
-        modifiers = raw_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
+        for source_type, modifier in get_modifier_index(raw_data).all():
+            if self._is_skill_proficiency_modifier(modifier):
+                skill_name = self._extract_skill_name_from_modifier(modifier)
+                if skill_name:
+                    skill_proficiencies.append({'name': skill_name})
                 
-            for modifier in modifier_list:
-                if self._is_skill_proficiency_modifier(modifier):
-                    skill_name = self._extract_skill_name_from_modifier(modifier)
-                    if skill_name:
-                        skill_proficiencies.append({'name': skill_name})
-                
-                if self._is_skill_expertise_modifier(modifier):
-                    skill_name = self._extract_skill_name_from_modifier(modifier)
-                    if skill_name:
-                        skill_expertise.append({'name': skill_name})
+            if self._is_skill_expertise_modifier(modifier):
+                skill_name = self._extract_skill_name_from_modifier(modifier)
+                if skill_name:
+                    skill_expertise.append({'name': skill_name})
         
         return {
             'skill_proficiencies': skill_proficiencies,
@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -548,8 +549,7 @@ class EnhancedEncumbranceCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_feat_capacity_modifier(self, character_data: Dict[str, Any]) -> int:
         """Get carrying capacity modifier from feats."""
-        modifiers = character_data.get('modifiers', {})
-        feat_modifiers = modifiers.get('feat', [])
+        feat_modifiers = get_modifier_index(character_data).from_source('feat')
         modifier = 0
         
         for mod in feat_modifiers:
@@ -560,8 +560,7 @@ class EnhancedEncumbranceCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_item_capacity_modifier(self, character_data: Dict[str, Any]) -> int:
         """Get carrying capacity modifier from magic items."""
-        modifiers = character_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(character_data).from_source('item')
         modifier = 0
         
         for mod in item_modifiers:
@@ -572,19 +571,12 @@ class EnhancedEncumbranceCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_misc_capacity_modifier(self, character_data: Dict[str, Any]) -> int:
         """Get miscellaneous carrying capacity modifiers."""
-        modifiers = character_data.get('modifiers', {})
         modifier = 0
         
-        for source_type, modifier_list in modifiers.items():
-            if source_type in ['feat', 'item', 'race', 'class']:
-                continue  # Already handled
-                
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for mod in modifier_list:
-                if self._is_carrying_capacity_modifier(mod):
-                    modifier += mod.get('value', 0)
+        # Feat, item, race and class modifiers are already handled
+        for source_type, mod in get_modifier_index(character_data).except_sources('feat', 'item', 'race', 'class'):
+            if self._is_carrying_capacity_modifier(mod):
+                modifier += mod.get('value', 0)
         
         return modifier
     
@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -577,27 +578,25 @@ class EnhancedHitPointsCalculator(RuleAwareCalculator, ICachedCalculator):
     def _get_ability_bonuses_from_modifiers(self, character_data: Dict[str, Any], ability_id: int, sub_type_pattern: str) -> int:
         """Get total bonuses to an ability score from all modifier sources."""
         total_bonus = 0
-        modifiers = character_data.get('modifiers', {})
 
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
+        # Only modifiers with the ability's subtype or statId can match
+        index = get_modifier_index(character_data)
+        candidates = index.merge(index.by_subtype(sub_type_pattern), index.with_value('statId', ability_id))
+        for source_type, modifier in candidates:
+            # Check if this modifier affects the specific ability
+            mod_sub_type = modifier.get('subType', '')
+            mod_stat_id = modifier.get('statId')
+            mod_type = modifier.get('type', '')
+
+            # Skip "set" type modifiers (those are handled elsewhere)
+            if mod_type == 'set':
                 continue
 
-            for modifier in modifier_list:
-                # Check if this modifier affects the specific ability
-                mod_sub_type = modifier.get('subType', '')
-                mod_stat_id = modifier.get('statId')
-                mod_type = modifier.get('type', '')
-
-                # Skip "set" type modifiers (those are handled elsewhere)
-                if mod_type == 'set':
-                    continue
-
-                # Check if this modifier matches the ability
-                if mod_sub_type == sub_type_pattern or mod_stat_id == ability_id:
-                    bonus = modifier.get('value', 0) or modifier.get('fixedValue', 0) or modifier.get('bonus', 0)
-                    if bonus:
-                        total_bonus += bonus
+            # Check if this modifier matches the ability
+            if mod_sub_type == sub_type_pattern or mod_stat_id == ability_id:
+                bonus = modifier.get('value', 0) or modifier.get('fixedValue', 0) or modifier.get('bonus', 0)
+                if bonus:
+                    total_bonus += bonus
 
         return total_bonus
     
@@ -730,8 +729,7 @@ class EnhancedHitPointsCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_feat_hp_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get HP bonus from feats (e.g., Tough)."""
-        modifiers = character_data.get('modifiers', {})
-        feat_modifiers = modifiers.get('feat', [])
+        feat_modifiers = get_modifier_index(character_data).from_source('feat')
         bonus = 0
 
         # Get total level for per-level bonuses
@@ -753,8 +751,7 @@ class EnhancedHitPointsCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_item_hp_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get HP bonus from magic items (only equipped/worn items)."""
-        modifiers = character_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(character_data).from_source('item')
         inventory = character_data.get('inventory', [])
         bonus = 0
 
@@ -780,8 +777,7 @@ class EnhancedHitPointsCalculator(RuleAwareCalculator, ICachedCalculator):
 
     def _get_race_hp_bonus(self, character_data: Dict[str, Any], total_level: int) -> int:
         """Get HP bonus from race/species features (e.g., Dwarf Toughness)."""
-        modifiers = character_data.get('modifiers', {})
-        race_modifiers = modifiers.get('race', [])
+        race_modifiers = get_modifier_index(character_data).from_source('race')
         bonus = 0
 
         for modifier in race_modifiers:
@@ -799,19 +795,12 @@ class EnhancedHitPointsCalculator(RuleAwareCalculator, ICachedCalculator):
 
     def _get_misc_hp_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get HP bonus from other sources."""
-        modifiers = character_data.get('modifiers', {})
         bonus = 0
         
-        for source_type, modifier_list in modifiers.items():
-            if source_type in ['feat', 'item', 'class', 'race']:
-                continue  # Already handled
-                
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_hp_modifier(modifier):
-                    bonus += modifier.get('value', 0)
+        # Feat, item, class and race modifiers are already handled
+        for source_type, modifier in get_modifier_index(character_data).except_sources('feat', 'item', 'class', 'race'):
+            if self._is_hp_modifier(modifier):
+                bonus += modifier.get('value', 0)
         
         return bonus
     
@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import contains_any, get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -33,6 +34,14 @@ GAMING_SETS = {
     'dice set', 'dragonchess set', 'playing card set', 'three-dragon ante set',
 }
 
+# Friendly subtype names accepted as languages without a 'language' keyword
+EXACT_LANGUAGES = {
+    'common', 'elvish', 'draconic', 'dwarvish', 'halfling', 'gnomish',
+    'giant', 'goblin', 'orc', "thieves' cant", 'celestial', 'infernal', 'abyssal',
+}
+
+TOOL_KEYWORDS = ('supplies', 'kit', 'tools', 'set', 'instrument', 'utensil')
+
 
 @dataclass
 class ProficiencyData:
@@ -687,51 +696,46 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         item_bonuses = []
 
         # Check modifiers for ability check bonuses (Stone of Good Luck, etc.)
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                # Look for ability check bonuses
-                if modifier.get('subType') == 'ability-checks' and modifier.get('isGranted', False):
-                    bonus = modifier.get('fixedValue') or modifier.get('value', 0)
-                    if bonus:
-                        # Find item name from componentId and check if equipped
-                        component_id = modifier.get('componentId')
-                        item_name = "Unknown Item"
-                        is_equipped = False
-
-                        if component_id:
-                            # Search inventory for the item - try both raw and enhanced format
-                            inventory = character_data.get('inventory', [])
-                            equipment = character_data.get('equipment', {})
-                            enhanced_equipment = equipment.get('enhanced_equipment', [])
-
-                            # Check raw inventory format
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_name = item['definition'].get('name', 'Unknown Item')
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('ability-checks'):
+            # Look for ability check bonuses
+            if modifier.get('isGranted', False):
+                bonus = modifier.get('fixedValue') or modifier.get('value', 0)
+                if bonus:
+                    # Find item name from componentId and check if equipped
+                    component_id = modifier.get('componentId')
+                    item_name = "Unknown Item"
+                    is_equipped = False
+
+                    if component_id:
+                        # Search inventory for the item - try both raw and enhanced format
+                        inventory = character_data.get('inventory', [])
+                        equipment = character_data.get('equipment', {})
+                        enhanced_equipment = equipment.get('enhanced_equipment', [])
+
+                        # Check raw inventory format
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_name = item['definition'].get('name', 'Unknown Item')
+                                is_equipped = item.get('equipped', False)
+                                break
+
+                        # Check enhanced equipment format if not found
+                        if not is_equipped and item_name == "Unknown Item":
+                            for item in enhanced_equipment:
+                                # Enhanced format uses definition_key like "112130694:4773"
+                                def_key = item.get('definition_key', '')
+                                if str(component_id) in def_key:
+                                    item_name = item.get('name', 'Unknown Item')
                                     is_equipped = item.get('equipped', False)
                                     break
 
-                            # Check enhanced equipment format if not found
-                            if not is_equipped and item_name == "Unknown Item":
-                                for item in enhanced_equipment:
-                                    # Enhanced format uses definition_key like "112130694:4773"
-                                    def_key = item.get('definition_key', '')
-                                    if str(component_id) in def_key:
-                                        item_name = item.get('name', 'Unknown Item')
-                                        is_equipped = item.get('equipped', False)
-                                        break
-
-                        # Only add bonus if item is equipped
-                        if is_equipped:
-                            ability_check_bonus += bonus
-                            item_bonuses.append({'name': item_name, 'bonus': bonus})
-                            self.logger.debug(f"Found ability check bonus from equipped {item_name}: +{bonus}")
-                        else:
-                            self.logger.debug(f"Ignoring ability check bonus from unequipped {item_name}: +{bonus}")
+                    # Only add bonus if item is equipped
+                    if is_equipped:
+                        ability_check_bonus += bonus
+                        item_bonuses.append({'name': item_name, 'bonus': bonus})
+                        self.logger.debug(f"Found ability check bonus from equipped {item_name}: +{bonus}")
+                    else:
+                        self.logger.debug(f"Ignoring ability check bonus from unequipped {item_name}: +{bonus}")
 
         return ability_check_bonus, item_bonuses
 
@@ -751,51 +755,46 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         item_bonuses = []
 
         # Check modifiers for saving throw bonuses (Stone of Good Luck, etc.)
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                # Look for saving throw bonuses
-                if modifier.get('subType') == 'saving-throws' and modifier.get('isGranted', False):
-                    bonus = modifier.get('fixedValue') or modifier.get('value', 0)
-                    if bonus:
-                        # Find item name from componentId and check if equipped
-                        component_id = modifier.get('componentId')
-                        item_name = "Unknown Item"
-                        is_equipped = False
-
-                        if component_id:
-                            # Search inventory for the item - try both raw and enhanced format
-                            inventory = character_data.get('inventory', [])
-                            equipment = character_data.get('equipment', {})
-                            enhanced_equipment = equipment.get('enhanced_equipment', [])
-
-                            # Check raw inventory format
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_name = item['definition'].get('name', 'Unknown Item')
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('saving-throws'):
+            # Look for saving throw bonuses
+            if modifier.get('isGranted', False):
+                bonus = modifier.get('fixedValue') or modifier.get('value', 0)
+                if bonus:
+                    # Find item name from componentId and check if equipped
+                    component_id = modifier.get('componentId')
+                    item_name = "Unknown Item"
+                    is_equipped = False
+
+                    if component_id:
+                        # Search inventory for the item - try both raw and enhanced format
+                        inventory = character_data.get('inventory', [])
+                        equipment = character_data.get('equipment', {})
+                        enhanced_equipment = equipment.get('enhanced_equipment', [])
+
+                        # Check raw inventory format
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_name = item['definition'].get('name', 'Unknown Item')
+                                is_equipped = item.get('equipped', False)
+                                break
+
+                        # Check enhanced equipment format if not found
+                        if not is_equipped and item_name == "Unknown Item":
+                            for item in enhanced_equipment:
+                                # Enhanced format uses definition_key like "112130694:4773"
+                                def_key = item.get('definition_key', '')
+                                if str(component_id) in def_key:
+                                    item_name = item.get('name', 'Unknown Item')
                                     is_equipped = item.get('equipped', False)
                                     break
 
-                            # Check enhanced equipment format if not found
-                            if not is_equipped and item_name == "Unknown Item":
-                                for item in enhanced_equipment:
-                                    # Enhanced format uses definition_key like "112130694:4773"
-                                    def_key = item.get('definition_key', '')
-                                    if str(component_id) in def_key:
-                                        item_name = item.get('name', 'Unknown Item')
-                                        is_equipped = item.get('equipped', False)
-                                        break
-
-                        # Only add bonus if item is equipped
-                        if is_equipped:
-                            saving_throw_bonus += bonus
-                            item_bonuses.append({'name': item_name, 'bonus': bonus})
-                            self.logger.debug(f"Found saving throw bonus from equipped {item_name}: +{bonus}")
-                        else:
-                            self.logger.debug(f"Ignoring saving throw bonus from unequipped {item_name}: +{bonus}")
+                    # Only add bonus if item is equipped
+                    if is_equipped:
+                        saving_throw_bonus += bonus
+                        item_bonuses.append({'name': item_name, 'bonus': bonus})
+                        self.logger.debug(f"Found saving throw bonus from equipped {item_name}: +{bonus}")
+                    else:
+                        self.logger.debug(f"Ignoring saving throw bonus from unequipped {item_name}: +{bonus}")
 
         return saving_throw_bonus, item_bonuses
 
@@ -992,22 +991,22 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         skill_sources = {}  # Track where each skill proficiency comes from
 
         # Extract skill proficiencies from modifiers (D&D Beyond API structure)
-        modifiers = character_data.get('modifiers', {})
-
-        # Process modifiers from all sources
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
 
-            for modifier in modifier_list:
-                if self._is_skill_proficiency_modifier(modifier):
-                    skill_name = self._extract_skill_from_modifier(modifier)
-                    if skill_name:
-                        proficient_skills.add(skill_name)
-                        # Store the source (first one wins if multiple sources)
-                        if skill_name not in skill_sources:
-                            skill_sources[skill_name] = source_type
-                        logger.debug(f"Found skill proficiency: {skill_name} (source: {source_type})")
+        # Only modifiers with a skill/proficiency subtype or type name can match
+        index = get_modifier_index(character_data)
+        candidates = index.merge(
+            index.by_subtype_containing('skill', 'proficiency'),
+            index.where('friendlyTypeName', contains_any('skill', 'proficiency'))
+        )
+        for source_type, modifier in candidates:
+            if self._is_skill_proficiency_modifier(modifier):
+                skill_name = self._extract_skill_from_modifier(modifier)
+                if skill_name:
+                    proficient_skills.add(skill_name)
+                    # Store the source (first one wins if multiple sources)
+                    if skill_name not in skill_sources:
+                        skill_sources[skill_name] = source_type
+                    logger.debug(f"Found skill proficiency: {skill_name} (source: {source_type})")
 
         return proficient_skills, skill_sources
     
@@ -1040,24 +1039,19 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         proficient_saves = set()
         
         # Extract saving throw proficiencies from modifiers (D&D Beyond API structure)
-        modifiers = character_data.get('modifiers', {})
         
-        # Process modifiers from all sources
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_saving_throw_modifier(modifier):
-                    ability_name = self._extract_saving_throw_from_modifier(modifier)
-                    if ability_name:
-                        # For saving throw proficiencies, use a targeted approach based on actual D&D Beyond UI behavior
-                        # Since the API vs UI discrepancy is specific to multiclass saving throws
-                        if self._should_allow_saving_throw_proficiency(modifier, character_data):
-                            proficient_saves.add(ability_name)
-                            logger.debug(f"Found saving throw proficiency: {ability_name} (source: {source_type})")
-                        else:
-                            logger.debug(f"Rejected saving throw proficiency: {ability_name} (source: {source_type}) - does not match D&D Beyond UI behavior")
+        # Saving throw proficiencies are type="proficiency" modifiers
+        for source_type, modifier in get_modifier_index(character_data).by_type('proficiency'):
+            if self._is_saving_throw_modifier(modifier):
+                ability_name = self._extract_saving_throw_from_modifier(modifier)
+                if ability_name:
+                    # For saving throw proficiencies, use a targeted approach based on actual D&D Beyond UI behavior
+                    # Since the API vs UI discrepancy is specific to multiclass saving throws
+                    if self._should_allow_saving_throw_proficiency(modifier, character_data):
+                        proficient_saves.add(ability_name)
+                        logger.debug(f"Found saving throw proficiency: {ability_name} (source: {source_type})")
+                    else:
+                        logger.debug(f"Rejected saving throw proficiency: {ability_name} (source: {source_type}) - does not match D&D Beyond UI behavior")
         
         return proficient_saves
     
@@ -1190,26 +1184,28 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         instruments = []
         seen = set()
 
-        modifiers = character_data.get('modifiers', {})
-
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
 
-            for modifier in modifier_list:
-                if self._is_tool_or_instrument_modifier(modifier):
-                    name = self._extract_tool_from_modifier(modifier, source_type, character_data)
-                    if name and name not in seen:
-                        seen.add(name)
-                        if name.lower() in MUSICAL_INSTRUMENTS:
-                            instruments.append(name)
-                            logger.debug(f"Musical instrument proficiency: {name} (source: {source_type})")
-                        elif name.lower() in GAMING_SETS:
-                            gaming_sets.append(name)
-                            logger.debug(f"Gaming set proficiency: {name} (source: {source_type})")
-                        else:
-                            tools.append(name)
-                            logger.debug(f"Tool proficiency: {name} (source: {source_type})")
+        index = get_modifier_index(character_data)
+        tool_keyword = contains_any(*TOOL_KEYWORDS)
+        candidates = index.merge(
+            index.where('friendlySubtypeName', lambda value: tool_keyword(value) or (
+                isinstance(value, str) and value.lower() in MUSICAL_INSTRUMENTS | GAMING_SETS)),
+            index.where('friendlyTypeName', contains_any('tool'))
+        )
+        for source_type, modifier in candidates:
+            if self._is_tool_or_instrument_modifier(modifier):
+                name = self._extract_tool_from_modifier(modifier, source_type, character_data)
+                if name and name not in seen:
+                    seen.add(name)
+                    if name.lower() in MUSICAL_INSTRUMENTS:
+                        instruments.append(name)
+                        logger.debug(f"Musical instrument proficiency: {name} (source: {source_type})")
+                    elif name.lower() in GAMING_SETS:
+                        gaming_sets.append(name)
+                        logger.debug(f"Gaming set proficiency: {name} (source: {source_type})")
+                    else:
+                        tools.append(name)
+                        logger.debug(f"Tool proficiency: {name} (source: {source_type})")
 
         return sorted(tools), sorted(gaming_sets), sorted(instruments)
 
@@ -1224,20 +1220,20 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         seen_languages = set()
         
         # Check for languages in modifiers
-        modifiers = character_data.get('modifiers', {})
-        
-        # Process modifiers from different sources
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-            
-            for modifier in modifier_list:
-                if self._is_language_modifier(modifier):
-                    lang_name = self._extract_language_from_modifier(modifier, source_type, character_data)
-                    if lang_name and lang_name != 'Unknown Language' and lang_name not in seen_languages:
-                        languages.append(lang_name)
-                        seen_languages.add(lang_name)
-                        logger.debug(f"Language proficiency: {lang_name} (source: {source_type})")
+        index = get_modifier_index(character_data)
+        candidates = index.merge(
+            index.by_subtype_containing('language'),
+            index.where('friendlySubtypeName', lambda value: isinstance(value, str) and (
+                'language' in value.lower() or value.lower() in EXACT_LANGUAGES)),
+            index.where('friendlyTypeName', contains_any('language'))
+        )
+        for source_type, modifier in candidates:
+            if self._is_language_modifier(modifier):
+                lang_name = self._extract_language_from_modifier(modifier, source_type, character_data)
+                if lang_name and lang_name != 'Unknown Language' and lang_name not in seen_languages:
+                    languages.append(lang_name)
+                    seen_languages.add(lang_name)
+                    logger.debug(f"Language proficiency: {lang_name} (source: {source_type})")
         
         # Check race/species features for languages
         for data_key in ['race', 'species']:
@@ -1284,11 +1280,8 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
             return True
         
         # Check for exact language matches (not partial matches to avoid false positives)
-        exact_languages = ['common', 'elvish', 'draconic', 'dwarvish', 'halfling', 'gnomish', 
-                          'giant', 'goblin', 'orc', "thieves' cant", 'celestial', 'infernal', 'abyssal']
-        
         # Only match if the friendly subtype is exactly one of these languages
-        is_language = friendly_subtype in exact_languages
+        is_language = friendly_subtype in EXACT_LANGUAGES
         if is_language:
             logger.debug(f"Detected language modifier by exact match: {friendly_subtype}")
         
@@ -1451,50 +1444,38 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         }
         
         # Extract weapon proficiencies from modifiers
-        modifiers = character_data.get('modifiers', {})
         
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
+        for source_type, modifier in get_modifier_index(character_data).by_type('proficiency'):
+            # Must be granted
+            if not modifier.get('isGranted'):
                 continue
-                
-            for modifier in modifier_list:
-                if not isinstance(modifier, dict):
-                    continue
                     
-                # Only accept proficiency type modifiers
-                if modifier.get('type') != 'proficiency':
-                    continue
-                    
-                # Must be granted
-                if not modifier.get('isGranted'):
-                    continue
-                    
-                subtype = modifier.get('subType', '')
-                friendly_name = modifier.get('friendlySubtypeName', '')
-                modifier_subtype_id = modifier.get('modifierSubTypeId', 0)
+            subtype = modifier.get('subType', '')
+            friendly_name = modifier.get('friendlySubtypeName', '')
+            modifier_subtype_id = modifier.get('modifierSubTypeId', 0)
                 
-                # Use modifierSubTypeId to identify weapon proficiencies
-                # Based on D&D Beyond data: weapon proficiencies appear to have IDs 260+
-                # and exclude saving throws (220s) and skills (240s)
-                if modifier_subtype_id < 260 or modifier_subtype_id in range(220, 250):
-                    continue
+            # Use modifierSubTypeId to identify weapon proficiencies
+            # Based on D&D Beyond data: weapon proficiencies appear to have IDs 260+
+            # and exclude saving throws (220s) and skills (240s)
+            if modifier_subtype_id < 260 or modifier_subtype_id in range(220, 250):
+                continue
                 
-                # Additional check: must contain weapon-related keywords in subType
-                weapon_keywords = ['weapon', 'rapier', 'shortsword', 'crossbow', 'simple-weapons', 'martial-weapons']
-                if not any(keyword in subtype.lower() for keyword in weapon_keywords):
-                    continue
+            # Additional check: must contain weapon-related keywords in subType
+            weapon_keywords = ['weapon', 'rapier', 'shortsword', 'crossbow', 'simple-weapons', 'martial-weapons']
+            if not any(keyword in subtype.lower() for keyword in weapon_keywords):
+                continue
                 
-                # Apply multiclass validation for weapon proficiencies
-                if not self._should_allow_weapon_proficiency(modifier, character_data):
-                    logger.debug(f"Rejected weapon proficiency due to multiclass rules: {friendly_name} (source: {source_type})")
-                    continue
+            # Apply multiclass validation for weapon proficiencies
+            if not self._should_allow_weapon_proficiency(modifier, character_data):
+                logger.debug(f"Rejected weapon proficiency due to multiclass rules: {friendly_name} (source: {source_type})")
+                continue
                 
-                # Use the friendlySubtypeName as it matches D&D Beyond exactly
-                weapon_name = friendly_name or subtype.replace('-', ' ').title()
-                if weapon_name not in seen_weapons:
-                    weapon_proficiencies.append(weapon_name)
-                    seen_weapons.add(weapon_name)
-                    logger.debug(f"Weapon proficiency: {weapon_name} (ID: {modifier_subtype_id}, source: {source_type})")
+            # Use the friendlySubtypeName as it matches D&D Beyond exactly
+            weapon_name = friendly_name or subtype.replace('-', ' ').title()
+            if weapon_name not in seen_weapons:
+                weapon_proficiencies.append(weapon_name)
+                seen_weapons.add(weapon_name)
+                logger.debug(f"Weapon proficiency: {weapon_name} (ID: {modifier_subtype_id}, source: {source_type})")
         
         return sorted(weapon_proficiencies)
 
@@ -1604,34 +1585,22 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         seen_armor = set()
         
         # Extract armor proficiencies from modifiers
-        modifiers = character_data.get('modifiers', {})
         
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
+        for source_type, modifier in get_modifier_index(character_data).by_type('proficiency'):
+            # Must be granted
+            if not modifier.get('isGranted'):
                 continue
-                
-            for modifier in modifier_list:
-                if not isinstance(modifier, dict):
-                    continue
-                    
-                # Only accept proficiency type modifiers
-                if modifier.get('type') != 'proficiency':
-                    continue
-                    
-                # Must be granted
-                if not modifier.get('isGranted'):
-                    continue
                     
-                subtype = modifier.get('subType', '')
+            subtype = modifier.get('subType', '')
                 
-                # Check for armor proficiencies
-                armor_types = ['light-armor', 'medium-armor', 'heavy-armor', 'shields']
-                if subtype in armor_types:
-                    armor_name = subtype.replace('-', ' ').title()
-                    if armor_name not in seen_armor:
-                        armor_proficiencies.append(armor_name)
-                        seen_armor.add(armor_name)
-                        logger.debug(f"Armor proficiency: {armor_name} (source: {source_type})")
+            # Check for armor proficiencies
+            armor_types = ['light-armor', 'medium-armor', 'heavy-armor', 'shields']
+            if subtype in armor_types:
+                armor_name = subtype.replace('-', ' ').title()
+                if armor_name not in seen_armor:
+                    armor_proficiencies.append(armor_name)
+                    seen_armor.add(armor_name)
+                    logger.debug(f"Armor proficiency: {armor_name} (source: {source_type})")
         
         return sorted(armor_proficiencies)
     
@@ -1640,19 +1609,20 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         expertise_skills = []
         
         # Extract expertise from modifiers (D&D Beyond API structure)
-        modifiers = character_data.get('modifiers', {})
         
-        # Process modifiers from all sources
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_expertise_modifier(modifier):
-                    skill_name = self._extract_skill_from_modifier(modifier)
-                    if skill_name:
-                        expertise_skills.append(skill_name)
-                        logger.debug(f"Found skill expertise: {skill_name} (source: {source_type})")
+        # Only modifiers with an expertise type or subtype name can match
+        index = get_modifier_index(character_data)
+        expertise_name = contains_any('expertise', 'double')
+        candidates = index.merge(
+            index.where('friendlyTypeName', expertise_name),
+            index.where('friendlySubtypeName', expertise_name)
+        )
+        for source_type, modifier in candidates:
+            if self._is_expertise_modifier(modifier):
+                skill_name = self._extract_skill_from_modifier(modifier)
+                if skill_name:
+                    expertise_skills.append(skill_name)
+                    logger.debug(f"Found skill expertise: {skill_name} (source: {source_type})")
         
         return expertise_skills
     
@@ -1707,12 +1677,9 @@ class EnhancedProficiencyCalculator(RuleAwareCalculator, ICachedCalculator):
         if friendly_subtype in GAMING_SETS:
             return True
 
-        # Tool keywords to look for
-        tool_keywords = ['supplies', 'kit', 'tools', 'set', 'instrument', 'utensil']
-
         # Check if it's a tool type or contains tool keywords
         return ('tool' in friendly_type or
-                any(keyword in friendly_subtype for keyword in tool_keywords))
+                any(keyword in friendly_subtype for keyword in TOOL_KEYWORDS))
     
     def _extract_tool_from_modifier(self, modifier: Dict[str, Any], source_type: str, character_data: Dict[str, Any]) -> Optional[str]:
         """Extract tool name from a modifier."""
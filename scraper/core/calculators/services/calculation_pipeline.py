@@ -8,12 +8,15 @@ order while handling dependencies and error recovery.
 
 from typing import Dict, Any, List, Optional, Set
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dataclasses import dataclass, field
 from datetime import datetime
 import time
 
 from ..interfaces.coordination import ICoordinator
 from ..utils.performance import monitor_performance
+from ..utils.modifier_index import activate_modifier_index
 from .interfaces import CalculationContext, CalculationResult, CalculationStatus
 
 logger = logging.getLogger(__name__)
@@ -25,10 +28,33 @@ class PipelineStage:
     name: str
     coordinator: ICoordinator
     dependencies: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StageExecution:
+    """State of one stage within a single pipeline execution."""
     executed: bool = False
     result: Optional[CalculationResult] = None
     execution_time: Optional[float] = None
     error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class PipelineExecution:
+    """
+    Per-run state for one CalculationPipeline.execute call.
+    
+    Keeping this off the pipeline lets one pipeline (and the coordinator
+    stack behind it) serve several characters concurrently.
+    """
+    context: Optional[CalculationContext]
+    stages: Dict[str, StageExecution]
+    start_time: float = field(default_factory=time.time)
+    results: Dict[str, Any] = field(default_factory=dict)
+    # Guards results and context.metadata writes from concurrent stages
+    lock: threading.Lock = field(default_factory=threading.Lock)
 
 
 class CalculationPipeline:
@@ -38,24 +64,51 @@ class CalculationPipeline:
     This pipeline orchestrates the execution of multiple coordinators
     in the correct order based on their dependencies. It provides
     error handling, performance monitoring, and result aggregation.
+    
+    In "parallel" execution mode, stages whose dependencies have completed
+    are scheduled concurrently on a thread pool instead of one at a time.
     """
     
-    def __init__(self):
-        """Initialize the calculation pipeline."""
+    EXECUTION_MODES = ('sequential', 'parallel')
+    
+    def __init__(self, execution_mode: str = 'sequential', max_workers: int = 4):
+        """
+        Initialize the calculation pipeline.
+        
+        Args:
+            execution_mode: "sequential" (default) or "parallel"
+            max_workers: Thread pool width for parallel execution
+        """
+        if execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {execution_mode}. Use one of {self.EXECUTION_MODES}")
+        
         self.stages: Dict[str, PipelineStage] = {}
         self.execution_order: List[str] = []
+        self.execution_mode = execution_mode
+        self.max_workers = max(1, max_workers)
         self.logger = logging.getLogger(self.__class__.__name__)
         
-        # Pipeline state
-        self.is_executing = False
-        self.execution_results: Dict[str, Any] = {}
-        self.execution_context: Optional[CalculationContext] = None
+        # Shared state; per-run state lives in PipelineExecution
+        self._state_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.active_executions = 0
+        self.last_execution: Optional[PipelineExecution] = None
         
         # Performance tracking
         self.execution_times: List[float] = []
         self.total_executions = 0
         self.successful_executions = 0
     
+    @property
+    def is_executing(self) -> bool:
+        """Whether any execution is currently in progress."""
+        return self.active_executions > 0
+    
+    @property
+    def execution_results(self) -> Dict[str, Any]:
+        """Results of the most recently completed execution."""
+        return self.last_execution.results if self.last_execution else {}
+    
     def register_stage(self, name: str, coordinator: ICoordinator, dependencies: List[str] = None):
         """
         Register a calculation stage with dependencies.
@@ -145,6 +198,9 @@ class CalculationPipeline:
         """
         Execute the calculation pipeline.
         
+        Safe to call concurrently from several threads: each call gets its own
+        PipelineExecution, so callers must pass their own context.
+        
         Args:
             raw_data: Raw character data to process
             context: Optional calculation context
@@ -152,72 +208,135 @@ class CalculationPipeline:
         Returns:
             Dictionary containing results from all stages
         """
-        if self.is_executing:
-            raise RuntimeError("Pipeline is already executing")
+        execution = PipelineExecution(
+            context=context,
+            stages={name: StageExecution() for name in self.stages}
+        )
         
-        start_time = time.time()
-        self.is_executing = True
-        self.execution_context = context
-        self.execution_results = {}
+        with self._state_lock:
+            self.active_executions += 1
         
         try:
-            # Reset stage execution state
-            for stage in self.stages.values():
-                stage.executed = False
-                stage.result = None
-                stage.execution_time = None
-                stage.error = None
-            
             # Validate dependencies before execution
             self._validate_dependencies()
             
-            # Execute stages in dependency order
-            for stage_name in self.execution_order:
-                if stage_name not in self.stages:
-                    self.logger.warning(f"Stage '{stage_name}' not found in pipeline")
-                    continue
-                
-                stage = self.stages[stage_name]
-                
-                # Check if dependencies are satisfied
-                if not self._are_dependencies_satisfied(stage):
-                    error_msg = f"Dependencies not satisfied for stage '{stage_name}'"
-                    self.logger.error(error_msg)
-                    stage.error = error_msg
-                    continue
-                
-                # Execute stage
-                self._execute_stage(stage, raw_data, context)
+            # Index modifiers once so calculators query buckets instead of rescanning
+            with activate_modifier_index(raw_data):
+                if self.execution_mode == 'parallel':
+                    self._execute_parallel(raw_data, execution)
+                else:
+                    self._execute_sequential(raw_data, execution)
             
             # Aggregate results
-            self._aggregate_results()
+            self._aggregate_results(execution)
             
             # Update performance metrics
-            execution_time = time.time() - start_time
-            self.execution_times.append(execution_time)
-            self.total_executions += 1
+            execution_time = time.time() - execution.start_time
+            failed_stages = [name for name, state in execution.stages.items() if state.error]
+            
+            with self._state_lock:
+                self.execution_times.append(execution_time)
+                self.total_executions += 1
+                if not failed_stages:
+                    self.successful_executions += 1
+                self.last_execution = execution
             
             # Check if execution was successful
-            failed_stages = [name for name, stage in self.stages.items() if stage.error]
             if not failed_stages:
-                self.successful_executions += 1
                 self.logger.info(f"Pipeline execution completed successfully in {execution_time:.3f}s")
             else:
                 self.logger.error(f"Pipeline execution completed with {len(failed_stages)} failed stages: {failed_stages}")
             
-            return self.execution_results
+            return execution.results
             
         except Exception as e:
             self.logger.error(f"Pipeline execution failed: {str(e)}")
             raise
         
         finally:
-            self.is_executing = False
-            self.execution_context = None
+            with self._state_lock:
+                self.active_executions -= 1
+    
+    def _execute_sequential(self, raw_data: Dict[str, Any], execution: PipelineExecution):
+        """Execute stages one at a time in dependency order."""
+        for stage_name in self.execution_order:
+            if stage_name not in self.stages:
+                self.logger.warning(f"Stage '{stage_name}' not found in pipeline")
+                continue
+            
+            stage = self.stages[stage_name]
+            
+            # Check if dependencies are satisfied
+            if not self._are_dependencies_satisfied(stage, execution):
+                error_msg = f"Dependencies not satisfied for stage '{stage_name}'"
+                self.logger.error(error_msg)
+                execution.stages[stage_name].error = error_msg
+                continue
+            
+            # Execute stage
+            self._execute_stage(stage, raw_data, execution)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the shared stage thread pool, creating it on first use."""
+        with self._state_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='pipeline'
+                )
+            return self._executor
+    
+    def _execute_parallel(self, raw_data: Dict[str, Any], execution: PipelineExecution):
+        """
+        Execute stages concurrently as soon as their dependencies complete.
+        
+        Ready stages are submitted in execution_order, so priority still decides
+        which ready stage starts first when the pool is saturated.
+        """
+        pool = self._get_executor()
+        pending = [name for name in self.execution_order if name in self.stages]
+        running = {}
+        finished: Set[str] = set()
+        
+        while pending or running:
+            for stage_name in list(pending):
+                stage = self.stages[stage_name]
+                if not all(dep in finished for dep in stage.dependencies):
+                    continue
+                
+                pending.remove(stage_name)
+                if not self._are_dependencies_satisfied(stage, execution):
+                    error_msg = f"Dependencies not satisfied for stage '{stage_name}'"
+                    self.logger.error(error_msg)
+                    execution.stages[stage_name].error = error_msg
+                    finished.add(stage_name)
+                else:
+                    future = pool.submit(self._execute_stage, stage, raw_data, execution)
+                    running[future] = stage_name
+            
+            if not running:
+                # Remaining stages can never become ready
+                for stage_name in pending:
+                    execution.stages[stage_name].error = f"Dependencies not satisfied for stage '{stage_name}'"
+                    self.logger.error(execution.stages[stage_name].error)
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished.add(running.pop(future))
+    
+    def shutdown(self):
+        """Release the parallel stage thread pool."""
+        with self._state_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
     
-    def _execute_stage(self, stage: PipelineStage, raw_data: Dict[str, Any], context: CalculationContext):
+    def _execute_stage(self, stage: PipelineStage, raw_data: Dict[str, Any], execution: PipelineExecution):
         """Execute a single pipeline stage."""
+        state = execution.stages[stage.name]
+        context = execution.context
         stage_start_time = time.time()
+        state.started_at = stage_start_time
         
         try:
             self.logger.debug(f"Executing stage: {stage.name}")
@@ -225,47 +344,52 @@ class CalculationPipeline:
             # Check if coordinator can handle the data
             if not stage.coordinator.can_coordinate(raw_data):
                 self.logger.warning(f"Coordinator for stage '{stage.name}' cannot handle input data")
-                stage.error = "Coordinator cannot handle input data"
+                state.error = "Coordinator cannot handle input data"
                 return
             
             # Execute coordinator
             result = stage.coordinator.coordinate(raw_data, context or CalculationContext())
             
             # Store result
-            stage.result = result
-            stage.execution_time = time.time() - stage_start_time
-            stage.executed = True
+            state.result = result
+            state.execution_time = time.time() - stage_start_time
             
             # Handle result
             if result.status == CalculationStatus.COMPLETED:
-                self.execution_results[stage.name] = result.data
-                
-                # Add result to context for dependent stages
-                if context and hasattr(context, 'metadata'):
-                    if not context.metadata:
-                        context.metadata = {}
-                    context.metadata[stage.name] = result.data
+                with execution.lock:
+                    execution.results[stage.name] = result.data
+                    
+                    # Add result to context for dependent stages
+                    if context and hasattr(context, 'metadata'):
+                        if not context.metadata:
+                            context.metadata = {}
+                        context.metadata[stage.name] = result.data
                 
                 self.logger.debug(f"Stage '{stage.name}' completed successfully")
             else:
                 error_msg = f"Stage '{stage.name}' failed: {'; '.join(result.errors)}"
-                stage.error = error_msg
+                state.error = error_msg
                 self.logger.error(error_msg)
             
+            state.executed = True
+            
         except Exception as e:
-            stage.error = f"Stage execution error: {str(e)}"
-            stage.execution_time = time.time() - stage_start_time
+            state.error = f"Stage execution error: {str(e)}"
+            state.execution_time = time.time() - stage_start_time
             self.logger.error(f"Error executing stage '{stage.name}': {str(e)}")
+        
+        finally:
+            state.finished_at = time.time()
     
-    def _are_dependencies_satisfied(self, stage: PipelineStage) -> bool:
-        """Check if all dependencies for a stage are satisfied."""
+    def _are_dependencies_satisfied(self, stage: PipelineStage, execution: PipelineExecution) -> bool:
+        """Check if all dependencies for a stage are satisfied within an execution."""
         for dep_name in stage.dependencies:
-            if dep_name not in self.stages:
+            if dep_name not in self.stages or dep_name not in execution.stages:
                 self.logger.error(f"Dependency '{dep_name}' not found for stage '{stage.name}'")
                 return False
             
-            dep_stage = self.stages[dep_name]
-            if not dep_stage.executed or dep_stage.error:
+            dep_state = execution.stages[dep_name]
+            if not dep_state.executed or dep_state.error:
                 return False
         
         return True
@@ -286,27 +410,79 @@ class CalculationPipeline:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
     
-    def _aggregate_results(self):
+    def _aggregate_results(self, execution: PipelineExecution):
         """Aggregate results from all executed stages."""
-        # Results are already being stored in execution_results during stage execution
+        # Results are already being stored in execution.results during stage execution
         # This method can be extended for custom aggregation logic
+        states = execution.stages
+        start_time = execution.start_time
+        critical_path, critical_path_time = self._compute_critical_path(execution)
         
         # Add metadata about pipeline execution
-        self.execution_results['_pipeline_metadata'] = {
-            'total_stages': len(self.stages),
-            'executed_stages': len([s for s in self.stages.values() if s.executed]),
-            'failed_stages': len([s for s in self.stages.values() if s.error]),
+        execution.results['_pipeline_metadata'] = {
+            'total_stages': len(states),
+            'executed_stages': len([s for s in states.values() if s.executed]),
+            'failed_stages': len([s for s in states.values() if s.error]),
             'execution_order': self.execution_order,
+            'execution_mode': self.execution_mode,
             'stage_times': {
-                name: stage.execution_time 
-                for name, stage in self.stages.items() 
-                if stage.execution_time is not None
-            }
+                name: state.execution_time 
+                for name, state in states.items() 
+                if state.execution_time is not None
+            },
+            'stage_timeline': {
+                name: {
+                    'start': state.started_at - start_time,
+                    'end': state.finished_at - start_time
+                }
+                for name, state in states.items()
+                if state.started_at is not None and state.finished_at is not None
+            },
+            'critical_path': critical_path,
+            'critical_path_time': critical_path_time,
+            'wall_time': time.time() - start_time
         }
     
+    def _compute_critical_path(self, execution: PipelineExecution):
+        """
+        Find the dependency chain with the largest summed stage time.
+        
+        This is the lower bound on pipeline latency however wide the pool is.
+        
+        Returns:
+            Tuple of (stage names along the path, total time in seconds)
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        
+        for name in self.execution_order:
+            state = execution.stages.get(name)
+            if state is None or state.execution_time is None:
+                continue
+            
+            best_dep, best_finish = None, 0.0
+            for dep in self.stages[name].dependencies:
+                if finish.get(dep, 0.0) > best_finish:
+                    best_dep, best_finish = dep, finish[dep]
+            
+            finish[name] = best_finish + state.execution_time
+            previous[name] = best_dep
+        
+        if not finish:
+            return [], 0.0
+        
+        end = max(finish, key=finish.get)
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        
+        return list(reversed(path)), finish[end]
+    
     def get_stage_result(self, stage_name: str) -> Optional[CalculationResult]:
         """
-        Get the result of a specific stage.
+        Get the result of a specific stage from the last completed execution.
         
         Args:
             stage_name: Name of the stage
@@ -314,13 +490,14 @@ class CalculationPipeline:
         Returns:
             Stage result or None if not found/executed
         """
-        if stage_name in self.stages:
-            return self.stages[stage_name].result
+        execution = self.last_execution
+        if execution and stage_name in execution.stages:
+            return execution.stages[stage_name].result
         return None
     
     def get_stage_status(self, stage_name: str) -> Dict[str, Any]:
         """
-        Get the status of a specific stage.
+        Get the status of a specific stage in the last completed execution.
         
         Args:
             stage_name: Name of the stage
@@ -332,13 +509,21 @@ class CalculationPipeline:
             return {'status': 'not_found'}
         
         stage = self.stages[stage_name]
+        execution = self.last_execution
+        state = execution.stages.get(stage_name) if execution else None
+        if state is None:
+            state = StageExecution()
+        
         return {
-            'status': 'completed' if stage.executed and not stage.error else 'failed' if stage.error else 'pending',
-            'executed': stage.executed,
-            'execution_time': stage.execution_time,
-            'error': stage.error,
+            'status': 'completed' if state.executed and not state.error else 'failed' if state.error else 'pending',
+            'executed': state.executed,
+            'execution_time': state.execution_time,
+            'error': state.error,
             'dependencies': stage.dependencies,
-            'dependencies_satisfied': self._are_dependencies_satisfied(stage) if not stage.executed else True
+            'dependencies_satisfied': (
+                self._are_dependencies_satisfied(stage, execution)
+                if execution and not state.executed else True
+            )
         }
     
     def get_execution_summary(self) -> Dict[str, Any]:
@@ -355,6 +540,7 @@ class CalculationPipeline:
         return {
             'total_stages': len(self.stages),
             'execution_order': self.execution_order,
+            'execution_mode': self.execution_mode,
             'stages': stage_statuses,
             'is_executing': self.is_executing,
             'performance': {
@@ -375,13 +561,9 @@ class CalculationPipeline:
         return list(self.stages.keys())
     
     def clear_results(self):
-        """Clear all execution results and reset stage state."""
-        self.execution_results = {}
-        for stage in self.stages.values():
-            stage.executed = False
-            stage.result = None
-            stage.execution_time = None
-            stage.error = None
+        """Forget the last execution's results and stage state."""
+        with self._state_lock:
+            self.last_execution = None
         
         self.logger.debug("Pipeline results cleared")
     
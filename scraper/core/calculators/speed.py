@@ -17,6 +17,7 @@ from .interfaces.core import (
 from .services.interfaces import CalculationContext, CalculationResult, CalculationStatus
 from .utils.math import DnDMath, MathUtils
 from .utils.validation import CharacterDataValidator
+from .utils.modifier_index import get_modifier_index
 from .base import RuleAwareCalculator
 from ..rules.version_manager import RuleVersionManager
 
@@ -557,8 +558,7 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_feat_speed_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get speed bonuses from feats."""
-        modifiers = character_data.get('modifiers', {})
-        feat_modifiers = modifiers.get('feat', [])
+        feat_modifiers = get_modifier_index(character_data).from_source('feat')
         bonus = 0
         
         for modifier in feat_modifiers:
@@ -569,8 +569,7 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
 
     def _get_item_speed_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get speed bonuses from magic items."""
-        modifiers = character_data.get('modifiers', {})
-        item_modifiers = modifiers.get('item', [])
+        item_modifiers = get_modifier_index(character_data).from_source('item')
         bonus = 0
 
         for modifier in item_modifiers:
@@ -587,19 +586,12 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
     
     def _get_misc_speed_bonus(self, character_data: Dict[str, Any]) -> int:
         """Get miscellaneous speed bonuses."""
-        modifiers = character_data.get('modifiers', {})
         bonus = 0
         
-        for source_type, modifier_list in modifiers.items():
-            if source_type in ['feat', 'item', 'class', 'race']:
-                continue  # Already handled
-                
-            if not isinstance(modifier_list, list):
-                continue
-                
-            for modifier in modifier_list:
-                if self._is_speed_modifier(modifier):
-                    bonus += (modifier.get('value') or 0)
+        # Feat, item, class and race modifiers are already handled
+        for source_type, modifier in get_modifier_index(character_data).except_sources('feat', 'item', 'class', 'race'):
+            if self._is_speed_modifier(modifier):
+                bonus += (modifier.get('value') or 0)
         
         return bonus
     
@@ -652,35 +644,30 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
         # Check modifiers for climbing speed (from race or items)
         # D&D Beyond stores this as subType: 'innate-speed-climbing'
         # When fixedValue/value is None, it means climbing speed equals walking speed
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if modifier.get('subType') == 'innate-speed-climbing' and modifier.get('isGranted', False):
-                    # Check if this is from an equipped item
-                    if source_type == 'item':
-                        component_id = modifier.get('componentId')
-                        if component_id:
-                            # Check if item is equipped
-                            inventory = character_data.get('inventory', [])
-                            item_equipped = False
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_equipped = item.get('equipped', False)
-                                    break
-
-                            if not item_equipped:
-                                continue  # Skip unequipped items
-
-                    # Get climbing speed value
-                    speed_value = modifier.get('fixedValue') or modifier.get('value')
-                    if speed_value is None:
-                        # None means climbing speed equals walking speed
-                        return walking_speed
-                    else:
-                        return speed_value
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('innate-speed-climbing'):
+            if modifier.get('isGranted', False):
+                # Check if this is from an equipped item
+                if source_type == 'item':
+                    component_id = modifier.get('componentId')
+                    if component_id:
+                        # Check if item is equipped
+                        inventory = character_data.get('inventory', [])
+                        item_equipped = False
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_equipped = item.get('equipped', False)
+                                break
+
+                        if not item_equipped:
+                            continue  # Skip unequipped items
+
+                # Get climbing speed value
+                speed_value = modifier.get('fixedValue') or modifier.get('value')
+                if speed_value is None:
+                    # None means climbing speed equals walking speed
+                    return walking_speed
+                else:
+                    return speed_value
 
         # Check for class features that grant climbing speed
         classes = character_data.get('classes', [])
@@ -714,31 +701,26 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
 
         # Check modifiers for swimming speed (from race or items)
         # D&D Beyond stores this as subType: 'innate-speed-swimming'
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if modifier.get('subType') == 'innate-speed-swimming' and modifier.get('isGranted', False):
-                    # Check if this is from an equipped item
-                    if source_type == 'item':
-                        component_id = modifier.get('componentId')
-                        if component_id:
-                            # Check if item is equipped
-                            inventory = character_data.get('inventory', [])
-                            item_equipped = False
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_equipped = item.get('equipped', False)
-                                    break
-
-                            if not item_equipped:
-                                continue  # Skip unequipped items
-
-                    # Get swimming speed value
-                    speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
-                    return speed_value
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('innate-speed-swimming'):
+            if modifier.get('isGranted', False):
+                # Check if this is from an equipped item
+                if source_type == 'item':
+                    component_id = modifier.get('componentId')
+                    if component_id:
+                        # Check if item is equipped
+                        inventory = character_data.get('inventory', [])
+                        item_equipped = False
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_equipped = item.get('equipped', False)
+                                break
+
+                        if not item_equipped:
+                            continue  # Skip unequipped items
+
+                # Get swimming speed value
+                speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
+                return speed_value
 
         return 0
     
@@ -765,31 +747,26 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
 
         # Check modifiers for flying speed (from race or items)
         # D&D Beyond stores this as subType: 'innate-speed-flying'
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if modifier.get('subType') == 'innate-speed-flying' and modifier.get('isGranted', False):
-                    # Check if this is from an equipped item
-                    if source_type == 'item':
-                        component_id = modifier.get('componentId')
-                        if component_id:
-                            # Check if item is equipped
-                            inventory = character_data.get('inventory', [])
-                            item_equipped = False
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_equipped = item.get('equipped', False)
-                                    break
-
-                            if not item_equipped:
-                                continue  # Skip unequipped items
-
-                    # Get flying speed value
-                    speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
-                    return speed_value
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('innate-speed-flying'):
+            if modifier.get('isGranted', False):
+                # Check if this is from an equipped item
+                if source_type == 'item':
+                    component_id = modifier.get('componentId')
+                    if component_id:
+                        # Check if item is equipped
+                        inventory = character_data.get('inventory', [])
+                        item_equipped = False
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_equipped = item.get('equipped', False)
+                                break
+
+                        if not item_equipped:
+                            continue  # Skip unequipped items
+
+                # Get flying speed value
+                speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
+                return speed_value
 
         return 0
     
@@ -807,31 +784,26 @@ class EnhancedSpeedCalculator(RuleAwareCalculator, ICachedCalculator):
 
         # Check modifiers for burrowing speed (from race or items)
         # D&D Beyond stores this as subType: 'innate-speed-burrowing'
-        modifiers = character_data.get('modifiers', {})
-        for source_type, modifier_list in modifiers.items():
-            if not isinstance(modifier_list, list):
-                continue
-
-            for modifier in modifier_list:
-                if modifier.get('subType') == 'innate-speed-burrowing' and modifier.get('isGranted', False):
-                    # Check if this is from an equipped item
-                    if source_type == 'item':
-                        component_id = modifier.get('componentId')
-                        if component_id:
-                            # Check if item is equipped
-                            inventory = character_data.get('inventory', [])
-                            item_equipped = False
-                            for item in inventory:
-                                if item.get('definition', {}).get('id') == component_id:
-                                    item_equipped = item.get('equipped', False)
-                                    break
-
-                            if not item_equipped:
-                                continue  # Skip unequipped items
-
-                    # Get burrowing speed value
-                    speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
-                    return speed_value
+        for source_type, modifier in get_modifier_index(character_data).by_subtype('innate-speed-burrowing'):
+            if modifier.get('isGranted', False):
+                # Check if this is from an equipped item
+                if source_type == 'item':
+                    component_id = modifier.get('componentId')
+                    if component_id:
+                        # Check if item is equipped
+                        inventory = character_data.get('inventory', [])
+                        item_equipped = False
+                        for item in inventory:
+                            if item.get('definition', {}).get('id') == component_id:
+                                item_equipped = item.get('equipped', False)
+                                break
+
+                        if not item_equipped:
+                            continue  # Skip unequipped items
+
+                # Get burrowing speed value
+                speed_value = modifier.get('fixedValue') or modifier.get('value', 0)
+                return speed_value
 
         return 0
     
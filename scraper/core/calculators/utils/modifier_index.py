@@ -0,0 +1,216 @@
+"""
+Pre-indexed modifier lookups for the calculator system.
+
+D&D Beyond groups a character's modifiers into source buckets (race, class,
+background, item, feat, condition). Most calculators only want modifiers of a
+given type/subType or from a given component, so instead of each calculator
+re-walking every bucket, the pipeline builds one ModifierIndex per execution
+and calculators query it.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional, Tuple, Iterator
+
+logger = logging.getLogger(__name__)
+
+# (source bucket name, raw modifier dict)
+SourcedModifier = Tuple[str, Dict[str, Any]]
+
+
+def contains_any(*needles: str) -> Callable[[Any], bool]:
+    """Value test for ModifierIndex.where: a string whose lowercase form contains any needle."""
+    return lambda value: isinstance(value, str) and any(needle in value.lower() for needle in needles)
+
+
+class ModifierIndex:
+    """
+    Read-only index over a character's raw ``modifiers`` buckets.
+
+    Modifiers are bucketed by source, ``type``, ``subType``, (type, subType)
+    and ``componentId``. Every lookup returns entries in the original
+    source/list order, so replacing a linear scan with a lookup preserves
+    the order in which bonuses were previously applied.
+    """
+
+    def __init__(self, modifiers: Optional[Dict[str, Any]]):
+        self._by_source: Dict[str, List[Dict[str, Any]]] = {}
+        self._all: List[SourcedModifier] = []
+        self._by_type: Dict[str, List[SourcedModifier]] = defaultdict(list)
+        self._by_subtype: Dict[str, List[SourcedModifier]] = defaultdict(list)
+        self._by_type_subtype: Dict[Tuple[str, str], List[SourcedModifier]] = defaultdict(list)
+        self._by_component: Dict[Any, List[SourcedModifier]] = defaultdict(list)
+        # field -> value -> modifiers, built on first use by where()/with_value()
+        self._by_field: Dict[str, Dict[Any, List[SourcedModifier]]] = {
+            'type': self._by_type, 'subType': self._by_subtype
+        }
+
+        if not isinstance(modifiers, dict):
+            return
+
+        for source, modifier_list in modifiers.items():
+            if not isinstance(modifier_list, list):
+                continue
+
+            bucket = [m for m in modifier_list if isinstance(m, dict)]
+            self._by_source[source] = bucket
+
+            for modifier in bucket:
+                entry = (source, modifier)
+                self._all.append(entry)
+
+                mod_type = modifier.get('type')
+                sub_type = modifier.get('subType')
+                self._by_type[mod_type].append(entry)
+                self._by_subtype[sub_type].append(entry)
+                self._by_type_subtype[(mod_type, sub_type)].append(entry)
+
+                component_id = modifier.get('componentId')
+                if component_id is not None:
+                    self._by_component[component_id].append(entry)
+
+    @classmethod
+    def from_character_data(cls, character_data: Dict[str, Any]) -> 'ModifierIndex':
+        """Build an index from raw character data."""
+        return cls(character_data.get('modifiers', {}))
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def sources(self) -> List[str]:
+        """Source bucket names, in payload order."""
+        return list(self._by_source)
+
+    def from_source(self, source: str) -> List[Dict[str, Any]]:
+        """All modifiers in one source bucket (e.g. 'item', 'race')."""
+        return self._by_source.get(source, [])
+
+    def all(self) -> List[SourcedModifier]:
+        """Every modifier with its source bucket, in payload order."""
+        return self._all
+
+    def by_type(self, mod_type: str) -> List[SourcedModifier]:
+        """Modifiers with the given ``type`` (e.g. 'bonus', 'proficiency')."""
+        return self._by_type.get(mod_type, [])
+
+    def by_subtype(self, sub_type: str) -> List[SourcedModifier]:
+        """Modifiers with the given ``subType`` (e.g. 'armor-class')."""
+        return self._by_subtype.get(sub_type, [])
+
+    def by_type_and_subtype(self, mod_type: str, sub_type: str) -> List[SourcedModifier]:
+        """Modifiers matching both ``type`` and ``subType``."""
+        return self._by_type_subtype.get((mod_type, sub_type), [])
+
+    def by_subtype_containing(self, *needles: str) -> List[SourcedModifier]:
+        """
+        Modifiers whose lowercased ``subType`` contains any of the needles.
+
+        Only the distinct subType keys are tested, not every modifier.
+        """
+        return self.where('subType', contains_any(*needles))
+
+    def with_value(self, field: str, value: Any) -> List[SourcedModifier]:
+        """Modifiers whose ``field`` equals value (e.g. statId, modifiesTypeId)."""
+        return self._field_groups(field).get(value, [])
+
+    def where(self, field: str, test: Callable[[Any], bool]) -> List[SourcedModifier]:
+        """
+        Modifiers whose ``field`` value passes test, in payload order.
+
+        The test runs once per distinct value of the field, not per modifier.
+        """
+        return self.merge(*(entries for value, entries in self._field_groups(field).items() if test(value)))
+
+    def except_sources(self, *sources: str) -> List[SourcedModifier]:
+        """Modifiers from every source bucket except the given ones."""
+        return [
+            (source, modifier)
+            for source, bucket in self._by_source.items() if source not in sources
+            for modifier in bucket
+        ]
+
+    def merge(self, *lookups: List[SourcedModifier]) -> List[SourcedModifier]:
+        """
+        Union of several lookup results, in payload order.
+
+        A modifier matched by more than one lookup is returned once, so a
+        merged lookup visits the same modifiers as the linear scan it replaces.
+        """
+        lookups = [lookup for lookup in lookups if lookup]
+        if not lookups:
+            return []
+        if len(lookups) == 1:
+            return lookups[0]
+
+        matched = set()
+        for lookup in lookups:
+            matched.update(id(modifier) for _, modifier in lookup)
+        return [entry for entry in self._all if id(entry[1]) in matched]
+
+    def _field_groups(self, field: str) -> Dict[Any, List[SourcedModifier]]:
+        groups = self._by_field.get(field)
+        if groups is None:
+            # Built outside any lock: concurrent first uses build identical groups
+            groups = defaultdict(list)
+            for entry in self._all:
+                groups[entry[1].get(field)].append(entry)
+            self._by_field[field] = groups
+        return groups
+
+    def by_component(self, component_id: Any) -> List[SourcedModifier]:
+        """Modifiers granted by one component (item, feat, class feature...)."""
+        return self._by_component.get(component_id, [])
+
+
+# Indexes for payloads currently being calculated, keyed by id() of the raw
+# ``modifiers`` dict. Calculators only receive (often transformed copies of)
+# the raw data, but those copies share the same modifiers object, so this
+# lets them find the index the pipeline built without threading it through
+# every signature.
+_active_indexes: Dict[int, Tuple[Any, ModifierIndex, int]] = {}
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def activate_modifier_index(character_data: Dict[str, Any]) -> Iterator[ModifierIndex]:
+    """
+    Build an index for a payload and make it visible to get_modifier_index
+    for the duration of the block.
+
+    Concurrent or nested activations for the same modifiers share one index.
+    """
+    modifiers = character_data.get('modifiers')
+    key = id(modifiers)
+    with _active_lock:
+        entry = _active_indexes.get(key)
+        if entry is not None and entry[0] is modifiers:
+            index = entry[1]
+            _active_indexes[key] = (modifiers, index, entry[2] + 1)
+        else:
+            index = ModifierIndex(modifiers)
+            _active_indexes[key] = (modifiers, index, 1)
+    try:
+        yield index
+    finally:
+        with _active_lock:
+            held, index, count = _active_indexes[key]
+            if count > 1:
+                _active_indexes[key] = (held, index, count - 1)
+            else:
+                del _active_indexes[key]
+
+
+def get_modifier_index(character_data: Dict[str, Any]) -> ModifierIndex:
+    """
+    Get the modifier index for a payload.
+
+    Returns the index activated by the running pipeline when there is one,
+    otherwise builds a throwaway index (calculators used standalone).
+    """
+    modifiers = character_data.get('modifiers')
+    entry = _active_indexes.get(id(modifiers))
+    if entry is not None and entry[0] is modifiers:
+        return entry[1]
+    return ModifierIndex(modifiers)
@@ -0,0 +1,330 @@
+"""
+Async D&D Beyond API client implementation.
+
+Uses a single pooled aiohttp session so many characters can be fetched
+concurrently over reused keep-alive connections.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+import aiohttp
+
+from shared.config.settings import Settings
+from .dndbeyond_client import DNDBeyondClientBase, AUTH_SERVICE_URL, TOKEN_REFRESH_BUFFER
+from .rate_limiter import TokenBucketRateLimiter
+from .exceptions import (
+    CharacterNotFoundError, APIError, ValidationError, RateLimitError, TimeoutError
+)
+
+logger = logging.getLogger(__name__)
+
+PARTY_INVENTORY_URL = "https://character-service.dndbeyond.com/character/v5/party/inventory/{}"
+INFUSION_ITEMS_URL = "https://character-service.dndbeyond.com/character/v5/infusion/items/{}"
+KNOWN_INFUSIONS_URL = "https://character-service.dndbeyond.com/character/v5/known-infusions/{}"
+
+# Same statuses the synchronous client's urllib3 Retry strategy retries
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncDNDBeyondClient(DNDBeyondClientBase):
+    """
+    Async D&D Beyond API client with connection pooling.
+
+    Mirrors DNDBeyondClient's endpoints and exception mapping. Use as an
+    async context manager, or call close() when done:
+
+        async with AsyncDNDBeyondClient(rate_limiter=limiter) as client:
+            data = await client.fetch_character_data(12345678)
+    """
+
+    def __init__(self, user_agent: Optional[str] = None, cobalt_token: Optional[str] = None,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 max_connections: int = 10, keepalive_timeout: float = 60.0):
+        self.settings = Settings()
+        if user_agent:
+            self.settings.user_agent = user_agent
+
+        # Cobalt session token: explicit param > env var/config
+        self.cobalt_token = cobalt_token or self.settings.cobalt_token or ''
+
+        # Bearer token cache; the lock coalesces concurrent refreshes into one exchange
+        self._bearer_token = None
+        self._bearer_expires_at = 0
+        self._token_lock = asyncio.Lock()
+
+        # Rate limiting (falls back to a private bucket paced by min_request_delay)
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.from_delay(
+            self.settings.min_request_delay
+        )
+
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        logger.info(f"Async DNDBeyond client initialized with base URL: {self.settings.api_base_url}")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.settings.api_timeout),
+                headers={
+                    'User-Agent': self.settings.user_agent,
+                    'Accept': 'application/json',
+                    'Accept-Language': 'en-US,en;q=0.9'
+                }
+            )
+            if self.cobalt_token:
+                logger.info("Cobalt session token configured (private character access enabled)")
+        return self.session
+
+    def _bearer_token_valid(self) -> bool:
+        return bool(self._bearer_token) and time.time() < self._bearer_expires_at
+
+    async def _get_bearer_token(self) -> Optional[str]:
+        """
+        Get a valid bearer token, refreshing via auth-service if needed.
+
+        Concurrent callers that find the token expired wait on a single
+        refresh instead of each performing their own token exchange.
+
+        Returns:
+            Bearer token string, or None if no cobalt token configured
+        """
+        if not self.cobalt_token:
+            return None
+
+        if self._bearer_token_valid():
+            return self._bearer_token
+
+        async with self._token_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._bearer_token_valid():
+                return self._bearer_token
+
+            logger.info("Exchanging CobaltSession for bearer token via auth-service")
+
+            try:
+                async with self._get_session().post(
+                    AUTH_SERVICE_URL,
+                    headers={
+                        'Cookie': f'CobaltSession={self.cobalt_token}',
+                        'Content-Type': 'application/json',
+                    }
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        self._bearer_token = data.get('token', '')
+                        ttl = data.get('ttl', 300)
+                        self._bearer_expires_at = time.time() + ttl - TOKEN_REFRESH_BUFFER
+                        logger.info(f"Bearer token obtained (TTL: {ttl}s)")
+                        return self._bearer_token
+
+                    text = await response.text()
+                    logger.error(
+                        f"Auth-service token exchange failed (HTTP {response.status}): "
+                        f"{text[:200]}"
+                    )
+                    return None
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Auth-service request failed: {e}")
+                return None
+
+    async def _get_auth_headers(self) -> Dict[str, str]:
+        """Get authorization headers for API requests."""
+        bearer = await self._get_bearer_token()
+        if bearer:
+            return {'Authorization': f'Bearer {bearer}'}
+        return {}
+
+    async def _get(self, url: str) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Perform a rate-limited GET with retries on transient statuses.
+
+        Returns:
+            Tuple of (status, parsed JSON for 200 or response text otherwise, headers)
+
+        Raises:
+            asyncio.TimeoutError: Request timed out
+            aiohttp.ClientError: Connection-level failure
+        """
+        session = self._get_session()
+
+        for attempt in range(self.settings.api_retries + 1):
+            await self.rate_limiter.acquire_async()
+
+            logger.debug(f"Making request to: {url}")
+            async with session.get(url, headers=await self._get_auth_headers()) as response:
+                if response.status in RETRY_STATUSES and attempt < self.settings.api_retries:
+                    if response.status == 429:
+                        delay = float(response.headers.get('Retry-After', 2 ** attempt))
+                    else:
+                        delay = 2 ** attempt
+                    logger.debug(f"HTTP {response.status} from {url}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status == 200:
+                    payload = await response.json(content_type=None)
+                else:
+                    payload = await response.text()
+                return response.status, payload, dict(response.headers)
+
+        # Unreachable: the final attempt always returns
+        raise APIError(0, f"Request to {url} exhausted retries")
+
+    async def fetch_character_data(self, character_id: int, session_cookie: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch character data from D&D Beyond API.
+
+        Args:
+            character_id: The character ID to fetch
+            session_cookie: Ignored; authentication uses the cobalt token
+
+        Returns:
+            Raw character data dictionary
+
+        Raises:
+            CharacterNotFoundError: Character doesn't exist
+            PrivateCharacterError: Character is private
+            APIError: API returned an error
+            ValidationError: Character data is invalid
+            TimeoutError: Request timed out
+        """
+        logger.info(f"Fetching character data for ID: {character_id}")
+
+        url = f"{self.settings.api_base_url.rstrip('/')}/{character_id}?includeCustomItems=true"
+
+        try:
+            status, payload, headers = await self._get(url)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Request timed out after {self.settings.api_timeout} seconds")
+        except aiohttp.ClientError as e:
+            raise APIError(0, f"Request failed: {str(e)}")
+
+        if status == 200:
+            # Extract character data from wrapper
+            if isinstance(payload, dict) and 'data' in payload:
+                data = payload['data']
+                logger.debug("Extracted character data from API wrapper")
+            else:
+                data = payload
+                logger.debug("Using response data directly (no wrapper detected)")
+
+            if not self.validate_character_data(data):
+                raise ValidationError(f"Character {character_id} data failed validation")
+
+            logger.info(f"Successfully fetched character {character_id}")
+            return data
+
+        elif status == 404:
+            raise CharacterNotFoundError(character_id)
+
+        elif status == 403:
+            self._raise_private_error(character_id)
+
+        elif status == 429:
+            raise RateLimitError(int(headers.get('Retry-After', 60)))
+
+        else:
+            raise APIError(status, payload)
+
+    async def get_character(self, character_id: int) -> Dict[str, Any]:
+        """Alias of fetch_character_data matching DNDBeyondClient.get_character."""
+        return await self.fetch_character_data(character_id)
+
+    async def _get_optional(self, url: str, label: str, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch an auxiliary endpoint where missing or forbidden data is not an error.
+
+        Args:
+            url: Endpoint URL
+            label: Human-readable name of the data (for logging)
+            owner: Description of who the data belongs to (for logging)
+
+        Raises:
+            RateLimitError: Rate limit exceeded
+            TimeoutError: Request timed out
+        """
+        try:
+            status, payload, headers = await self._get(url)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"{label.capitalize()} request timed out after {self.settings.api_timeout} seconds"
+            )
+        except aiohttp.ClientError as e:
+            logger.warning(f"{label.capitalize()} request failed: {str(e)}")
+            return None
+
+        if status == 200:
+            if isinstance(payload, dict) and 'data' in payload:
+                logger.info(f"Successfully fetched {label} for {owner}")
+                return payload['data']
+            logger.warning(f"{label.capitalize()} response missing data wrapper")
+            return None
+
+        elif status == 404:
+            logger.info(f"No {label} found for {owner}")
+            return None
+
+        elif status == 403:
+            logger.warning(f"Access denied to {label} for {owner}")
+            return None
+
+        elif status == 429:
+            raise RateLimitError(int(headers.get('Retry-After', 60)))
+
+        logger.warning(f"{label.capitalize()} API returned {status}: {str(payload)[:200]}")
+        return None
+
+    async def get_party_inventory(self, campaign_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch party inventory data for a campaign (None if unavailable)."""
+        if not campaign_id:
+            logger.debug("No campaign ID provided, skipping party inventory")
+            return None
+
+        logger.info(f"Fetching party inventory for campaign ID: {campaign_id}")
+        return await self._get_optional(
+            PARTY_INVENTORY_URL.format(campaign_id), "party inventory", f"campaign {campaign_id}"
+        )
+
+    async def get_character_infusions(self, character_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch active infusions for a character (None if unavailable)."""
+        logger.info(f"Fetching infusions for character ID: {character_id}")
+        return await self._get_optional(
+            INFUSION_ITEMS_URL.format(character_id), "infusions", f"character {character_id}"
+        )
+
+    async def get_known_infusions(self, character_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch known infusions for a character (None if unavailable)."""
+        logger.info(f"Fetching known infusions for character ID: {character_id}")
+        return await self._get_optional(
+            KNOWN_INFUSIONS_URL.format(character_id), "known infusions", f"character {character_id}"
+        )
+
+    async def close(self):
+        """Close the pooled session."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.debug("Async client session closed")
+        self.session = None
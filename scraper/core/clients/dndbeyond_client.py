@@ -14,6 +14,7 @@ from requests.packages.urllib3.util.retry import Retry
 
 from scraper.core.interfaces.character_client import CharacterClientInterface
 from shared.config.settings import Settings
+from .rate_limiter import TokenBucketRateLimiter
 from .exceptions import (
     CharacterNotFoundError, PrivateCharacterError, APIError,
     ValidationError, RateLimitError, TimeoutError
@@ -26,12 +27,126 @@ AUTH_SERVICE_URL = "https://auth-service.dndbeyond.com/v1/cobalt-token"
 TOKEN_REFRESH_BUFFER = 30
 
 
-class DNDBeyondClient(CharacterClientInterface):
+class DNDBeyondClientBase(CharacterClientInterface):
+    """
+    Behaviour shared by the synchronous and async D&D Beyond clients:
+    private-character error reporting, payload validation and summaries.
+    """
+
+    cobalt_token: str = ''
+
+    def _raise_private_error(self, character_id: int):
+        """Raise PrivateCharacterError with context-aware message."""
+        if self.cobalt_token:
+            raise PrivateCharacterError(
+                character_id,
+                f"Character {character_id} access denied. Your cobalt session token may be "
+                f"expired - get a fresh one from browser DevTools."
+            )
+        raise PrivateCharacterError(
+            character_id,
+            f"Character {character_id} is private. Set DNDBEYOND_COBALT_TOKEN in your .env "
+            f"file or config/scraper.yaml to access private characters."
+        )
+
+    def validate_character_data(self, data: Dict[str, Any]) -> bool:
+        """
+        Validate that character data contains required fields.
+
+        Args:
+            data: Raw character data dictionary
+
+        Returns:
+            True if data is valid, False otherwise
+        """
+        if not isinstance(data, dict):
+            logger.error("Character data is not a dictionary")
+            return False
+
+        # Required top-level fields
+        required_fields = ['id', 'name', 'classes']
+
+        for field in required_fields:
+            if field not in data:
+                logger.error(f"Missing required field: {field}")
+                return False
+
+        # Validate character has at least one class
+        if not data.get('classes') or len(data['classes']) == 0:
+            logger.error("Character has no classes")
+            return False
+
+        # Validate character ID is correct
+        if not isinstance(data.get('id'), int) or data['id'] <= 0:
+            logger.error(f"Invalid character ID: {data.get('id')}")
+            return False
+
+        logger.debug("Character data validation passed")
+        return True
+
+    def get_character_summary(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract basic character summary from raw data.
+
+        Args:
+            data: Raw character data dictionary
+
+        Returns:
+            Dictionary with basic character info
+        """
+        try:
+            # Calculate total level from classes directly
+            classes = data.get('classes', [])
+            total_level = sum(cls.get('level', 0) for cls in classes)
+
+            # Get primary class
+            primary_class = None
+            if classes:
+                # Find highest level class
+                primary_class = max(classes, key=lambda c: c.get('level', 0))
+
+            # Get species/race
+            race = data.get('race', {})
+            species = data.get('species', {})
+            race_name = (race.get('fullName') or race.get('baseName') or
+                        species.get('fullName') or species.get('baseName') or 'Unknown')
+
+            summary = {
+                'id': data.get('id'),
+                'name': data.get('name', 'Unknown'),
+                'level': total_level,
+                'race': race_name,
+                'classes': [
+                    {
+                        'name': cls.get('definition', {}).get('name', 'Unknown'),
+                        'level': cls.get('level', 0),
+                        'subclass': cls.get('subclassDefinition', {}).get('name')
+                    }
+                    for cls in classes
+                ],
+                'primary_class': primary_class.get('definition', {}).get('name') if primary_class else None,
+                'is_multiclass': len(classes) > 1
+            }
+
+            logger.debug(f"Generated summary for character: {summary['name']} (Level {summary['level']} {summary['primary_class']})")
+            return summary
+
+        except Exception as e:
+            logger.error(f"Error generating character summary: {str(e)}")
+            return {
+                'id': data.get('id'),
+                'name': data.get('name', 'Unknown'),
+                'error': f"Failed to generate summary: {str(e)}"
+            }
+
+
+class DNDBeyondClient(DNDBeyondClientBase):
     """
     D&D Beyond API client with robust error handling and rate limiting.
     """
 
-    def __init__(self, user_agent: Optional[str] = None, cobalt_token: Optional[str] = None):
+    def __init__(self, user_agent: Optional[str] = None, cobalt_token: Optional[str] = None,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None):
         self.settings = Settings()
         if user_agent:
             self.settings.user_agent = user_agent
@@ -47,9 +162,10 @@ class DNDBeyondClient(CharacterClientInterface):
         self.session = requests.Session()
         self._setup_session()
 
-        # Rate limiting
+        # Rate limiting (a shared limiter paces all clients in the process)
         self.last_request_time = 0
         self.min_delay = self.settings.min_request_delay
+        self.rate_limiter = rate_limiter
 
         logger.info(f"DNDBeyond client initialized with base URL: {self.settings.api_base_url}")
 
@@ -133,22 +249,13 @@ class DNDBeyondClient(CharacterClientInterface):
             return {'Authorization': f'Bearer {bearer}'}
         return {}
 
-    def _raise_private_error(self, character_id: int):
-        """Raise PrivateCharacterError with context-aware message."""
-        if self.cobalt_token:
-            raise PrivateCharacterError(
-                character_id,
-                f"Character {character_id} access denied. Your cobalt session token may be "
-                f"expired - get a fresh one from browser DevTools."
-            )
-        raise PrivateCharacterError(
-            character_id,
-            f"Character {character_id} is private. Set DNDBEYOND_COBALT_TOKEN in your .env "
-            f"file or config/scraper.yaml to access private characters."
-        )
-
     def _apply_rate_limiting(self):
         """Apply rate limiting between requests."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            self.last_request_time = time.time()
+            return
+
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
 
@@ -513,96 +620,6 @@ class DNDBeyondClient(CharacterClientInterface):
             logger.warning(f"Known infusions request failed: {str(e)}")
             return None
 
-    def validate_character_data(self, data: Dict[str, Any]) -> bool:
-        """
-        Validate that character data contains required fields.
-
-        Args:
-            data: Raw character data dictionary
-
-        Returns:
-            True if data is valid, False otherwise
-        """
-        if not isinstance(data, dict):
-            logger.error("Character data is not a dictionary")
-            return False
-
-        # Required top-level fields
-        required_fields = ['id', 'name', 'classes']
-
-        for field in required_fields:
-            if field not in data:
-                logger.error(f"Missing required field: {field}")
-                return False
-
-        # Validate character has at least one class
-        if not data.get('classes') or len(data['classes']) == 0:
-            logger.error("Character has no classes")
-            return False
-
-        # Validate character ID is correct
-        if not isinstance(data.get('id'), int) or data['id'] <= 0:
-            logger.error(f"Invalid character ID: {data.get('id')}")
-            return False
-
-        logger.debug("Character data validation passed")
-        return True
-
-    def get_character_summary(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Extract basic character summary from raw data.
-
-        Args:
-            data: Raw character data dictionary
-
-        Returns:
-            Dictionary with basic character info
-        """
-        try:
-            # Calculate total level from classes directly
-            classes = data.get('classes', [])
-            total_level = sum(cls.get('level', 0) for cls in classes)
-
-            # Get primary class
-            primary_class = None
-            if classes:
-                # Find highest level class
-                primary_class = max(classes, key=lambda c: c.get('level', 0))
-
-            # Get species/race
-            race = data.get('race', {})
-            species = data.get('species', {})
-            race_name = (race.get('fullName') or race.get('baseName') or
-                        species.get('fullName') or species.get('baseName') or 'Unknown')
-
-            summary = {
-                'id': data.get('id'),
-                'name': data.get('name', 'Unknown'),
-                'level': total_level,
-                'race': race_name,
-                'classes': [
-                    {
-                        'name': cls.get('definition', {}).get('name', 'Unknown'),
-                        'level': cls.get('level', 0),
-                        'subclass': cls.get('subclassDefinition', {}).get('name')
-                    }
-                    for cls in classes
-                ],
-                'primary_class': primary_class.get('definition', {}).get('name') if primary_class else None,
-                'is_multiclass': len(classes) > 1
-            }
-
-            logger.debug(f"Generated summary for character: {summary['name']} (Level {summary['level']} {summary['primary_class']})")
-            return summary
-
-        except Exception as e:
-            logger.error(f"Error generating character summary: {str(e)}")
-            return {
-                'id': data.get('id'),
-                'name': data.get('name', 'Unknown'),
-                'error': f"Failed to generate summary: {str(e)}"
-            }
-
     def close(self):
         """Close the session."""
         if self.session:
@@ -8,6 +8,7 @@ import logging
 from scraper.core.interfaces.character_client import CharacterClientInterface
 from shared.config.manager import get_config_manager
 from .dndbeyond_client import DNDBeyondClient
+from .async_dndbeyond_client import AsyncDNDBeyondClient
 from .mock_client import MockDNDBeyondClient, StaticMockClient
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ class ClientFactory:
         Create a character client based on configuration or explicit type.
         
         Args:
-            client_type: Override client type ("real", "mock", "static")
+            client_type: Override client type ("real", "async", "mock", "static")
             config_manager: Optional config manager instance
             **kwargs: Additional arguments passed to client constructor
             
@@ -51,6 +52,10 @@ class ClientFactory:
             logger.info("Creating real D&D Beyond API client")
             return DNDBeyondClient(**kwargs)
             
+        elif client_type == "async":
+            logger.info("Creating async D&D Beyond API client")
+            return AsyncDNDBeyondClient(**kwargs)
+            
         elif client_type == "mock":
             logger.info("Creating mock D&D Beyond client")
             return MockDNDBeyondClient(**kwargs)
@@ -0,0 +1,119 @@
+"""
+Shared token-bucket rate limiter for D&D Beyond API requests.
+
+A single limiter instance is shared by every client in the process so that
+concurrent scrapes (worker threads or asyncio tasks) collectively respect
+the configured request rate instead of each client pacing only itself.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket usable from both synchronous and async code.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request consumes one token; callers wait until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+
+        self.rate = float(rate)
+        self.capacity = int(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay_seconds: float, burst: int = 1) -> 'TokenBucketRateLimiter':
+        """Create a limiter that allows one request every ``delay_seconds``."""
+        return cls(rate=1.0 / max(float(delay_seconds), 0.001), capacity=burst)
+
+    def _reserve(self) -> float:
+        """
+        Reserve a token and return how long the caller must wait for it.
+
+        The token is debited immediately (the balance may go negative), so
+        concurrent callers queue up behind each other in arrival order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Block the current thread until a request may be made.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            logger.debug(f"Rate limiting: waiting {wait_time:.2f} seconds for token")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self) -> float:
+        """
+        Wait without blocking the event loop until a request may be made.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            logger.debug(f"Rate limiting: waiting {wait_time:.2f} seconds for token")
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+
+_shared_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(config_manager=None) -> TokenBucketRateLimiter:
+    """
+    Get the process-wide API rate limiter, creating it from config on first use.
+
+    Uses ``rate_limit.delay_between_requests`` and ``rate_limit.burst`` from
+    config/scraper.yaml.
+    """
+    global _shared_rate_limiter
+
+    with _shared_lock:
+        if _shared_rate_limiter is None:
+            if config_manager is None:
+                from shared.config.manager import get_config_manager
+                config_manager = get_config_manager()
+
+            delay = config_manager.get_config_value('rate_limit', 'delay_between_requests', default=5)
+            burst = config_manager.get_config_value('rate_limit', 'burst', default=1)
+            _shared_rate_limiter = TokenBucketRateLimiter.from_delay(delay, burst=burst)
+            logger.info(f"Shared API rate limiter: 1 request per {delay}s (burst {burst})")
+
+        return _shared_rate_limiter
+
+
+def reset_shared_rate_limiter():
+    """Reset the shared limiter (useful for testing or config reloads)."""
+    global _shared_rate_limiter
+    with _shared_lock:
+        _shared_rate_limiter = None
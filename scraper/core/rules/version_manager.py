@@ -61,6 +61,10 @@ class RuleVersionManager:
         if version:
             logger.info(f"Rule version forced to {version.value}")
     
+    def invalidate(self, character_id: int) -> None:
+        """Drop a cached detection so the next call re-detects from fresh data."""
+        self.version_cache.pop(character_id, None)
+    
     def detect_rule_version(self, character_data: Dict[str, Any], character_id: int = None) -> DetectionResult:
         """
         Detect the rule version for a character using multiple methods.
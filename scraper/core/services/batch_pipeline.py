@@ -0,0 +1,269 @@
+"""
+Pipelined batch processing for enhanced_dnd_scraper --batch.
+
+Three overlapping stages:
+
+1. Fetch: a pooled async client fetches several characters at once, paced
+   by the shared rate limiter.
+2. Calculate: raw payloads go to a pool of worker processes that each build
+   one CharacterCalculator up front and reuse it for every character.
+3. Write: a single writer thread saves output files and fingerprints, so
+   disk I/O never stalls fetching or calculation.
+
+Each character moves to the next stage as soon as it leaves the previous
+one, so network waits overlap with CPU-bound calculation.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from scraper.core.clients.async_dndbeyond_client import AsyncDNDBeyondClient
+from scraper.core.clients.rate_limiter import get_shared_rate_limiter
+from scraper.core.rules.version_manager import RuleVersion
+from shared.config.manager import get_config_manager
+
+logger = logging.getLogger(__name__)
+
+# Per-worker calculator stack, built once by _init_calculation_worker
+_worker_calculator = None
+_worker_rule_manager = None
+
+
+def _init_calculation_worker(force_rule_version: Optional[RuleVersion], clean_html: bool):
+    """Build the worker's calculator once so every task reuses it warm."""
+    global _worker_calculator, _worker_rule_manager
+
+    from scraper.core.calculators.character_calculator import CharacterCalculator
+    from scraper.core.rules.version_manager import RuleVersionManager
+
+    config_manager = get_config_manager()
+    config_manager.set_setting('output.clean_html', clean_html)
+
+    _worker_rule_manager = RuleVersionManager()
+    if force_rule_version:
+        _worker_rule_manager.set_force_version(force_rule_version)
+    _worker_calculator = CharacterCalculator(
+        config_manager=config_manager,
+        rule_manager=_worker_rule_manager
+    )
+
+
+def _calculate_character(character_id: str, raw_data: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """
+    Calculate one character in a worker.
+
+    Returns:
+        Tuple of (complete character data, calculation seconds)
+    """
+    from scraper.enhanced_dnd_scraper import EnhancedDnDScraper
+
+    start = time.perf_counter()
+    # Fresh detection per payload; a worker outlives many characters
+    _worker_rule_manager.invalidate(int(character_id))
+    complete_data = EnhancedDnDScraper.build_complete_data(
+        _worker_calculator, _worker_rule_manager, character_id, raw_data
+    )
+    return complete_data, time.perf_counter() - start
+
+
+@dataclass
+class BatchResult:
+    """Outcome and per-stage timing of a batch run."""
+    total: int = 0
+    saved: List[Tuple[str, str]] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    stage_times: Dict[str, float] = field(default_factory=lambda: {'fetch': 0.0, 'calculate': 0.0, 'write': 0.0})
+    wall_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Characters completed (saved or skipped) per second."""
+        done = len(self.saved) + len(self.skipped)
+        return done / self.wall_time if self.wall_time > 0 else 0.0
+
+    def log_summary(self):
+        """Log the batch summary with throughput and per-stage timing."""
+        logger.info("\n=== Batch Processing Complete ===")
+        logger.info(f"Successfully processed: {len(self.saved) + len(self.skipped)}/{self.total} characters"
+                    f" ({len(self.skipped)} unchanged)")
+        logger.info(f"Wall time: {self.wall_time:.2f}s, throughput: {self.throughput:.2f} characters/sec")
+        for stage, seconds in self.stage_times.items():
+            logger.info(f"  {stage}: {seconds:.2f}s total")
+
+        if self.failed:
+            logger.warning("Failed characters:")
+            for failure in self.failed:
+                logger.warning(f"  - {failure}")
+
+
+class BatchPipeline:
+    """
+    Fetch → calculate → write pipeline over a list of character IDs.
+
+    Args:
+        force_rule_version: Optional rule version override for every character
+        discord_config: Optional Discord notification config (passed to each scraper)
+        discord_output: Also save JSON to the discord directory
+        skip_unchanged: Skip calculation and saving for unchanged payloads
+        raw_output: Also save raw API data to character_data/raw_{id}_{ts}.json
+        fetch_concurrency: Characters fetched at once (default from config)
+        calculation_workers: Calculator processes; 0 = one per CPU, 1 = in-process
+            (default from config)
+        cache_max_age: Serve cached raw payloads younger than this (seconds)
+        offline: Read payloads only from the raw payload cache
+    """
+
+    def __init__(self, force_rule_version: Optional[RuleVersion] = None,
+                 discord_config: Optional[Dict[str, Any]] = None, discord_output: bool = False,
+                 skip_unchanged: bool = False, raw_output: bool = False,
+                 fetch_concurrency: Optional[int] = None, calculation_workers: Optional[int] = None,
+                 cache_max_age: Optional[float] = None, offline: bool = False):
+        self.config_manager = get_config_manager()
+        self.force_rule_version = force_rule_version
+        self.discord_config = discord_config
+        self.discord_output = discord_output
+        self.skip_unchanged = skip_unchanged
+        self.raw_output = raw_output
+        self.cache_max_age = cache_max_age
+        self.offline = offline
+
+        if fetch_concurrency is None:
+            fetch_concurrency = self.config_manager.get_config_value(
+                'batch_processing', 'fetch_concurrency', default=4
+            )
+        if calculation_workers is None:
+            calculation_workers = self.config_manager.get_config_value(
+                'batch_processing', 'calculation_workers', default=0
+            )
+        self.fetch_concurrency = max(1, int(fetch_concurrency))
+        self.calculation_workers = int(calculation_workers) or (os.cpu_count() or 1)
+
+    def _create_calculation_executor(self) -> Executor:
+        """Process pool of warm calculators, or a single in-process worker."""
+        clean_html = self.config_manager.get_config_value('output', 'clean_html', default=True)
+        initargs = (self.force_rule_version, clean_html)
+
+        if self.calculation_workers <= 1:
+            return ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='batch-calc',
+                initializer=_init_calculation_worker, initargs=initargs
+            )
+        return ProcessPoolExecutor(
+            max_workers=self.calculation_workers,
+            initializer=_init_calculation_worker, initargs=initargs
+        )
+
+    def run(self, character_ids: List[str]) -> BatchResult:
+        """Process every character and return the batch result."""
+        return asyncio.run(self._run(character_ids))
+
+    async def _run(self, character_ids: List[str]) -> BatchResult:
+        result = BatchResult(total=len(character_ids))
+        logger.info(f"Batch pipeline: {self.fetch_concurrency} concurrent fetches, "
+                    f"{self.calculation_workers} calculator worker(s)")
+
+        start = time.perf_counter()
+        calc_executor = self._create_calculation_executor()
+        write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-write')
+        fetch_semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        try:
+            if self.offline:
+                # Payloads come from the raw cache; no API client needed
+                await asyncio.gather(*(
+                    self._process_character(character_id, None, fetch_semaphore,
+                                            calc_executor, write_executor, result)
+                    for character_id in character_ids
+                ))
+            else:
+                async with AsyncDNDBeyondClient(
+                    rate_limiter=get_shared_rate_limiter(self.config_manager),
+                    max_connections=self.fetch_concurrency
+                ) as client:
+                    await asyncio.gather(*(
+                        self._process_character(character_id, client, fetch_semaphore,
+                                                calc_executor, write_executor, result)
+                        for character_id in character_ids
+                    ))
+        finally:
+            calc_executor.shutdown(wait=True)
+            write_executor.shutdown(wait=True)
+
+        result.wall_time = time.perf_counter() - start
+        return result
+
+    async def _process_character(self, character_id: str, client: Optional[AsyncDNDBeyondClient],
+                                 fetch_semaphore: asyncio.Semaphore, calc_executor: Executor,
+                                 write_executor: Executor, result: BatchResult):
+        """Move one character through fetch, calculate and write."""
+        from scraper.enhanced_dnd_scraper import EnhancedDnDScraper
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            # The scraper never builds its own calculator here; workers calculate
+            scraper = EnhancedDnDScraper(
+                character_id=character_id,
+                force_rule_version=self.force_rule_version,
+                discord_config=self.discord_config,
+                storage_dir="character_data",
+                discord_output=self.discord_output,
+                skip_unchanged=self.skip_unchanged,
+                cache_max_age=self.cache_max_age,
+                offline=self.offline
+            )
+
+            async with fetch_semaphore:
+                stage_start = time.perf_counter()
+                if self.offline:
+                    fetched = await loop.run_in_executor(None, scraper.fetch_character_data)
+                else:
+                    fetched = await scraper.fetch_character_data_async(client)
+                result.stage_times['fetch'] += time.perf_counter() - stage_start
+            if not fetched:
+                result.failed.append(f"{character_id}: Failed to fetch data")
+                return
+
+            # Fingerprint before the payload leaves this process
+            payload_fingerprint = scraper.get_payload_fingerprint()
+            if self.skip_unchanged and scraper.is_unchanged(payload_fingerprint):
+                result.skipped.append(character_id)
+                logger.info(f"⏭️  {character_id}: unchanged since last scrape")
+                return
+
+            complete_data, calc_time = await loop.run_in_executor(
+                calc_executor, _calculate_character, character_id, scraper.raw_data
+            )
+            result.stage_times['calculate'] += calc_time
+
+            stage_start = time.perf_counter()
+            output_path = await loop.run_in_executor(
+                write_executor, self._write_character, scraper, complete_data, payload_fingerprint
+            )
+            result.stage_times['write'] += time.perf_counter() - stage_start
+
+            result.saved.append((character_id, output_path))
+            logger.info(f"✅ {character_id}: Saved to {output_path}")
+
+        except Exception as e:
+            result.failed.append(f"{character_id}: {str(e)}")
+            logger.error(f"❌ Failed to process {character_id}: {e}")
+
+    def _write_character(self, scraper, complete_data: Dict[str, Any], payload_fingerprint: str) -> str:
+        """Writer stage: save outputs (and raw data if requested) for one character."""
+        output_path = scraper.write_character_data(complete_data, payload_fingerprint)
+
+        if self.raw_output:
+            character_data_dir = Path("character_data")
+            character_data_dir.mkdir(exist_ok=True)
+            raw_file = str(character_data_dir / f"raw_{scraper.character_id}_{int(time.time())}.json")
+            scraper.save_raw_data(raw_file)
+
+        return output_path
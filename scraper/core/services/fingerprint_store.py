@@ -0,0 +1,129 @@
+"""
+Payload fingerprint store for skipping unchanged characters.
+
+Remembers a stable hash of each character's assembled raw API payload
+(character, party inventory and infusions) together with the files written
+for it, so repeat scrapes of an unchanged character can skip calculation,
+saving and change detection entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def compute_payload_fingerprint(raw_data: Dict[str, Any], processing_options: str = '') -> str:
+    """
+    Compute a stable fingerprint for a raw character payload.
+
+    Args:
+        raw_data: Assembled raw API data
+        processing_options: Options that change calculated output for the same
+            payload (scraper version, forced rules, HTML cleaning)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(raw_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode('utf-8'))
+    if processing_options:
+        digest.update(b'\0' + processing_options.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PayloadFingerprintStore:
+    """
+    Thread-safe JSON file mapping character IDs to their last saved fingerprint.
+
+    Each record holds the fingerprint and the output paths written for it,
+    keyed by output target ("scraper", "discord").
+    """
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+        self._lock = threading.Lock()
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            try:
+                with open(self.store_path, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f)
+            except FileNotFoundError:
+                self._records = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable fingerprint store {self.store_path}: {e}")
+                self._records = {}
+        return self._records
+
+    def _write(self):
+        """Atomically rewrite the store file."""
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_suffix(self.store_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._records, f, indent=2)
+        os.replace(tmp_path, self.store_path)
+
+    def is_unchanged(self, character_id: str, fingerprint: str, required_targets=('scraper',)) -> bool:
+        """
+        Check whether a payload matches the last saved one for this character.
+
+        The match only counts if every required output target was written for
+        that fingerprint and its file still exists.
+        """
+        with self._lock:
+            record = self._load().get(str(character_id))
+
+        if not record or record.get('fingerprint') != fingerprint:
+            return False
+
+        outputs = record.get('outputs', {})
+        for target in required_targets:
+            path = outputs.get(target)
+            if not path or not Path(path).exists():
+                return False
+        return True
+
+    def get_outputs(self, character_id: str) -> Dict[str, str]:
+        """Get the output paths recorded for a character's last saved payload."""
+        with self._lock:
+            record = self._load().get(str(character_id), {})
+        return dict(record.get('outputs', {}))
+
+    def record(self, character_id: str, fingerprint: str, outputs: Dict[str, str]):
+        """Record the fingerprint and output paths of a saved payload."""
+        with self._lock:
+            records = self._load()
+            previous = records.get(str(character_id), {})
+            merged_outputs = outputs
+            if previous.get('fingerprint') == fingerprint:
+                merged_outputs = {**previous.get('outputs', {}), **outputs}
+            records[str(character_id)] = {
+                'fingerprint': fingerprint,
+                'outputs': merged_outputs,
+                'updated': time.time()
+            }
+            try:
+                self._write()
+            except OSError as e:
+                logger.warning(f"Failed to persist fingerprint store {self.store_path}: {e}")
+
+
+_stores: Dict[str, PayloadFingerprintStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_fingerprint_store(store_path: Path) -> PayloadFingerprintStore:
+    """Get the process-wide store for a path, so concurrent scrapers share one cache and lock."""
+    key = str(Path(store_path).absolute())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = PayloadFingerprintStore(Path(key))
+        return _stores[key]
@@ -0,0 +1,365 @@
+"""
+Content-addressed cache of raw D&D Beyond payloads.
+
+Every assembled raw payload (character, party inventory and infusions) is
+stored once under its SHA-256 hash and indexed by character ID. The scraper
+can serve a recent payload instead of hitting the network, and the whole
+calculator can be re-run over every cached character fully offline, e.g.
+after a calculator upgrade.
+
+Layout under the cache directory:
+
+    index.json              entries keyed "<character_id>:<hash>"
+    index.journal           fetch/access time updates since index.json was written
+    index.lock              held while a process changes the index or journal
+    objects/<hash>.json.gz  gzipped payloads
+
+Re-fetching an unchanged payload (the monitor's common case) only appends a
+line to the journal; index.json is rewritten when entries are added or
+evicted, or when the journal grows long.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .fingerprint_store import compute_payload_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Timestamp updates journaled before the index is rewritten with them
+JOURNAL_COMPACT_LINES = 500
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a lock file, shared with other processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            # Retries for about 10 seconds, then raises OSError
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RawPayloadCache:
+    """
+    Thread-safe raw payload cache with LRU eviction by entry count and size.
+
+    The index is shared with other processes (the monitor and CLI scrapes):
+    it is reloaded whenever another process rewrote it, and the journal is
+    replayed on every access. Changes are made under index.lock, so no
+    journal line is appended while another process folds the journal into
+    index.json and removes it.
+
+    Args:
+        cache_dir: Directory holding the index and payload objects
+        max_entries: Maximum cached payloads (0 = unlimited)
+        max_bytes: Maximum total compressed size (0 = unlimited)
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 2000, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.journal_path = self.cache_dir / "index.journal"
+        self.lock_path = self.cache_dir / "index.lock"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # character_id -> keys of its cached payloads
+        self._by_character: Dict[str, Set[str]] = {}
+        # (mtime_ns, size) of index.json when it was loaded
+        self._index_stamp: Optional[Tuple[int, int]] = None
+        self._journal_offset = 0
+        self._journal_lines = 0
+        # Access times from get() not yet written to disk
+        self._accessed: Dict[str, float] = {}
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Entries as currently on disk, merged with this process's unsaved access times."""
+        stamp = self._stamp(self.index_path)
+        if self._entries is None or stamp != self._index_stamp:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get('entries', {})
+            except FileNotFoundError:
+                entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable raw cache index {self.index_path}: {e}")
+                entries = {}
+
+            self._entries = entries
+            self._index_stamp = stamp
+            self._journal_offset = 0
+            self._journal_lines = 0
+            self._by_character = {}
+            for key, entry in entries.items():
+                self._by_character.setdefault(entry['character_id'], set()).add(key)
+            for key, accessed in self._accessed.items():
+                if key in entries:
+                    entries[key]['last_access'] = max(entries[key]['last_access'], accessed)
+
+        self._replay_journal()
+        return self._entries
+
+    def _replay_journal(self):
+        """Apply timestamp updates appended to the journal since it was last read."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < self._journal_offset:
+                    # Compacted by another process
+                    self._journal_offset = 0
+                    self._journal_lines = 0
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            self._journal_offset = 0
+            self._journal_lines = 0
+            return
+
+        # Leave a partially written last line for the next read
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            try:
+                update = json.loads(line)
+                entry = self._entries.get(update['key'])
+                if entry is not None:
+                    entry['fetched_at'] = max(entry['fetched_at'], update['fetched_at'])
+                    entry['last_access'] = max(entry['last_access'], update['last_access'])
+            except (ValueError, KeyError, TypeError):
+                continue
+            self._journal_lines += 1
+        self._journal_offset += complete
+
+    def _append_journal(self, keys: List[str]):
+        """Record timestamp updates without rewriting the index (index.lock held)."""
+        lines = ''.join(
+            json.dumps({'key': key, 'fetched_at': self._entries[key]['fetched_at'],
+                        'last_access': self._entries[key]['last_access']}, separators=(',', ':')) + '\n'
+            for key in keys if key in self._entries
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        self._accessed.clear()
+
+    def _write_index(self):
+        """
+        Atomically rewrite the index file, folding in and removing the journal.
+
+        Call with index.lock held, after _load() replayed the journal.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self._entries}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._index_stamp = self._stamp(self.index_path)
+        self._journal_offset = 0
+        self._journal_lines = 0
+        self._accessed.clear()
+
+    def _object_path(self, payload_hash: str) -> Path:
+        return self.objects_dir / f"{payload_hash}.json.gz"
+
+    def _latest_entry(self, character_id: str) -> Optional[Dict[str, Any]]:
+        keys = self._by_character.get(str(character_id))
+        if not keys:
+            return None
+        return max((self._entries[key] for key in keys), key=lambda e: e['fetched_at'])
+
+    def _remove(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_character.get(entry['character_id'])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_character[entry['character_id']]
+        return entry
+
+    def put(self, character_id: str, raw_data: Dict[str, Any]) -> str:
+        """
+        Cache a freshly fetched payload.
+
+        An identical payload already cached for the character is not rewritten;
+        its fetch time is refreshed through the journal instead.
+
+        Returns:
+            Payload hash
+        """
+        payload_hash = compute_payload_fingerprint(raw_data)
+        key = f"{character_id}:{payload_hash}"
+        now = time.time()
+
+        with self._lock, _file_lock(self.lock_path):
+            entries = self._load()
+            object_path = self._object_path(payload_hash)
+
+            try:
+                if key in entries and object_path.exists():
+                    # Unchanged payload: only timestamps move
+                    entries[key]['fetched_at'] = now
+                    entries[key]['last_access'] = now
+                    if self._journal_lines < JOURNAL_COMPACT_LINES:
+                        self._append_journal([key] + list(self._accessed))
+                    else:
+                        self._write_index()
+                    return payload_hash
+            except OSError as e:
+                logger.warning(f"Failed to persist raw cache timestamps {self.journal_path}: {e}")
+                return payload_hash
+
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_suffix('.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(raw_data, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, object_path)
+
+            entries[key] = {
+                'character_id': str(character_id),
+                'hash': payload_hash,
+                'fetched_at': now,
+                'last_access': now,
+                'size': object_path.stat().st_size
+            }
+            self._by_character.setdefault(str(character_id), set()).add(key)
+            self._evict(protect=key)
+
+            try:
+                self._write_index()
+            except OSError as e:
+                logger.warning(f"Failed to persist raw cache index {self.index_path}: {e}")
+
+        return payload_hash
+
+    def get(self, character_id: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recently fetched payload for a character.
+
+        Args:
+            character_id: D&D Beyond character ID
+            max_age: Only return payloads fetched within this many seconds
+                (None = any age)
+
+        Returns:
+            Raw payload, or None if nothing suitable is cached
+        """
+        with self._lock:
+            self._load()
+            entry = self._latest_entry(character_id)
+            if entry is None:
+                return None
+            if max_age is not None and time.time() - entry['fetched_at'] > max_age:
+                return None
+            # Access times are persisted with the next put()
+            entry['last_access'] = time.time()
+            key = f"{character_id}:{entry['hash']}"
+            self._accessed[key] = entry['last_access']
+            object_path = self._object_path(entry['hash'])
+
+        try:
+            with gzip.open(object_path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cached payload for {character_id}: {e}")
+            with self._lock:
+                try:
+                    with _file_lock(self.lock_path):
+                        self._load()
+                        if self._remove(key) is not None:
+                            self._write_index()
+                except OSError as write_error:
+                    logger.warning(f"Failed to persist raw cache index {self.index_path}: {write_error}")
+            return None
+
+    def get_age(self, character_id: str) -> Optional[float]:
+        """Seconds since the latest cached payload for a character was fetched."""
+        with self._lock:
+            self._load()
+            entry = self._latest_entry(character_id)
+        return time.time() - entry['fetched_at'] if entry else None
+
+    def character_ids(self) -> List[str]:
+        """IDs of every character with a cached payload."""
+        with self._lock:
+            self._load()
+            return sorted(self._by_character, key=lambda c: (len(c), c))
+
+    def _evict(self, protect: str):
+        """Drop least recently used entries until within the count and size limits."""
+        entries = self._entries
+        total_bytes = sum(e['size'] for e in entries.values())
+
+        def over_limit() -> bool:
+            return ((self.max_entries and len(entries) > self.max_entries)
+                    or (self.max_bytes and total_bytes > self.max_bytes))
+
+        if not over_limit():
+            return
+
+        for key in sorted(entries, key=lambda k: entries[k]['last_access']):
+            if not over_limit():
+                break
+            if key == protect:
+                continue
+
+            entry = self._remove(key)
+            total_bytes -= entry['size']
+            if not any(e['hash'] == entry['hash'] for e in entries.values()):
+                try:
+                    self._object_path(entry['hash']).unlink()
+                except FileNotFoundError:
+                    pass
+            logger.debug(f"Evicted cached payload {key}")
+
+
+_caches: Dict[str, RawPayloadCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_raw_payload_cache(cache_dir: Path, max_entries: int = 2000,
+                          max_bytes: int = 500 * 1024 * 1024) -> RawPayloadCache:
+    """Get the process-wide cache for a directory, so concurrent scrapers share one index and lock."""
+    key = str(Path(cache_dir).absolute())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RawPayloadCache(Path(key), max_entries=max_entries, max_bytes=max_bytes)
+        return _caches[key]
@@ -4,10 +4,11 @@ HTML Cleaning Utilities
 Provides utilities for cleaning HTML content from D&D Beyond API responses.
 """
 
-import re
 import logging
 from typing import Any, Dict, List, Union
 
+from shared.text.html_markdown import strip_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,29 +29,8 @@ class HTMLCleaner:
         if not text or not isinstance(text, str):
             return text or ""
             
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Decode common HTML entities
-        html_entities = {
-            '&amp;': '&',
-            '&lt;': '<',
-            '&gt;': '>',
-            '&quot;': '"',
-            '&#39;': "'",
-            '&nbsp;': ' ',
-            '&mdash;': '—',
-            '&ndash;': '–',
-            '&hellip;': '…',
-        }
-        
-        for entity, replacement in html_entities.items():
-            text = text.replace(entity, replacement)
-        
-        # Clean up extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Shared converter: compiled tag/entity pass, memoized across descriptions
+        return strip_html(text)
     
     @staticmethod
     def clean_character_data(data: Dict[str, Any], clean_html: bool = True) -> Dict[str, Any]:
@@ -27,6 +27,7 @@ License: MIT
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -49,15 +50,54 @@ class EnhancedSpellJSONEncoder(json.JSONEncoder):
             pass
         return super().default(obj)
 
+
+def _json_key(key) -> str:
+    """Render a dict key the way json.dump does."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, float):
+        return json.dumps(key)
+    return str(key)
+
+
+def to_json_compatible(obj):
+    """
+    Convert calculated character data to exactly what reading back its JSON
+    file would give (string keys, lists for tuples, plain dicts for spells),
+    without serializing it.
+
+    Lets in-process callers hand scraper output straight to consumers written
+    against the saved JSON files.
+    """
+    if isinstance(obj, dict):
+        return {_json_key(k): to_json_compatible(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_json_compatible(v) for v in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return to_json_compatible(EnhancedSpellJSONEncoder().default(obj))
+
 # Add parent directory to path for module imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 # v6.0.0 imports
 from scraper.core.clients.factory import ClientFactory
+from scraper.core.clients.rate_limiter import TokenBucketRateLimiter
+from scraper.core.services.fingerprint_store import (
+    PayloadFingerprintStore, compute_payload_fingerprint, get_fingerprint_store
+)
+from scraper.core.services.raw_payload_cache import RawPayloadCache, get_raw_payload_cache
 from scraper.core.calculators.character_calculator import CharacterCalculator
 from scraper.core.rules.version_manager import RuleVersionManager, RuleVersion
 from shared.config.manager import get_config_manager
 from discord.core.services.discord_integration import DiscordIntegrationService
+from discord.core.storage.snapshot_catalog import get_snapshot_catalog
 
 # Configure logging
 logging.basicConfig(
@@ -79,7 +119,11 @@ class EnhancedDnDScraper:
     
     def __init__(self, character_id: str, force_rule_version: Optional[RuleVersion] = None, 
                  no_html: bool = False, discord_config: Optional[Dict[str, Any]] = None, 
-                 storage_dir: Optional[str] = None, discord_output: bool = False):
+                 storage_dir: Optional[str] = None, discord_output: bool = False,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 skip_unchanged: bool = False,
+                 calculator: Optional[CharacterCalculator] = None,
+                 cache_max_age: Optional[float] = None, offline: bool = False):
         """
         Initialize the enhanced scraper.
         
@@ -90,11 +134,27 @@ class EnhancedDnDScraper:
             discord_config: Optional Discord configuration for notifications
             storage_dir: Directory for storing character snapshots (for Discord)
             discord_output: Whether to also save JSON to discord directory
+            rate_limiter: Optional shared rate limiter pacing requests across
+                concurrent scrapers (replaces the per-client delay)
+            skip_unchanged: Skip calculation and saving when the raw payload is
+                identical to the last one saved for this character
+            calculator: Optional shared CharacterCalculator, so long-running
+                callers reuse one warmed calculator stack across scrapes (call
+                its disable_result_caching() first). Ignored when
+                force_rule_version is set. Otherwise one is built on first use.
+            cache_max_age: Serve a cached raw payload younger than this many
+                seconds instead of fetching (default raw_cache.max_age_seconds;
+                0 always fetches)
+            offline: Only use the raw payload cache, never the network
         """
         self.character_id = character_id
         self.force_rule_version = force_rule_version
         self.no_html = no_html
         self.discord_output = discord_output
+        self.skip_unchanged = skip_unchanged
+        self.last_save_skipped = False
+        self.offline = offline
+        self.loaded_from_cache = False
         
         # Initialize Discord integration if config provided
         self.discord_service = None
@@ -112,25 +172,49 @@ class EnhancedDnDScraper:
         
         # Initialize v6.0.0 components
         self.config_manager = get_config_manager()
-        self.rule_manager = RuleVersionManager()
-        if force_rule_version:
-            self.rule_manager.set_force_version(force_rule_version)
+        if calculator is not None and not force_rule_version:
+            self.rule_manager = calculator.rule_manager
+            # The shared detection cache outlives this scrape; re-detect from fresh data
+            self.rule_manager.invalidate(int(character_id))
+        else:
+            calculator = None
+            self.rule_manager = RuleVersionManager()
+            if force_rule_version:
+                self.rule_manager.set_force_version(force_rule_version)
         
+        client_kwargs = {'rate_limiter': rate_limiter} if rate_limiter else {}
         self.client = ClientFactory.create_client(
             client_type='real',
-            config_manager=self.config_manager
+            config_manager=self.config_manager,
+            **client_kwargs
         )
         # Override client rate limit with config value so scraper.yaml is the single source of truth
         configured_delay = self.config_manager.get_config_value('rate_limit', 'delay_between_requests', default=5)
         if hasattr(self.client, 'min_delay'):
             self.client.min_delay = float(configured_delay)
-        self.calculator = CharacterCalculator(
-            config_manager=self.config_manager,
-            rule_manager=self.rule_manager
-        )
+        self._calculator = calculator
+        
+        if cache_max_age is None:
+            cache_max_age = self.config_manager.get_config_value('raw_cache', 'max_age_seconds', default=0)
+        self.cache_max_age = cache_max_age
         
         logger.info(f"Enhanced D&D Scraper v6.0.0 initialized for character {character_id}")
     
+    @property
+    def calculator(self) -> CharacterCalculator:
+        """
+        The character calculator, built on first use.
+        
+        Callers that only fetch and write (the batch pipeline calculates in
+        worker processes) never pay for building the calculator stack.
+        """
+        if self._calculator is None:
+            self._calculator = CharacterCalculator(
+                config_manager=self.config_manager,
+                rule_manager=self.rule_manager
+            )
+        return self._calculator
+    
     def _find_project_root(self) -> Path:
         """Find the project root directory containing character_data folder."""
         current = Path(__file__).parent.absolute()
@@ -152,13 +236,72 @@ class EnhancedDnDScraper:
         
         return fallback
     
+    def _get_raw_cache(self) -> Optional[RawPayloadCache]:
+        """Get the shared raw payload cache, or None when disabled."""
+        if not self.config_manager.get_config_value('raw_cache', 'enabled', default=True) and not self.offline:
+            return None
+        
+        cache_dir = Path(self.config_manager.get_config_value(
+            'raw_cache', 'directory', default='character_data/scraper/cache'
+        ))
+        if not cache_dir.is_absolute():
+            cache_dir = self._find_project_root() / cache_dir
+        return get_raw_payload_cache(
+            cache_dir,
+            max_entries=self.config_manager.get_config_value('raw_cache', 'max_entries', default=2000),
+            max_bytes=self.config_manager.get_config_value('raw_cache', 'max_size_mb', default=500) * 1024 * 1024
+        )
+    
+    def _load_cached_payload(self) -> bool:
+        """
+        Use a cached raw payload instead of fetching, when policy allows.
+        
+        Offline scrapers accept a cached payload of any age; otherwise it must
+        be younger than cache_max_age.
+        
+        Returns:
+            True if raw_data was loaded from the cache
+        """
+        if not self.offline and not self.cache_max_age:
+            return False
+        
+        cache = self._get_raw_cache()
+        if cache is None:
+            return False
+        
+        raw_data = cache.get(self.character_id, max_age=None if self.offline else self.cache_max_age)
+        if raw_data is None:
+            return False
+        
+        self.raw_data = raw_data
+        self.loaded_from_cache = True
+        logger.info(f"Using cached payload for character {self.character_id} "
+                    f"(fetched {cache.get_age(self.character_id):.0f}s ago)")
+        return True
+    
+    def _cache_raw_payload(self):
+        """Store the freshly fetched raw payload in the cache."""
+        cache = self._get_raw_cache()
+        if cache is None:
+            return
+        try:
+            cache.put(self.character_id, self.raw_data)
+        except OSError as e:
+            logger.warning(f"Failed to cache raw payload for {self.character_id}: {e}")
+    
     def fetch_character_data(self) -> bool:
         """
-        Fetch character data from D&D Beyond API.
+        Fetch character data from D&D Beyond API (or the raw payload cache).
 
         Returns:
             True if successful, False otherwise
         """
+        if self._load_cached_payload():
+            return True
+        if self.offline:
+            logger.error(f"No cached payload for character {self.character_id} (offline mode)")
+            return False
+        
         try:
             logger.debug("Fetching character data from API")
             self.raw_data = self.client.get_character(int(self.character_id))
@@ -187,29 +330,7 @@ class EnhancedDnDScraper:
                 logger.debug("Character is not in a campaign, skipping party inventory")
 
             # Check if character has Artificer class or subclass before fetching infusions
-            logger.debug("Checking for artificer classes")
-            character_classes = self.raw_data.get('classes', [])
-            artificer_levels = 0
-
-            for cls in character_classes:
-                if cls is None:
-                    logger.warning("Encountered None class in classes array")
-                    continue
-
-                # Safely get class definition
-                definition = cls.get('definition')
-                class_name = definition.get('name', '') if definition else ''
-
-                # Safely get subclass definition
-                subclass_def = cls.get('subclassDefinition')
-                subclass_name = subclass_def.get('name', '') if subclass_def else ''
-
-                # Check for Artificer main class
-                if class_name == 'Artificer':
-                    artificer_levels += cls.get('level', 0)
-                # Check for subclasses that grant infusions (like Armorer Fighter, etc.)
-                elif any(keyword in subclass_name.lower() for keyword in ['artificer', 'infusion']):
-                    artificer_levels += cls.get('level', 0)
+            artificer_levels = self._get_artificer_levels()
 
             if artificer_levels > 0:
                 logger.info(f"Character has {artificer_levels} Artificer levels, fetching infusion data")
@@ -237,11 +358,100 @@ class EnhancedDnDScraper:
             else:
                 logger.debug("Character has no Artificer levels, skipping infusion data")
 
+            self._cache_raw_payload()
             return True
         except Exception as e:
             logger.error(f"Failed to fetch character data: {e}")
             return False
     
+    def _get_artificer_levels(self) -> int:
+        """Count levels in Artificer or infusion-granting subclasses."""
+        logger.debug("Checking for artificer classes")
+        character_classes = self.raw_data.get('classes', [])
+        artificer_levels = 0
+
+        for cls in character_classes:
+            if cls is None:
+                logger.warning("Encountered None class in classes array")
+                continue
+
+            # Safely get class definition
+            definition = cls.get('definition')
+            class_name = definition.get('name', '') if definition else ''
+
+            # Safely get subclass definition
+            subclass_def = cls.get('subclassDefinition')
+            subclass_name = subclass_def.get('name', '') if subclass_def else ''
+
+            # Check for Artificer main class
+            if class_name == 'Artificer':
+                artificer_levels += cls.get('level', 0)
+            # Check for subclasses that grant infusions (like Armorer Fighter, etc.)
+            elif any(keyword in subclass_name.lower() for keyword in ['artificer', 'infusion']):
+                artificer_levels += cls.get('level', 0)
+
+        return artificer_levels
+
+    async def fetch_character_data_async(self, client) -> bool:
+        """
+        Fetch character data using a shared async client.
+
+        Mirrors fetch_character_data() but awaits an AsyncDNDBeyondClient so
+        many characters can share one pooled connection set.
+
+        Args:
+            client: AsyncDNDBeyondClient instance (owned by the caller)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # Cache reads and writes are gzip + index file I/O; keep them off the event loop
+        if await asyncio.to_thread(self._load_cached_payload):
+            return True
+        if self.offline:
+            logger.error(f"No cached payload for character {self.character_id} (offline mode)")
+            return False
+        
+        try:
+            character_id = int(self.character_id)
+            self.raw_data = await client.fetch_character_data(character_id)
+            logger.info("Character data fetched successfully")
+
+            campaign_data = self.raw_data.get('campaign', {})
+            if campaign_data and campaign_data.get('id'):
+                campaign_id = campaign_data['id']
+                logger.info(f"Character is in campaign {campaign_id}, fetching party inventory")
+                try:
+                    party_inventory = await client.get_party_inventory(campaign_id)
+                    if party_inventory:
+                        self.raw_data['party_inventory'] = party_inventory
+                        logger.info("Party inventory fetched successfully")
+                    else:
+                        logger.info("No party inventory available for this campaign")
+                except Exception as e:
+                    logger.warning(f"Failed to fetch party inventory: {e}")
+
+            artificer_levels = self._get_artificer_levels()
+            if artificer_levels > 0:
+                logger.info(f"Character has {artificer_levels} Artificer levels, fetching infusion data")
+                try:
+                    infusions, known_infusions = await asyncio.gather(
+                        client.get_character_infusions(character_id),
+                        client.get_known_infusions(character_id)
+                    )
+                    if infusions:
+                        self.raw_data['infusions'] = infusions
+                    if known_infusions:
+                        self.raw_data['known_infusions'] = known_infusions
+                except Exception as e:
+                    logger.warning(f"Failed to fetch infusion data: {e}")
+
+            await asyncio.to_thread(self._cache_raw_payload)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to fetch character data: {e}")
+            return False
+
     def calculate_character_data(self) -> Dict[str, Any]:
         """
         Calculate complete character data using v6.0.0 architecture.
@@ -250,21 +460,39 @@ class EnhancedDnDScraper:
             Complete character data dictionary
         """
         logger.info("Calculating complete character data using v6.0.0 architecture")
+        return self.build_complete_data(self.calculator, self.rule_manager, self.character_id, self.raw_data)
+    
+    @staticmethod
+    def build_complete_data(calculator: CharacterCalculator, rule_manager: RuleVersionManager,
+                            character_id: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the calculator over raw data and add v6.0.0 output metadata.
         
+        Static so batch worker processes can calculate without a scraper instance.
+        
+        Args:
+            calculator: Calculator to run
+            rule_manager: Rule version manager used by the calculator
+            character_id: D&D Beyond character ID
+            raw_data: Raw API data
+            
+        Returns:
+            Complete character data dictionary
+        """
         # Use the enhanced calculator with rule version detection
-        complete_data = self.calculator.calculate_complete_json(self.raw_data)
+        complete_data = calculator.calculate_complete_json(raw_data)
         
         # Add v6.0.0 metadata fields
         complete_data.update({
             'scraper_version': '6.0.0',
             'api_version': 'v5',
-            'character_url': f"https://ddb.ac/characters/{self.character_id}",
+            'character_url': f"https://ddb.ac/characters/{character_id}",
             'generated_timestamp': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
         })
         
         # Log rule version detection results
-        rule_detection = self.rule_manager.detect_rule_version(self.raw_data, int(self.character_id))
-        detection_summary = self.rule_manager.get_detection_summary(rule_detection)
+        rule_detection = rule_manager.detect_rule_version(raw_data, int(character_id))
+        detection_summary = rule_manager.get_detection_summary(rule_detection)
         
         logger.info("Rule Version Detection:")
         for line in detection_summary.split('\n'):
@@ -308,6 +536,39 @@ class EnhancedDnDScraper:
         
         return True
     
+    def _get_fingerprint_store(self) -> PayloadFingerprintStore:
+        """Get the shared payload fingerprint store for this project."""
+        return get_fingerprint_store(self._find_project_root() / "character_data" / ".fingerprints.json")
+    
+    def get_payload_fingerprint(self) -> str:
+        """
+        Fingerprint the fetched raw payload plus options that affect calculated output.
+        
+        Returns:
+            Hex digest identifying this payload/processing combination
+        """
+        if not hasattr(self, 'raw_data'):
+            raise ValueError("No character data to fingerprint. Call fetch_character_data() first.")
+        
+        clean_html = self.config_manager.get_config_value('output', 'clean_html', default=True)
+        options = f"6.0.0|rules={self.force_rule_version}|clean_html={clean_html}"
+        return compute_payload_fingerprint(self.raw_data, options)
+    
+    def is_unchanged(self, fingerprint: Optional[str] = None) -> bool:
+        """
+        Check whether the fetched payload matches the last one saved for this character.
+        
+        Args:
+            fingerprint: Precomputed payload fingerprint (computed if omitted)
+        
+        Returns:
+            True if calculation and saving can be skipped
+        """
+        targets = ('scraper', 'discord') if self.discord_output else ('scraper',)
+        return self._get_fingerprint_store().is_unchanged(
+            self.character_id, fingerprint or self.get_payload_fingerprint(), targets
+        )
+    
     def save_character_data(self, output_file: Optional[str] = None) -> str:
         """
         Save character data to JSON file with new directory structure.
@@ -321,9 +582,37 @@ class EnhancedDnDScraper:
         if not hasattr(self, 'raw_data'):
             raise ValueError("No character data to save. Call fetch_character_data() first.")
         
+        # Fingerprint before calculating, since calculators may annotate raw_data.
+        # Short-circuit when D&D Beyond returned exactly what we saved last time.
+        payload_fingerprint = self.get_payload_fingerprint()
+        self.last_save_skipped = False
+        if self.skip_unchanged and not output_file and self.is_unchanged(payload_fingerprint):
+            self.last_save_skipped = True
+            previous_path = self._get_fingerprint_store().get_outputs(self.character_id)['scraper']
+            logger.info(f"Character {self.character_id} unchanged since last scrape, keeping {previous_path}")
+            return previous_path
+        
         # Calculate complete data
         complete_data = self.calculate_character_data()
         
+        return self.write_character_data(complete_data, payload_fingerprint, output_file)
+    
+    def write_character_data(self, complete_data: Dict[str, Any], payload_fingerprint: Optional[str] = None,
+                             output_file: Optional[str] = None) -> str:
+        """
+        Write already-calculated character data and record its fingerprint.
+        
+        Args:
+            complete_data: Output of calculate_character_data()/build_complete_data()
+            payload_fingerprint: Fingerprint of the raw payload (computed if omitted)
+            output_file: Optional output filename
+            
+        Returns:
+            Path to saved file
+        """
+        if payload_fingerprint is None:
+            payload_fingerprint = self.get_payload_fingerprint()
+        
         # Check if raw data should be saved automatically
         config_manager = get_config_manager()
         include_raw_data = config_manager.get_config_value('output', 'include_raw_data', default=False)
@@ -350,9 +639,12 @@ class EnhancedDnDScraper:
             output_file = f"character_{self.character_id}_{timestamp}.json"
             output_path = scraper_dir / output_file
         
+        # Serialise once; the discord copy and its catalog hash use the same text
+        serialized = json.dumps(complete_data, indent=2, ensure_ascii=False, cls=EnhancedSpellJSONEncoder)
+        
         # Save to primary output path (scraper directory or explicit path)
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(complete_data, f, indent=2, ensure_ascii=False, cls=EnhancedSpellJSONEncoder)
+            f.write(serialized)
         
         logger.info(f"Character data saved to: {output_path.absolute()}")
         
@@ -362,11 +654,20 @@ class EnhancedDnDScraper:
             discord_filename = f"character_{self.character_id}_{timestamp}.json"
             discord_path = discord_dir / discord_filename
             
-            with open(discord_path, 'w', encoding='utf-8') as f:
-                json.dump(complete_data, f, indent=2, ensure_ascii=False, cls=EnhancedSpellJSONEncoder)
+            # Keep the snapshot catalog current so monitors never rescan the directory
+            with get_snapshot_catalog(discord_dir).changing() as catalog:
+                with open(discord_path, 'w', encoding='utf-8') as f:
+                    f.write(serialized)
+                catalog.record_snapshot(self.character_id, discord_path, serialized, complete_data)
             
             logger.info(f"Discord copy saved to: {discord_path.absolute()}")
         
+        # Remember this payload so unchanged polls can be skipped next time
+        outputs = {'scraper': str(output_path.absolute())}
+        if self.discord_output:
+            outputs['discord'] = str(discord_path.absolute())
+        self._get_fingerprint_store().record(self.character_id, payload_fingerprint, outputs)
+        
         # Send Discord notification if Discord service is explicitly configured (CLI)
         if self.discord_service:
             try:
@@ -464,6 +765,7 @@ Local JSON files are not supported.
 
     parser.add_argument(
         "character_id",
+        nargs="?",
         help="D&D Beyond character ID (from character URL)"
     )
 
@@ -508,6 +810,36 @@ Local JSON files are not supported.
         help="Process multiple character IDs from file (one per line) (Phase 4 feature)"
     )
     
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        help="Calculator worker processes for --batch (0 = one per CPU, 1 = in-process; default from config)"
+    )
+    
+    parser.add_argument(
+        "--fetch-concurrency",
+        type=int,
+        help="Characters fetched at once for --batch (default from config)"
+    )
+    
+    parser.add_argument(
+        "--max-cache-age",
+        type=float,
+        help="Use a cached raw payload younger than this many seconds instead of fetching (default from config)"
+    )
+    
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never contact D&D Beyond; calculate from the raw payload cache only"
+    )
+    
+    parser.add_argument(
+        "--recalculate-cached",
+        action="store_true",
+        help="Re-run the calculator over every character in the raw payload cache (implies --offline)"
+    )
+    
     parser.add_argument(
         "--keep-html",
         action="store_true",
@@ -531,6 +863,12 @@ Local JSON files are not supported.
         help="Path to Discord configuration file (default: discord/discord_config.yml)"
     )
     
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Skip calculation and saving when D&D Beyond returns the same data as the last saved scrape"
+    )
+    
     parser.add_argument(
         "--discord",
         action="store_true",
@@ -580,15 +918,15 @@ def perform_quick_compare(character_data: Dict[str, Any], validation_file: str):
         logger.error(f"Quick compare failed: {e}")
 
 
-def process_batch_characters(batch_file: str, args):
-    """Process multiple characters from a batch file."""
-    import time
+def process_batch_characters(batch_file: Optional[str], args, character_ids: Optional[list] = None):
+    """Process multiple characters from a batch file (or an explicit ID list)."""
     from pathlib import Path
     
-    batch_path = Path(batch_file)
-    if not batch_path.exists():
-        logger.error(f"Batch file not found: {batch_file}")
-        return False
+    if character_ids is None:
+        batch_path = Path(batch_file)
+        if not batch_path.exists():
+            logger.error(f"Batch file not found: {batch_file}")
+            return False
     
     # Handle HTML preservation configuration for batch processing
     if args.keep_html:
@@ -597,91 +935,55 @@ def process_batch_characters(batch_file: str, args):
         logger.info("HTML preservation enabled for batch processing (--keep-html flag)")
     
     # Read character IDs from file
-    with open(batch_path, 'r') as f:
-        character_ids = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if character_ids is None:
+        with open(batch_path, 'r') as f:
+            character_ids = [line.strip() for line in f if line.strip() and not line.startswith('#')]
     
     if not character_ids:
         logger.error("No character IDs found in batch file")
         return False
     
-    logger.info(f"Processing {len(character_ids)} characters from batch file")
+    logger.info(f"Processing {len(character_ids)} characters")
     
-    success_count = 0
-    failed_characters = []
-    
-    for i, character_id in enumerate(character_ids, 1):
-        logger.info(f"Processing character {i}/{len(character_ids)}: {character_id}")
+    # Handle Discord configuration for batch processing
+    discord_config = None
+    if hasattr(args, 'discord_notify') and args.discord_notify:
+        config_manager = get_config_manager()
+        discord_config = config_manager.get_config_value('discord', default={})
         
-        try:
-            # Handle Discord configuration for batch processing
-            discord_config = None
-            if hasattr(args, 'discord_notify') and args.discord_notify:
-                config_manager = get_config_manager()
-                discord_config = config_manager.get_config_value('discord', default={})
-                
-                # Override with command line arguments
-                if hasattr(args, 'discord_webhook') and args.discord_webhook:
-                    discord_config['webhook_url'] = args.discord_webhook
-                    discord_config['enabled'] = True
-                
-                if hasattr(args, 'discord_config') and args.discord_config:
-                    discord_config['config_file'] = args.discord_config
-                
-                # Enable Discord if webhook is provided
-                if discord_config.get('webhook_url'):
-                    discord_config['enabled'] = True
-                else:
-                    discord_config = None
-            
-            # Create scraper instance for this character
-            scraper = EnhancedDnDScraper(
-                character_id=character_id,
-                force_rule_version=args.force_rule_version if hasattr(args, 'force_rule_version') else None,
-                discord_config=discord_config,
-                storage_dir="character_data",
-                discord_output=getattr(args, 'discord', False)
-            )
-            
-            # Check rate limiting before API call
-            scraper._check_rate_limit()
-            
-            # Fetch character data
-            if not scraper.fetch_character_data():
-                failed_characters.append(f"{character_id}: Failed to fetch data")
-                continue
-            
-            # Save character data (will use Discord-compatible naming)
-            output_path = scraper.save_character_data()
-            
-            # Save raw data if requested
-            if args.raw_output:
-                import time
-                character_data_dir = Path("character_data")
-                character_data_dir.mkdir(exist_ok=True)
-                raw_file = str(character_data_dir / f"raw_{character_id}_{int(time.time())}.json")
-                scraper.save_raw_data(raw_file)
-            
-            success_count += 1
-            logger.info(f"✅ {character_id}: Saved to {output_path}")
-            
-        except Exception as e:
-            failed_characters.append(f"{character_id}: {str(e)}")
-            logger.error(f"❌ Failed to process {character_id}: {e}")
+        # Override with command line arguments
+        if hasattr(args, 'discord_webhook') and args.discord_webhook:
+            discord_config['webhook_url'] = args.discord_webhook
+            discord_config['enabled'] = True
         
-        # Rate limiting between batch characters is handled by _check_rate_limit()
-        # at the start of each iteration, using the configured delay_between_requests
-    
-    # Summary
-    logger.info(f"\n=== Batch Processing Complete ===")
-    logger.info(f"Successfully processed: {success_count}/{len(character_ids)} characters")
+        if hasattr(args, 'discord_config') and args.discord_config:
+            discord_config['config_file'] = args.discord_config
+        
+        # Enable Discord if webhook is provided
+        if discord_config.get('webhook_url'):
+            discord_config['enabled'] = True
+        else:
+            discord_config = None
     
-    if failed_characters:
-        logger.warning(f"Failed characters:")
-        for failure in failed_characters:
-            logger.warning(f"  - {failure}")
-        return False
+    # Fetches, calculations and writes overlap across characters; the shared
+    # rate limiter still paces every API request
+    from scraper.core.services.batch_pipeline import BatchPipeline
+    pipeline = BatchPipeline(
+        force_rule_version=args.force_rule_version if hasattr(args, 'force_rule_version') else None,
+        discord_config=discord_config,
+        discord_output=getattr(args, 'discord', False),
+        skip_unchanged=getattr(args, 'skip_unchanged', False),
+        raw_output=bool(args.raw_output),
+        fetch_concurrency=getattr(args, 'fetch_concurrency', None),
+        calculation_workers=getattr(args, 'batch_workers', None),
+        cache_max_age=getattr(args, 'max_cache_age', None),
+        offline=getattr(args, 'offline', False)
+    )
+    result = pipeline.run(character_ids)
     
-    return True
+    # Summary
+    result.log_summary()
+    return not result.failed
 
 
 def main():
@@ -710,6 +1012,18 @@ def main():
     
     # Store for batch processing
     args.force_rule_version = force_rule_version
+    
+    # Recalculate everything in the raw payload cache without the network
+    if args.recalculate_cached:
+        args.offline = True
+        scraper = EnhancedDnDScraper(character_id='0', offline=True)
+        cached_ids = scraper._get_raw_cache().character_ids()
+        if not cached_ids:
+            logger.error("Raw payload cache is empty")
+            sys.exit(1)
+        logger.info(f"Recalculating {len(cached_ids)} cached characters offline")
+        success = process_batch_characters(None, args, character_ids=cached_ids)
+        sys.exit(0 if success else 1)
 
     # Handle batch processing
     if args.batch:
@@ -723,7 +1037,8 @@ def main():
             logger.error(f"❌ Batch processing error: {e}")
             sys.exit(1)
     
-    # character_id is now required by argparse, so no need to validate here
+    if not args.character_id:
+        parser.error("character_id is required unless --batch or --recalculate-cached is given")
 
     try:
         # Handle HTML preservation configuration
@@ -763,13 +1078,17 @@ def main():
             force_rule_version=force_rule_version,
             discord_config=discord_config,
             storage_dir="character_data",
-            discord_output=args.discord
+            discord_output=args.discord,
+            skip_unchanged=args.skip_unchanged,
+            cache_max_age=args.max_cache_age,
+            offline=args.offline
         )
         _st['init'] = time.time() - _st0
 
         # Check rate limiting before API call
         _st1 = time.time()
-        scraper._check_rate_limit()
+        if not args.offline:
+            scraper._check_rate_limit()
         _st['rate_limit'] = time.time() - _st1
 
         # Fetch character data
@@ -287,8 +287,8 @@ class ConfigManager:
                     config_data['api'] = {}
                 config_data['api'].update(scraper_config['api'])
             
-            # Merge calculations, output, error_handling, testing, batch_processing, rate_limit
-            for section in ['calculations', 'output', 'error_handling', 'testing', 'batch_processing', 'rate_limit']:
+            # Merge calculations, output, error_handling, testing, batch_processing, rate_limit, raw_cache
+            for section in ['calculations', 'output', 'error_handling', 'testing', 'batch_processing', 'rate_limit', 'raw_cache']:
                 if section in scraper_config:
                     config_data[section] = scraper_config[section]
         
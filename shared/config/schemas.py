@@ -121,6 +121,19 @@ class RateLimitConfig(BaseModel):
     """Rate limiting configuration."""
     requests_per_minute: int = Field(default=3, ge=1, le=60)
     delay_between_requests: int = Field(default=5, ge=1, le=300)
+    burst: int = Field(default=1, ge=1, le=20)
+
+
+class RawCacheConfig(BaseModel):
+    """Raw API payload cache configuration."""
+    enabled: bool = Field(default=True, description="Store every fetched raw payload in the cache")
+    directory: str = Field(default="character_data/scraper/cache")
+    max_age_seconds: int = Field(
+        default=0, ge=0,
+        description="Serve cached payloads younger than this instead of fetching (0 = always fetch)"
+    )
+    max_entries: int = Field(default=2000, ge=0, description="Maximum cached payloads (0 = unlimited)")
+    max_size_mb: int = Field(default=500, ge=0, description="Maximum cache size in MB (0 = unlimited)")
 
 
 class ErrorHandlingConfig(BaseModel):
@@ -135,6 +148,16 @@ class BatchProcessingConfig(BaseModel):
     default_character_ids: List[int] = Field(default_factory=list)
     output_directory: str = Field(default="output/")
     backup_directory: str = Field(default="backup/")
+    fetch_concurrency: int = Field(
+        default=4, ge=1, le=32,
+        description="Characters fetched from D&D Beyond at once in --batch mode "
+                   "(requests are still paced by rate_limit)"
+    )
+    calculation_workers: int = Field(
+        default=0, ge=0, le=64,
+        description="Calculator worker processes for --batch mode "
+                   "(0 = one per CPU, 1 = calculate in-process)"
+    )
 
 
 class PerformanceConfig(BaseModel):
@@ -149,6 +172,15 @@ class PerformanceConfig(BaseModel):
         description="Enable memory usage optimizations. "
                    "Recommended to keep enabled unless debugging memory issues."
     )
+    parallel_pipeline: bool = Field(
+        default=False,
+        description="Run independent calculation pipeline stages concurrently on a thread pool. "
+                   "Stages still wait for the stages they declare as dependencies."
+    )
+    pipeline_workers: int = Field(
+        default=4, ge=1, le=16,
+        description="Thread pool width used when parallel_pipeline is enabled."
+    )
     # Note: cleanup_temp_files was unused and removed
 
 
@@ -201,6 +233,7 @@ class EnvironmentConfig(BaseModel):
     logging: Optional[LoggingConfig] = Field(default=None)
     testing: Optional[TestingConfig] = Field(default=None)
     rate_limit: Optional[RateLimitConfig] = Field(default=None)
+    raw_cache: Optional[RawCacheConfig] = Field(default=None)
     error_handling: Optional[ErrorHandlingConfig] = Field(default=None)
     batch_processing: Optional[BatchProcessingConfig] = Field(default=None)
     performance: Optional[PerformanceConfig] = Field(default=None)
@@ -217,6 +250,7 @@ class AppConfig(BaseModel):
     testing: TestingConfig = Field(default_factory=TestingConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
     rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    raw_cache: RawCacheConfig = Field(default_factory=RawCacheConfig)
     error_handling: ErrorHandlingConfig = Field(default_factory=ErrorHandlingConfig)
     batch_processing: BatchProcessingConfig = Field(default_factory=BatchProcessingConfig)
     performance: PerformanceConfig = Field(default_factory=PerformanceConfig)
@@ -0,0 +1,19 @@
+"""
+Text conversion shared by the scraper and the parser.
+"""
+
+from .html_markdown import (
+    ConversionMemo,
+    configure_memo,
+    dnd_html_to_markdown,
+    get_memo,
+    strip_html
+)
+
+__all__ = [
+    'ConversionMemo',
+    'configure_memo',
+    'dnd_html_to_markdown',
+    'get_memo',
+    'strip_html'
+]
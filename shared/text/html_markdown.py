@@ -0,0 +1,408 @@
+"""
+HTML to markdown conversion for D&D Beyond descriptions.
+
+Shared by the parser's TextProcessor (full markdown conversion) and the
+scraper's HTMLCleaner (plain-text stripping). All patterns are compiled once,
+passes whose trigger text is absent are skipped, and the formatting stage
+(dice, spell components, damage types, conditions, "At Higher Levels") is
+two tokenizing passes over the text instead of one regex pass per term.
+
+The HTML stage keeps its ordered passes: paragraph, emphasis, line break and
+table handling depend on what the earlier passes produced, and the rendered
+sheets must not change.
+
+Feature, trait and item descriptions repeat across characters and runs, so
+conversions go through a bounded memo keyed by a hash of the input. The memo
+can be persisted (see configure_memo()) so later runs reuse it.
+"""
+
+import hashlib
+import html
+import logging
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMO_SIZE = 4096
+MEMO_VERSION = 1
+
+# Stage 1: D&D Beyond HTML to markdown-ish text
+_P_OPEN = re.compile(r'<p[^>]*>')
+_P_CLOSE = re.compile(r'</p>')
+_STRONG = re.compile(r'<strong[^>]*>([^<]+)</strong>')
+_EM = re.compile(r'<em[^>]*>([^<]+)</em>')
+_SUBHEAD_SPAN = re.compile(r'<span[^>]*[Ii]nline-[Ss]ubhead[^>]*>([^<]+)</span>')
+_BR = re.compile(r'<br\s*/?\s*>')
+_ACTION = re.compile(r'\[action\]([^[]+)\[/action\]')
+_ITEMS = re.compile(r'\[items\]([^[]+)\[/items\]')
+_WPROP = re.compile(r'\[wprop\]([^[]+)\[/wprop\]')
+_TABLE = re.compile(r'<table[^>]*>.*?</table>', re.DOTALL | re.IGNORECASE)
+_CAPTION = re.compile(r'<caption[^>]*>([^<]+)</caption>', re.IGNORECASE)
+_ROW = re.compile(r'<tr[^>]*>(.*?)</tr>', re.DOTALL | re.IGNORECASE)
+_CELL = re.compile(r'<t[hd][^>]*>(.*?)</t[hd]>', re.DOTALL | re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+# Stage 2: markdown formatting
+_DICE_OR_HIGHER_LEVELS = re.compile(
+    r'(?<!`)(?P<dice>\d+d\d+(?:\s*[+-]\s*\d+)?)(?!`)'
+    r'|(?m:^)(?P<higher>At Higher Levels\.?)'
+)
+_DAMAGE_TYPES = ('acid', 'bludgeoning', 'cold', 'fire', 'force', 'lightning',
+                 'necrotic', 'piercing', 'poison', 'psychic', 'radiant', 'slashing', 'thunder')
+_CONDITIONS = ('blinded', 'charmed', 'deafened', 'exhaustion', 'frightened', 'grappled',
+               'incapacitated', 'invisible', 'paralyzed', 'petrified', 'poisoned', 'prone',
+               'restrained', 'stunned', 'unconscious')
+_TERM = re.compile(
+    r'\b(?P<component>[VSM])\b'
+    rf'|(?i:\b(?P<damage>{"|".join(_DAMAGE_TYPES)})\s+damage\b)'
+    rf'|(?i:\b(?P<condition>{"|".join(_CONDITIONS)})\b)'
+)
+
+# Stage 3: cleanup
+_MDASH_ENTITY_SPACING = re.compile(r'\s+&mdash;\s+')
+_MDASH_SPACING = re.compile(r'\s+—\s+')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'[ \t]+([.,:;!?])')
+_SPACE_AFTER_PUNCTUATION = re.compile(r'([.,:;!?])[ \t]+')
+_CODE_INLINE = re.compile(r'(\S)`([^`]+)`(\S)')
+_CODE_LINE_START = re.compile(r'^`([^`]+)`(\S)', re.MULTILINE)
+_CODE_LINE_END = re.compile(r'(\S)`([^`]+)`$', re.MULTILINE)
+_QUADRUPLE_BOLD = re.compile(r'\*\*\*\*([^*]+)\*\*\*\*')
+_TRIPLE_BOLD = re.compile(r'\*\*\*([^*]+)\*\*\*')
+_HORIZONTAL_WHITESPACE = re.compile(r'[ \t]+')
+
+# Plain-text stripping: &amp; is decoded first, so "&amp;lt;" ends up as "<"
+_PLAIN_ENTITIES = {
+    'lt': '<', 'gt': '>', 'quot': '"', '#39': "'", 'nbsp': ' ',
+    'mdash': '—', 'ndash': '–', 'hellip': '…',
+}
+_PLAIN_ENTITY = re.compile(r'&(?:amp;)?(lt|gt|quot|#39|nbsp|mdash|ndash|hellip);|&amp;')
+
+
+def _convert_table(match: re.Match) -> str:
+    table_html = match.group(0)
+
+    caption_match = _CAPTION.search(table_html)
+    caption = caption_match.group(1) if caption_match else ""
+
+    rows = _ROW.findall(table_html)
+    if not rows:
+        return ""
+
+    markdown_rows = []
+    headers = []
+    for i, row in enumerate(rows):
+        cells = _CELL.findall(row)
+        if not cells:
+            continue
+
+        cleaned_cells = [_WHITESPACE.sub(' ', _TAG.sub('', cell).strip()) for cell in cells]
+
+        if i == 0 and not headers:
+            # First row is likely headers
+            headers = cleaned_cells
+            markdown_rows.append('| ' + ' | '.join(headers) + ' |')
+            markdown_rows.append('|' + ''.join(' --- |' for _ in headers))
+        else:
+            markdown_rows.append('| ' + ' | '.join(cleaned_cells) + ' |')
+
+    result = ""
+    if caption:
+        result += f"**{caption}**\n\n"
+    if markdown_rows:
+        result += '\n'.join(markdown_rows)
+    return result
+
+
+def preprocess_dnd_html(text: str) -> str:
+    """Convert D&D Beyond paragraphs, emphasis, line breaks, tags and tables to markdown."""
+    if not text:
+        return ""
+
+    has_tags = '<' in text
+    if has_tags:
+        if '<p' in text:
+            text = _P_OPEN.sub('', text)
+        if '</p>' in text:
+            text = _P_CLOSE.sub('\n\n', text)
+
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    if has_tags:
+        if '<strong' in text:
+            text = _STRONG.sub(r'**\1**', text)
+        if '<em' in text:
+            text = _EM.sub(r'*\1*', text)
+        if '<span' in text:
+            text = _SUBHEAD_SPAN.sub(r'**\1**', text)
+        if '<br' in text:
+            text = _BR.sub('\n', text)
+
+    if '&nbsp;' in text:
+        text = text.replace('&nbsp;', ' ')
+
+    if '[' in text:
+        text = _ACTION.sub(r'**\1**', text)
+        text = _ITEMS.sub(r'*\1*', text)
+
+    if has_tags:
+        text = _TABLE.sub(_convert_table, text)
+
+    if '[' in text:
+        text = _WPROP.sub(r'*\1*', text)
+
+    return text
+
+
+def strip_tags_preserve_mdash(text: str) -> str:
+    """Remove HTML tags and decode entities, leaving &mdash; encoded."""
+    if not text:
+        return ""
+
+    if '<' in text:
+        text = _TAG.sub('', text)
+
+    if '&' in text or '§' in text:
+        text = text.replace('&mdash;', '§MDASH§')
+        text = html.unescape(text)
+        # Second decoding round for double-encoded entities html.unescape leaves behind
+        text = text.replace('&amp;', '&')
+        text = text.replace('&lt;', '<')
+        text = text.replace('&gt;', '>')
+        text = text.replace('&quot;', '"')
+        text = text.replace('&#39;', "'")
+        text = text.replace('&nbsp;', ' ')
+        text = text.replace('§MDASH§', '&mdash;')
+
+    return text
+
+
+def _mark_dice_or_higher_levels(match: re.Match) -> str:
+    if match.group('dice') is not None:
+        return f"`{match.group('dice')}`"
+    return f"**{match.group('higher')}**"
+
+
+def _mark_term(match: re.Match) -> str:
+    if match.group('component') is not None:
+        return f"**{match.group('component')}**"
+    if match.group('damage') is not None:
+        return f"*{match.group('damage')} damage*"
+    return f"*{match.group('condition')}*"
+
+
+def convert_dnd_formatting(text: str) -> str:
+    """Mark up dice, spell components, damage types, conditions and "At Higher Levels"."""
+    if not text:
+        return ""
+
+    # Two token passes: the markup added by the first creates word boundaries
+    # the terms in the second rely on (e.g. "`1d6`fire damage")
+    text = _DICE_OR_HIGHER_LEVELS.sub(_mark_dice_or_higher_levels, text)
+    return _TERM.sub(_mark_term, text)
+
+
+def postprocess_dnd_content(text: str) -> str:
+    """Fix dash, punctuation, inline code and doubled emphasis spacing."""
+    if not text:
+        return ""
+
+    if '&mdash;' in text:
+        text = _MDASH_ENTITY_SPACING.sub(' — ', text)
+    if '—' in text:
+        text = _MDASH_SPACING.sub(' — ', text)
+
+    text = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+    text = _SPACE_AFTER_PUNCTUATION.sub(r'\1 ', text)
+
+    if '`' in text:
+        text = _CODE_INLINE.sub(r'\1 `\2` \3', text)
+        text = _CODE_LINE_START.sub(r'`\1` \2', text)
+        text = _CODE_LINE_END.sub(r'\1 `\2`', text)
+
+    if '***' in text:
+        text = _QUADRUPLE_BOLD.sub(r'**\1**', text)
+        text = _TRIPLE_BOLD.sub(r'**\1**', text)
+
+    return text
+
+
+def normalize_paragraph_whitespace(text: str) -> str:
+    """Collapse horizontal whitespace and blank lines, keeping paragraph breaks."""
+    if not text:
+        return ""
+
+    paragraphs = []
+    for paragraph in text.split('\n\n'):
+        lines = []
+        for line in paragraph.split('\n'):
+            line = _HORIZONTAL_WHITESPACE.sub(' ', line.strip())
+            if line:
+                lines.append(line)
+        if lines:
+            paragraphs.append('\n'.join(lines))
+    return '\n\n'.join(paragraphs)
+
+
+def _dnd_html_to_markdown(text: str) -> str:
+    text = preprocess_dnd_html(text)
+    text = strip_tags_preserve_mdash(text)
+    text = convert_dnd_formatting(text)
+    text = postprocess_dnd_content(text)
+    return normalize_paragraph_whitespace(text).strip()
+
+
+def _decode_plain_entity(match: re.Match) -> str:
+    entity = match.group(1)
+    return _PLAIN_ENTITIES[entity] if entity is not None else '&'
+
+
+def _strip_html(text: str) -> str:
+    if '<' in text:
+        text = _TAG.sub('', text)
+    if '&' in text:
+        text = _PLAIN_ENTITY.sub(_decode_plain_entity, text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class ConversionMemo:
+    """
+    Bounded LRU of conversion results keyed by a hash of the converter and input.
+
+    Args:
+        max_entries: Results kept before the least recently used are dropped
+        persist_path: Pickle file to load from and save to (None = memory only)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMO_SIZE, persist_path: Optional[Path] = None):
+        self.max_entries = max(1, max_entries)
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.persist_path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def convert(self, kind: str, text: str, converter: Callable[[str], str]) -> str:
+        """
+        Memoized converter(text).
+
+        Args:
+            kind: Name of the conversion, so different converters never share results
+            text: Input text
+            converter: Function producing the result on a miss
+        """
+        key = hashlib.blake2b(f"{kind}\0{text}".encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        result = converter(text)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        return result
+
+    def save(self) -> None:
+        """Write the memo to its persist path if it has new entries."""
+        if not self.persist_path or not self._dirty:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+            self._dirty = False
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process temp file: batch workers may save concurrently
+            tmp_path = self.persist_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': MEMO_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logger.debug(f"Failed to persist text conversion memo {self.persist_path}: {e}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.persist_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') != MEMO_VERSION:
+                return
+            for key, value in cached['entries'][-self.max_entries:]:
+                self._entries[key] = value
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable text conversion memo {self.persist_path}: {e}")
+
+
+_memo = ConversionMemo()
+_memo_lock = threading.Lock()
+
+
+def configure_memo(max_entries: int = DEFAULT_MEMO_SIZE, persist_path: Optional[Path] = None) -> ConversionMemo:
+    """
+    Replace the process-wide memo if its size or persist path changed.
+
+    Returns:
+        The memo in use
+    """
+    global _memo
+    with _memo_lock:
+        persist_path = Path(persist_path) if persist_path else None
+        if _memo.max_entries != max(1, max_entries) or _memo.persist_path != persist_path:
+            _memo.save()
+            _memo = ConversionMemo(max_entries, persist_path)
+        return _memo
+
+
+def get_memo() -> ConversionMemo:
+    """The process-wide conversion memo."""
+    return _memo
+
+
+def dnd_html_to_markdown(text: str) -> str:
+    """
+    Convert a D&D Beyond HTML description to markdown (memoized).
+
+    Args:
+        text: Raw description HTML
+
+    Returns:
+        Markdown with paragraph breaks kept and whitespace normalized
+    """
+    if not text:
+        return ""
+    return _memo.convert('markdown', text, _dnd_html_to_markdown)
+
+
+def strip_html(text: str) -> str:
+    """
+    Strip tags, decode common entities and collapse whitespace (memoized).
+
+    Args:
+        text: Text potentially containing HTML
+
+    Returns:
+        Single-line plain text
+    """
+    if not text:
+        return ""
+    return _memo.convert('plain', text, _strip_html)